@@ -1,8 +1,42 @@
 # 导入 SerialServo 类并将其暴露给包用户
 from .serial_servo import SerialServo
+# 导入遥测轮询类
+from .servo_telemetry import ServoTelemetryPoller
+# 导入基于asyncio的异步串口舵机类
+from .async_serial_servo import AsyncSerialServo
+# 导入轨迹流式发送类
+from .servo_trajectory import ServoTrajectory
+# 导入串口舵机动作组播放类
+from .servo_action import ServoActionPlayer, compile_action, compile_action_json
+# 导入串口舵机总线扫描类
+from .servo_scanner import ServoScanner
+# 导入多串口舵机总线管理类
+from .servo_bus import ServoBusManager
+# 导入串口舵机总线模拟类
+from .servo_sim import SimulatedUART, VirtualServo
+# 导入串口舵机通信统计类
+from .servo_metrics import ServoMetrics
+# 导入串口舵机总线优先级调度类
+from .servo_scheduler import ServoScheduler
+# 导入串口舵机后台发送类
+from .servo_sender import ServoSender
+# 导入串口舵机第二核总线工作类
+from .servo_worker import ServoWorker
+# 导入串口舵机位置估计类
+from .servo_estimator import ServoPositionEstimator
+# 导入串口舵机闭环位置控制类
+from .servo_controller import ServoPositionController
+# 导入串口舵机批量配置类
+from .servo_provision import ServoProvisioner
+# 导入串口舵机配置快照类
+from .servo_snapshot import ServoConfigSnapshot
+# 导入串口舵机电机模式速度斜坡类
+from .servo_ramp import ServoSpeedRamp
+# 导入串口舵机总线时序模型类
+from .servo_timing import ServoTiming
 
-# 通过 __all__ 确保只暴露 SerialServo 类
-__all__ = ["SerialServo"]
+# 通过 __all__ 确保只暴露公开的类
+__all__ = ["SerialServo", "ServoTelemetryPoller", "AsyncSerialServo", "ServoTrajectory", "ServoActionPlayer", "compile_action", "compile_action_json", "ServoScanner", "ServoBusManager", "SimulatedUART", "VirtualServo", "ServoMetrics", "ServoScheduler", "ServoSender", "ServoWorker", "ServoPositionEstimator", "ServoPositionController", "ServoProvisioner", "ServoConfigSnapshot", "ServoSpeedRamp", "ServoTiming"]
 # 定义版本号
 __version__ = "1.0.0"
 
@@ -0,0 +1,725 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/8 下午3:40
+# @Author  : 李清水
+# @File    : async_serial_servo.py
+# @Description : 基于asyncio的串口舵机驱动类，异步等待舵机回复
+
+# ======================================== 导入相关模块 =========================================
+
+# 硬件相关的模块，只用于类型注解；没有 machine.UART 的平台（如unix端口）也可以导入本模块
+try:
+    from machine import UART
+except ImportError:
+    UART = None
+# 异步IO模块
+import asyncio
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 异步串口舵机类
+class AsyncSerialServo(SerialServo):
+    """
+    基于asyncio的串口舵机控制类。
+
+    该类继承 SerialServo，复用其数据包构建、校验和参数解析逻辑，写入类命令保持同步调用
+    （只向UART写入几个字节，不会阻塞）。所有读取类方法改为协程：发送请求后通过
+    asyncio.StreamReader 在UART上等待完整的回复数据包，超时则返回 None，
+    等待期间其他任务（LED刷新、网络、传感器等）可以继续运行。
+    同一总线上的读取事务由 asyncio.Lock 串行化，避免多个任务互相抢占回复；
+    等待回复期间其他任务发送的写入命令暂存起来，收到回复后再写入UART，不会与回复交错。
+
+    Attributes:
+        uart (machine.UART): 用于与舵机通信的UART实例。
+        timeout_ms (int): 等待舵机回复的超时时间，单位毫秒。
+
+    Methods:
+        与 SerialServo 中的读取方法同名的协程，例如：
+        read_servo_position(servo_id: int) -> float:
+            异步获取舵机的实时角度位置。
+        read_servo_voltage(servo_id: int) -> float:
+            异步获取舵机的实时输入电压。
+        read_servo_temp(servo_id: int) -> int:
+            异步获取舵机的实时温度。
+
+    ==========================================
+
+    asyncio based serial servo control class.
+
+    The class inherits SerialServo and reuses its packet building, checksum and parameter decoding.
+    Write commands stay synchronous (they only put a few bytes into the UART and do not block).
+    All read methods become coroutines: after the request is sent, the complete reply packet is awaited
+    through asyncio.StreamReader on the UART, and None is returned on timeout. Other tasks such as LED
+    rendering, networking or sensors keep running while a reply is pending. Read transactions on the
+    same bus are serialized with an asyncio.Lock so that tasks cannot steal each other's replies; write
+    commands sent by other tasks while a reply is awaited are held back and written to the UART once the
+    reply has arrived, so they cannot interleave with it.
+
+    Attributes:
+        uart (machine.UART): UART instance for communication with the servo.
+        timeout_ms (int): Time to wait for a servo reply, in milliseconds.
+
+    Methods:
+        Coroutines with the same names as the SerialServo read methods, for example:
+        read_servo_position(servo_id: int) -> float:
+            Asynchronously read the real-time position of the servo.
+        read_servo_voltage(servo_id: int) -> float:
+            Asynchronously read the real-time input voltage of the servo.
+        read_servo_temp(servo_id: int) -> int:
+            Asynchronously read the real-time temperature of the servo.
+    """
+
+    def __init__(self, uart: UART, timeout_ms: int = 20, echo: bool = False,
+                 cache_config: bool = False, cache_ttl_ms: int = 0, metrics=None) -> None:
+        """
+        初始化异步串口舵机控制类。
+
+        Args:
+            uart (UART): 使用的UART实例。
+            timeout_ms (int): 等待舵机回复的超时时间，单位毫秒，默认20ms。
+            echo (bool): 总线是否会回显发送的字节，默认False。
+            cache_config (bool): 是否启用静态配置缓存，默认False。
+            cache_ttl_ms (int): 配置缓存的有效期，单位毫秒，0表示永不过期。
+            metrics (ServoMetrics, optional): 通信统计实例，默认None表示不统计。
+
+        Raises:
+            ValueError: 如果超时时间不大于0或缓存有效期为负数，则抛出异常。
+
+        ==========================================
+
+        Initialize the asynchronous serial servo control class.
+
+        Args:
+            uart (UART): The UART instance used for communication with the servo.
+            timeout_ms (int): Time to wait for a servo reply in milliseconds, 20 ms by default.
+            echo (bool): Whether the bus echoes transmitted bytes, False by default.
+            cache_config (bool): Enable the static configuration cache, False by default.
+            cache_ttl_ms (int): Lifetime of cached configuration in milliseconds, 0 means never expire.
+            metrics (ServoMetrics, optional): Communication metrics, None by default to disable them.
+
+        Raises:
+            ValueError: If the timeout is not greater than 0 or the cache TTL is negative.
+        """
+        if timeout_ms <= 0:
+            raise ValueError("Timeout must be greater than 0.")
+
+        super().__init__(uart, echo, cache_config, cache_ttl_ms, metrics=metrics)
+        self.timeout_ms = timeout_ms
+        # 在UART上创建流读取对象
+        self._reader = asyncio.StreamReader(uart)
+        # 协程读取锁，保证请求和回复一一对应；_lock 保留为父类同步方法使用的事务锁
+        self._alock = asyncio.Lock()
+        # 等待回复期间暂存的数据包，不在等待回复时为None
+        self._deferred = None
+
+    def _write(self, packet) -> None:
+        """
+        发送数据包；等待回复期间暂存数据包，回复收到后再发送。
+
+        写入命令是同步调用，无法等待协程读取锁。回显模式下，等待期间写入的回显会落入正在接收的回复中，
+        并使回显长度与已经计算的回复长度不一致，因此回显和统计都在数据包真正写入时才记录。
+
+        ==========================================
+
+        Send a packet; while a reply is awaited the packet is held back and sent after the reply has arrived.
+
+        Write commands are synchronous and cannot await the coroutine read lock. In echo mode the echo of a write
+        made while waiting would land in the reply being received and no longer match the reply length already
+        computed, so echo and metrics are only recorded when the packet is actually written.
+        """
+        if self._deferred is not None:
+            # 复制数据包，调用者可能复用发送缓冲区
+            self._deferred.append(bytes(packet))
+            return
+        super()._write(packet)
+
+    def _flush_deferred(self) -> None:
+        """
+        按顺序发送等待回复期间暂存的数据包。
+
+        ==========================================
+
+        Send the packets held back while a reply was awaited, in order.
+        """
+        deferred = self._deferred
+        self._deferred = None
+        for packet in deferred:
+            super()._write(packet)
+
+    async def _aquery(self, servo_id: int, command: tuple, refresh: bool = False) -> list:
+        """
+        异步发送读取命令并等待完整的回复数据包。
+
+        与 SerialServo 相同，启用配置缓存时配置读取命令优先返回缓存中的参数。
+
+        Args:
+            servo_id (int): 舵机ID。
+            command (tuple): 读取命令元组（命令编号，参数长度，返回数据长度）。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取。
+
+        Returns:
+            list: 返回数据包中的参数，超时或数据有误时返回空列表。
+
+        ==========================================
+
+        Asynchronously send a read command and await the complete reply packet.
+
+        As in SerialServo, configuration reads are answered from the cache when it is enabled.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            command (tuple): Read command tuple (command ID, parameter length, returned data length).
+            refresh (bool): If True, bypass the configuration cache and read from the servo.
+
+        Returns:
+            list: Parameters of the reply packet, or an empty list on timeout or invalid data.
+        """
+        # 优先从配置缓存中读取
+        cacheable = self.cache_config and command[0] in SerialServo.CONFIG_READ_COMMANDS
+        if cacheable and not refresh:
+            params = self._cached_params(servo_id, command[0])
+            if params is not None:
+                return params
+
+        async with self._alock:
+            # 丢弃接收缓冲区中的残留数据，避免与本次回复错位；
+            # 回显模式下之前的写入（包括暂存后才发送的数据包）的回显可能仍在线路上，只扣除已丢弃的部分，其余计入回复长度
+            count = self.uart.any()
+            self._discard(count)
+            pending = self._echo_pending - count
+            self._echo_pending = pending if pending > 0 else 0
+            if self.metrics is not None:
+                self.metrics.record_flush()
+
+            # 发送读取命令，之后其他任务的写入暂存到收到回复为止
+            self.send_command(servo_id, command[0], [])
+            self._deferred = []
+
+            # 完整回复长度包括回显模式下自身发送的字节
+            try:
+                data = await asyncio.wait_for_ms(self._reader.readexactly(self.reply_size(command)), self.timeout_ms)
+            except asyncio.TimeoutError:
+                self._echo_pending = 0
+                self._flush_deferred()
+                if self.metrics is not None:
+                    self.metrics.record_timeout()
+                return []
+            except BaseException:
+                # 任务被取消时同样发送暂存的数据包
+                self._flush_deferred()
+                raise
+
+            if self.echo:
+                data = self._strip_echo(data)
+
+            params = self._check_packet(data, command[0], command[2])
+            self._flush_deferred()
+
+        # 读取成功后写入配置缓存
+        if cacheable and len(params) > 0:
+            self._store_config(servo_id, command[0], params)
+
+        return params
+
+    async def get_servo_move_immediate(self, servo_id: int) -> tuple:
+        """
+        异步获取舵机的预设角度和时间。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            tuple: 角度和时间的元组，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the preset angle and time of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            tuple: Angle and time, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_MOVE_TIME_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_move_time(params)
+
+    async def get_servo_move_immediate_raw(self, servo_id: int) -> tuple:
+        """
+        异步获取舵机的预设位置和时间，位置为舵机原始单位。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            tuple: 预设位置（0~1000）和时间（毫秒）的元组，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the preset position and time of the servo, position in raw units.
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            tuple: Tuple of preset position (0~1000) and time in milliseconds, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_MOVE_TIME_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_move_time_raw(params)
+
+    async def get_servo_id(self, servo_id: int) -> int:
+        """
+        异步获取舵机的ID。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 舵机ID，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the servo ID.
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            int: The servo ID, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_ID_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_servo_id(params)
+
+    async def get_servo_angle_offset(self, servo_id: int, refresh: bool = False) -> float:
+        """
+        异步获取舵机的偏差角度。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
+
+        Returns:
+            float: 偏差角度，单位为度，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the angle offset of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
+
+        Returns:
+            float: Angle offset in degrees, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_ANGLE_OFFSET_READ, refresh)
+        if len(params) == 0:
+            return None
+        return self._parse_angle_offset(params)
+
+    async def get_servo_angle_offset_raw(self, servo_id: int, refresh: bool = False) -> int:
+        """
+        异步获取舵机的偏差值（-125~125）。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
+
+        Returns:
+            int: 偏差值，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the angle offset of the servo (-125~125).
+
+        Args:
+            servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
+
+        Returns:
+            int: Offset units, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_ANGLE_OFFSET_READ, refresh)
+        if len(params) == 0:
+            return None
+        return self._parse_angle_offset_raw(params)
+
+    async def get_servo_angle_range(self, servo_id: int, refresh: bool = False) -> tuple:
+        """
+        异步获取舵机的角度限位。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
+
+        Returns:
+            tuple: 最小角度和最大角度的元组，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the angle limits of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
+
+        Returns:
+            tuple: Minimum and maximum angle, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_ANGLE_LIMIT_READ, refresh)
+        if len(params) == 0:
+            return None
+        return self._parse_angle_range(params)
+
+    async def get_servo_angle_range_raw(self, servo_id: int, refresh: bool = False) -> tuple:
+        """
+        异步获取舵机的角度限位，单位为舵机原始单位。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
+
+        Returns:
+            tuple: 最小和最大位置（0~1000）的元组，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the angle limits of the servo in raw units.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
+
+        Returns:
+            tuple: Tuple of minimum and maximum position (0~1000), or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_ANGLE_LIMIT_READ, refresh)
+        if len(params) == 0:
+            return None
+        return self._parse_angle_range_raw(params)
+
+    async def get_servo_vin_range(self, servo_id: int, refresh: bool = False) -> tuple:
+        """
+        异步获取舵机的电压限制值。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
+
+        Returns:
+            tuple: 最小电压和最大电压的元组，单位为伏特，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the voltage limits of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
+
+        Returns:
+            tuple: Minimum and maximum voltage in volts, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_VIN_LIMIT_READ, refresh)
+        if len(params) == 0:
+            return None
+        return self._parse_vin_range(params)
+
+    async def get_servo_vin_range_mv(self, servo_id: int, refresh: bool = False) -> tuple:
+        """
+        异步获取舵机的输入电压限制，单位毫伏。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
+
+        Returns:
+            tuple: 最小和最大电压（毫伏）的元组，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the input voltage limits of the servo in millivolts.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
+
+        Returns:
+            tuple: Tuple of minimum and maximum voltage in millivolts, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_VIN_LIMIT_READ, refresh)
+        if len(params) == 0:
+            return None
+        return self._parse_vin_range_mv(params)
+
+    async def get_servo_temp_range(self, servo_id: int, refresh: bool = False) -> int:
+        """
+        异步获取舵机的最高温度限制值。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
+
+        Returns:
+            int: 最高温度限制值，单位为摄氏度，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the maximum temperature limit of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
+
+        Returns:
+            int: Maximum temperature limit in degrees Celsius, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_TEMP_MAX_LIMIT_READ, refresh)
+        if len(params) == 0:
+            return None
+        return self._parse_temp_range(params)
+
+    async def read_servo_temp(self, servo_id: int) -> int:
+        """
+        异步获取舵机的实时温度。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 温度值，单位为摄氏度，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously read the real-time temperature of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            int: Temperature in degrees Celsius, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_TEMP_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_temp(params)
+
+    async def read_servo_voltage(self, servo_id: int) -> float:
+        """
+        异步获取舵机的实时输入电压。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            float: 输入电压，单位为伏特，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously read the real-time input voltage of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            float: Input voltage in volts, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_VIN_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_voltage(params)
+
+    async def read_servo_voltage_mv(self, servo_id: int) -> int:
+        """
+        异步获取舵机的实时输入电压，单位毫伏。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 输入电压（毫伏），读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously read the real-time input voltage of the servo in millivolts.
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            int: Input voltage in millivolts, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_VIN_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_voltage_mv(params)
+
+    async def read_servo_position(self, servo_id: int) -> float:
+        """
+        异步获取舵机的实时角度位置。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            float: 角度位置，单位为度，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously read the real-time position of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            float: Position in degrees, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_POS_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_position(params)
+
+    async def read_servo_position_raw(self, servo_id: int) -> int:
+        """
+        异步获取舵机的实时位置，单位为舵机原始单位（0~1000）。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 当前位置（0~1000），读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously read the real-time position of the servo in raw units (0~1000).
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            int: Current position (0~1000), or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_POS_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_position_raw(params)
+
+    async def get_servo_mode_and_speed(self, servo_id: int, refresh: bool = False) -> tuple:
+        """
+        异步获取舵机的工作模式和转动速度。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
+
+        Returns:
+            tuple: 工作模式和转动速度的元组，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the working mode and speed of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
+
+        Returns:
+            tuple: Working mode and speed, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_OR_MOTOR_MODE_READ, refresh)
+        if len(params) == 0:
+            return None
+        return self._parse_mode_and_speed(params)
+
+    async def get_servo_motor_load_status(self, servo_id: int) -> bool:
+        """
+        异步获取舵机电机是否装载。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            bool: True表示电机已装载，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get whether the servo motor is loaded.
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            bool: True if the motor is loaded, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_LOAD_OR_UNLOAD_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_load_status(params)
+
+    async def get_servo_led(self, servo_id: int) -> bool:
+        """
+        异步获取舵机LED的亮灭状态。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            bool: True表示LED常灭，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the LED status of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+
+        Returns:
+            bool: True if the LED is off, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_LED_CTRL_READ)
+        if len(params) == 0:
+            return None
+        return self._parse_led(params)
+
+    async def get_servo_led_alarm(self, servo_id: int, refresh: bool = False) -> int:
+        """
+        异步获取舵机LED故障报警值。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
+
+        Returns:
+            int: 报警值，范围0~7，读取失败时返回None。
+
+        ==========================================
+
+        Asynchronously get the LED alarm value of the servo.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
+
+        Returns:
+            int: Alarm value in the range 0~7, or None if the read fails.
+        """
+        params = await self._aquery(servo_id, SerialServo.SERVO_LED_ERROR_READ, refresh)
+        if len(params) == 0:
+            return None
+        return self._parse_led_alarm(params)
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
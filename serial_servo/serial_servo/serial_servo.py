@@ -7,8 +7,11 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 硬件相关的模块
-from machine import UART
+# 硬件相关的模块，只用于类型注解；没有 machine.UART 的平台（如unix端口）也可以导入本模块
+try:
+    from machine import UART
+except ImportError:
+    UART = None
 # 时间相关的模块
 import time
 
@@ -28,6 +31,9 @@ class SerialServo:
 
     Attributes:
         uart (machine.UART): 用于与舵机通信的UART实例。
+        reply_timeout_us (int): 读取命令等待回复的超时时间，单位微秒，默认5000。
+        sender (ServoSender): 后台发送类实例，由 ServoSender 关联，默认None表示直接写入UART。
+        timing (ServoTiming): 总线时序模型实例，由 ServoTiming 关联，默认None表示使用固定的回复超时时间。
 
     Class Variables:
         - 指令及其参数长度或返回数据长度的定义。
@@ -42,8 +48,12 @@ class SerialServo:
             构建舵机指令包。
         send_command(servo_id: int, cmd: int, params: list[int] = []) -> None:
             发送控制指令到舵机。
-        receive_command(expected_cmd: int, expected_data_len: int) -> list:
+        receive_command(expected_cmd: int, expected_data_len: int) -> memoryview:
             接收并处理舵机返回的指令数据包。
+        begin_transaction() -> None:
+            获取事务锁，开始一个不可被其他线程打断的总线事务。
+        end_transaction() -> None:
+            释放事务锁，结束总线事务。
         move_servo_immediate(servo_id: int, angle: float, time_ms: int) -> None:
             立即控制舵机转动到指定角度。
         get_servo_move_immediate(servo_id: int) -> tuple:
@@ -98,6 +108,11 @@ class SerialServo:
             设置舵机LED闪烁报警对应的故障值。
         get_servo_led_alarm(servo_id: int) -> int:
             获取舵机LED故障报警状态。
+        move_servo_immediate_raw、move_servo_with_time_delay_raw、get_servo_move_immediate_raw、
+        read_servo_position_raw、set/get_servo_angle_range_raw、set/get_servo_angle_offset_raw:
+            使用舵机原始位置单位（0~1000）的整数接口，不进行浮点运算。
+        read_servo_voltage_mv、set/get_servo_vin_range_mv:
+            使用毫伏整数的电压接口。
 
     =================================================
 
@@ -110,6 +125,9 @@ class SerialServo:
 
     Attributes:
         uart (machine.UART): UART instance for communication with the servo.
+        reply_timeout_us (int): Time a read command waits for its reply, in microseconds, default 5000.
+        sender (ServoSender): Background sender attached by ServoSender, None by default to write the UART directly.
+        timing (ServoTiming): Bus timing model attached by ServoTiming, None by default to use the fixed reply timeout.
 
     Class Variables:
         - Definitions of command lengths or return data lengths.
@@ -124,8 +142,12 @@ class SerialServo:
             Construct servo control command packet.
         send_command(servo_id: int, cmd: int, params: list[int] = []) -> None:
             Send control command to the servo.
-        receive_command(expected_cmd: int, expected_data_len: int) -> list:
+        receive_command(expected_cmd: int, expected_data_len: int) -> memoryview:
             Receive and process the response from the servo.
+        begin_transaction() -> None:
+            Take the transaction lock to start a bus transaction other threads cannot interrupt.
+        end_transaction() -> None:
+            Release the transaction lock and end the bus transaction.
         move_servo_immediate(servo_id: int, angle: float, time_ms: int) -> None:
             Control the servo to move immediately to a specified angle.
         get_servo_move_immediate(servo_id: int) -> tuple:
@@ -180,6 +202,11 @@ class SerialServo:
             Set the LED alarm fault code for the servo.
         get_servo_led_alarm(servo_id: int) -> int:
             Get the current LED alarm fault code of the servo.
+        move_servo_immediate_raw, move_servo_with_time_delay_raw, get_servo_move_immediate_raw,
+        read_servo_position_raw, set/get_servo_angle_range_raw, set/get_servo_angle_offset_raw:
+            Integer API in raw servo position units (0~1000) without floating point math.
+        read_servo_voltage_mv, set/get_servo_vin_range_mv:
+            Voltage API in integer millivolts.
 
     """
 
@@ -272,6 +299,9 @@ class SerialServo:
     ERROR_OVER_VOLT_AND_STALL = 6   # 过压和堵转报警
     ERROR_ALL = 7                   # 过温、过压和堵转报警
 
+    # 接收缓冲区大小：最长的回复为10字节，超出部分（回显或残留数据）分块读出后丢弃
+    RX_BUFFER_SIZE = 32
+
     # 读取命令集合：根据指令的元组长度来确定哪些是读取命令（命令编号，参数长度，返回数据长度）
     READ_COMMANDS = {
         2,  # SERVO_MOVE_TIME_READ
@@ -290,12 +320,61 @@ class SerialServo:
         36  # SERVO_LED_ERROR_READ
     }
 
-    def __init__(self, uart: UART) -> None:
+    # 配置写入命令与对应读取命令的映射：写入参数与读取返回的参数格式一致，可直接更新配置缓存
+    CONFIG_WRITE_TO_READ = {
+        17: 19, # SERVO_ANGLE_OFFSET_ADJUST -> SERVO_ANGLE_OFFSET_READ
+        20: 21, # SERVO_ANGLE_LIMIT_WRITE -> SERVO_ANGLE_LIMIT_READ
+        22: 23, # SERVO_VIN_LIMIT_WRITE -> SERVO_VIN_LIMIT_READ
+        24: 25, # SERVO_TEMP_MAX_LIMIT_WRITE -> SERVO_TEMP_MAX_LIMIT_READ
+        29: 30, # SERVO_OR_MOTOR_MODE_WRITE -> SERVO_OR_MOTOR_MODE_READ
+        35: 36  # SERVO_LED_ERROR_WRITE -> SERVO_LED_ERROR_READ
+    }
+
+    # 可缓存的配置读取命令集合
+    CONFIG_READ_COMMANDS = {19, 21, 23, 25, 30, 36}
+
+    # 可合并的写入命令集合：参数与上一次发送的完全相同时，舵机状态不会改变，可以不再发送
+    COALESCE_COMMANDS = {
+        1,  # SERVO_MOVE_TIME_WRITE
+        17, # SERVO_ANGLE_OFFSET_ADJUST
+        20, # SERVO_ANGLE_LIMIT_WRITE
+        22, # SERVO_VIN_LIMIT_WRITE
+        24, # SERVO_TEMP_MAX_LIMIT_WRITE
+        29, # SERVO_OR_MOTOR_MODE_WRITE
+        31, # SERVO_LOAD_OR_UNLOAD_WRITE
+        33, # SERVO_LED_CTRL_WRITE
+        35  # SERVO_LED_ERROR_WRITE
+    }
+
+    # 会改变舵机运动状态的命令集合：发送后立即转动命令的影子状态失效
+    MOTION_RESET_COMMANDS = {
+        7,  # SERVO_MOVE_TIME_WAIT_WRITE
+        11, # SERVO_MOVE_START
+        12, # SERVO_MOVE_STOP
+        29, # SERVO_OR_MOTOR_MODE_WRITE
+        31  # SERVO_LOAD_OR_UNLOAD_WRITE
+    }
+
+    def __init__(self, uart: UART, echo: bool = False, cache_config: bool = False, cache_ttl_ms: int = 0,
+                 coalesce_writes: bool = False, metrics=None, thread_safe: bool = False) -> None:
         """
         初始化串口舵机控制类。
 
         Args:
             uart (UART): 使用的UART实例。
+            echo (bool): 总线是否会将发送的字节回显到接收端（常见的单线半双工TTL舵机总线适配板），
+                         为True时接收数据前会丢弃自身发送的字节，默认False。
+            cache_config (bool): 是否启用静态配置缓存（角度限位、电压限制、温度限制、偏差、工作模式、LED报警），
+                                 首次读取后缓存，调用对应的设置方法时同步更新，默认False。
+            cache_ttl_ms (int): 配置缓存的有效期，单位毫秒，0表示永不过期。
+            coalesce_writes (bool): 是否启用写入合并，为True时记录每个舵机最近一次发送的状态（目标角度和时间、
+                                    LED、装载、工作模式及各项配置），不会改变舵机状态的重复命令不再发送，默认False。
+            metrics (ServoMetrics, optional): 通信统计实例，按舵机和指令统计发送、回复和各类错误，默认None表示不统计。
+            thread_safe (bool): 是否启用事务锁，为True时每次读取的请求和回复在事务锁内完成，多个线程或中断回调
+                                可以共用同一个实例，默认False。
+
+        Raises:
+            ValueError: 如果缓存有效期为负数，则抛出异常。
 
         ===================================================
 
@@ -303,10 +382,78 @@ class SerialServo:
 
         Args:
             uart (UART): The UART instance used for communication with the servo.
+            echo (bool): Whether the bus echoes every transmitted byte back into RX (common one-wire
+                         half-duplex TTL servo adapters). When True, our own bytes are discarded
+                         before a reply is parsed. Default is False.
+            cache_config (bool): Enable the static configuration cache (angle limits, voltage limits, temperature
+                                 limit, offset, working mode, LED alarm). Values are cached on first read and updated
+                                 by the matching setters. Default is False.
+            cache_ttl_ms (int): Lifetime of cached configuration in milliseconds, 0 means never expire.
+            coalesce_writes (bool): Enable write coalescing. The last commanded state of every servo (target angle
+                                    and time, LED, load, mode and configuration) is shadowed, and repeated commands
+                                    that would not change it are not sent. Default is False.
+            metrics (ServoMetrics, optional): Communication metrics counting sends, replies and errors per servo and
+                                              command. Default None disables metrics.
+            thread_safe (bool): Enable transaction locking. When True, the request and reply of every read happen
+                                under a transaction lock, so several threads or interrupt callbacks can share one
+                                instance. Default is False.
+
+        Raises:
+            ValueError: If the cache TTL is negative.
 
         """
         self.uart = uart
 
+        # 回显抑制：尚未从接收数据中丢弃的自身发送字节数，以及最近一次发送的数据包
+        self.echo = echo
+        self._echo_pending = 0
+        self._last_packet = b''
+
+        # 配置缓存：舵机ID -> {读取命令编号: (参数, 缓存时间)}
+        if cache_ttl_ms < 0:
+            raise ValueError("Cache TTL must not be negative.")
+        self.cache_config = cache_config
+        self.cache_ttl_ms = cache_ttl_ms
+        self._config_cache = {}
+
+        # 写入合并：舵机ID -> {写入命令编号: 最近一次发送的参数}，以及发送和被合并的命令计数
+        self.coalesce_writes = coalesce_writes
+        self._shadow = {}
+        self.sent_writes = 0
+        self.suppressed_writes = 0
+
+        # 读取命令等待回复的超时时间，单位微秒，完整回复到达后立即返回
+        self.reply_timeout_us = 5000
+
+        # 通信统计，None表示不统计
+        self.metrics = metrics
+
+        # 后台发送类实例（ServoSender），None表示直接写入UART
+        self.sender = None
+
+        # 总线时序模型（ServoTiming），None表示使用固定的回复超时时间；以及已写入数据发送完成时刻的估计值
+        self.timing = None
+        self._tx_end = time.ticks_us()
+
+        # 预先分配的接收缓冲区和参数缓冲区，以及每种参数长度对应的视图，接收回复时不分配内存
+        self._rx = bytearray(SerialServo.RX_BUFFER_SIZE)
+        self._params = bytearray(SerialServo.RX_BUFFER_SIZE)
+        view = memoryview(self._params)
+        self._param_views = [view[:n] for n in range(SerialServo.RX_BUFFER_SIZE - 5)]
+
+        # 事务锁：一次读取的请求和回复之间持有；写入锁：只在写入UART和更新状态时短暂持有；None表示不加锁
+        self._lock = None
+        self._write_lock = None
+        # 持有事务锁的线程ID，事务内的写入不再获取事务锁
+        self._owner = None
+        self._get_ident = None
+        if thread_safe:
+            # 只在启用时导入线程模块，没有 _thread 的平台也可以使用本类
+            import _thread
+            self._lock = _thread.allocate_lock()
+            self._write_lock = _thread.allocate_lock()
+            self._get_ident = _thread.get_ident
+
     def calculate_checksum(self, data: list[int]) -> int:
         """
         计算校验和。
@@ -316,179 +463,1185 @@ class SerialServo:
         Args:
             data (list[int]): 数据包（不包括校验和本身）。
 
-        Returns:
-            int: 计算出的校验和，值范围为 0~255。
+        Returns:
+            int: 计算出的校验和，值范围为 0~255。
+
+        ===================================================
+
+        Calculate checksum to ensure data integrity and correctness.
+
+        The checksum is obtained by summing the data packet and taking the one's complement (low eight bits of data).
+        Args:
+            data (list[int]): Data packet (excluding checksum itself).
+
+        Returns:
+            int: Calculated checksum, value range 0~255.
+
+        """
+
+        checksum = ~(sum(data) & 0xFF) & 0xFF
+
+        return checksum
+
+    def build_packet(self, servo_id: int, cmd: int, params: list[int]) -> bytearray:
+        """
+        构建舵机指令包。
+
+        根据舵机ID、指令命令和参数生成一个完整的数据包，并附加校验和。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253，其中254为广播ID，表示所有舵机。
+            cmd (int): 指令命令字节。
+            params (list[int]): 参数列表。
+
+        Returns:
+            bytearray: 构建的舵机控制指令包。
+
+        Raises:
+            ValueError: 如果舵机ID不在 0~254 范围内，则抛出异常。
+
+        ===================================================
+
+        Build servo control command packet, including checksum.
+
+        Args:
+            servo_id (int): Servo ID, range 0~253, where 254 is broadcast ID, indicating all servos.
+            cmd (int): Command byte.
+            params (list[int]): Parameter list (default empty).
+
+        Returns:
+            bytearray: Built servo control command packet, including checksum.
+
+        Raises:
+            ValueError: If the servo ID is not in the range 0~254, an exception will be raised.
+        """
+        # 对传入参数进行检查
+        # 检查舵机ID是否在 0~254 范围内
+        if servo_id < 0 or servo_id > 254:
+            raise ValueError("Servo ID must be in range 0~254.")
+
+        # 数据包长度（指令+参数+校验和）
+        length = 3 + len(params)
+        # 构建数据包：帧头 + ID + 数据长度 + 命令 + 参数 + 校验和
+        packet = [0x55, 0x55, servo_id, length, cmd] + params
+        # 计算校验和（从ID到最后一个参数）
+        checksum = self.calculate_checksum(packet[2:])
+        # 增加校验和
+        packet.append(checksum)
+
+        return bytearray(packet)
+
+    def send_command(self, servo_id: int, cmd: int, params: list[int] = []) -> None:
+        """
+        发送控制指令到舵机。
+
+        通过UART将构建好的数据包发送给指定舵机，执行相应的控制命令。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            cmd (int): 指令命令字节。
+            params (list[int], optional): 参数列表（默认为空）。
+
+        Raises:
+            ValueError: 如果舵机ID不在 0~254 范围内，则抛出异常。
+
+        ===================================================
+
+        Send control command to the servo.
+
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            cmd (int): Command byte.
+            params (list[int], optional): Parameter list (default empty).
+
+        Raises:
+            ValueError: If the servo ID is not in the range 0~254, an exception will be raised.
+
+        """
+        write_lock = self._write_lock
+        if write_lock is None:
+            self._send(servo_id, cmd, params)
+            return
+
+        # 只写指令不等待正在进行的读取事务，只持有写入锁；回显模式下写入的回显会进入接收缓冲区，需要与读取事务互斥。
+        # 读取指令由调用者在事务中发送（例如 _query），这里不再获取事务锁
+        transaction = self._needs_transaction(cmd)
+        if transaction:
+            self.begin_transaction()
+        write_lock.acquire()
+        try:
+            self._send(servo_id, cmd, params)
+        finally:
+            write_lock.release()
+            if transaction:
+                self.end_transaction()
+
+    def _needs_transaction(self, cmd: int) -> bool:
+        """
+        判断只写指令是否需要获取事务锁：回显模式下需要，当前线程已经持有事务锁时不再获取。
+
+        ===================================================
+
+        Tell whether a write-only command needs the transaction lock: it does in echo mode, unless the current thread
+        already holds the lock.
+        """
+        if not self.echo or cmd in SerialServo.READ_COMMANDS:
+            return False
+        return self._owner != self._get_ident()
+
+    def _send(self, servo_id: int, cmd: int, params: list) -> None:
+        """
+        构建并发送指令，同时更新写入合并的影子状态和配置缓存，调用者负责加锁。
+
+        ===================================================
+
+        Build and send a command and update the write-coalescing shadow and configuration cache; the caller
+        holds any locks.
+        """
+        # 写入合并：与影子状态相同的命令不再发送
+        if self.coalesce_writes and cmd in SerialServo.COALESCE_COMMANDS:
+            shadow = self._shadow.get(servo_id)
+            if shadow is not None and shadow.get(cmd) == params:
+                self.suppressed_writes += 1
+                return
+            self.sent_writes += 1
+
+        packet = self.build_packet(servo_id, cmd, params)
+        self._write(packet)
+
+        # 配置写入命令同步更新配置缓存
+        if self.cache_config:
+            self._update_config_cache(servo_id, cmd, params)
+
+        # 更新影子状态
+        if self.coalesce_writes:
+            self._update_shadow(servo_id, cmd, params)
+
+    def _update_shadow(self, servo_id: int, cmd: int, params: list) -> None:
+        """
+        根据已发送的命令更新影子状态。
+
+        可合并的写入命令记录其参数；改变运动状态的命令使立即转动命令的影子状态失效；
+        广播命令作用于所有已记录的舵机；修改舵机ID时将影子状态迁移到新ID下。
+
+        ===================================================
+
+        Update the shadow state from a sent command.
+
+        Coalescable writes record their parameters; commands that change the motion state invalidate the
+        shadowed immediate move; broadcast commands apply to every shadowed servo; changing a servo ID moves
+        its shadow to the new ID.
+        """
+        if cmd == SerialServo.SERVO_ID_WRITE[0]:
+            # 修改舵机ID：影子状态迁移到新ID下
+            if servo_id == 254:
+                self._shadow.clear()
+            elif servo_id in self._shadow:
+                self._shadow[params[0]] = self._shadow.pop(servo_id)
+            return
+
+        # 广播命令作用于所有已记录的舵机
+        if servo_id == 254:
+            targets = list(self._shadow.values())
+        else:
+            if servo_id not in self._shadow:
+                self._shadow[servo_id] = {}
+            targets = [self._shadow[servo_id]]
+
+        move_cmd = SerialServo.SERVO_MOVE_TIME_WRITE[0]
+        for shadow in targets:
+            if cmd in SerialServo.MOTION_RESET_COMMANDS and move_cmd in shadow:
+                del shadow[move_cmd]
+            if cmd in SerialServo.COALESCE_COMMANDS:
+                # 保存参数副本，避免调用者修改列表
+                shadow[cmd] = list(params)
+
+    def invalidate_shadow(self, servo_id: int = None) -> None:
+        """
+        使写入合并的影子状态失效，下一次命令一定会发送。
+
+        当舵机被外部控制、重新上电或通信异常后应调用该方法。
+
+        Args:
+            servo_id (int, optional): 舵机ID，为None时清空所有舵机的影子状态。
+
+        ===================================================
+
+        Invalidate the write-coalescing shadow state so that the next command is always sent.
+
+        Call it after the servo was driven externally, power cycled, or communication failed.
+
+        Args:
+            servo_id (int, optional): Servo ID; None clears the shadow of every servo.
+        """
+        if servo_id is None:
+            self._shadow.clear()
+        elif servo_id in self._shadow:
+            del self._shadow[servo_id]
+
+    def write_packet(self, packet) -> None:
+        """
+        通过UART发送一个已构建好的数据包。
+
+        在回显模式下记录发送的字节，以便接收时从数据中丢弃回显。
+        关联了后台发送类时，只写指令放入其发送缓冲区后立即返回；读取指令需要按顺序收到回复，
+        发送前先同步写出缓冲区中的全部数据。
+
+        Args:
+            packet (bytes | bytearray): 完整的舵机指令包。
+
+        ===================================================
+
+        Send an already built packet through the UART.
+
+        In echo mode the transmitted bytes are recorded so that their echo can be discarded on receive.
+        With a background sender attached, write-only commands are put into its TX buffer and the call returns at
+        once; read commands need their replies in order, so the buffer is written out synchronously before them.
+
+        Args:
+            packet (bytes | bytearray): A complete servo command packet.
+        """
+        write_lock = self._write_lock
+        if write_lock is None:
+            self._write(packet)
+            return
+
+        # 回显模式下与 send_command 相同，只写指令的回显不能落入其他线程的读取事务中
+        transaction = self._needs_transaction(packet[4])
+        if transaction:
+            self.begin_transaction()
+        # 一次写入的多个数据包（例如分组运动）在写入锁内完整发送，不会与其他线程的数据交错
+        write_lock.acquire()
+        try:
+            self._write(packet)
+        finally:
+            write_lock.release()
+            if transaction:
+                self.end_transaction()
+
+    def _write(self, packet) -> None:
+        """
+        发送数据包并记录统计和回显，调用者负责加锁。
+
+        ===================================================
+
+        Send a packet and record metrics and echo; the caller holds any locks.
+        """
+        sender = self.sender
+        if sender is None:
+            self.uart.write(packet)
+        elif packet[4] in SerialServo.READ_COMMANDS or not sender.enqueue(packet):
+            # 读取指令或缓冲区已满：先写出缓冲区中的数据，再直接发送
+            sender.flush()
+            if packet[4] not in SerialServo.READ_COMMANDS:
+                sender.overflows += 1
+            self.uart.write(packet)
+        else:
+            # 已放入后台发送缓冲区：发送完成时刻和回显由后台发送类在数据真正写入UART时累计
+            if self.metrics is not None:
+                self.metrics.record_send(packet)
+            return
+
+        # 累计发送完成时刻
+        if self.timing is not None:
+            self._tx_end = self.timing.tx_end(self._tx_end, len(packet))
+
+        if self.metrics is not None:
+            self.metrics.record_send(packet)
+
+        # 回显模式下记录发送的字节
+        if self.echo:
+            self._echo_pending += len(packet)
+            self._last_packet = packet
+
+        # 等待读取回复期间暂停后台发送，避免与回复冲突；截止时刻按最长的回复计算
+        if sender is not None and packet[4] in SerialServo.READ_COMMANDS:
+            sender._hold_until = self.reply_deadline(SerialServo.SERVO_MOVE_TIME_READ)
+
+    def reply_size(self, command: tuple) -> int:
+        """
+        计算读取命令的完整回复在接收缓冲区中占用的字节数（包括尚未丢弃的回显字节）。
+
+        Args:
+            command (tuple): 读取命令元组（命令编号，参数长度，返回数据长度）。
+
+        Returns:
+            int: 接收完整回复所需的字节数。
+
+        ===================================================
+
+        Number of bytes a complete reply to a read command occupies in the receive buffer,
+        including echo bytes that have not been discarded yet.
+
+        Args:
+            command (tuple): Read command tuple (command ID, parameter length, returned data length).
+
+        Returns:
+            int: Number of bytes needed to receive the complete reply.
+        """
+        # 帧头2字节 + ID 1字节 + 数据长度
+        return command[2] + 3 + self._echo_pending
+
+    def reply_deadline(self, command: tuple) -> int:
+        """
+        计算刚发送的读取命令等待完整回复的截止时刻。
+
+        关联了总线时序模型时，从请求实际发送完成的时刻（包括排在它前面的写入数据）起算；
+        否则为当前时刻加上 reply_timeout_us。
+
+        Args:
+            command (tuple): 读取命令元组（命令编号，参数长度，返回数据长度）。
+
+        Returns:
+            int: 截止时刻（time.ticks_us）。
+
+        ===================================================
+
+        Deadline for the complete reply to a read command that has just been sent.
+
+        With a bus timing model attached it counts from the moment the request has actually left the wire
+        (including any writes queued before it); otherwise it is now plus reply_timeout_us.
+
+        Args:
+            command (tuple): Read command tuple (command ID, parameter length, returned data length).
+
+        Returns:
+            int: Deadline (time.ticks_us).
+        """
+        timing = self.timing
+        if timing is None:
+            return time.ticks_add(time.ticks_us(), self.reply_timeout_us)
+        return time.ticks_add(self._tx_end, timing.reply_window_us(command))
+
+    def wait_reply(self, command: tuple, timeout_us: int = None) -> bool:
+        """
+        轮询等待读取命令的完整回复到达接收缓冲区，而不是固定延时。
+
+        Args:
+            command (tuple): 读取命令元组（命令编号，参数长度，返回数据长度）。
+            timeout_us (int, optional): 超时时间，单位微秒，None表示等待到 reply_deadline() 的截止时刻。
+
+        Returns:
+            bool: 完整回复在超时前到达时返回True，否则返回False。
+
+        ===================================================
+
+        Poll until the complete reply to a read command is in the receive buffer instead of sleeping a fixed time.
+
+        Args:
+            command (tuple): Read command tuple (command ID, parameter length, returned data length).
+            timeout_us (int, optional): Timeout in microseconds, None waits until the reply_deadline() deadline.
+
+        Returns:
+            bool: True if the complete reply arrived before the timeout, False otherwise.
+        """
+        if timeout_us is None:
+            deadline = self.reply_deadline(command)
+        else:
+            deadline = time.ticks_add(time.ticks_us(), timeout_us)
+        size = self.reply_size(command)
+        while self.uart.any() < size:
+            if time.ticks_diff(time.ticks_us(), deadline) > 0:
+                return False
+        return True
+
+    def flush_input(self) -> None:
+        """
+        清空UART接收缓冲区，并清除尚未丢弃的回显记录。
+
+        ===================================================
+
+        Empty the UART receive buffer and clear any pending echo bookkeeping.
+        """
+        self._discard(self.uart.any())
+        self._echo_pending = 0
+
+        # 仍未收到回复的读取请求记为超时
+        if self.metrics is not None:
+            self.metrics.record_flush()
+
+    def _discard(self, count: int) -> int:
+        """
+        分块读出并丢弃接收缓冲区中的 count 个字节，不分配内存。
+
+        Args:
+            count (int): 要丢弃的字节数。
+
+        Returns:
+            int: 实际丢弃的字节数。
+
+        ===================================================
+
+        Read out and drop count bytes of the receive buffer in chunks without allocating.
+
+        Args:
+            count (int): Number of bytes to drop.
+
+        Returns:
+            int: Number of bytes actually dropped.
+        """
+        buf = self._rx
+        size = len(buf)
+        dropped = 0
+        while count > 0:
+            got = self.uart.readinto(buf, count if count < size else size)
+            if not got:
+                break
+            count -= got
+            dropped += got
+        return dropped
+
+    def _strip_echo(self, data):
+        """
+        从接收数据中丢弃自身发送的回显字节。
+
+        回显字节数由发送时记录，并与最近一次发送的数据包逐字节比对，不会产生额外的读取和延时。
+        如果比对不一致，则认为总线没有产生回显，数据原样返回。
+
+        Args:
+            data (bytes): 从UART接收到的数据。
+
+        Returns:
+            bytes: 去除回显后的数据。
+
+        ===================================================
+
+        Discard our own echoed bytes from received data.
+
+        The echo length is recorded on transmit and checked byte by byte against the last sent packet,
+        so no extra reads or sleeps are needed. If they do not match, the bus is assumed not to have
+        echoed and the data is returned unchanged.
+
+        Args:
+            data (bytes): Data received from the UART.
+
+        Returns:
+            bytes: The data without echo.
+        """
+        return data[self._echo_offset(data, len(data)):]
+
+    def _echo_offset(self, data, count: int) -> int:
+        """
+        计算接收数据中回显字节之后的起始位置，并更新尚未丢弃的回显记录。
+
+        Args:
+            data (bytes | bytearray): 接收到的数据。
+            count (int): 数据中有效的字节数。
+
+        Returns:
+            int: 回复数据的起始位置，没有回显或比对不一致时为0。
+
+        ===================================================
+
+        Offset of the data following our own echo, updating the pending echo bookkeeping.
+
+        Args:
+            data (bytes | bytearray): Received data.
+            count (int): Number of valid bytes in data.
+
+        Returns:
+            int: Start of the reply data, 0 without echo or on a mismatch.
+        """
+        pending = self._echo_pending
+        if pending == 0:
+            return 0
+
+        # 只收到了部分回显，全部丢弃
+        if count <= pending:
+            self._echo_pending = pending - count
+            return count
+
+        self._echo_pending = 0
+        # 回显的最后部分应与最近一次发送的数据包一致，前部已被分块丢弃时只比对剩余部分
+        last = self._last_packet
+        n = len(last)
+        if n > pending:
+            n = pending
+        base = pending - n
+        skip = len(last) - n
+        for i in range(n):
+            if data[base + i] != last[skip + i]:
+                return 0
+
+        return pending
+
+    def receive_command(self, expected_cmd: int, expected_data_len: int) -> memoryview:
+        """
+        接收并处理舵机返回的指令数据包。
+
+        该方法使用 `uart.readinto` 把数据读入预先分配的接收缓冲区，验证帧头、命令编号、数据长度及校验和，
+        如果数据无误，把参数复制到预先分配的参数缓冲区并返回其视图，整个过程不分配内存。
+        返回的视图在下一次接收时会被覆盖，需要保留参数时应使用 `bytes(params)` 复制；
+        启用 thread_safe 时其他线程可能随时接收，此时返回参数的副本。
+
+        Args:
+            expected_cmd (int): 期望接收到的命令编号。
+            expected_data_len (int): 期望的返回数据长度。
+
+        Returns:
+            memoryview | bytes: 返回数据包中的参数（启用 thread_safe 时为副本），如果数据有误则返回长度为0的视图。
+
+        Raises:
+            ValueError: 如果期望接收到的命令编号不是读取命令，则抛出异常。
+
+        ===================================================
+
+        Receive and process the response from the servo.
+
+        This method reads the data into a preallocated receive buffer with `uart.readinto`, validates the frame header,
+        command ID, data length, and checksum. If the data is correct, the parameters are copied into a preallocated
+        parameter buffer and a view of it is returned, so nothing is allocated. The view is overwritten by the next
+        receive; copy it with `bytes(params)` to keep the parameters. With thread_safe enabled another thread may
+        receive at any time, so a copy of the parameters is returned instead.
+
+        Args:
+            expected_cmd (int): The expected command ID to be received.
+            expected_data_len (int): The expected length of the returned data.
+
+        Returns:
+            memoryview | bytes: Parameters of the packet (a copy with thread_safe enabled), or a zero-length view if
+                                the data is incorrect.
+
+        Raises:
+            ValueError: If the expected command ID is not a read command, an exception is raised.
+
+        """
+        # 判断期望接收到的命令编号是否是读取命令
+        if expected_cmd not in SerialServo.READ_COMMANDS:
+            raise ValueError("Expected command is not a read command.")
+
+        uart = self.uart
+        buf = self._rx
+        available = uart.any()
+
+        # 超出接收缓冲区的前部数据只能是回显或残留数据，分块读出后丢弃
+        if available > len(buf):
+            dropped = self._discard(available - len(buf))
+            available -= dropped
+            pending = self._echo_pending
+            if dropped > pending:
+                # 丢弃了回显以外的数据，本次回复无效
+                self._echo_pending = 0
+                self._discard(available)
+                if self.metrics is not None:
+                    self.metrics.record_length_error()
+                return self._param_views[0]
+            self._echo_pending = pending - dropped
+
+        # 接收数据
+        count = uart.readinto(buf, available) if available > 0 else 0
+        if not count:
+            count = 0
+
+        # 回显模式下跳过自身发送的字节
+        start = 0
+        if self.echo:
+            start = self._echo_offset(buf, count)
+
+        params = self._check_frame(buf, start, count, expected_cmd, expected_data_len)
+        # 启用事务锁时，其他线程的读取可能在事务结束后覆盖共享的参数缓冲区，返回副本
+        if self._lock is not None and len(params) > 0:
+            return bytes(params)
+        return params
+
+    def _check_packet(self, data, expected_cmd: int, expected_data_len: int) -> memoryview:
+        """
+        校验一个完整的返回数据包并取出参数。
+
+        检查帧头、命令编号、数据长度和校验和，任一项不符合时返回长度为0的视图。
+
+        Args:
+            data (bytes): 接收到的完整数据包。
+            expected_cmd (int): 期望接收到的命令编号。
+            expected_data_len (int): 期望的返回数据长度。
+
+        Returns:
+            memoryview: 数据包中的参数，如果数据有误则返回长度为0的视图。
+
+        ===================================================
+
+        Validate a complete reply packet and extract its parameters.
+
+        The frame header, command ID, data length and checksum are checked; a zero-length view is returned
+        if any of them does not match.
+
+        Args:
+            data (bytes): The complete received packet.
+            expected_cmd (int): The expected command ID.
+            expected_data_len (int): The expected length of the returned data.
+
+        Returns:
+            memoryview: Parameters of the packet, or a zero-length view if the data is incorrect.
+        """
+        return self._check_frame(data, 0, len(data), expected_cmd, expected_data_len)
+
+    def _check_frame(self, data, start: int, end: int, expected_cmd: int, expected_data_len: int) -> memoryview:
+        """
+        按下标校验 data[start:end] 中的返回数据包，不复制数据；参数复制到预先分配的参数缓冲区。
+
+        ===================================================
+
+        Validate the reply packet in data[start:end] by index without copying it; the parameters are copied into
+        the preallocated parameter buffer.
+        """
+        metrics = self.metrics
+        size = end - start
+
+        # 数据包长度不足时返回空视图，没有收到任何数据视为超时
+        if size < 6:
+            if metrics is not None:
+                if size == 0:
+                    metrics.record_timeout()
+                else:
+                    metrics.record_length_error()
+            return self._param_views[0]
+
+        # 检查帧头是否正确（前两个字节应该是0x55）
+        if data[start] != 0x55 or data[start + 1] != 0x55:
+            if metrics is not None:
+                metrics.record_header_error()
+            return self._param_views[0]
+
+        # 检查命令编号是否与预期一致
+        if data[start + 4] != expected_cmd:
+            if metrics is not None:
+                metrics.record_header_error()
+            return self._param_views[0]
+
+        # 检查数据长度是否与期望一致，第4个字节为数据长度位
+        length = data[start + 3]
+        if length != expected_data_len or size != length + 3:
+            # 如果返回数据长度不匹配，则返回空视图
+            if metrics is not None:
+                metrics.record_length_error()
+            return self._param_views[0]
+
+        # 校验和计算：从ID开始到倒数第二个字节，逐字节求和避免切片
+        total = 0
+        for i in range(start + 2, end - 1):
+            total += data[i]
+        if data[end - 1] != ~(total & 0xFF) & 0xFF:
+            if metrics is not None:
+                metrics.record_checksum_error()
+            return self._param_views[0]
+
+        if metrics is not None:
+            metrics.record_reply()
+
+        # 数据区包括从第6个字节到倒数第二个字节，复制到参数缓冲区后返回对应长度的视图
+        params = self._params
+        count = length - 3
+        for i in range(count):
+            params[i] = data[start + 5 + i]
+
+        return self._param_views[count]
+
+    def _query(self, servo_id: int, command: tuple, refresh: bool = False) -> list:
+        """
+        向舵机发送读取命令并接收返回的参数。
+
+        启用配置缓存时，配置读取命令优先返回缓存中的参数，读取成功后写入缓存。
+
+        Args:
+            servo_id (int): 舵机ID。
+            command (tuple): 读取命令元组（命令编号，参数长度，返回数据长度）。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取。
+
+        Returns:
+            bytes | memoryview: 返回数据包中的参数（接收到的参数为下一次接收时会被覆盖的视图），如果读取失败则长度为0。
+
+        ===================================================
+
+        Send a read command to the servo and receive the returned parameters.
+
+        With the configuration cache enabled, configuration reads are answered from the cache when possible,
+        and successful reads are stored in it.
+
+        Args:
+            servo_id (int): The ID of the servo.
+            command (tuple): Read command tuple (command ID, parameter length, returned data length).
+            refresh (bool): If True, bypass the configuration cache and read from the servo.
+
+        Returns:
+            bytes | memoryview: Parameters of the reply packet (a view overwritten by the next receive when read
+                                from the bus), zero-length if the read fails.
+        """
+        # 优先从配置缓存中读取
+        cacheable = self.cache_config and command[0] in SerialServo.CONFIG_READ_COMMANDS
+        if cacheable and not refresh:
+            params = self._cached_params(servo_id, command[0])
+            if params is not None:
+                return params
+
+        # 请求和回复在事务锁内完成，其他线程不会抢走本次回复
+        self.begin_transaction()
+        try:
+            # 发送读取命令
+            self.send_command(servo_id, command[0], [])
+
+            # 等待完整回复到达，最多等待到 reply_deadline() 的截止时刻
+            self.wait_reply(command)
+
+            # 接收并解析返回的数据
+            params = self.receive_command(command[0], command[2])
+        finally:
+            # 回复已处理，恢复后台发送
+            if self.sender is not None:
+                self.sender._hold_until = None
+            self.end_transaction()
+
+        # 读取成功后写入配置缓存
+        if cacheable and len(params) > 0:
+            self._store_config(servo_id, command[0], params)
+
+        return params
+
+    def begin_transaction(self) -> None:
+        """
+        获取事务锁，开始一个不可被其他线程打断的总线事务（例如一组读取请求及其回复），未启用事务锁时不执行任何操作。
+
+        事务锁不可重入，事务内只能调用 send_command、write_packet、wait_reply、receive_command 等底层方法，
+        不能调用会自行获取事务锁的读取方法；事务内的只写指令不会再次获取事务锁。
+
+        ===================================================
+
+        Take the transaction lock to start a bus transaction that other threads cannot interrupt (for example a set
+        of read requests and their replies); does nothing when transaction locking is disabled.
+
+        The lock is not reentrant: inside a transaction only low-level methods such as send_command, write_packet,
+        wait_reply and receive_command may be called, not the read methods that take the lock themselves. Write-only
+        commands inside a transaction do not take the lock again.
+        """
+        if self._lock is not None:
+            self._lock.acquire()
+            self._owner = self._get_ident()
+
+    def end_transaction(self) -> None:
+        """
+        释放事务锁，结束总线事务。
+
+        ===================================================
+
+        Release the transaction lock and end the bus transaction.
+        """
+        if self._lock is not None:
+            self._owner = None
+            self._lock.release()
+
+    def _cached_params(self, servo_id: int, read_cmd: int):
+        """
+        获取配置缓存中未过期的参数，没有缓存或已过期时返回None。
+
+        ===================================================
+
+        Get unexpired parameters from the configuration cache, or None if absent or expired.
+        """
+        entries = self._config_cache.get(servo_id)
+        if entries is None or read_cmd not in entries:
+            return None
+
+        params, stamp = entries[read_cmd]
+        # 判断缓存是否过期
+        if self.cache_ttl_ms > 0 and time.ticks_diff(time.ticks_ms(), stamp) >= self.cache_ttl_ms:
+            del entries[read_cmd]
+            return None
+
+        return params
+
+    def _store_config(self, servo_id: int, read_cmd: int, params) -> None:
+        """
+        将配置参数写入配置缓存。
+
+        ===================================================
+
+        Store configuration parameters in the configuration cache.
+        """
+        if servo_id not in self._config_cache:
+            self._config_cache[servo_id] = {}
+        self._config_cache[servo_id][read_cmd] = (bytes(params), time.ticks_ms())
+
+    def _update_config_cache(self, servo_id: int, cmd: int, params: list) -> None:
+        """
+        根据发送的写入命令更新配置缓存。
+
+        配置写入命令的参数直接作为对应读取命令的缓存参数；广播写入会使所有舵机的该项缓存失效；
+        修改舵机ID时将缓存迁移到新ID下。
+
+        ===================================================
+
+        Update the configuration cache from a sent write command.
+
+        Parameters of a configuration write become the cached parameters of the matching read command.
+        A broadcast write invalidates that entry for every servo, and changing a servo ID moves its cache
+        to the new ID.
+        """
+        if cmd in SerialServo.CONFIG_WRITE_TO_READ:
+            read_cmd = SerialServo.CONFIG_WRITE_TO_READ[cmd]
+            if servo_id == 254:
+                # 广播写入：所有舵机的该项缓存失效
+                for entries in self._config_cache.values():
+                    if read_cmd in entries:
+                        del entries[read_cmd]
+            else:
+                self._store_config(servo_id, read_cmd, params)
+        elif cmd == SerialServo.SERVO_ID_WRITE[0]:
+            # 修改舵机ID：缓存迁移到新ID下
+            if servo_id == 254:
+                self._config_cache.clear()
+            elif servo_id in self._config_cache:
+                self._config_cache[params[0]] = self._config_cache.pop(servo_id)
+
+    def invalidate_config_cache(self, servo_id: int = None) -> None:
+        """
+        使配置缓存失效。
+
+        Args:
+            servo_id (int, optional): 舵机ID，为None时清空所有舵机的配置缓存。
+
+        ===================================================
+
+        Invalidate the configuration cache.
+
+        Args:
+            servo_id (int, optional): Servo ID; None clears the cache of every servo.
+        """
+        if servo_id is None:
+            self._config_cache.clear()
+        elif servo_id in self._config_cache:
+            del self._config_cache[servo_id]
+
+    def _parse_move_time_raw(self, params) -> tuple:
+        """
+        解析舵机预设位置和时间参数，位置为舵机原始单位。
+
+        ===================================================
+
+        Parse the preset position and time parameters, position in raw units.
+        """
+        # 解析位置值，低8位和高8位合并为一个16位整数
+        position = params[0] + (params[1] << 8)
+        # 判断位置是否在合理范围内
+        if position < 0 or position > 1000:
+            raise ValueError("Angle value is out of range.")
+
+        # 解析时间值，低8位和高8位合并为一个16位整数
+        time_value = params[2] + (params[3] << 8)
+        # 判断时间是否在合理范围内
+        if time_value < 0 or time_value > 30000:
+            raise ValueError("Time value is out of range.")
+
+        return position, time_value
+
+    def _parse_move_time(self, params) -> tuple:
+        """
+        解析舵机预设角度和时间参数。
+
+        ===================================================
+
+        Parse the preset angle and time parameters.
+        """
+        position, time_value = self._parse_move_time_raw(params)
+        # 将位置转换为角度值
+        return position * 0.24, time_value
+
+    def _parse_servo_id(self, params) -> int:
+        """
+        解析舵机ID参数。
+
+        ===================================================
+
+        Parse the servo ID parameter.
+        """
+        # 返回舵机ID
+        servo_id_value = params[0]
+        # 判断ID是否在合理范围内
+        if servo_id_value < 0 or servo_id_value > 254:
+            raise ValueError("Servo ID must be in range 0~254.")
+
+        return servo_id_value
+
+    def _parse_angle_offset_raw(self, params) -> int:
+        """
+        解析舵机偏差参数，返回 -125~125 的偏差单位。
+
+        ===================================================
+
+        Parse the angle offset parameter as offset units in the range -125~125.
+        """
+        # 获取偏差值（无符号字节，范围 0~255）
+        offset_value = params[0]
+        # 转换为有符号字节，范围为 -125 到 125
+        if offset_value > 127:
+            # 处理负值偏差
+            offset_value -= 256
+
+        # 判断偏差是否在合理范围内
+        if offset_value < -125 or offset_value > 125:
+            raise ValueError("Angle offset must be in range -30~30.")
+
+        return offset_value
+
+    def _parse_angle_offset(self, params) -> float:
+        """
+        解析舵机偏差角度参数。
+
+        ===================================================
+
+        Parse the angle offset parameter.
+        """
+        # 将偏差值转换为角度范围 -30 到 30 度
+        return self._parse_angle_offset_raw(params) * 0.24
+
+    def _parse_angle_range_raw(self, params) -> tuple:
+        """
+        解析舵机角度限位参数，返回舵机原始单位。
+
+        ===================================================
+
+        Parse the angle limit parameters in raw units.
+        """
+        # 解析最小和最大位置，低8位和高8位合并为一个16位整数
+        min_position = params[0] + (params[1] << 8)
+        max_position = params[2] + (params[3] << 8)
+
+        # 判断位置是否在合理范围内
+        if min_position < 0 or min_position > 1000 or max_position < 0 or max_position > 1000:
+            raise ValueError("Angle must be in range 0~240.")
+
+        # 判断最小位置是否小于最大位置
+        if min_position >= max_position:
+            raise ValueError("Min angle must be less than max angle.")
+
+        return min_position, max_position
+
+    def _parse_angle_range(self, params) -> tuple:
+        """
+        解析舵机角度限位参数。
+
+        ===================================================
+
+        Parse the angle limit parameters.
+        """
+        min_position, max_position = self._parse_angle_range_raw(params)
+        # 将位置转换为角度值
+        return min_position * 0.24, max_position * 0.24
+
+    def _parse_vin_range_mv(self, params) -> tuple:
+        """
+        解析舵机电压限制参数，单位毫伏。
+
+        ===================================================
+
+        Parse the voltage limit parameters in millivolts.
+        """
+        # 解析最小和最大电压值，低8位和高8位合并为一个16位整数
+        min_mv = params[0] + (params[1] << 8)
+        max_mv = params[2] + (params[3] << 8)
+
+        # 判断电压是否在合理范围内
+        if min_mv < 4500 or min_mv > 12000:
+            raise ValueError("Voltage must be in range 4.5V ~ 14.0V.")
+        if max_mv < 4500 or max_mv > 14000:
+            raise ValueError("Voltage must be in range 4.5V ~ 14.0V.")
+
+        # 判断最小电压是否小于最大电压
+        if min_mv >= max_mv:
+            raise ValueError("Min voltage must be less than max voltage.")
+
+        return min_mv, max_mv
+
+    def _parse_vin_range(self, params) -> tuple:
+        """
+        解析舵机电压限制参数。
 
         ===================================================
 
-        Calculate checksum to ensure data integrity and correctness.
+        Parse the voltage limit parameters.
+        """
+        min_mv, max_mv = self._parse_vin_range_mv(params)
+        # 转换为伏特单位
+        return min_mv / 1000, max_mv / 1000
 
-        The checksum is obtained by summing the data packet and taking the one's complement (low eight bits of data).
-        Args:
-            data (list[int]): Data packet (excluding checksum itself).
+    def _parse_temp_range(self, params) -> int:
+        """
+        解析舵机最高温度限制参数。
 
-        Returns:
-            int: Calculated checksum, value range 0~255.
+        ===================================================
 
+        Parse the maximum temperature limit parameter.
         """
+        # 获取最高温度限制值
+        max_temp_limit = params[0]
 
-        checksum = ~(sum(data) & 0xFF) & 0xFF
+        # 判断温度是否在合理范围内
+        if not (50 <= max_temp_limit <= 100):
+            raise ValueError("Temperature limit is out of range.")
 
-        return checksum
+        return max_temp_limit
 
-    def build_packet(self, servo_id: int, cmd: int, params: list[int]) -> bytearray:
+    def _parse_temp(self, params) -> int:
         """
-        构建舵机指令包。
+        解析舵机实时温度参数。
 
-        根据舵机ID、指令命令和参数生成一个完整的数据包，并附加校验和。
+        ===================================================
 
-        Args:
-            servo_id (int): 舵机ID，范围0~253，其中254为广播ID，表示所有舵机。
-            cmd (int): 指令命令字节。
-            params (list[int]): 参数列表。
+        Parse the real-time temperature parameter.
+        """
+        # 获取温度值
+        temperature = params[0]
 
-        Returns:
-            bytearray: 构建的舵机控制指令包。
+        # 判断温度是否在合理范围内
+        if not (0 <= temperature <= 100):
+            raise ValueError("Temperature is out of range.")
 
-        Raises:
-            ValueError: 如果舵机ID不在 0~254 范围内，则抛出异常。
+        return temperature
+
+    def _parse_voltage_mv(self, params) -> int:
+        """
+        解析舵机实时输入电压参数，单位毫伏。
 
         ===================================================
 
-        Build servo control command packet, including checksum.
+        Parse the real-time input voltage parameters in millivolts.
+        """
+        # 将电压值的低高字节合并成一个整数
+        voltage_mv = params[0] + (params[1] << 8)
 
-        Args:
-            servo_id (int): Servo ID, range 0~253, where 254 is broadcast ID, indicating all servos.
-            cmd (int): Command byte.
-            params (list[int]): Parameter list (default empty).
+        # 判断电压是否在合理范围内，电压范围 4.5V 到 12.0V
+        if not (4500 <= voltage_mv <= 12000):
+            raise ValueError("Voltage is out of range.")
 
-        Returns:
-            bytearray: Built servo control command packet, including checksum.
+        return voltage_mv
 
-        Raises:
-            ValueError: If the servo ID is not in the range 0~254, an exception will be raised.
+    def _parse_voltage(self, params) -> float:
         """
-        # 对传入参数进行检查
-        # 检查舵机ID是否在 0~254 范围内
-        if servo_id < 0 or servo_id > 254:
-            raise ValueError("Servo ID must be in range 0~254.")
+        解析舵机实时输入电压参数。
 
-        # 数据包长度（指令+参数+校验和）
-        length = 3 + len(params)
-        # 构建数据包：帧头 + ID + 数据长度 + 命令 + 参数 + 校验和
-        packet = [0x55, 0x55, servo_id, length, cmd] + params
-        # 计算校验和（从ID到最后一个参数）
-        checksum = self.calculate_checksum(packet[2:])
-        # 增加校验和
-        packet.append(checksum)
+        ===================================================
 
-        return bytearray(packet)
+        Parse the real-time input voltage parameters.
+        """
+        # 将电压值转换为伏特
+        return self._parse_voltage_mv(params) / 1000.0
 
-    def send_command(self, servo_id: int, cmd: int, params: list[int] = []) -> None:
+    def _parse_position_raw(self, params) -> int:
         """
-        发送控制指令到舵机。
+        解析舵机实时位置参数，返回舵机原始单位（0~1000对应0~240°）。
 
-        通过UART将构建好的数据包发送给指定舵机，执行相应的控制命令。
+        ===================================================
 
-        Args:
-            servo_id (int): 舵机ID，范围0~253。
-            cmd (int): 指令命令字节。
-            params (list[int], optional): 参数列表（默认为空）。
+        Parse the real-time position parameters in raw units (0~1000 maps to 0~240 degrees).
+        """
+        # 将位置的低高字节合并为一个16位整数
+        position_value = params[0] + (params[1] << 8)
 
-        Raises:
-            ValueError: 如果舵机ID不在 0~254 范围内，则抛出异常。
+        # 将值转换为 signed short int 型数据（可能为负值）
+        # 判断是否为负值
+        if position_value >= 0x8000:
+            # 如果是负值，进行补码转换
+            position_value -= 0x10000
 
-        ===================================================
+        # 判断位置是否在合理范围内
+        if not (0 <= position_value <= 1000):
+            raise ValueError("Position is out of range.")
 
-        Send control command to the servo.
+        return position_value
 
-        Args:
-            servo_id (int): Servo ID, range 0~253.
-            cmd (int): Command byte.
-            params (list[int], optional): Parameter list (default empty).
+    def _parse_position(self, params) -> float:
+        """
+        解析舵机实时角度位置参数。
 
-        Raises:
-            ValueError: If the servo ID is not in the range 0~254, an exception will be raised.
+        ===================================================
 
+        Parse the real-time position parameters.
         """
-        packet = self.build_packet(servo_id, cmd, params)
-        self.uart.write(packet)
+        # 将位置值转换为角度值，映射到 0~240° 范围
+        return self._parse_position_raw(params) * 0.24
 
-    def receive_command(self, expected_cmd: int, expected_data_len: int) -> list:
+    def _parse_mode_and_speed(self, params) -> tuple:
         """
-        接收并处理舵机返回的指令数据包。
+        解析舵机工作模式和转动速度参数。
 
-        该方法从UART串口接收数据，验证帧头、命令编号、数据长度及校验和，
-        如果数据无误，解析并返回相关参数。
+        ===================================================
 
-        Args:
-            expected_cmd (int): 期望接收到的命令编号。
-            expected_data_len (int): 期望的返回数据长度。
+        Parse the working mode and speed parameters.
+        """
+        # 解析舵机模式，0 为位置控制模式，1 为电机控制模式
+        mode = params[0]
+        if mode not in [SerialServo.MODE_POSITION, SerialServo.MODE_MOTOR]:
+            raise ValueError("Invalid servo mode.")
 
-        Returns:
-            list: 返回解析后的数据列表（包括参数），如果数据有误则返回空列表。
+        # 如果是电机控制模式，返回速度值；如果是位置控制模式，返回速度值为0
+        if mode == SerialServo.MODE_MOTOR:
+            # 解析转动速度，低8位和高8位合并为一个16位整数
+            speed_value = params[2] + (params[3] << 8)
+            # 速度以补码形式发送，负数表示反转
+            if speed_value > 32767:
+                speed_value -= 65536
+            if speed_value < -1000 or speed_value > 1000:
+                raise ValueError("Speed must be between -1000 and 1000 in motor control mode.")
+            # 返回工作模式和转动速度
+            return mode, speed_value
+        else:
+            return mode, 0
 
-        Raises:
-            ValueError: 如果期望接收到的命令编号不是读取命令，则抛出异常。
+    def _parse_load_status(self, params) -> bool:
+        """
+        解析舵机电机装载状态参数。
 
         ===================================================
 
-        Receive and process the response from the servo.
+        Parse the motor load status parameter.
+        """
+        # 解析电机状态，0表示卸载电机，1表示装载电机
+        motor_status = params[0]
+        if motor_status not in [0, 1]:
+            raise ValueError("Invalid motor status value.")
+
+        # 如果状态为1，则表示电机已装载，返回True；如果为0，则表示电机已卸载，返回False
+        return motor_status == 1
 
-        This method receives data from the UART serial interface, validates the frame header, command ID, data length, and checksum.
-        If the data is correct, it parses and returns the relevant parameters.
+    def _parse_led(self, params) -> bool:
+        """
+        解析舵机LED状态参数。
 
-        Args:
-            expected_cmd (int): The expected command ID to be received.
-            expected_data_len (int): The expected length of the returned data.
+        ===================================================
 
-        Returns:
-            list: A list of parsed data (including parameters). If the data is incorrect, an empty list is returned.
+        Parse the LED status parameter.
+        """
+        # 解析LED状态，0表示常亮，1表示常灭
+        led_status = params[0]
+        if led_status not in [0, 1]:
+            raise ValueError("Invalid LED status value.")
 
-        Raises:
-            ValueError: If the expected command ID is not a read command, an exception is raised.
+        # 如果状态为1，则表示LED常灭，返回True；如果为0，则表示LED常亮，返回False
+        return led_status == 1
 
+    def _parse_led_alarm(self, params) -> int:
         """
-        # 判断期望接收到的命令编号是否是读取命令
-        if expected_cmd not in SerialServo.READ_COMMANDS:
-            raise ValueError("Expected command is not a read command.")
+        解析舵机LED故障报警参数。
 
-        # 接收数据
-        data = self.uart.read()
+        ===================================================
 
-        # # 打印接收到的数据
-        # print('recv data:', data)
+        Parse the LED alarm parameter.
+        """
+        # 解析LED故障报警值
+        error_alarm_value = params[0]
 
-        # 如果接收到的数据长度没有，则返回空列表
-        if data is None:
-            return []
+        # 判断值是否在合法范围内
+        if error_alarm_value not in [SerialServo.ERROR_NO_ALARM,
+                                     SerialServo.ERROR_OVER_TEMP,
+                                     SerialServo.ERROR_OVER_VOLT,
+                                     SerialServo.ERROR_OVER_TEMP_AND_VOLT,
+                                     SerialServo.ERROR_STALL,
+                                     SerialServo.ERROR_OVER_TEMP_AND_STALL,
+                                     SerialServo.ERROR_OVER_VOLT_AND_STALL,
+                                     SerialServo.ERROR_ALL]:
 
-        # 检查帧头是否正确（前两个字节应该是0x55）
-        if data[0] != 0x55 or data[1] != 0x55:
-            return []
+            raise ValueError("Error alarm value is out of range.")
 
-        # 检查命令编号是否与预期一致
-        if data[4] != expected_cmd:
-            return []
-
-        # 检查数据长度是否与期望一致，data[3]为数据长度位
-        length = data[3]
-        if length != expected_data_len:
-            # 如果返回数据长度不匹配，则返回空列表
-            return []
-
-        # 校验和计算
-        checksum_received = data[-1]
-        # 从ID开始到倒数第二个字节
-        checksum_calculated = self.calculate_checksum(data[2:-1])
-        if checksum_received != checksum_calculated:
-            return []
-
-        # 根据数据长度解析相关参数，数据区包括从第6个字节到倒数第二个字节
-        params = data[5:-1]
-
-        # 返回解析后的参数
-        return params
+        # 返回LED故障报警值
+        return error_alarm_value
 
     def move_servo_immediate(self, servo_id: int, angle: float, time_ms: int) -> None:
         """
@@ -522,31 +1675,56 @@ class SerialServo:
         if angle < 0 or angle > 240:
             raise ValueError("Angle must be in range 0~240.")
 
+        # 将角度转换为舵机原始单位，每单位0.24°
+        self.move_servo_immediate_raw(servo_id, int(angle / 0.24), time_ms)
+
+    def move_servo_immediate_raw(self, servo_id: int, position: int, time_ms: int) -> None:
+        """
+        立即控制舵机转动到指定位置。
+
+        与 `move_servo_immediate` 相同，但位置使用舵机原始单位（0~1000，每单位0.24°），不进行浮点运算。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            position (int): 目标位置（0~1000）。
+            time_ms (int): 转动时间（0~30000 毫秒）。
+
+        Raises:
+            ValueError: 如果位置不在 0~1000 范围内或时间不在范围内，则抛出异常。
+
+        ===================================================
+
+        Immediately move the servo to the given position.
+
+        Same as `move_servo_immediate`, but the position is given in raw servo units (0~1000, 0.24 degrees each)
+        and no floating point math is done.
+
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            position (int): Target position (0~1000).
+            time_ms (int): Time to rotate (0~30000 milliseconds).
+
+        Raises:
+            ValueError: If the position is not in the range 0~1000 or the time is out of range.
+        """
+        # 判断位置是否在 0~1000 范围内
+        if position < 0 or position > 1000:
+            raise ValueError("Position must be in range 0~1000.")
+
         # 判断时间是否在 0~30000 毫秒范围内
         if time_ms < 0 or time_ms > 30000:
             raise ValueError("Time must be in range 0~30000.")
 
-        # 将角度转换为舵机控制指令所需的低八位和高八位
-        # 转换为整数并限制为低8位
-        angle_low = int(angle / 0.24) & 0xFF
-        # 获取高8位
-        angle_high = (int(angle / 0.24) >> 8) & 0xFF
-
-        # 将时间转换为低八位和高八位
-        # 转换为低8位
-        time_low = time_ms & 0xFF
-        # 获取高8位
-        time_high = (time_ms >> 8) & 0xFF
-
-        # 发送 SERVO_MOVE_TIME_WRITE 指令
-        self.send_command(servo_id, SerialServo.SERVO_MOVE_TIME_WRITE[0], [angle_low, angle_high, time_low, time_high])
+        # 发送 SERVO_MOVE_TIME_WRITE 指令，位置和时间均为低八位在前
+        self.send_command(servo_id, SerialServo.SERVO_MOVE_TIME_WRITE[0],
+                          [position & 0xFF, (position >> 8) & 0xFF, time_ms & 0xFF, (time_ms >> 8) & 0xFF])
 
     def get_servo_move_immediate(self, servo_id: int) -> tuple:
         """
         获取舵机的预设角度和时间。
 
         该方法通过舵机ID发送 `SERVO_MOVE_TIME_READ` 指令来读取舵机的预设角度和时间，
-        然后延迟5ms，接收并解析返回的数据。
+        然后通过 `wait_reply()` 轮询等待完整回复（最多等待到 `reply_deadline()` 的截止时刻），接收并解析返回的数据。
 
         Args:
             servo_id (int): 舵机的ID。
@@ -563,7 +1741,8 @@ class SerialServo:
         Get the preset angle and time of the servo.
 
         This method sends the `SERVO_MOVE_TIME_READ` command to the servo using the servo ID to read the preset angle and time,
-        then waits for 5ms before receiving and parsing the returned data.
+        then polls with `wait_reply()` for the complete reply (at most until the `reply_deadline()` deadline) before
+        receiving and parsing the returned data.
 
         Args:
             servo_id (int): The ID of the servo.
@@ -576,34 +1755,47 @@ class SerialServo:
             ValueError: If the angle or time values are out of the acceptable range, an exception is raised.
         """
 
-        # 发送SERVO_MOVE_TIME_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_MOVE_TIME_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_MOVE_TIME_READ[0], SerialServo.SERVO_MOVE_TIME_READ[2])
+        # 发送SERVO_MOVE_TIME_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_MOVE_TIME_READ)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 解析角度值，低8位和高8位合并为一个16位整数
-        angle_value = params[0] + (params[1] << 8)
-        # 将angle_value转换为角度值
-        angle_value = angle_value * 0.24
-        # 判断角度是否在合理范围内
-        if angle_value < 0 or angle_value > 240:
-            raise ValueError("Angle value is out of range.")
+        return self._parse_move_time(params)
 
-        # 解析时间值，低8位和高8位合并为一个16位整数
-        time_value = params[2] + (params[3] << 8)
-        # 判断时间是否在合理范围内
-        if time_value < 0 or time_value > 30000:
-            raise ValueError("Time value is out of range.")
+    def get_servo_move_immediate_raw(self, servo_id: int) -> tuple:
+        """
+        获取舵机的预设位置和时间，位置为舵机原始单位。
+
+        与 `get_servo_move_immediate` 相同，但返回整数，不进行浮点运算。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            tuple: 预设位置（0~1000）和时间（毫秒），如果读取失败则返回None。
+
+        ===================================================
+
+        Get the preset position and time of the servo, position in raw units.
+
+        Same as `get_servo_move_immediate`, but returns integers and does no floating point math.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            tuple: Preset position (0~1000) and time in milliseconds, or None if the read fails.
+        """
+        # 发送SERVO_MOVE_TIME_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_MOVE_TIME_READ)
+
+        # 如果没有接收到数据，则返回None
+        if len(params) == 0:
+            return None
 
-        return angle_value, time_value
+        return self._parse_move_time_raw(params)
 
     def move_servo_with_time_delay(self, servo_id: int, angle: float, time_ms: int) -> None:
         """
@@ -639,24 +1831,49 @@ class SerialServo:
         if angle < 0 or angle > 240:
             raise ValueError("Angle must be in range 0~240.")
 
+        # 将角度转换为舵机原始单位，每单位0.24°
+        self.move_servo_with_time_delay_raw(servo_id, int(angle / 0.24), time_ms)
+
+    def move_servo_with_time_delay_raw(self, servo_id: int, position: int, time_ms: int) -> None:
+        """
+        预设舵机的目标位置和转动时间，收到开始转动指令后才开始转动。
+
+        与 `move_servo_with_time_delay` 相同，但位置使用舵机原始单位（0~1000，每单位0.24°），不进行浮点运算。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            position (int): 目标位置（0~1000）。
+            time_ms (int): 转动时间（0~30000 毫秒）。
+
+        Raises:
+            ValueError: 如果位置不在 0~1000 范围内或时间不在范围内，则抛出异常。
+
+        ===================================================
+
+        Preset the target position and movement time; the servo starts moving on SERVO_MOVE_START.
+
+        Same as `move_servo_with_time_delay`, but the position is given in raw servo units (0~1000, 0.24 degrees each)
+        and no floating point math is done.
+
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            position (int): Target position (0~1000).
+            time_ms (int): Time to rotate (0~30000 milliseconds).
+
+        Raises:
+            ValueError: If the position is not in the range 0~1000 or the time is out of range.
+        """
+        # 判断位置是否在 0~1000 范围内
+        if position < 0 or position > 1000:
+            raise ValueError("Position must be in range 0~1000.")
+
         # 判断时间是否在 0~30000 毫秒范围内
         if time_ms < 0 or time_ms > 30000:
             raise ValueError("Time must be in range 0~30000.")
 
-        # 将角度转换为舵机控制指令所需的低八位和高八位
-        # 转换为整数并限制为低8位
-        angle_low = int(angle / 0.24) & 0xFF
-        # 获取高8位
-        angle_high = (int(angle / 0.24) >> 8) & 0xFF
-
-        # 将时间转换为低八位和高八位
-        # 转换为低8位
-        time_low = time_ms & 0xFF
-        # 获取高8位
-        time_high = (time_ms >> 8) & 0xFF
-
-        # 发送 SERVO_MOVE_TIME_WAIT_WRITE 指令来设置预设角度和时间
-        self.send_command(servo_id, SerialServo.SERVO_MOVE_TIME_WAIT_WRITE[0], [angle_low, angle_high, time_low, time_high])
+        # 发送 SERVO_MOVE_TIME_WAIT_WRITE 指令，位置和时间均为低八位在前
+        self.send_command(servo_id, SerialServo.SERVO_MOVE_TIME_WAIT_WRITE[0],
+                          [position & 0xFF, (position >> 8) & 0xFF, time_ms & 0xFF, (time_ms >> 8) & 0xFF])
 
     def get_servo_move_with_time_delay(self, servo_id: int) -> tuple:
         """
@@ -664,7 +1881,7 @@ class SerialServo:
         该方法无法正常工作，还没排查出问题！
 
         该方法通过舵机ID发送 `SERVO_MOVE_TIME_WAIT_READ` 指令来读取舵机的预设角度和时间，
-        然后延迟5ms，接收并解析返回的数据。
+        然后通过 `wait_reply()` 轮询等待完整回复（最多等待到 `reply_deadline()` 的截止时刻），接收并解析返回的数据。
 
         Args:
             servo_id (int): 舵机的ID。
@@ -682,7 +1899,8 @@ class SerialServo:
         This method is not functioning correctly, and the issue has not been identified yet!
 
         This method sends the `SERVO_MOVE_TIME_WAIT_READ` command using the servo ID to read the preset angle and time,
-        then waits for 5ms before receiving and parsing the returned data.
+        then polls with `wait_reply()` for the complete reply (at most until the `reply_deadline()` deadline) before
+        receiving and parsing the returned data.
 
         Args:
             servo_id (int): The ID of the servo.
@@ -699,34 +1917,14 @@ class SerialServo:
         # 抛出异常
         raise ValueError("This function is not working properly! You can use get_servo_move_immediate() instead.")
 
-        # 发送SERVO_MOVE_TIME_WAIT_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_MOVE_TIME_WAIT_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_MOVE_TIME_WAIT_READ[0], SerialServo.SERVO_MOVE_TIME_WAIT_READ[2])
+        # 发送SERVO_MOVE_TIME_WAIT_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_MOVE_TIME_WAIT_READ)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 解析角度值，低8位和高8位合并为一个16位整数
-        angle_value = params[0] + (params[1] << 8)
-        # 将angle_value转换为角度值
-        angle_value = angle_value * 0.24
-        # 判断角度是否在合理范围内
-        if angle_value < 0 or angle_value > 240:
-            raise ValueError("Angle value is out of range.")
-
-        # 解析时间值，低8位和高8位合并为一个16位整数
-        time_value = params[2] + (params[3] << 8)
-        # 判断时间是否在合理范围内
-        if time_value < 0 or time_value > 30000:
-            raise ValueError("Time value is out of range.")
-
-        return angle_value, time_value
+        return self._parse_move_time(params)
 
     def start_servo(self, servo_id: int) -> None:
         """
@@ -848,26 +2046,14 @@ class SerialServo:
             ValueError: If the servo ID is not within the range of 0~253, an exception is raised.
 
         """
-        # 发送SERVO_ID_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_ID_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_ID_READ[0], SerialServo.SERVO_ID_READ[2])
+        # 发送SERVO_ID_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_ID_READ)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
-            return None
-
-        # 返回舵机ID
-        servo_id_value = params[0]
-        # 判断ID是否在合理范围内
-        if servo_id_value < 0 or servo_id_value > 254:
-            raise ValueError("Servo ID must be in range 0~254.")
+            return None
 
-        return servo_id_value
+        return self._parse_servo_id(params)
 
     def set_servo_angle_offset(self, servo_id: int, angle: float, save_to_memory: bool = False) -> None:
         """
@@ -905,21 +2091,46 @@ class SerialServo:
             raise ValueError("Angle must be in range -30~30.")
 
         # 将角度转换为偏差值，偏差值的范围为-125到125，每0.24°对应一个偏差单位
-        offset = int(angle / 0.24)
+        self.set_servo_angle_offset_raw(servo_id, int(angle / 0.24), save_to_memory)
+
+    def set_servo_angle_offset_raw(self, servo_id: int, offset: int, save_to_memory: bool = False) -> None:
+        """
+        设置舵机的偏差值，单位为偏差单位（-125~125，每单位0.24°）。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            offset (int): 偏差值（-125~125）。
+            save_to_memory (bool): 是否掉电保存偏差值，默认False。
+
+        Raises:
+            ValueError: 如果偏差值不在 -125~125 范围内，则抛出异常。
+
+        ===================================================
+
+        Set the angle offset of the servo in offset units (-125~125, 0.24 degrees each).
+
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            offset (int): Offset (-125~125).
+            save_to_memory (bool): Whether to save the offset across power cycles, default False.
+
+        Raises:
+            ValueError: If the offset is not in the range -125~125.
+        """
+        # 判断偏差值是否在 -125~125 范围内
+        if offset < -125 or offset > 125:
+            raise ValueError("Offset must be in range -125~125.")
 
         # 强制转换偏差值为无符号字节
         offset = (offset + 256) % 256
 
+        # 首先写入偏差值
+        self.send_command(servo_id, SerialServo.SERVO_ANGLE_OFFSET_ADJUST[0], [offset])
         # 判断是否需要保存偏差值
         if save_to_memory:
-            # 首先写入偏差值
-            self.send_command(servo_id, SerialServo.SERVO_ANGLE_OFFSET_ADJUST[0], [offset])
-            # 保存偏差值
             self.send_command(servo_id, SerialServo.SERVO_ANGLE_OFFSET_WRITE[0], [])
-        else:
-            self.send_command(servo_id, SerialServo.SERVO_ANGLE_OFFSET_ADJUST[0], [offset])
 
-    def get_servo_angle_offset(self, servo_id: int) -> float:
+    def get_servo_angle_offset(self, servo_id: int, refresh: bool = False) -> float:
         """
         获取舵机的偏差角度。
 
@@ -928,6 +2139,7 @@ class SerialServo:
 
         Args:
             servo_id (int): 舵机的ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
 
         Returns:
             float: 返回舵机的偏差角度，单位为度，范围为 -30 到 30 度。
@@ -945,6 +2157,7 @@ class SerialServo:
 
         Args:
             servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
 
         Returns:
             float: The servo's offset angle in degrees, in the range of -30° to 30°.
@@ -954,34 +2167,49 @@ class SerialServo:
             ValueError: If the offset angle is not within the range of -30°~30°, an exception will be raised.
 
         """
-        # 发送SERVO_ANGLE_OFFSET_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_ANGLE_OFFSET_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_ANGLE_OFFSET_READ[0], SerialServo.SERVO_ANGLE_OFFSET_READ[2])
+        # 发送SERVO_ANGLE_OFFSET_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_ANGLE_OFFSET_READ, refresh)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 获取偏差值（无符号字节，范围 0~255）
-        offset_value = params[0]
-        # 转换为有符号字节，范围为 -125 到 125
-        if offset_value > 127:
-            # 处理负值偏差
-            offset_value -= 256
+        return self._parse_angle_offset(params)
 
-        # 将偏差值转换为角度范围 -30 到 30 度
-        angle_offset = offset_value * (30 / 125.0)
+    def get_servo_angle_offset_raw(self, servo_id: int, refresh: bool = False) -> int:
+        """
+        获取舵机的偏差值。
 
-        # 判断偏差角度是否在合理范围内
-        if angle_offset < -30 or angle_offset > 30:
-            raise ValueError("Angle offset must be in range -30~30.")
+        与 `get_servo_angle_offset` 相同，但返回整数，不进行浮点运算。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取。
 
-        return angle_offset
+        Returns:
+            int: 偏差值（-125~125，每单位0.24°），如果读取失败则返回None。
+
+        ===================================================
+
+        Get the angle offset of the servo.
+
+        Same as `get_servo_angle_offset`, but returns integers and does no floating point math.
+
+        Args:
+            servo_id (int): Servo ID.
+            refresh (bool): If True, bypass the configuration cache and read from the servo.
+
+        Returns:
+            int: Offset (-125~125, 0.24 degrees each), or None if the read fails.
+        """
+        # 发送SERVO_ANGLE_OFFSET_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_ANGLE_OFFSET_READ, refresh)
+
+        # 如果没有接收到数据，则返回None
+        if len(params) == 0:
+            return None
+
+        return self._parse_angle_offset_raw(params)
 
     def set_servo_angle_range(self, servo_id: int, min_angle: float, max_angle: float) -> None:
         """
@@ -1020,20 +2248,46 @@ class SerialServo:
             raise ValueError("Max angle must be greater than min angle.")
 
         # 将角度转换为指令所需的范围0~1000，表示0~240°，每0.24°对应一个单位
-        min_value = int(min_angle / 0.24)
-        max_value = int(max_angle / 0.24)
+        self.set_servo_angle_range_raw(servo_id, int(min_angle / 0.24), int(max_angle / 0.24))
+
+    def set_servo_angle_range_raw(self, servo_id: int, min_position: int, max_position: int) -> None:
+        """
+        设置舵机的角度限位，单位为舵机原始单位（0~1000，每单位0.24°）。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            min_position (int): 最小位置（0~1000）。
+            max_position (int): 最大位置（0~1000）。
 
-        # 取最大角度和最小角度的低八位和高八位
-        min_value_low = min_value & 0xFF
-        min_value_high = (min_value >> 8) & 0xFF
+        Raises:
+            ValueError: 如果位置不在 0~1000 范围内或最小位置不小于最大位置，则抛出异常。
+
+        ===================================================
 
-        max_value_low = max_value & 0xFF
-        max_value_high = (max_value >> 8) & 0xFF
+        Set the angle limits of the servo in raw units (0~1000, 0.24 degrees each).
 
-        # 生成指令包并发送
-        self.send_command(servo_id, SerialServo.SERVO_ANGLE_LIMIT_WRITE[0], [min_value_low, min_value_high, max_value_low, max_value_high])
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            min_position (int): Minimum position (0~1000).
+            max_position (int): Maximum position (0~1000).
+
+        Raises:
+            ValueError: If a position is not in the range 0~1000 or the minimum is not below the maximum.
+        """
+        # 判断最小和最大位置是否在 0~1000 范围内
+        if min_position < 0 or min_position > 1000 or max_position < 0 or max_position > 1000:
+            raise ValueError("Position must be in range 0~1000.")
+
+        # 判断最小和最大位置是否合理
+        if min_position >= max_position:
+            raise ValueError("Max position must be greater than min position.")
 
-    def get_servo_angle_range(self, servo_id: int) -> tuple:
+        # 生成指令包并发送，低八位在前
+        self.send_command(servo_id, SerialServo.SERVO_ANGLE_LIMIT_WRITE[0],
+                          [min_position & 0xFF, (min_position >> 8) & 0xFF,
+                           max_position & 0xFF, (max_position >> 8) & 0xFF])
+
+    def get_servo_angle_range(self, servo_id: int, refresh: bool = False) -> tuple:
         """
         获取舵机的角度限位。
 
@@ -1042,6 +2296,7 @@ class SerialServo:
 
         Args:
             servo_id (int): 舵机的ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
 
         Returns:
             tuple: 返回舵机的角度限位，最小角度和最大角度的元组，单位为度。
@@ -1059,6 +2314,7 @@ class SerialServo:
 
         Args:
             servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
 
         Returns:
             tuple: A tuple containing the servo's angle limits, with the minimum and maximum angles in degrees.
@@ -1068,39 +2324,49 @@ class SerialServo:
             ValueError: If the minimum or maximum angle is not within the range of 0°~240°, an exception will be raised.
 
         """
-        # 发送SERVO_ANGLE_LIMIT_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_ANGLE_LIMIT_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
+        # 发送SERVO_ANGLE_LIMIT_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_ANGLE_LIMIT_READ, refresh)
 
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_ANGLE_LIMIT_READ[0], SerialServo.SERVO_ANGLE_LIMIT_READ[2])
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 解析最小角度值，低8位和高8位合并为一个16位整数
-        min_angle = params[0] + (params[1] << 8)
-        # 将min_angle转换为角度值
-        min_angle = min_angle * 0.24
-        # 判断最小角度是否在合理范围内
-        if min_angle < 0 or min_angle > 240:
-            raise ValueError("Angle must be in range 0~240.")
+        return self._parse_angle_range(params)
 
-        # 解析最大角度值，低8位和高8位合并为一个16位整数
-        max_angle = params[2] + (params[3] << 8)
-        # 将max_angle转换为角度值
-        max_angle = max_angle * 0.24
-        # 判断最大角度是否在合理范围内
-        if max_angle < 0 or max_angle > 240:
-            raise ValueError("Angle must be in range 0~240.")
+    def get_servo_angle_range_raw(self, servo_id: int, refresh: bool = False) -> tuple:
+        """
+        获取舵机的角度限位，单位为舵机原始单位。
 
-        # 判断最小角度是否小于最大角度
-        if min_angle >= max_angle:
-            raise ValueError("Min angle must be less than max angle.")
+        与 `get_servo_angle_range` 相同，但返回整数，不进行浮点运算。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取。
+
+        Returns:
+            tuple: 最小和最大位置（0~1000），如果读取失败则返回None。
+
+        ===================================================
+
+        Get the angle limits of the servo in raw units.
+
+        Same as `get_servo_angle_range`, but returns integers and does no floating point math.
+
+        Args:
+            servo_id (int): Servo ID.
+            refresh (bool): If True, bypass the configuration cache and read from the servo.
+
+        Returns:
+            tuple: Minimum and maximum position (0~1000), or None if the read fails.
+        """
+        # 发送SERVO_ANGLE_LIMIT_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_ANGLE_LIMIT_READ, refresh)
+
+        # 如果没有接收到数据，则返回None
+        if len(params) == 0:
+            return None
 
-        return min_angle, max_angle
+        return self._parse_angle_range_raw(params)
 
     def set_servo_vin_range(self, servo_id: int, min_vin: float, max_vin: float) -> None:
         """
@@ -1137,21 +2403,46 @@ class SerialServo:
         if max_vin < 4.5 or max_vin > 14.0:
             raise ValueError("Voltage must be in range 4.5V ~ 14.0V.")
 
-        # 将电压转换为毫伏，范围4500~12000 毫伏
-        min_vin_mV = int(min_vin * 1000)
-        max_vin_mV = int(max_vin * 1000)
+        # 将电压转换为毫伏
+        self.set_servo_vin_range_mv(servo_id, int(min_vin * 1000), int(max_vin * 1000))
 
-        # 取出最小电压的低八位和高八位
-        min_vin_low = min_vin_mV & 0xFF
-        min_vin_high = (min_vin_mV >> 8) & 0xFF
+    def set_servo_vin_range_mv(self, servo_id: int, min_mv: int, max_mv: int) -> None:
+        """
+        设置舵机的输入电压限制，单位毫伏。
 
-        max_vin_low = max_vin_mV & 0xFF
-        max_vin_high = (max_vin_mV >> 8) & 0xFF
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            min_mv (int): 最小电压（4500~14000 毫伏）。
+            max_mv (int): 最大电压（4500~14000 毫伏）。
 
-        # 生成指令包并发送
-        self.send_command(servo_id, SerialServo.SERVO_VIN_LIMIT_WRITE[0], [min_vin_low, min_vin_high,  max_vin_low, max_vin_high])
+        Raises:
+            ValueError: 如果电压不在 4500~14000 毫伏范围内或最小电压不小于最大电压，则抛出异常。
+
+        ===================================================
+
+        Set the input voltage limits of the servo in millivolts.
 
-    def get_servo_vin_range(self, servo_id: int) -> tuple:
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            min_mv (int): Minimum voltage (4500~14000 millivolts).
+            max_mv (int): Maximum voltage (4500~14000 millivolts).
+
+        Raises:
+            ValueError: If a voltage is not in the range 4500~14000 mV or the minimum is not below the maximum.
+        """
+        # 确保最小电压小于最大电压
+        if min_mv >= max_mv:
+            raise ValueError("Minimum voltage must be less than maximum voltage.")
+
+        # 确保电压限制值在4500 ~ 14000毫伏范围内
+        if min_mv < 4500 or min_mv > 14000 or max_mv < 4500 or max_mv > 14000:
+            raise ValueError("Voltage must be in range 4.5V ~ 14.0V.")
+
+        # 生成指令包并发送，低八位在前
+        self.send_command(servo_id, SerialServo.SERVO_VIN_LIMIT_WRITE[0],
+                          [min_mv & 0xFF, (min_mv >> 8) & 0xFF, max_mv & 0xFF, (max_mv >> 8) & 0xFF])
+
+    def get_servo_vin_range(self, servo_id: int, refresh: bool = False) -> tuple:
         """
         获取舵机的电压限制值。
 
@@ -1160,6 +2451,7 @@ class SerialServo:
 
         Args:
             servo_id (int): 舵机的ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
 
         Returns:
             tuple: 返回舵机的最大和最小电压限制值，单位为伏特，范围为4.5V到14.0V。
@@ -1176,6 +2468,7 @@ class SerialServo:
 
         Args:
             servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
 
         Returns:
             tuple: A tuple containing the servo's minimum and maximum voltage limits in volts,
@@ -1186,40 +2479,49 @@ class SerialServo:
 
         """
 
-        # 发送SERVO_VIN_LIMIT_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_VIN_LIMIT_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_VIN_LIMIT_READ[0], SerialServo.SERVO_VIN_LIMIT_READ[2])
+        # 发送SERVO_VIN_LIMIT_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_VIN_LIMIT_READ, refresh)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 解析最小电压值，低8位和高8位合并为一个16位整数
-        min_vin = params[0] + (params[1] << 8)
-        # 将min_vin转换为伏特单位
-        min_vin = min_vin / 1000
-        # 判断最小电压是否在合理范围内
-        if min_vin < 4.5 or min_vin > 12.0:
-            raise ValueError("Voltage must be in range 4.5V ~ 14.0V.")
+        return self._parse_vin_range(params)
 
-        # 解析最大电压值，低8位和高8位合并为一个16位整数
-        max_vin = params[2] + (params[3] << 8)
-        # 将max_vin转换为伏特单位
-        max_vin = max_vin / 1000
-        # 判断最大电压是否在合理范围内
-        if max_vin < 4.5 or max_vin > 14.0:
-            raise ValueError("Voltage must be in range 4.5V ~ 14.0V.")
+    def get_servo_vin_range_mv(self, servo_id: int, refresh: bool = False) -> tuple:
+        """
+        获取舵机的输入电压限制，单位毫伏。
 
-        # 判断最小电压是否小于最大电压
-        if min_vin >= max_vin:
-            raise ValueError("Min voltage must be less than max voltage.")
+        与 `get_servo_vin_range` 相同，但返回整数，不进行浮点运算。
+
+        Args:
+            servo_id (int): 舵机ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取。
+
+        Returns:
+            tuple: 最小和最大电压（毫伏），如果读取失败则返回None。
+
+        ===================================================
+
+        Get the input voltage limits of the servo in millivolts.
+
+        Same as `get_servo_vin_range`, but returns integers and does no floating point math.
+
+        Args:
+            servo_id (int): Servo ID.
+            refresh (bool): If True, bypass the configuration cache and read from the servo.
+
+        Returns:
+            tuple: Minimum and maximum voltage in millivolts, or None if the read fails.
+        """
+        # 发送SERVO_VIN_LIMIT_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_VIN_LIMIT_READ, refresh)
+
+        # 如果没有接收到数据，则返回None
+        if len(params) == 0:
+            return None
 
-        return min_vin, max_vin
+        return self._parse_vin_range_mv(params)
 
     def set_servo_temp_range(self, servo_id: int, max_temp: int) -> None:
         """
@@ -1250,7 +2552,7 @@ class SerialServo:
         # 生成指令包并发送
         self.send_command(servo_id, SerialServo.SERVO_TEMP_MAX_LIMIT_WRITE[0], [int(max_temp) & 0xFF])
 
-    def get_servo_temp_range(self, servo_id: int) -> int:
+    def get_servo_temp_range(self, servo_id: int, refresh: bool = False) -> int:
         """
         获取舵机的内部最高温度限制值。
 
@@ -1259,6 +2561,7 @@ class SerialServo:
 
         Args:
             servo_id (int): 舵机的ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
 
         Returns:
             int: 返回舵机的内部最高温度限制值，单位为摄氏度，范围50~100℃。
@@ -1276,6 +2579,7 @@ class SerialServo:
 
         Args:
             servo_id (int): The ID of the servo.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
 
         Returns:
             int: The internal maximum temperature limit of the servo, in degrees Celsius, with a range from 50°C to 100°C.
@@ -1286,27 +2590,14 @@ class SerialServo:
 
         """
 
-        # 发送SERVO_TEMP_MAX_LIMIT_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_TEMP_MAX_LIMIT_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_TEMP_MAX_LIMIT_READ[0], SerialServo.SERVO_TEMP_MAX_LIMIT_READ[2])
+        # 发送SERVO_TEMP_MAX_LIMIT_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_TEMP_MAX_LIMIT_READ, refresh)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 获取最高温度限制值
-        max_temp_limit = params[0]
-
-        # 判断温度是否在合理范围内
-        if not (50 <= max_temp_limit <= 100):
-            raise ValueError("Temperature limit is out of range.")
-
-        return max_temp_limit
+        return self._parse_temp_range(params)
 
     def read_servo_temp(self, servo_id: int) -> int:
         """
@@ -1341,27 +2632,14 @@ class SerialServo:
             ValueError: If the temperature is not within the range of 0°C to 100°C, an exception will be raised.
 
         """
-        # 发送SERVO_TEMP_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_TEMP_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_TEMP_READ[0], SerialServo.SERVO_TEMP_READ[2])
+        # 发送SERVO_TEMP_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_TEMP_READ)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 获取温度值
-        temperature = params[0]
-
-        # 判断温度是否在合理范围内
-        if not (0 <= temperature <= 100):
-            raise ValueError("Temperature is out of range.")
-
-        return temperature
+        return self._parse_temp(params)
 
     def read_servo_voltage(self, servo_id: int) -> float:
         """
@@ -1396,29 +2674,47 @@ class SerialServo:
             ValueError: If the voltage is not within the range of 4.5V to 12.0V, an exception will be raised.
 
         """
-        # 发送SERVO_VIN_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_VIN_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_VIN_READ[0], SerialServo.SERVO_VIN_READ[2])
+        # 发送SERVO_VIN_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_VIN_READ)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 将电压值的低高字节合并成一个整数
-        voltage_value = params[0] + (params[1] << 8)
+        return self._parse_voltage(params)
 
-        # 将电压值转换为伏特，电压范围 4.5V 到 12.0V
-        voltage = voltage_value / 1000.0
-        # 判断电压是否在合理范围内
-        if not (4.5 <= voltage <= 12.0):
-            raise ValueError("Voltage is out of range.")
+    def read_servo_voltage_mv(self, servo_id: int) -> int:
+        """
+        获取舵机的实时输入电压，单位毫伏。
+
+        与 `read_servo_voltage` 相同，但返回整数，不进行浮点运算。
 
-        return voltage
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 输入电压（毫伏），如果读取失败则返回None。
+
+        ===================================================
+
+        Get the real-time input voltage of the servo in millivolts.
+
+        Same as `read_servo_voltage`, but returns integers and does no floating point math.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            int: Input voltage in millivolts, or None if the read fails.
+        """
+        # 发送SERVO_VIN_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_VIN_READ)
+
+        # 如果没有接收到数据，则返回None
+        if len(params) == 0:
+            return None
+
+        return self._parse_voltage_mv(params)
 
     def read_servo_position(self, servo_id: int) -> float:
         """
@@ -1455,36 +2751,47 @@ class SerialServo:
             ValueError: If the position is not within the range of 0~240°, an exception will be raised.
 
         """
-        # 发送SERVO_POS_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_POS_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_POS_READ[0], SerialServo.SERVO_POS_READ[2])
+        # 发送SERVO_POS_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_POS_READ)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 将角度位置的低高字节合并为一个16位整数
-        position_value = params[0] + (params[1] << 8)
+        return self._parse_position(params)
 
-        # 将值转换为 signed short int 型数据（可能为负值）
-        # 判断是否为负值
-        if position_value >= 0x8000:
-            # 如果是负值，进行补码转换
-            position_value -= 0x10000
+    def read_servo_position_raw(self, servo_id: int) -> int:
+        """
+        获取舵机的实时位置，单位为舵机原始单位。
 
-        # 将位置值转换为角度值，映射到 0~240° 范围
-        position_angle = (position_value / 1000) * 240
+        与 `read_servo_position` 相同，但返回整数，不进行浮点运算。
 
-        # 判断角度值是否在合理范围内
-        if not (0 <= position_angle <= 240):
-            raise ValueError("Position is out of range.")
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 当前位置（0~1000，每单位0.24°），如果读取失败则返回None。
+
+        ===================================================
+
+        Get the real-time position of the servo in raw units.
+
+        Same as `read_servo_position`, but returns integers and does no floating point math.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            int: Current position (0~1000, 0.24 degrees each), or None if the read fails.
+        """
+        # 发送SERVO_POS_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_POS_READ)
 
-        return position_angle
+        # 如果没有接收到数据，则返回None
+        if len(params) == 0:
+            return None
+
+        return self._parse_position_raw(params)
 
     def set_servo_mode_and_speed(self, servo_id: int, mode: int, speed: int) -> None:
         """
@@ -1539,7 +2846,7 @@ class SerialServo:
         # 发送指令
         self.send_command(servo_id, SerialServo.SERVO_OR_MOTOR_MODE_WRITE[0], [mode, 0, low_byte, high_byte])
 
-    def get_servo_mode_and_speed(self, servo_id: int) -> tuple:
+    def get_servo_mode_and_speed(self, servo_id: int, refresh: bool = False) -> tuple:
         """
         获取舵机的工作模式和转动速度。
 
@@ -1548,6 +2855,7 @@ class SerialServo:
 
         Args:
             servo_id (int): 舵机的ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
 
         Returns:
             tuple: 返回舵机的工作模式、转动速度（单位：转/分钟）。如果读取失败，则返回 None。
@@ -1564,6 +2872,7 @@ class SerialServo:
 
         Args:
             servo_id (int): The servo's ID.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
 
         Returns:
             tuple: A tuple containing the servo's working mode and rotation speed (in RPM). If the read fails, it returns None.
@@ -1573,32 +2882,14 @@ class SerialServo:
             or if the mode and speed are incompatible.
 
         """
-        # 发送SERVO_OR_MOTOR_MODE_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_OR_MOTOR_MODE_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_OR_MOTOR_MODE_READ[0], SerialServo.SERVO_OR_MOTOR_MODE_READ[2])
+        # 发送SERVO_OR_MOTOR_MODE_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_OR_MOTOR_MODE_READ, refresh)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 解析舵机模式，0 为位置控制模式，1 为电机控制模式
-        mode = params[0]
-        if mode not in [SerialServo.MODE_POSITION, SerialServo.MODE_MOTOR]:
-            raise ValueError("Invalid servo mode.")
-
-        # 如果是电机控制模式，返回速度值；如果是位置控制模式，返回速度值为0
-        if mode == SerialServo.MODE_MOTOR:
-            # 解析转动速度，低8位和高8位合并为一个16位整数
-            speed_value = params[2] + (params[3] << 8)
-            # 返回工作模式和转动速度
-            return mode, speed_value
-        else:
-            return mode, 0
+        return self._parse_mode_and_speed(params)
 
     def set_servo_motor_load(self, servo_id: int, unload: bool) -> None:
         """
@@ -1661,26 +2952,14 @@ class SerialServo:
                   If the read fails, it returns `None`.
 
         """
-        # 发送SERVO_LOAD_OR_UNLOAD_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_LOAD_OR_UNLOAD_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_LOAD_OR_UNLOAD_READ[0], SerialServo.SERVO_LOAD_OR_UNLOAD_READ[2])
+        # 发送SERVO_LOAD_OR_UNLOAD_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_LOAD_OR_UNLOAD_READ)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 解析电机状态，0表示卸载电机，1表示装载电机
-        motor_status = params[0]
-        if motor_status not in [0, 1]:
-            raise ValueError("Invalid motor status value.")
-
-        # 如果状态为1，则表示电机已装载，返回True；如果为0，则表示电机已卸载，返回False
-        return motor_status == 1
+        return self._parse_load_status(params)
 
     def set_servo_led(self, servo_id: int, led_on: bool) -> None:
         """
@@ -1747,26 +3026,14 @@ class SerialServo:
             ValueError: If the servo ID is invalid or if the LED state is incorrect, an exception is raised.
 
         """
-        # 发送SERVO_LED_CTRL_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_LED_CTRL_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_LED_CTRL_READ[0], SerialServo.SERVO_LED_CTRL_READ[2])
+        # 发送SERVO_LED_CTRL_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_LED_CTRL_READ)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 解析LED状态，0表示常亮，1表示常灭
-        led_status = params[0]
-        if led_status not in [0, 1]:
-            raise ValueError("Invalid LED status value.")
-
-        # 如果状态为1，则表示LED常灭，返回True；如果为0，则表示LED常亮，返回False
-        return led_status == 1
+        return self._parse_led(params)
 
     def set_servo_led_alarm(self, servo_id: int, alarm_code: int) -> None:
         """
@@ -1810,7 +3077,7 @@ class SerialServo:
         # 生成指令包并发送
         self.send_command(servo_id, 35, [alarm_code])
 
-    def get_servo_led_alarm(self, servo_id: int) -> int:
+    def get_servo_led_alarm(self, servo_id: int, refresh: bool = False) -> int:
         """
         获取舵机LED故障报警状态。
 
@@ -1819,6 +3086,7 @@ class SerialServo:
 
         Args:
             servo_id (int): 舵机的ID。
+            refresh (bool): 为True时跳过配置缓存，直接从舵机读取，默认False。
 
         Returns:
             int: 返回LED闪烁报警值，范围为0~7，表示舵机的故障类型。
@@ -1837,6 +3105,7 @@ class SerialServo:
 
         Args:
             servo_id (int): The servo's ID.
+            refresh (bool): If True, bypass the configuration cache and read from the servo. Default is False.
 
         Returns:
             int: The LED flashing alarm value, in the range 0~7, representing the servo's fault type.
@@ -1846,36 +3115,14 @@ class SerialServo:
             ValueError: If the servo ID is invalid or the LED state is not acceptable, an exception is raised.
 
         """
-        # 发送SERVO_LED_ERROR_READ命令
-        self.send_command(servo_id, SerialServo.SERVO_LED_ERROR_READ[0], [])
-
-        # 延迟5ms再接收数据
-        time.sleep_ms(5)
-
-        # 接收并解析返回的数据
-        params = self.receive_command(SerialServo.SERVO_LED_ERROR_READ[0], SerialServo.SERVO_LED_ERROR_READ[2])
+        # 发送SERVO_LED_ERROR_READ命令并接收返回的数据
+        params = self._query(servo_id, SerialServo.SERVO_LED_ERROR_READ, refresh)
 
         # 如果没有接收到数据，则返回None
         if len(params) == 0:
             return None
 
-        # 解析LED故障报警值
-        error_alarm_value = params[0]
-
-        # 判断值是否在合法范围内
-        if error_alarm_value not in [SerialServo.ERROR_NO_ALARM,
-                                     SerialServo.ERROR_OVER_TEMP,
-                                     SerialServo.ERROR_OVER_VOLT,
-                                     SerialServo.ERROR_OVER_TEMP_AND_VOLT,
-                                     SerialServo.ERROR_STALL,
-                                     SerialServo.ERROR_OVER_TEMP_AND_STALL,
-                                     SerialServo.ERROR_OVER_VOLT_AND_STALL,
-                                     SerialServo.ERROR_ALL]:
-
-            raise ValueError("Error alarm value is out of range.")
-
-        # 返回LED故障报警值
-        return error_alarm_value
+        return self._parse_led_alarm(params)
 
 # ======================================== 初始化配置 ==========================================
 
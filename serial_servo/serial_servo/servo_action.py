@@ -0,0 +1,434 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/15 上午9:30
+# @Author  : 李清水
+# @File    : servo_action.py
+# @Description : 串口舵机动作组文件的编译和播放，动作组以紧凑的二进制格式保存在Flash中
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 二进制打包模块
+import struct
+# json模块
+import json
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# 动作组文件格式（小端）：
+# 文件头：  魔数 b'SACT'（4字节） + 版本号（1字节） + 舵机数量N（1字节） + 关键帧数量（2字节）
+# 舵机ID表：N个字节
+# 关键帧：  每帧 2 + 2*N 字节，依次为 运动时间（毫秒，2字节） + N个舵机的目标位置（舵机原始单位0~1000，各2字节）
+#          目标位置为 0xFFFF 表示该舵机在本帧保持不动，不发送指令
+# 每一帧的运动从上一帧的时间点开始，运动时间等于两帧时间点之差
+ACTION_MAGIC = b'SACT'
+ACTION_VERSION = 1
+# 文件头格式
+_HEADER_FORMAT = '<4sBBH'
+_HEADER_SIZE = 8
+# 保持不动标记
+ACTION_HOLD = 0xFFFF
+
+# ======================================== 功能函数 ============================================
+
+def compile_action(keyframes: list, path: str) -> int:
+    """
+    将可读的关键帧列表编译为二进制动作组文件。
+
+    Args:
+        keyframes (list): 关键帧列表，每个关键帧为（时间，{舵机ID: 角度}）元组，
+                          时间单位毫秒、严格递增，相邻关键帧时间差不超过30000毫秒，角度范围0~240度。
+                          关键帧中未出现的舵机在该帧保持不动。
+        path (str): 输出文件路径。
+
+    Returns:
+        int: 写入的关键帧数量。
+
+    Raises:
+        ValueError: 如果关键帧为空、时间不递增、时间差超出范围、舵机ID或角度无效，则抛出异常。
+
+    ==========================================
+
+    Compile a human-readable keyframe list into a binary action file.
+
+    Args:
+        keyframes (list): List of (time, {servo_id: angle}) tuples; time in milliseconds, strictly increasing,
+                          at most 30000 ms between keyframes, angle in the range 0~240 degrees.
+                          Servos missing from a keyframe hold still during it.
+        path (str): Output file path.
+
+    Returns:
+        int: Number of keyframes written.
+
+    Raises:
+        ValueError: If the list is empty, times are not increasing or too far apart, or an ID or angle is invalid.
+    """
+    if len(keyframes) == 0:
+        raise ValueError("Keyframe list must not be empty.")
+    if len(keyframes) > 0xFFFF:
+        raise ValueError("Too many keyframes.")
+
+    # 收集所有出现过的舵机ID
+    ids = []
+    for _, angles in keyframes:
+        for servo_id in angles:
+            servo_id = int(servo_id)
+            if servo_id < 0 or servo_id > 253:
+                raise ValueError("Servo ID must be in range 0~253.")
+            if servo_id not in ids:
+                ids.append(servo_id)
+    ids.sort()
+    if len(ids) == 0:
+        raise ValueError("Keyframes contain no servo.")
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack(_HEADER_FORMAT, ACTION_MAGIC, ACTION_VERSION, len(ids), len(keyframes)))
+        f.write(bytes(ids))
+
+        row_format = '<H' + 'H' * len(ids)
+        last_time = 0
+        first = True
+        for t, angles in keyframes:
+            # 检查时间是否递增，运动时间是否在舵机支持的范围内
+            if t < last_time or (t == last_time and not first):
+                raise ValueError("Keyframe times must be strictly increasing.")
+            duration = t - last_time
+            if duration > 30000:
+                raise ValueError("Keyframes must be at most 30000 ms apart.")
+
+            # 关键帧中的ID可能是字符串（来自json），统一转换为整数
+            targets = {}
+            for servo_id, angle in angles.items():
+                if angle < 0 or angle > 240:
+                    raise ValueError("Angle must be in range 0~240.")
+                targets[int(servo_id)] = int(angle / 0.24)
+
+            row = [duration]
+            for servo_id in ids:
+                row.append(targets.get(servo_id, ACTION_HOLD))
+            f.write(struct.pack(row_format, *row))
+
+            last_time = t
+            first = False
+
+    return len(keyframes)
+
+def compile_action_json(src_path: str, dst_path: str) -> int:
+    """
+    将json格式的动作组文件编译为二进制动作组文件。
+
+    json文件格式为 {"keyframes": [[时间, {"舵机ID": 角度, ...}], ...]}。
+
+    Args:
+        src_path (str): json文件路径。
+        dst_path (str): 输出的二进制文件路径。
+
+    Returns:
+        int: 写入的关键帧数量。
+
+    Raises:
+        ValueError: 如果json格式或关键帧内容无效，则抛出异常。
+
+    ==========================================
+
+    Compile a json action file into a binary action file.
+
+    The json format is {"keyframes": [[time, {"servo_id": angle, ...}], ...]}.
+
+    Args:
+        src_path (str): Path of the json file.
+        dst_path (str): Path of the binary output file.
+
+    Returns:
+        int: Number of keyframes written.
+
+    Raises:
+        ValueError: If the json layout or the keyframes are invalid.
+    """
+    with open(src_path, 'r') as f:
+        data = json.load(f)
+
+    if 'keyframes' not in data:
+        raise ValueError("Action json must contain 'keyframes'.")
+
+    keyframes = []
+    for item in data['keyframes']:
+        keyframes.append((item[0], item[1]))
+
+    return compile_action(keyframes, dst_path)
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机动作组播放类
+class ServoActionPlayer:
+    """
+    串口舵机动作组播放类。
+
+    该类从Flash中逐帧读取二进制动作组文件，不把整个动作组加载到内存中。每一帧的数据包在预先分配的缓冲区中
+    直接修改位置字节和校验和，按时间表发送：
+    批量模式下每帧所有舵机的 SERVO_MOVE_TIME_WRITE 指令合并为一次写入；
+    同步模式下先发送所有舵机的 SERVO_MOVE_TIME_WAIT_WRITE 指令，再广播 SERVO_MOVE_START 指令让所有舵机同时开始运动。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例。
+        servo_ids (list[int]): 动作组中的舵机ID列表。
+        frames (int): 关键帧数量。
+        mode (int): 播放模式，MODE_BATCH 或 MODE_SYNC。
+        frames_sent (int): 已发送的关键帧数量。
+        max_lateness_ms (int): 关键帧发送相对计划时间的最大延迟，单位毫秒。
+
+    Methods:
+        start() -> None:
+            从第一帧开始播放。
+        update() -> bool:
+            非阻塞地发送到期的关键帧。
+        play() -> None:
+            阻塞地播放完整个动作组。
+        close() -> None:
+            关闭动作组文件。
+
+    ==========================================
+
+    Serial servo action player.
+
+    The binary action file is streamed from flash row by row instead of being loaded into RAM. The packets of
+    each row are patched in place in a preallocated buffer (position bytes and checksums) and sent on schedule:
+    in batch mode all SERVO_MOVE_TIME_WRITE packets of a row go out in one write; in sync mode every servo gets
+    a SERVO_MOVE_TIME_WAIT_WRITE packet first and a broadcast SERVO_MOVE_START makes them start together.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance.
+        servo_ids (list[int]): IDs of the servos in the action.
+        frames (int): Number of keyframes.
+        mode (int): Playback mode, MODE_BATCH or MODE_SYNC.
+        frames_sent (int): Number of keyframes sent.
+        max_lateness_ms (int): Largest delay of a keyframe after its planned time, in milliseconds.
+
+    Methods:
+        start() -> None:
+            Start playing from the first keyframe.
+        update() -> bool:
+            Send the due keyframe without blocking.
+        play() -> None:
+            Block until the whole action has been played.
+        close() -> None:
+            Close the action file.
+    """
+
+    # 类变量：播放模式
+    # 批量模式：每帧一次写入所有舵机的立即转动指令
+    MODE_BATCH = 0
+    # 同步模式：延迟转动指令 + 广播开始转动指令
+    MODE_SYNC = 1
+
+    def __init__(self, servo: SerialServo, path: str, mode: int = MODE_BATCH) -> None:
+        """
+        打开动作组文件并初始化播放类。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            path (str): 二进制动作组文件路径。
+            mode (int): 播放模式，MODE_BATCH 或 MODE_SYNC。
+
+        Raises:
+            ValueError: 如果播放模式无效或文件格式不正确，则抛出异常。
+
+        ==========================================
+
+        Open an action file and initialize the player.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            path (str): Path of the binary action file.
+            mode (int): Playback mode, MODE_BATCH or MODE_SYNC.
+
+        Raises:
+            ValueError: If the mode is invalid or the file format is wrong.
+        """
+        if mode not in (ServoActionPlayer.MODE_BATCH, ServoActionPlayer.MODE_SYNC):
+            raise ValueError("Invalid playback mode.")
+
+        self.servo = servo
+        self.mode = mode
+        self._file = open(path, 'rb')
+
+        # 解析文件头
+        header = self._file.read(_HEADER_SIZE)
+        if len(header) != _HEADER_SIZE:
+            self._file.close()
+            raise ValueError("Action file is too short.")
+        magic, version, count, frames = struct.unpack(_HEADER_FORMAT, header)
+        if magic != ACTION_MAGIC or version != ACTION_VERSION or count == 0:
+            self._file.close()
+            raise ValueError("Invalid action file.")
+
+        self.servo_ids = list(self._file.read(count))
+        self.frames = frames
+        # 关键帧数据在文件中的起始位置
+        self._data_offset = _HEADER_SIZE + count
+
+        # 预先分配一帧的读取缓冲区
+        self._row = bytearray(2 + 2 * count)
+        self._row_view = memoryview(self._row)
+
+        # 预先构建所有舵机的数据包，只需修改位置、时间和校验和
+        cmd = SerialServo.SERVO_MOVE_TIME_WRITE[0] if mode == ServoActionPlayer.MODE_BATCH \
+            else SerialServo.SERVO_MOVE_TIME_WAIT_WRITE[0]
+        self._packets = bytearray(10 * count)
+        self._packets_view = memoryview(self._packets)
+        self._templates = bytearray(10 * count)
+        for i in range(count):
+            self._templates[10 * i:10 * i + 10] = servo.build_packet(self.servo_ids[i], cmd, [0, 0, 0, 0])
+        # 同步模式下的广播开始转动指令
+        self._start_packet = bytes(servo.build_packet(254, SerialServo.SERVO_MOVE_START[0], []))
+
+        self._index = 0
+        self._next_ms = 0
+        self._start_ms = 0
+        self._running = False
+
+        self.frames_sent = 0
+        self.max_lateness_ms = 0
+
+    def _read_row(self) -> int:
+        """
+        读取下一帧到缓冲区，返回该帧的运动时间。
+
+        ==========================================
+
+        Read the next row into the buffer and return its movement time.
+        """
+        if self._file.readinto(self._row) != len(self._row):
+            raise ValueError("Action file is truncated.")
+        return self._row[0] | (self._row[1] << 8)
+
+    def _send_row(self, duration: int) -> None:
+        """
+        按缓冲区中的一帧数据构建并发送数据包。
+
+        ==========================================
+
+        Build and send the packets of the row in the buffer.
+        """
+        row = self._row
+        packets = self._packets
+        templates = self._templates
+        time_low = duration & 0xFF
+        time_high = (duration >> 8) & 0xFF
+        length = 0
+        for i in range(len(self.servo_ids)):
+            low = row[2 + 2 * i]
+            high = row[3 + 2 * i]
+            # 保持不动的舵机不发送指令
+            if low == 0xFF and high == 0xFF:
+                continue
+            src = 10 * i
+            # 复制模板数据包的帧头、ID、长度和命令
+            for j in range(5):
+                packets[length + j] = templates[src + j]
+            packets[length + 5] = low
+            packets[length + 6] = high
+            packets[length + 7] = time_low
+            packets[length + 8] = time_high
+            packets[length + 9] = ~(templates[src + 2] + templates[src + 3] + templates[src + 4]
+                                    + low + high + time_low + time_high) & 0xFF
+            length += 10
+
+        if length > 0:
+            self.servo.write_packet(self._packets_view[:length])
+            if self.mode == ServoActionPlayer.MODE_SYNC:
+                self.servo.write_packet(self._start_packet)
+        self.frames_sent += 1
+
+    def start(self) -> None:
+        """
+        从第一帧开始播放动作组，立即发送第一帧。
+
+        ==========================================
+
+        Start playing the action from the first keyframe and send it immediately.
+        """
+        self._file.seek(self._data_offset)
+
+        # 动作组直接写入数据包，写入合并的影子状态不再可信
+        for servo_id in self.servo_ids:
+            self.servo.invalidate_shadow(servo_id)
+
+        self._index = 0
+        self._start_ms = time.ticks_ms()
+        self._next_ms = 0
+        self.frames_sent = 0
+        self.max_lateness_ms = 0
+        self._running = self.frames > 0
+        self.update()
+
+    def update(self) -> bool:
+        """
+        非阻塞地发送到期的关键帧。
+
+        Returns:
+            bool: 动作组仍在播放时返回True，播放结束后返回False。
+
+        ==========================================
+
+        Send the due keyframe without blocking.
+
+        Returns:
+            bool: True while the action is playing, False once it has finished.
+        """
+        if not self._running:
+            return False
+
+        late = time.ticks_diff(time.ticks_ms(), time.ticks_add(self._start_ms, self._next_ms))
+        if late < 0:
+            return True
+        if late > self.max_lateness_ms:
+            self.max_lateness_ms = late
+
+        # 每一帧的运动从上一帧的时间点开始
+        duration = self._read_row()
+        self._send_row(duration)
+        self._index += 1
+        self._next_ms += duration
+
+        if self._index >= self.frames:
+            self._running = False
+        return self._running
+
+    def play(self) -> None:
+        """
+        阻塞地播放完整个动作组，并等待最后一帧运动完成。
+
+        ==========================================
+
+        Block until the whole action has been played, including the movement of the last keyframe.
+        """
+        self.start()
+        while self._running:
+            wait = time.ticks_diff(time.ticks_add(self._start_ms, self._next_ms), time.ticks_ms())
+            if wait > 0:
+                time.sleep_ms(wait)
+            self.update()
+
+        # 等待最后一帧运动完成
+        wait = time.ticks_diff(time.ticks_add(self._start_ms, self._next_ms), time.ticks_ms())
+        if wait > 0:
+            time.sleep_ms(wait)
+
+    def close(self) -> None:
+        """
+        关闭动作组文件。
+
+        ==========================================
+
+        Close the action file.
+        """
+        self._running = False
+        self._file.close()
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
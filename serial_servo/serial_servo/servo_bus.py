@@ -0,0 +1,528 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/17 下午2:40
+# @Author  : 李清水
+# @File    : servo_bus.py
+# @Description : 多串口舵机总线管理类，将舵机ID映射到不同的UART总线，并行发送分组运动指令和读取遥测数据
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 多串口舵机总线管理类
+class ServoBusManager:
+    """
+    多串口舵机总线管理类。
+
+    大型机器人通常把舵机分布在两到三路UART上以获得更高的总带宽。该类将舵机ID映射到各自的总线
+    （每路总线一个 `SerialServo` 实例），对所有舵机提供统一的分组运动和遥测读取接口：
+    分组运动时每路总线的数据包合并为一次写入，各路UART同时发送；读取时在每路总线上各保持一个未完成的请求，
+    轮询所有总线，某路回复到达或超时后立即发出该路的下一个请求，等待一路回复时其他总线照常收发。
+
+    Attributes:
+        buses (list[SerialServo]): 各路总线的串口舵机控制类实例。
+        servo_map (dict): 舵机ID -> 总线序号。
+        timeouts (int): 读取时超时未收到完整回复的次数。
+        errors (int): 读取时收到无效回复的次数。
+
+    Methods:
+        assign(servo_id: int, bus_index: int) -> None:
+            将舵机ID映射到指定总线。
+        bus_of(servo_id: int) -> SerialServo:
+            获取舵机所在总线的控制类实例。
+        move_servos(moves: dict, time_ms: int) -> None:
+            所有舵机立即转动到指定角度。
+        move_servos_sync(moves: dict, time_ms: int) -> None:
+            所有舵机同时开始转动到指定角度。
+        stop_servos(servo_ids=None) -> None:
+            停止舵机转动。
+        read_positions(servo_ids=None) -> dict:
+            并行读取舵机角度。
+        read_voltages(servo_ids=None) -> dict:
+            并行读取舵机输入电压。
+        read_temperatures(servo_ids=None) -> dict:
+            并行读取舵机温度。
+        read_params(command: tuple, servo_ids=None) -> dict:
+            并行执行任意读取命令，返回未解析的参数。
+
+    ==========================================
+
+    Multi-UART serial servo bus manager.
+
+    Large rigs split their servos across two or three UARTs for more total bandwidth. This class maps servo IDs
+    to their bus (one `SerialServo` instance per bus) and offers group-move and telemetry APIs over the combined
+    set: a group move sends the packets of each bus in one write so that all UARTs transmit at the same time,
+    and reads keep one request in flight on every bus, polling all of them and issuing the next request of a bus
+    as soon as its reply arrives or times out, so one bus transmits while another waits for its reply.
+
+    Attributes:
+        buses (list[SerialServo]): Serial servo control instance of every bus.
+        servo_map (dict): Servo ID -> bus index.
+        timeouts (int): Number of reads without a complete reply in time.
+        errors (int): Number of invalid replies during reads.
+
+    Methods:
+        assign(servo_id: int, bus_index: int) -> None:
+            Map a servo ID to a bus.
+        bus_of(servo_id: int) -> SerialServo:
+            Get the control instance of the bus a servo is on.
+        move_servos(moves: dict, time_ms: int) -> None:
+            Move all servos to their angles immediately.
+        move_servos_sync(moves: dict, time_ms: int) -> None:
+            Start moving all servos to their angles at the same time.
+        stop_servos(servo_ids=None) -> None:
+            Stop servos.
+        read_positions(servo_ids=None) -> dict:
+            Read servo positions in parallel.
+        read_voltages(servo_ids=None) -> dict:
+            Read servo input voltages in parallel.
+        read_temperatures(servo_ids=None) -> dict:
+            Read servo temperatures in parallel.
+        read_params(command: tuple, servo_ids=None) -> dict:
+            Run any read command in parallel and return the undecoded parameters.
+    """
+
+    def __init__(self, buses: list, servo_map: dict = None) -> None:
+        """
+        初始化多串口舵机总线管理类。
+
+        Args:
+            buses (list[SerialServo]): 各路总线的串口舵机控制类实例。
+            servo_map (dict, optional): 舵机ID -> 总线序号，也可以之后调用 assign 添加。
+
+        Raises:
+            ValueError: 如果总线列表为空，或映射中的舵机ID、总线序号无效，则抛出异常。
+
+        ==========================================
+
+        Initialize the multi-UART bus manager.
+
+        Args:
+            buses (list[SerialServo]): Serial servo control instance of every bus.
+            servo_map (dict, optional): Servo ID -> bus index; servos can also be added later with assign.
+
+        Raises:
+            ValueError: If the bus list is empty, or a servo ID or bus index in the map is invalid.
+        """
+        if len(buses) == 0:
+            raise ValueError("Bus list must not be empty.")
+
+        self.buses = list(buses)
+        self.servo_map = {}
+        if servo_map:
+            for servo_id, bus_index in servo_map.items():
+                self.assign(servo_id, bus_index)
+
+        self.timeouts = 0
+        self.errors = 0
+
+    def assign(self, servo_id: int, bus_index: int) -> None:
+        """
+        将舵机ID映射到指定总线。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            bus_index (int): 总线序号。
+
+        Raises:
+            ValueError: 如果舵机ID或总线序号无效，则抛出异常。
+
+        ==========================================
+
+        Map a servo ID to a bus.
+
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            bus_index (int): Bus index.
+
+        Raises:
+            ValueError: If the servo ID or the bus index is invalid.
+        """
+        if servo_id < 0 or servo_id > 253:
+            raise ValueError("Servo ID must be in range 0~253.")
+        if bus_index < 0 or bus_index >= len(self.buses):
+            raise ValueError("Invalid bus index.")
+        self.servo_map[servo_id] = bus_index
+
+    def bus_of(self, servo_id: int) -> SerialServo:
+        """
+        获取舵机所在总线的控制类实例，可以直接调用其单个舵机的方法。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            SerialServo: 舵机所在总线的控制类实例。
+
+        Raises:
+            ValueError: 如果舵机ID没有映射到任何总线，则抛出异常。
+
+        ==========================================
+
+        Get the control instance of the bus a servo is on, for calling its single-servo methods directly.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            SerialServo: Control instance of the servo's bus.
+
+        Raises:
+            ValueError: If the servo ID is not mapped to a bus.
+        """
+        if servo_id not in self.servo_map:
+            raise ValueError("Servo ID %d is not assigned to a bus." % servo_id)
+        return self.buses[self.servo_map[servo_id]]
+
+    def _group(self, servo_ids) -> list:
+        """
+        按总线分组舵机ID，返回每路总线的ID列表。
+
+        ==========================================
+
+        Group servo IDs by bus and return the ID list of every bus.
+        """
+        if servo_ids is None:
+            servo_ids = self.servo_map
+        groups = [[] for _ in self.buses]
+        for servo_id in servo_ids:
+            if servo_id not in self.servo_map:
+                raise ValueError("Servo ID %d is not assigned to a bus." % servo_id)
+            groups[self.servo_map[servo_id]].append(servo_id)
+        return groups
+
+    def _write_moves(self, moves: dict, time_ms: int, cmd: int) -> list:
+        """
+        为每路总线构建合并的运动数据包并发送，返回每路总线的ID列表。
+
+        ==========================================
+
+        Build one combined move burst per bus, send it and return the ID list of every bus.
+        """
+        # 判断时间是否在 0~30000 毫秒范围内
+        if time_ms < 0 or time_ms > 30000:
+            raise ValueError("Time must be in range 0~30000.")
+        for angle in moves.values():
+            # 判断角度是否在 0~240度范围内
+            if angle < 0 or angle > 240:
+                raise ValueError("Angle must be in range 0~240.")
+
+        groups = self._group(moves)
+        time_low = time_ms & 0xFF
+        time_high = (time_ms >> 8) & 0xFF
+
+        # 先构建所有数据包，再依次写入，各路UART的发送在时间上重叠
+        bursts = []
+        for index, servo_ids in enumerate(groups):
+            bus = self.buses[index]
+            burst = bytearray()
+            for servo_id in servo_ids:
+                position = int(moves[servo_id] / 0.24)
+                burst += bus.build_packet(servo_id, cmd, [position & 0xFF, (position >> 8) & 0xFF,
+                                                          time_low, time_high])
+                # 合并写入绕过了写入合并的影子状态
+                bus.invalidate_shadow(servo_id)
+            bursts.append(burst)
+
+        for index, burst in enumerate(bursts):
+            if len(burst) > 0:
+                # 分组写入在事务内发送，不会插入其他线程的读取请求和回复之间
+                bus = self.buses[index]
+                bus.begin_transaction()
+                try:
+                    bus.write_packet(burst)
+                finally:
+                    bus.end_transaction()
+
+        return groups
+
+    def move_servos(self, moves: dict, time_ms: int) -> None:
+        """
+        所有舵机立即转动到指定角度（SERVO_MOVE_TIME_WRITE），每路总线一次写入。
+
+        Args:
+            moves (dict): 舵机ID -> 目标角度（0~240度）。
+            time_ms (int): 转动时间（0~30000 毫秒）。
+
+        Raises:
+            ValueError: 如果角度或时间超出范围，或舵机ID没有映射到任何总线，则抛出异常。
+
+        ==========================================
+
+        Move all servos to their angles immediately (SERVO_MOVE_TIME_WRITE), one write per bus.
+
+        Args:
+            moves (dict): Servo ID -> target angle (0~240 degrees).
+            time_ms (int): Movement time (0~30000 milliseconds).
+
+        Raises:
+            ValueError: If an angle or the time is out of range, or a servo ID is not mapped to a bus.
+        """
+        self._write_moves(moves, time_ms, SerialServo.SERVO_MOVE_TIME_WRITE[0])
+
+    def move_servos_sync(self, moves: dict, time_ms: int) -> None:
+        """
+        所有舵机同时开始转动到指定角度。
+
+        先在每路总线上发送 SERVO_MOVE_TIME_WAIT_WRITE 指令，再在每路总线上广播 SERVO_MOVE_START 指令。
+
+        Args:
+            moves (dict): 舵机ID -> 目标角度（0~240度）。
+            time_ms (int): 转动时间（0~30000 毫秒）。
+
+        Raises:
+            ValueError: 如果角度或时间超出范围，或舵机ID没有映射到任何总线，则抛出异常。
+
+        ==========================================
+
+        Start moving all servos to their angles at the same time.
+
+        SERVO_MOVE_TIME_WAIT_WRITE packets are sent on every bus first, then SERVO_MOVE_START is broadcast on every bus.
+
+        Args:
+            moves (dict): Servo ID -> target angle (0~240 degrees).
+            time_ms (int): Movement time (0~30000 milliseconds).
+
+        Raises:
+            ValueError: If an angle or the time is out of range, or a servo ID is not mapped to a bus.
+        """
+        groups = self._write_moves(moves, time_ms, SerialServo.SERVO_MOVE_TIME_WAIT_WRITE[0])
+        for index, servo_ids in enumerate(groups):
+            if len(servo_ids) > 0:
+                self.buses[index].start_servo(254)
+
+    def stop_servos(self, servo_ids=None) -> None:
+        """
+        停止舵机转动。
+
+        Args:
+            servo_ids (iterable, optional): 舵机ID列表，默认所有已映射的舵机。
+
+        Raises:
+            ValueError: 如果舵机ID没有映射到任何总线，则抛出异常。
+
+        ==========================================
+
+        Stop servos.
+
+        Args:
+            servo_ids (iterable, optional): Servo IDs, default every mapped servo.
+
+        Raises:
+            ValueError: If a servo ID is not mapped to a bus.
+        """
+        groups = self._group(servo_ids)
+        for index, ids in enumerate(groups):
+            bus = self.buses[index]
+            burst = bytearray()
+            for servo_id in ids:
+                burst += bus.build_packet(servo_id, SerialServo.SERVO_MOVE_STOP[0], [])
+                bus.invalidate_shadow(servo_id)
+            if len(burst) > 0:
+                bus.begin_transaction()
+                try:
+                    bus.write_packet(burst)
+                finally:
+                    bus.end_transaction()
+
+    def _read_all(self, servo_ids, command: tuple, parser: str) -> dict:
+        """
+        在所有总线上交错执行读取命令，每路总线保持一个未完成的请求。
+
+        Args:
+            servo_ids (iterable): 舵机ID列表，None表示所有已映射的舵机。
+            command (tuple): 读取命令元组（命令编号，参数长度，返回数据长度）。
+            parser (str): SerialServo 中解析返回参数的方法名，None表示返回原始参数。
+
+        Returns:
+            dict: 舵机ID -> 解析后的值，读取失败为None。
+
+        ==========================================
+
+        Run a read command interleaved across all buses, keeping one request in flight per bus.
+
+        Args:
+            servo_ids (iterable): Servo IDs, None means every mapped servo.
+            command (tuple): Read command tuple (command ID, parameter length, returned data length).
+            parser (str): Name of the SerialServo method that decodes the returned parameters, None returns the
+                          raw parameters.
+
+        Returns:
+            dict: Servo ID -> decoded value, None if the read failed.
+        """
+        groups = self._group(servo_ids)
+        count = len(self.buses)
+        heads = [0] * count
+        pending = [-1] * count
+        deadlines = [0] * count
+        results = {}
+
+        def issue(index):
+            # 发出该路总线的下一个请求
+            if heads[index] < len(groups[index]):
+                servo_id = groups[index][heads[index]]
+                heads[index] += 1
+                bus = self.buses[index]
+                bus.flush_input()
+                bus.send_command(servo_id, command[0], [])
+                pending[index] = servo_id
+                deadlines[index] = bus.reply_deadline(command)
+                return 1
+            pending[index] = -1
+            return 0
+
+        # 按总线序号依次获取事务锁，整个交错读取期间其他线程不会抢走回复
+        for bus in self.buses:
+            bus.begin_transaction()
+        try:
+            active = 0
+            for index in range(count):
+                active += issue(index)
+
+            while active > 0:
+                for index in range(count):
+                    servo_id = pending[index]
+                    if servo_id < 0:
+                        continue
+                    bus = self.buses[index]
+
+                    if bus.uart.any() >= bus.reply_size(command):
+                        params = bus.receive_command(command[0], command[2])
+                        value = None
+                        if len(params) == 0:
+                            self.errors += 1
+                        elif parser is None:
+                            value = bytes(params)
+                        else:
+                            try:
+                                value = getattr(bus, parser)(params)
+                            except ValueError:
+                                self.errors += 1
+                        results[servo_id] = value
+                    elif time.ticks_diff(time.ticks_us(), deadlines[index]) > 0:
+                        # 超时则清空接收缓冲区中的残留数据
+                        bus.flush_input()
+                        self.timeouts += 1
+                        results[servo_id] = None
+                    else:
+                        continue
+
+                    active -= 1
+                    active += issue(index)
+        finally:
+            for bus in self.buses:
+                bus.end_transaction()
+
+        return results
+
+    def read_positions(self, servo_ids=None) -> dict:
+        """
+        并行读取舵机的实时角度位置。
+
+        Args:
+            servo_ids (iterable, optional): 舵机ID列表，默认所有已映射的舵机。
+
+        Returns:
+            dict: 舵机ID -> 角度（度），读取失败为None。
+
+        ==========================================
+
+        Read the real-time positions of servos in parallel.
+
+        Args:
+            servo_ids (iterable, optional): Servo IDs, default every mapped servo.
+
+        Returns:
+            dict: Servo ID -> angle in degrees, None if the read failed.
+        """
+        return self._read_all(servo_ids, SerialServo.SERVO_POS_READ, "_parse_position")
+
+    def read_voltages(self, servo_ids=None) -> dict:
+        """
+        并行读取舵机的实时输入电压。
+
+        Args:
+            servo_ids (iterable, optional): 舵机ID列表，默认所有已映射的舵机。
+
+        Returns:
+            dict: 舵机ID -> 电压（伏特），读取失败为None。
+
+        ==========================================
+
+        Read the real-time input voltages of servos in parallel.
+
+        Args:
+            servo_ids (iterable, optional): Servo IDs, default every mapped servo.
+
+        Returns:
+            dict: Servo ID -> voltage in volts, None if the read failed.
+        """
+        return self._read_all(servo_ids, SerialServo.SERVO_VIN_READ, "_parse_voltage")
+
+    def read_temperatures(self, servo_ids=None) -> dict:
+        """
+        并行读取舵机的实时温度。
+
+        Args:
+            servo_ids (iterable, optional): 舵机ID列表，默认所有已映射的舵机。
+
+        Returns:
+            dict: 舵机ID -> 温度（摄氏度），读取失败为None。
+
+        ==========================================
+
+        Read the real-time temperatures of servos in parallel.
+
+        Args:
+            servo_ids (iterable, optional): Servo IDs, default every mapped servo.
+
+        Returns:
+            dict: Servo ID -> temperature in degrees Celsius, None if the read failed.
+        """
+        return self._read_all(servo_ids, SerialServo.SERVO_TEMP_READ, "_parse_temp")
+
+    def read_params(self, command: tuple, servo_ids=None) -> dict:
+        """
+        并行执行任意读取命令，返回未解析的参数，供配置比对等需要原始数据的场合使用。
+
+        Args:
+            command (tuple): 读取命令元组（命令编号，参数长度，返回数据长度）。
+            servo_ids (iterable, optional): 舵机ID列表，默认所有已映射的舵机。
+
+        Returns:
+            dict: 舵机ID -> 返回的参数（bytes），读取失败为None。
+
+        Raises:
+            ValueError: 如果命令不是读取命令，或舵机ID没有映射到任何总线，则抛出异常。
+
+        ==========================================
+
+        Run any read command in parallel and return the undecoded parameters, for uses that need the raw data
+        such as configuration diffs.
+
+        Args:
+            command (tuple): Read command tuple (command ID, parameter length, returned data length).
+            servo_ids (iterable, optional): Servo IDs, default every mapped servo.
+
+        Returns:
+            dict: Servo ID -> returned parameters (bytes), None if the read failed.
+
+        Raises:
+            ValueError: If the command is not a read command, or a servo ID is not mapped to a bus.
+        """
+        if len(command) != 3 or command[0] not in SerialServo.READ_COMMANDS:
+            raise ValueError("Command is not a read command.")
+        return self._read_all(servo_ids, command, None)
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,574 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/24 下午4:30
+# @Author  : 李清水
+# @File    : servo_controller.py
+# @Description : 串口舵机闭环位置控制类，按固定控制周期读取舵机位置，用整数运算的PID和前馈修正目标位置，
+#                并将修正后的目标一次性发送给所有舵机
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 紧凑数组模块
+from array import array
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机闭环位置控制类
+class ServoPositionController:
+    """
+    串口舵机闭环位置控制类。
+
+    舵机内部的位置环在负载、死区或装配间隙下会留下稳态误差，精确定位时需要在 `move_servo_immediate` 和
+    `read_servo_position` 外面再套一层修正环。该类按固定控制周期运行外环：读取每个舵机的位置，
+    按 PID 和目标速度前馈计算修正量，把“目标 + 修正量”作为新的立即转动指令，
+    所有舵机的指令写入一个预先分配的缓冲区后一次性发送（与 `ServoTrajectory` 相同，只修改位置字节和校验和）。
+
+    控制律全部使用整数运算：增益在初始化时转换为 Q8 定点数（乘以256），位置、误差和积分都以原始单位
+    （每单位0.24度）表示，循环中不进行浮点运算，也不分配内存。位置读取使用 `wait_reply` 轮询等待回复，
+    不使用固定延时；传入 `ServoPositionEstimator` 时，误差估计不超过 `max_error` 的周期直接使用预测位置，跳过总线读取。
+    修正量被 `max_correction` 限幅且误差仍在同一方向时不累加积分（条件积分），大幅阶跃后不会因积分饱和而超调。
+
+    如果总线或主循环跟不上控制周期，过期的周期会被跳过并计入截止时间错过次数；
+    单个周期的计算和通信时间超过控制周期时计入超时次数。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例。
+        servo_ids (list[int]): 控制的舵机ID列表。
+        period_ms (int): 控制周期，单位毫秒。
+        estimator (ServoPositionEstimator): 位置估计类实例，None表示每个周期都读取真实位置。
+        max_error (int): 使用预测位置时可接受的误差估计，原始单位。
+        cycles (int): 已运行的控制周期数。
+        overruns (int): 计算和通信时间超过控制周期的周期数。
+        deadline_misses (int): 因超过截止时间而跳过的周期数。
+        max_cycle_us (int): 单个周期计算和通信时间的最大值，单位微秒。
+        last_cycle_us (int): 最近一个周期的计算和通信时间，单位微秒。
+        max_lateness_us (int): 周期开始时间相对截止时间的最大延迟，单位微秒。
+        read_failures (int): 位置读取失败的次数。
+
+    Methods:
+        set_target(servo_id: int, angle: float) -> None:
+            设置舵机的目标角度。
+        set_target_raw(servo_id: int, position: int) -> None:
+            设置舵机的目标位置（原始单位）。
+        set_gains(kp: float, ki: float, kd: float, kff: float) -> None:
+            设置控制增益。
+        state(servo_id: int) -> tuple:
+            获取舵机的目标位置、最近读到的位置和最近发送的指令位置。
+        start() -> None:
+            开始闭环控制，立即运行第一个周期。
+        update() -> bool:
+            非阻塞地运行到期的控制周期。
+        run(duration_ms: int = None) -> None:
+            阻塞地运行闭环控制。
+        stop() -> None:
+            停止闭环控制。
+        reset_stats() -> None:
+            清零循环计时和超时统计。
+
+    ==========================================
+
+    Closed-loop position controller for serial servos.
+
+    The internal position loop of a servo leaves a steady-state error under load, deadband or backlash, so
+    precise positioning needs an outer correction loop around `move_servo_immediate` and `read_servo_position`.
+    This class runs that outer loop at a fixed control rate: it reads the position of every servo, computes a
+    correction from PID terms and target-velocity feed-forward, and sends "target + correction" as the new
+    immediate move. The moves of all servos are patched into one preallocated buffer (position bytes and
+    checksum only, as in `ServoTrajectory`) and sent in a single write.
+
+    The control law uses integer math only: gains are converted to Q8 fixed point (times 256) once, and
+    positions, errors and the integral are in raw units (0.24 degrees each), so the loop does no floating point
+    math and allocates nothing. Positions are read with `wait_reply` polling instead of fixed sleeps; with a
+    `ServoPositionEstimator`, cycles whose error estimate is within `max_error` use the predicted position and
+    skip the bus read. While the correction is clamped to `max_correction` and the error still pushes the same
+    way, the integral is not accumulated (conditional integration), so large steps do not overshoot from windup.
+
+    If the bus or the main loop cannot keep up, stale cycles are skipped and counted as deadline misses; a cycle
+    whose computation and communication take longer than the control period is counted as an overrun.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance.
+        servo_ids (list[int]): IDs of the controlled servos.
+        period_ms (int): Control period in milliseconds.
+        estimator (ServoPositionEstimator): Position estimator, None to read the real position every cycle.
+        max_error (int): Error estimate accepted when using the predicted position, in raw units.
+        cycles (int): Number of control cycles run.
+        overruns (int): Number of cycles whose computation and communication exceeded the control period.
+        deadline_misses (int): Number of cycles skipped because their deadline had passed.
+        max_cycle_us (int): Longest computation and communication time of one cycle, in microseconds.
+        last_cycle_us (int): Computation and communication time of the last cycle, in microseconds.
+        max_lateness_us (int): Largest delay of a cycle start after its deadline, in microseconds.
+        read_failures (int): Number of failed position reads.
+
+    Methods:
+        set_target(servo_id: int, angle: float) -> None:
+            Set the target angle of a servo.
+        set_target_raw(servo_id: int, position: int) -> None:
+            Set the target position of a servo in raw units.
+        set_gains(kp: float, ki: float, kd: float, kff: float) -> None:
+            Set the control gains.
+        state(servo_id: int) -> tuple:
+            Target, last read position and last commanded position of a servo.
+        start() -> None:
+            Start closed-loop control and run the first cycle immediately.
+        update() -> bool:
+            Run the due control cycle without blocking.
+        run(duration_ms: int = None) -> None:
+            Run closed-loop control, blocking.
+        stop() -> None:
+            Stop closed-loop control.
+        reset_stats() -> None:
+            Clear the loop timing and overrun statistics.
+    """
+
+    # 类变量：增益定点数的小数位数，Q8 表示增益乘以256后取整
+    GAIN_SHIFT = 8
+
+    def __init__(self, servo: SerialServo, servo_ids: list, period_ms: int = 20, kp: float = 0.5,
+                 ki: float = 0.1, kd: float = 0.0, kff: float = 0.0, integral_limit: int = 500,
+                 max_correction: int = 40, estimator=None, max_error: int = 2) -> None:
+        """
+        初始化闭环位置控制类，所有舵机的目标初始为未设置。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            servo_ids (list): 控制的舵机ID列表，ID范围0~253。
+            period_ms (int): 控制周期，单位毫秒，范围1~1000，默认20ms。
+            kp (float): 比例增益。
+            ki (float): 积分增益，每个控制周期累加一次误差。
+            kd (float): 微分增益，按相邻两个周期的误差之差计算。
+            kff (float): 前馈增益，按相邻两个周期的目标之差（目标速度）超前修正。
+            integral_limit (int): 误差积分的限幅，原始单位乘以周期数，防止积分饱和。
+            max_correction (int): 修正量的限幅，原始单位。
+            estimator (ServoPositionEstimator, optional): 位置估计类实例，None表示每个周期都读取真实位置。
+            max_error (int): 使用预测位置时可接受的误差估计，原始单位。
+
+        Raises:
+            ValueError: 如果舵机ID列表为空、ID超出范围、控制周期超出范围或限幅为负数，则抛出异常。
+
+        ==========================================
+
+        Initialize the closed-loop position controller; every target starts unset.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            servo_ids (list): IDs of the controlled servos, range 0~253.
+            period_ms (int): Control period in milliseconds, range 1~1000, 20 ms by default.
+            kp (float): Proportional gain.
+            ki (float): Integral gain; the error is accumulated once per control cycle.
+            kd (float): Derivative gain, applied to the error difference between two cycles.
+            kff (float): Feed-forward gain, applied to the target difference between two cycles (target velocity).
+            integral_limit (int): Clamp of the error integral in raw units times cycles, against windup.
+            max_correction (int): Clamp of the correction in raw units.
+            estimator (ServoPositionEstimator, optional): Position estimator, None to read the real position
+                                                          every cycle.
+            max_error (int): Error estimate accepted when using the predicted position, in raw units.
+
+        Raises:
+            ValueError: If the ID list is empty, an ID is out of range, the period is out of range, or a clamp
+                        is negative.
+        """
+        if len(servo_ids) == 0:
+            raise ValueError("Servo ID list must not be empty.")
+        for servo_id in servo_ids:
+            if servo_id < 0 or servo_id > 253:
+                raise ValueError("Servo ID must be in range 0~253.")
+        if period_ms < 1 or period_ms > 1000:
+            raise ValueError("Period must be in range 1~1000 ms.")
+        if integral_limit < 0 or max_correction < 0:
+            raise ValueError("Integral limit and max correction must not be negative.")
+
+        self.servo = servo
+        self.servo_ids = list(servo_ids)
+        self.period_ms = period_ms
+        self.estimator = estimator
+        self.max_error = max_error
+        self._integral_limit = integral_limit
+        self._max_correction = max_correction
+        self.set_gains(kp, ki, kd, kff)
+
+        count = len(self.servo_ids)
+        self._index = {}
+        for i in range(count):
+            self._index[self.servo_ids[i]] = i
+
+        # 每个舵机的控制状态：目标、上一周期的目标、最近读到的位置、最近发送的指令、误差积分和上一周期的误差
+        # 目标为-1表示尚未设置
+        self._targets = array('h', [-1] * count)
+        self._prev_targets = array('h', [0] * count)
+        self._positions = array('h', [-1] * count)
+        self._commands = array('h', [0] * count)
+        self._integral = array('i', [0] * count)
+        self._prev_errors = array('h', [0] * count)
+
+        # 预先构建一帧中所有舵机的立即转动数据包，转动时间等于控制周期，并记录校验和中与位置无关的部分
+        self._frame = bytearray(10 * count)
+        self._checksum_base = array('H', [0] * count)
+        for i in range(count):
+            packet = servo.build_packet(self.servo_ids[i], SerialServo.SERVO_MOVE_TIME_WRITE[0],
+                                        [0, 0, period_ms & 0xFF, (period_ms >> 8) & 0xFF])
+            self._frame[10 * i:10 * i + 10] = packet
+            self._checksum_base[i] = packet[2] + packet[3] + packet[4] + packet[7] + packet[8]
+
+        self._deadline = 0
+        self._running = False
+
+        # 统计数据
+        self.cycles = 0
+        self.read_failures = 0
+        self.reset_stats()
+
+    def _slot(self, servo_id: int) -> int:
+        """
+        获取舵机在控制状态数组中的序号。
+
+        ==========================================
+
+        Index of a servo in the control state arrays.
+        """
+        index = self._index.get(servo_id)
+        if index is None:
+            raise ValueError("Servo ID is not controlled.")
+        return index
+
+    def set_gains(self, kp: float, ki: float, kd: float, kff: float) -> None:
+        """
+        设置控制增益，转换为 Q8 定点数保存。
+
+        Args:
+            kp (float): 比例增益。
+            ki (float): 积分增益。
+            kd (float): 微分增益。
+            kff (float): 前馈增益。
+
+        ==========================================
+
+        Set the control gains, stored as Q8 fixed point.
+
+        Args:
+            kp (float): Proportional gain.
+            ki (float): Integral gain.
+            kd (float): Derivative gain.
+            kff (float): Feed-forward gain.
+        """
+        scale = 1 << ServoPositionController.GAIN_SHIFT
+        self._kp = int(kp * scale)
+        self._ki = int(ki * scale)
+        self._kd = int(kd * scale)
+        self._kff = int(kff * scale)
+
+    def set_target_raw(self, servo_id: int, position: int) -> None:
+        """
+        设置舵机的目标位置，控制运行时在下一个周期生效。
+
+        Args:
+            servo_id (int): 舵机ID。
+            position (int): 目标位置原始值，范围0~1000。
+
+        Raises:
+            ValueError: 如果舵机没有被控制，或位置超出范围，则抛出异常。
+
+        ==========================================
+
+        Set the target position of a servo; while running it takes effect in the next cycle.
+
+        Args:
+            servo_id (int): Servo ID.
+            position (int): Raw target position, range 0~1000.
+
+        Raises:
+            ValueError: If the servo is not controlled, or the position is out of range.
+        """
+        if position < 0 or position > 1000:
+            raise ValueError("Position must be in range 0~1000.")
+        i = self._slot(servo_id)
+        # 第一次设置目标时没有目标速度，前馈项从0开始
+        if self._targets[i] < 0:
+            self._prev_targets[i] = position
+        self._targets[i] = position
+
+    def set_target(self, servo_id: int, angle: float) -> None:
+        """
+        设置舵机的目标角度，控制运行时在下一个周期生效。
+
+        Args:
+            servo_id (int): 舵机ID。
+            angle (float): 目标角度，范围0~240度。
+
+        Raises:
+            ValueError: 如果舵机没有被控制，或角度超出范围，则抛出异常。
+
+        ==========================================
+
+        Set the target angle of a servo; while running it takes effect in the next cycle.
+
+        Args:
+            servo_id (int): Servo ID.
+            angle (float): Target angle, range 0~240 degrees.
+
+        Raises:
+            ValueError: If the servo is not controlled, or the angle is out of range.
+        """
+        if angle < 0 or angle > 240:
+            raise ValueError("Angle must be in range 0~240.")
+        self.set_target_raw(servo_id, int(angle / 0.24))
+
+    def state(self, servo_id: int) -> tuple:
+        """
+        获取舵机的控制状态。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            tuple: （目标位置，最近读到的位置，最近发送的指令位置），原始单位，尚未设置或读取时为-1。
+
+        Raises:
+            ValueError: 如果舵机没有被控制，则抛出异常。
+
+        ==========================================
+
+        Control state of a servo.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            tuple: (target, last read position, last commanded position) in raw units, -1 if not set or read yet.
+
+        Raises:
+            ValueError: If the servo is not controlled.
+        """
+        i = self._slot(servo_id)
+        command = self._commands[i] if self.cycles > 0 else -1
+        return self._targets[i], self._positions[i], command
+
+    def reset_stats(self) -> None:
+        """
+        清零循环计时和超时统计。
+
+        ==========================================
+
+        Clear the loop timing and overrun statistics.
+        """
+        self.overruns = 0
+        self.deadline_misses = 0
+        self.max_cycle_us = 0
+        self.last_cycle_us = 0
+        self.max_lateness_us = 0
+
+    def _read_position(self, servo_id: int) -> int:
+        """
+        读取舵机位置，有位置估计类时优先使用预测位置。
+
+        ==========================================
+
+        Read the position of a servo, preferring the prediction when an estimator is set.
+        """
+        if self.estimator is not None:
+            return self.estimator.get_position_raw(servo_id, self.max_error)
+        return self.servo.read_servo_position_raw(servo_id)
+
+    def _cycle(self) -> None:
+        """
+        运行一个控制周期：读取位置、计算修正量并发送所有舵机的指令。
+
+        ==========================================
+
+        Run one control cycle: read positions, compute corrections and send the moves of all servos.
+        """
+        shift = ServoPositionController.GAIN_SHIFT
+        kp = self._kp
+        ki = self._ki
+        kd = self._kd
+        kff = self._kff
+        limit = self._integral_limit
+        max_correction = self._max_correction
+        frame = self._frame
+        base = self._checksum_base
+        ids = self.servo_ids
+
+        for i in range(len(ids)):
+            target = self._targets[i]
+            position = self._read_position(ids[i])
+
+            if position is None:
+                # 读取失败时保持上一周期的指令，不更新积分和微分
+                self.read_failures += 1
+                command = self._commands[i] if self.cycles > 0 else target
+            else:
+                self._positions[i] = position
+                error = target - position
+
+                # 误差积分限幅，防止积分饱和
+                integral = self._integral[i] + error
+                if integral > limit:
+                    integral = limit
+                elif integral < -limit:
+                    integral = -limit
+
+                rest = kp * error + kd * (error - self._prev_errors[i]) + kff * (target - self._prev_targets[i])
+                correction = (rest + ki * integral) >> shift
+                # 条件积分：修正量已经饱和且误差仍在推动其继续增大时不累加积分，避免饱和期间积累的积分造成超调
+                if (correction > max_correction and error > 0) or (correction < -max_correction and error < 0):
+                    integral = self._integral[i]
+                    correction = (rest + ki * integral) >> shift
+                self._integral[i] = integral
+                self._prev_errors[i] = error
+
+                if correction > max_correction:
+                    correction = max_correction
+                elif correction < -max_correction:
+                    correction = -max_correction
+
+                command = target + correction
+                if command < 0:
+                    command = 0
+                elif command > 1000:
+                    command = 1000
+
+            self._prev_targets[i] = target
+            self._commands[i] = command
+
+            # 修改缓冲区中的位置字节和校验和
+            low = command & 0xFF
+            high = command >> 8
+            offset = 10 * i
+            frame[offset + 5] = low
+            frame[offset + 6] = high
+            frame[offset + 9] = ~(base[i] + low + high) & 0xFF
+
+        self.servo.write_packet(frame)
+
+        # 告知位置估计类新的转动指令
+        if self.estimator is not None:
+            for i in range(len(ids)):
+                self.estimator.note_move(ids[i], self._commands[i], self.period_ms)
+
+        self.cycles += 1
+
+    def start(self) -> None:
+        """
+        开始闭环控制，清零积分并立即运行第一个周期。
+
+        Raises:
+            ValueError: 如果有舵机尚未设置目标，则抛出异常。
+
+        ==========================================
+
+        Start closed-loop control, clear the integrals and run the first cycle immediately.
+
+        Raises:
+            ValueError: If a servo has no target yet.
+        """
+        for i in range(len(self.servo_ids)):
+            if self._targets[i] < 0:
+                raise ValueError("Every servo must have a target before start.")
+            self._integral[i] = 0
+            self._prev_errors[i] = 0
+            self._prev_targets[i] = self._targets[i]
+
+        # 控制类直接写入数据包，写入合并的影子状态不再可信
+        for servo_id in self.servo_ids:
+            self.servo.invalidate_shadow(servo_id)
+
+        self.reset_stats()
+        self._deadline = time.ticks_us()
+        self._running = True
+        self.update()
+
+    def update(self) -> bool:
+        """
+        非阻塞地运行到期的控制周期。
+
+        如果当前时间已经超过截止时间一个控制周期以上，跳过过期的周期并计入截止时间错过次数。
+
+        Returns:
+            bool: 控制仍在运行时返回True，停止后返回False。
+
+        ==========================================
+
+        Run the due control cycle without blocking.
+
+        If the current time is more than one control period past the deadline, stale cycles are skipped and
+        counted as deadline misses.
+
+        Returns:
+            bool: True while control is running, False once it has stopped.
+        """
+        if not self._running:
+            return False
+
+        start = time.ticks_us()
+        late = time.ticks_diff(start, self._deadline)
+        if late < 0:
+            return True
+
+        period_us = self.period_ms * 1000
+        # 跳过已经过期的周期，截止时间与控制周期保持对齐
+        if late >= period_us:
+            skipped = late // period_us
+            self.deadline_misses += skipped
+            self._deadline = time.ticks_add(self._deadline, skipped * period_us)
+            late -= skipped * period_us
+        if late > self.max_lateness_us:
+            self.max_lateness_us = late
+
+        self._cycle()
+        self._deadline = time.ticks_add(self._deadline, period_us)
+
+        # 记录本周期的计算和通信时间
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        self.last_cycle_us = elapsed
+        if elapsed > self.max_cycle_us:
+            self.max_cycle_us = elapsed
+        if elapsed > period_us:
+            self.overruns += 1
+        return True
+
+    def run(self, duration_ms: int = None) -> None:
+        """
+        阻塞地运行闭环控制，直到调用 stop() 或运行时间到达 duration_ms。
+
+        Args:
+            duration_ms (int, optional): 运行时间，单位毫秒，None表示一直运行。
+
+        ==========================================
+
+        Run closed-loop control, blocking until stop() is called or duration_ms has elapsed.
+
+        Args:
+            duration_ms (int, optional): Run time in milliseconds, None to run until stopped.
+        """
+        begin = time.ticks_ms()
+        self.start()
+        while self._running:
+            if duration_ms is not None and time.ticks_diff(time.ticks_ms(), begin) >= duration_ms:
+                self._running = False
+                break
+            wait = time.ticks_diff(self._deadline, time.ticks_us())
+            if wait > 1000:
+                time.sleep_ms(wait // 1000)
+            self.update()
+
+    def stop(self) -> None:
+        """
+        停止闭环控制，舵机保持在最后一次发送的指令位置。
+
+        ==========================================
+
+        Stop closed-loop control; the servos hold the last commanded position.
+        """
+        self._running = False
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
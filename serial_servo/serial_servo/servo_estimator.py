@@ -0,0 +1,512 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/24 上午9:15
+# @Author  : 李清水
+# @File    : servo_estimator.py
+# @Description : 串口舵机位置估计类，根据最近一次立即转动指令的目标、时间和开始时刻预测舵机当前位置，
+#                由偶尔的真实位置读取校正，并给出误差估计，控制器可以据此跳过总线读取
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 数组模块，用于紧凑地保存每个舵机的运动模型
+from array import array
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机位置估计类
+class ServoPositionEstimator:
+    """
+    串口舵机位置估计类。
+
+    控制器每个周期调用 `read_servo_position` 只是为了知道舵机在运动中的位置，每个舵机都要付出一次完整的总线往返。
+    该类为每个舵机保存一个运动模型：最近一次立即转动的起点、目标、开始时刻和转动时间，按线性插值预测当前位置
+    （全部使用整数运算，单位为原始位置单位，每单位0.24度）。
+
+    误差估计由两部分组成：
+    - 残差：每次真实读取时预测值与读数之差的指数平均，反映负载、滞后或堵转等模型没有描述的偏差；
+    - 运动误差：自上次校正以来，随运动时间按 `drift_percent` 增长（舵机实际速度与指令速度的偏差），
+      运动中途发出新指令时起点的误差一并带入；运动结束 `settle_ms` 毫秒后视为已到位，不再计入。
+
+    每次读取都会把模型重新锚定到读数上。`get_position_raw(servo_id, max_error)` 在误差估计不超过 `max_error` 时
+    直接返回预测值，否则读取一次真实位置，调用者据此选择开销最低的路径。其他来源（遥测轮询、第二核工作类等）
+    读到的位置可以通过 `observe()` 输入，其他途径发送的转动指令可以通过 `note_move()` 告知模型。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例。
+        servo_ids (list[int]): 估计位置的舵机ID列表。
+        drift_percent (int): 运动中误差估计的增长率，占指令速度的百分比。
+        settle_ms (int): 运动结束后舵机到位所需的时间，单位毫秒。
+        predictions (int): 直接返回预测值的次数。
+        reads (int): 读取真实位置的次数。
+
+    Methods:
+        move(servo_id: int, position: int, time_ms: int) -> None:
+            发送立即转动指令并更新模型。
+        note_move(servo_id: int, position: int, time_ms: int) -> None:
+            告知模型其他途径发送的立即转动指令。
+        observe(servo_id: int, position: int) -> None:
+            用一次真实位置读数校正模型。
+        correct(servo_id: int) -> int:
+            读取真实位置并校正模型。
+        predict_raw(servo_id: int) -> int:
+            预测当前位置（原始单位）。
+        error_raw(servo_id: int) -> int:
+            当前预测的误差估计（原始单位）。
+        get_position_raw(servo_id: int, max_error: int = 4) -> int:
+            误差估计足够小时返回预测值，否则读取真实位置。
+        get_position(servo_id: int, max_error: float = 1.0) -> float:
+            以度为单位的 get_position_raw。
+
+    ==========================================
+
+    Model-based position estimator for serial servos.
+
+    Controllers call `read_servo_position` every cycle only to know where a servo is mid-move, which costs a full
+    bus round trip per servo. This class keeps a motion model per servo: start, target, start time and duration of
+    the last immediate move, and predicts the current position by linear interpolation (integer math only, in raw
+    position units of 0.24 degrees).
+
+    The error estimate has two parts:
+    - Residual: exponential average of the difference between prediction and reading at every real read; it covers
+      load, lag or stalls that the model does not describe.
+    - Motion error: grows with the time moved since the last correction by `drift_percent` of the commanded speed
+      (how far the real speed may differ from it), carries the error of the start point when a new move begins
+      mid-move, and is dropped `settle_ms` milliseconds after the move ends.
+
+    Every read re-anchors the model on the reading. `get_position_raw(servo_id, max_error)` returns the prediction
+    while the error estimate is within `max_error` and reads the real position otherwise, so callers can pick the
+    cheap path. Positions read elsewhere (telemetry poller, second-core worker, ...) can be fed with `observe()`, and
+    moves sent by other means announced with `note_move()`.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance.
+        servo_ids (list[int]): IDs of the servos being estimated.
+        drift_percent (int): Growth rate of the error estimate while moving, in percent of the commanded speed.
+        settle_ms (int): Time a servo needs to settle after a move ends, in milliseconds.
+        predictions (int): Number of times the prediction was returned.
+        reads (int): Number of real position reads.
+
+    Methods:
+        move(servo_id: int, position: int, time_ms: int) -> None:
+            Send an immediate move and update the model.
+        note_move(servo_id: int, position: int, time_ms: int) -> None:
+            Tell the model about an immediate move sent by other means.
+        observe(servo_id: int, position: int) -> None:
+            Correct the model with one real position reading.
+        correct(servo_id: int) -> int:
+            Read the real position and correct the model.
+        predict_raw(servo_id: int) -> int:
+            Predicted current position in raw units.
+        error_raw(servo_id: int) -> int:
+            Error estimate of the current prediction in raw units.
+        get_position_raw(servo_id: int, max_error: int = 4) -> int:
+            Prediction when the error estimate is small enough, otherwise a real read.
+        get_position(servo_id: int, max_error: float = 1.0) -> float:
+            get_position_raw in degrees.
+    """
+
+    # 类变量：位置未知时的误差估计，等于整个位置范围
+    UNKNOWN_ERROR = 1000
+
+    def __init__(self, servo: SerialServo, servo_ids: list, drift_percent: int = 25, settle_ms: int = 100) -> None:
+        """
+        初始化位置估计类，所有舵机的位置初始为未知。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            servo_ids (list): 估计位置的舵机ID列表，ID范围0~253。
+            drift_percent (int): 运动中误差估计的增长率，占指令速度的百分比，范围0~100。
+            settle_ms (int): 运动结束后舵机到位所需的时间，单位毫秒。
+
+        Raises:
+            ValueError: 如果舵机ID列表为空、ID超出范围或参数超出范围，则抛出异常。
+
+        ==========================================
+
+        Initialize the position estimator; every position starts unknown.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            servo_ids (list): IDs of the servos to estimate, range 0~253.
+            drift_percent (int): Growth rate of the error estimate while moving, in percent of the commanded
+                                 speed, range 0~100.
+            settle_ms (int): Time a servo needs to settle after a move ends, in milliseconds.
+
+        Raises:
+            ValueError: If the ID list is empty, an ID is out of range, or a parameter is out of range.
+        """
+        if len(servo_ids) == 0:
+            raise ValueError("Servo ID list must not be empty.")
+        for servo_id in servo_ids:
+            if servo_id < 0 or servo_id > 253:
+                raise ValueError("Servo ID must be in range 0~253.")
+        if drift_percent < 0 or drift_percent > 100:
+            raise ValueError("Drift percent must be in range 0~100.")
+        if settle_ms < 0:
+            raise ValueError("Settle time must not be negative.")
+
+        self.servo = servo
+        self.servo_ids = list(servo_ids)
+        self.drift_percent = drift_percent
+        self.settle_ms = settle_ms
+
+        count = len(self.servo_ids)
+        self._index = {}
+        for i in range(count):
+            self._index[self.servo_ids[i]] = i
+
+        # 运动模型：锚点位置、目标位置、锚点时刻、锚点到运动结束的时间、残差和锚点是否来自真实读数
+        self._anchor = array('i', [0] * count)
+        self._target = array('i', [0] * count)
+        self._anchor_ms = array('i', [0] * count)
+        self._duration = array('i', [0] * count)
+        self._residual = array('i', [ServoPositionEstimator.UNKNOWN_ERROR] * count)
+        self._start_error = array('i', [0] * count)
+        self._measured = bytearray(count)
+
+        # 统计数据
+        self.predictions = 0
+        self.reads = 0
+
+    def _slot(self, servo_id: int) -> int:
+        """
+        获取舵机在模型数组中的序号。
+
+        ==========================================
+
+        Index of a servo in the model arrays.
+        """
+        index = self._index.get(servo_id)
+        if index is None:
+            raise ValueError("Servo ID is not estimated.")
+        return index
+
+    def note_move(self, servo_id: int, position: int, time_ms: int) -> None:
+        """
+        告知模型一条已经发送的立即转动指令，起点为当前的预测位置。
+
+        Args:
+            servo_id (int): 舵机ID。
+            position (int): 目标位置原始值，范围0~1000。
+            time_ms (int): 转动时间，单位毫秒，范围0~30000。
+
+        Raises:
+            ValueError: 如果舵机没有被估计，或位置、时间超出范围，则抛出异常。
+
+        ==========================================
+
+        Tell the model about an immediate move that has been sent; it starts from the current prediction.
+
+        Args:
+            servo_id (int): Servo ID.
+            position (int): Raw target position, range 0~1000.
+            time_ms (int): Move time in milliseconds, range 0~30000.
+
+        Raises:
+            ValueError: If the servo is not estimated, or the position or time is out of range.
+        """
+        if position < 0 or position > 1000:
+            raise ValueError("Position must be in range 0~1000.")
+        if time_ms < 0 or time_ms > 30000:
+            raise ValueError("Time must be in range 0~30000 ms.")
+
+        i = self._slot(servo_id)
+        now = time.ticks_ms()
+        if self._measured[i]:
+            # 以当前预测位置为新的起点，起点的运动误差带入新的运动，到位后不再计入
+            start = self._predict(i, now)
+            self._start_error[i] = self._motion_error(i, now)
+        else:
+            # 位置未知：起点未知，误差保持为整个位置范围，直到第一次读取
+            start = position
+
+        self._anchor[i] = start
+        self._target[i] = position
+        self._anchor_ms[i] = now
+        self._duration[i] = time_ms
+
+    def move(self, servo_id: int, position: int, time_ms: int) -> None:
+        """
+        发送立即转动指令（原始位置单位）并更新模型。
+
+        Args:
+            servo_id (int): 舵机ID。
+            position (int): 目标位置原始值，范围0~1000。
+            time_ms (int): 转动时间，单位毫秒，范围0~30000。
+
+        Raises:
+            ValueError: 如果舵机没有被估计，或位置、时间超出范围，则抛出异常。
+
+        ==========================================
+
+        Send an immediate move in raw position units and update the model.
+
+        Args:
+            servo_id (int): Servo ID.
+            position (int): Raw target position, range 0~1000.
+            time_ms (int): Move time in milliseconds, range 0~30000.
+
+        Raises:
+            ValueError: If the servo is not estimated, or the position or time is out of range.
+        """
+        self._slot(servo_id)
+        self.servo.move_servo_immediate_raw(servo_id, position, time_ms)
+        self.note_move(servo_id, position, time_ms)
+
+    def _predict(self, i: int, now: int) -> int:
+        """
+        按线性插值预测第 i 个舵机在 now 时刻的位置。
+
+        ==========================================
+
+        Predict the position of the i-th servo at time now by linear interpolation.
+        """
+        duration = self._duration[i]
+        elapsed = time.ticks_diff(now, self._anchor_ms[i])
+        if elapsed >= duration:
+            return self._target[i]
+        if elapsed <= 0:
+            return self._anchor[i]
+        anchor = self._anchor[i]
+        return anchor + (self._target[i] - anchor) * elapsed // duration
+
+    def _motion_error(self, i: int, now: int) -> int:
+        """
+        计算第 i 个舵机自上次校正以来的运动误差。
+
+        ==========================================
+
+        Motion error of the i-th servo since the last correction.
+        """
+        duration = self._duration[i]
+        elapsed = time.ticks_diff(now, self._anchor_ms[i])
+        # 运动结束并到位后不再计入运动误差
+        if elapsed >= duration + self.settle_ms:
+            return 0
+        error = self._start_error[i]
+        if elapsed > duration:
+            elapsed = duration
+        if elapsed > 0:
+            distance = abs(self._target[i] - self._anchor[i])
+            error += distance * elapsed * self.drift_percent // (duration * 100)
+        return error
+
+    def observe(self, servo_id: int, position: int) -> None:
+        """
+        用一次真实位置读数校正模型：更新残差，并把模型重新锚定到读数上。
+
+        Args:
+            servo_id (int): 舵机ID。
+            position (int): 读到的位置原始值。
+
+        Raises:
+            ValueError: 如果舵机没有被估计，则抛出异常。
+
+        ==========================================
+
+        Correct the model with one real position reading: update the residual and re-anchor the model on it.
+
+        Args:
+            servo_id (int): Servo ID.
+            position (int): Raw position that was read.
+
+        Raises:
+            ValueError: If the servo is not estimated.
+        """
+        i = self._slot(servo_id)
+        now = time.ticks_ms()
+        residual = abs(position - self._predict(i, now))
+
+        if self._measured[i]:
+            # 残差取指数平均，权重1/4
+            self._residual[i] = (3 * self._residual[i] + residual) // 4
+        else:
+            # 第一次读数：起点未知，残差从0开始
+            self._residual[i] = 0
+            self._measured[i] = 1
+
+        # 锚定到读数，剩余的转动时间不变；运动已经结束但尚未到位时，假设在 settle_ms 内到达目标
+        remaining = time.ticks_diff(time.ticks_add(self._anchor_ms[i], self._duration[i]), now)
+        if remaining <= 0:
+            remaining = self.settle_ms if position != self._target[i] else 0
+        self._anchor[i] = position
+        self._anchor_ms[i] = now
+        self._duration[i] = remaining
+        self._start_error[i] = 0
+
+    def correct(self, servo_id: int) -> int:
+        """
+        读取舵机的真实位置并校正模型。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 读到的位置原始值，读取失败时返回None。
+
+        Raises:
+            ValueError: 如果舵机没有被估计，则抛出异常。
+
+        ==========================================
+
+        Read the real position of a servo and correct the model.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            int: Raw position read, or None if the read failed.
+
+        Raises:
+            ValueError: If the servo is not estimated.
+        """
+        self._slot(servo_id)
+        self.reads += 1
+        position = self.servo.read_servo_position_raw(servo_id)
+        if position is not None:
+            self.observe(servo_id, position)
+        return position
+
+    def predict_raw(self, servo_id: int) -> int:
+        """
+        预测舵机当前的位置。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 预测位置原始值，位置未知时返回None。
+
+        Raises:
+            ValueError: 如果舵机没有被估计，则抛出异常。
+
+        ==========================================
+
+        Predict the current position of a servo.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            int: Predicted raw position, or None if the position is unknown.
+
+        Raises:
+            ValueError: If the servo is not estimated.
+        """
+        i = self._slot(servo_id)
+        if not self._measured[i]:
+            return None
+        return self._predict(i, time.ticks_ms())
+
+    def error_raw(self, servo_id: int) -> int:
+        """
+        获取当前预测的误差估计。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 误差估计（原始单位），位置未知时返回 UNKNOWN_ERROR。
+
+        Raises:
+            ValueError: 如果舵机没有被估计，则抛出异常。
+
+        ==========================================
+
+        Error estimate of the current prediction.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            int: Error estimate in raw units, UNKNOWN_ERROR if the position is unknown.
+
+        Raises:
+            ValueError: If the servo is not estimated.
+        """
+        i = self._slot(servo_id)
+        if not self._measured[i]:
+            return ServoPositionEstimator.UNKNOWN_ERROR
+        return self._residual[i] + self._motion_error(i, time.ticks_ms())
+
+    def get_position_raw(self, servo_id: int, max_error: int = 4) -> int:
+        """
+        误差估计不超过 max_error 时直接返回预测位置，否则读取一次真实位置并校正模型。
+
+        Args:
+            servo_id (int): 舵机ID。
+            max_error (int): 可接受的误差，原始单位，默认4（约1度）。
+
+        Returns:
+            int: 位置原始值，需要读取但读取失败时返回None。
+
+        Raises:
+            ValueError: 如果舵机没有被估计，则抛出异常。
+
+        ==========================================
+
+        Return the predicted position while its error estimate is within max_error, otherwise read the real
+        position once and correct the model.
+
+        Args:
+            servo_id (int): Servo ID.
+            max_error (int): Acceptable error in raw units, default 4 (about 1 degree).
+
+        Returns:
+            int: Raw position, or None if a read was needed and failed.
+
+        Raises:
+            ValueError: If the servo is not estimated.
+        """
+        i = self._slot(servo_id)
+        if self._measured[i]:
+            now = time.ticks_ms()
+            if self._residual[i] + self._motion_error(i, now) <= max_error:
+                self.predictions += 1
+                return self._predict(i, now)
+        return self.correct(servo_id)
+
+    def get_position(self, servo_id: int, max_error: float = 1.0) -> float:
+        """
+        以度为单位的 get_position_raw。
+
+        Args:
+            servo_id (int): 舵机ID。
+            max_error (float): 可接受的误差，单位为度，默认1度。
+
+        Returns:
+            float: 位置（单位为度），需要读取但读取失败时返回None。
+
+        Raises:
+            ValueError: 如果舵机没有被估计，则抛出异常。
+
+        ==========================================
+
+        get_position_raw in degrees.
+
+        Args:
+            servo_id (int): Servo ID.
+            max_error (float): Acceptable error in degrees, default 1 degree.
+
+        Returns:
+            float: Position in degrees, or None if a read was needed and failed.
+
+        Raises:
+            ValueError: If the servo is not estimated.
+        """
+        position = self.get_position_raw(servo_id, int(max_error / 0.24))
+        if position is None:
+            return None
+        return position * 0.24
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,395 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/20 上午10:15
+# @Author  : 李清水
+# @File    : servo_metrics.py
+# @Description : 串口舵机通信统计类，按舵机和指令统计发送、回复、超时、帧头/长度错误和校验和错误次数及回复延迟分布
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 数组模块，用于紧凑地保存计数
+from array import array
+# 导入串口舵机驱动类，使用其读取指令集合
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机通信统计类
+class ServoMetrics:
+    """
+    串口舵机通信统计类。
+
+    将实例传给 `SerialServo(uart, metrics=...)` 或赋值给 `servo.metrics` 后启用统计，默认不启用时驱动只多一次
+    属性判断。所有经过 `write_packet` 发送的数据包（包括遥测轮询、轨迹和动作组的直接发送）按舵机ID和指令编号
+    计数；读取指令的回复按结果分为成功、超时、帧头错误（帧头或指令编号不符）、长度错误和校验和错误，
+    成功回复的延迟计入直方图。每个实例记录一路总线上未完成的读取请求，多路总线应各自使用一个实例。
+
+    Attributes:
+        enabled (bool): 是否记录统计数据，可以临时关闭。
+
+    Methods:
+        counters(servo_id=None, cmd=None) -> dict:
+            获取匹配的舵机和指令的计数之和。
+        histogram(servo_id=None, cmd=None) -> list:
+            获取匹配的舵机和指令的延迟直方图。
+        latency_percentile(p: float, servo_id=None, cmd=None) -> int:
+            根据直方图估算延迟百分位数。
+        report() -> dict:
+            获取按舵机和指令划分的全部统计数据。
+        reset() -> None:
+            清空统计数据。
+
+    ==========================================
+
+    Serial servo communication metrics.
+
+    Pass an instance as `SerialServo(uart, metrics=...)` or assign it to `servo.metrics` to enable it; when disabled
+    the driver only pays one attribute check. Every packet sent through `write_packet` (including the direct sends
+    of the telemetry poller, trajectories and action playback) is counted per servo ID and command; replies to read
+    commands are classified as success, timeout, header error (wrong header or command ID), length error or checksum
+    error, and the latency of successful replies goes into a histogram. An instance tracks the read in flight on one
+    bus, so every bus needs its own instance.
+
+    Attributes:
+        enabled (bool): Whether metrics are recorded; can be switched off temporarily.
+
+    Methods:
+        counters(servo_id=None, cmd=None) -> dict:
+            Sum of the counters of matching servos and commands.
+        histogram(servo_id=None, cmd=None) -> list:
+            Latency histogram of matching servos and commands.
+        latency_percentile(p: float, servo_id=None, cmd=None) -> int:
+            Estimate a latency percentile from the histogram.
+        report() -> dict:
+            All metrics split by servo and command.
+        reset() -> None:
+            Clear all metrics.
+    """
+
+    # 类变量：计数项名称，与计数数组中的位置对应
+    COUNTERS = ("sent", "replies", "timeouts", "header_errors", "length_errors", "checksum_errors")
+    # 计数项在数组中的位置
+    SENT = 0
+    REPLIES = 1
+    TIMEOUTS = 2
+    HEADER_ERRORS = 3
+    LENGTH_ERRORS = 4
+    CHECKSUM_ERRORS = 5
+
+    # 类变量：延迟直方图各区间的上限，单位微秒，最后一个区间统计超过最大上限的回复
+    LATENCY_BOUNDS_US = (500, 1000, 2000, 3000, 5000, 10000, 20000)
+
+    def __init__(self) -> None:
+        """
+        初始化通信统计类。
+
+        ==========================================
+
+        Initialize the communication metrics.
+        """
+        self.enabled = True
+        # (舵机ID << 8) | 指令编号 -> 计数数组（计数项 + 直方图各区间）
+        self._stats = {}
+        self._size = len(ServoMetrics.COUNTERS) + len(ServoMetrics.LATENCY_BOUNDS_US) + 1
+        # 未完成的读取请求及其发送时间
+        self._pending = -1
+        self._pending_start = 0
+
+    def _entry(self, key: int):
+        """
+        获取指定键的计数数组，不存在时创建。
+
+        ==========================================
+
+        Get the counter array of a key, creating it if needed.
+        """
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = array('I', [0] * self._size)
+            self._stats[key] = entry
+        return entry
+
+    def record_send(self, packet) -> None:
+        """
+        记录一次写入的数据包（可以是多个数据包合并的一段数据）。
+
+        只有一个读取请求的写入会被跟踪延迟，合并发送的多个读取请求只计数。
+
+        Args:
+            packet (bytes | bytearray | memoryview): 写入的数据。
+
+        ==========================================
+
+        Record one write (possibly several packets in one burst).
+
+        Only a write with exactly one read request is tracked for latency; bursts of reads are only counted.
+
+        Args:
+            packet (bytes | bytearray | memoryview): Written data.
+        """
+        if not self.enabled:
+            return
+
+        reads = 0
+        read_key = -1
+        i = 0
+        size = len(packet)
+        while i + 5 <= size:
+            key = (packet[i + 2] << 8) | packet[i + 4]
+            self._entry(key)[ServoMetrics.SENT] += 1
+            if packet[i + 4] in SerialServo.READ_COMMANDS:
+                reads += 1
+                read_key = key
+            i += packet[i + 3] + 3
+
+        if reads == 1:
+            self._pending = read_key
+            self._pending_start = time.ticks_us()
+        elif reads > 1:
+            self._pending = -1
+
+    def _resolve(self, index: int) -> None:
+        """
+        按结果结束未完成的读取请求。
+
+        ==========================================
+
+        Finish the read in flight with the given outcome.
+        """
+        if not self.enabled or self._pending < 0:
+            return
+        entry = self._entry(self._pending)
+        entry[index] += 1
+
+        if index == ServoMetrics.REPLIES:
+            latency = time.ticks_diff(time.ticks_us(), self._pending_start)
+            bucket = 0
+            bounds = ServoMetrics.LATENCY_BOUNDS_US
+            while bucket < len(bounds) and latency > bounds[bucket]:
+                bucket += 1
+            entry[len(ServoMetrics.COUNTERS) + bucket] += 1
+
+        self._pending = -1
+
+    def record_reply(self) -> None:
+        """
+        记录未完成的读取请求收到了有效回复。
+
+        ==========================================
+
+        Record a valid reply to the read in flight.
+        """
+        self._resolve(ServoMetrics.REPLIES)
+
+    def record_timeout(self) -> None:
+        """
+        记录未完成的读取请求没有收到回复。
+
+        ==========================================
+
+        Record that the read in flight got no reply.
+        """
+        self._resolve(ServoMetrics.TIMEOUTS)
+
+    def record_header_error(self) -> None:
+        """
+        记录回复的帧头或指令编号错误。
+
+        ==========================================
+
+        Record a reply with a wrong header or command ID.
+        """
+        self._resolve(ServoMetrics.HEADER_ERRORS)
+
+    def record_length_error(self) -> None:
+        """
+        记录回复不完整或数据长度错误。
+
+        ==========================================
+
+        Record a truncated reply or one with a wrong data length.
+        """
+        self._resolve(ServoMetrics.LENGTH_ERRORS)
+
+    def record_checksum_error(self) -> None:
+        """
+        记录回复的校验和错误。
+
+        ==========================================
+
+        Record a reply with a wrong checksum.
+        """
+        self._resolve(ServoMetrics.CHECKSUM_ERRORS)
+
+    def record_flush(self) -> None:
+        """
+        清空接收缓冲区时，仍未完成的读取请求记为超时。
+
+        ==========================================
+
+        When the receive buffer is flushed, a read still in flight counts as a timeout.
+        """
+        self._resolve(ServoMetrics.TIMEOUTS)
+
+    def _matching(self, servo_id, cmd):
+        """
+        遍历匹配舵机ID和指令编号的计数数组。
+
+        ==========================================
+
+        Iterate over the counter arrays matching the servo ID and command.
+        """
+        for key, entry in self._stats.items():
+            if servo_id is not None and (key >> 8) != servo_id:
+                continue
+            if cmd is not None and (key & 0xFF) != cmd:
+                continue
+            yield entry
+
+    def counters(self, servo_id: int = None, cmd: int = None) -> dict:
+        """
+        获取匹配的舵机和指令的计数之和。
+
+        Args:
+            servo_id (int, optional): 舵机ID，None表示所有舵机。
+            cmd (int, optional): 指令编号，None表示所有指令。
+
+        Returns:
+            dict: 计数项名称 -> 计数。
+
+        ==========================================
+
+        Sum of the counters of matching servos and commands.
+
+        Args:
+            servo_id (int, optional): Servo ID, None means every servo.
+            cmd (int, optional): Command ID, None means every command.
+
+        Returns:
+            dict: Counter name -> count.
+        """
+        totals = [0] * len(ServoMetrics.COUNTERS)
+        for entry in self._matching(servo_id, cmd):
+            for i in range(len(totals)):
+                totals[i] += entry[i]
+        return dict(zip(ServoMetrics.COUNTERS, totals))
+
+    def histogram(self, servo_id: int = None, cmd: int = None) -> list:
+        """
+        获取匹配的舵机和指令的延迟直方图。
+
+        Args:
+            servo_id (int, optional): 舵机ID，None表示所有舵机。
+            cmd (int, optional): 指令编号，None表示所有指令。
+
+        Returns:
+            list: 各区间的回复数量，区间上限见 LATENCY_BOUNDS_US，最后一项为超过最大上限的数量。
+
+        ==========================================
+
+        Latency histogram of matching servos and commands.
+
+        Args:
+            servo_id (int, optional): Servo ID, None means every servo.
+            cmd (int, optional): Command ID, None means every command.
+
+        Returns:
+            list: Reply count per bucket; bucket bounds are LATENCY_BOUNDS_US, the last item counts replies above them.
+        """
+        offset = len(ServoMetrics.COUNTERS)
+        totals = [0] * (len(ServoMetrics.LATENCY_BOUNDS_US) + 1)
+        for entry in self._matching(servo_id, cmd):
+            for i in range(len(totals)):
+                totals[i] += entry[offset + i]
+        return totals
+
+    def latency_percentile(self, p: float, servo_id: int = None, cmd: int = None) -> int:
+        """
+        根据直方图估算延迟百分位数，返回所在区间的上限。
+
+        Args:
+            p (float): 百分位，范围0~100。
+            servo_id (int, optional): 舵机ID，None表示所有舵机。
+            cmd (int, optional): 指令编号，None表示所有指令。
+
+        Returns:
+            int: 延迟上限，单位微秒；没有回复时返回0，落在最后一个区间时返回-1。
+
+        Raises:
+            ValueError: 如果百分位不在0~100范围内，则抛出异常。
+
+        ==========================================
+
+        Estimate a latency percentile from the histogram as the upper bound of its bucket.
+
+        Args:
+            p (float): Percentile, range 0~100.
+            servo_id (int, optional): Servo ID, None means every servo.
+            cmd (int, optional): Command ID, None means every command.
+
+        Returns:
+            int: Latency bound in microseconds; 0 without replies, -1 if it falls into the last bucket.
+
+        Raises:
+            ValueError: If the percentile is not in the range 0~100.
+        """
+        if p < 0 or p > 100:
+            raise ValueError("Percentile must be in range 0~100.")
+
+        counts = self.histogram(servo_id, cmd)
+        total = sum(counts)
+        if total == 0:
+            return 0
+
+        threshold = total * p / 100
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= threshold and count > 0:
+                if i < len(ServoMetrics.LATENCY_BOUNDS_US):
+                    return ServoMetrics.LATENCY_BOUNDS_US[i]
+                return -1
+        return -1
+
+    def report(self) -> dict:
+        """
+        获取按舵机和指令划分的全部统计数据。
+
+        Returns:
+            dict: 舵机ID -> {指令编号 -> 计数项名称 -> 计数，以及 "latency" -> 延迟直方图}。
+
+        ==========================================
+
+        All metrics split by servo and command.
+
+        Returns:
+            dict: Servo ID -> {command ID -> counter name -> count, plus "latency" -> latency histogram}.
+        """
+        offset = len(ServoMetrics.COUNTERS)
+        result = {}
+        for key, entry in self._stats.items():
+            item = dict(zip(ServoMetrics.COUNTERS, entry[:offset]))
+            item["latency"] = list(entry[offset:])
+            result.setdefault(key >> 8, {})[key & 0xFF] = item
+        return result
+
+    def reset(self) -> None:
+        """
+        清空统计数据。
+
+        ==========================================
+
+        Clear all metrics.
+        """
+        self._stats.clear()
+        self._pending = -1
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,374 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/25 上午10:40
+# @Author  : 李清水
+# @File    : servo_provision.py
+# @Description : 串口舵机批量配置类，按配置模板读取多个舵机的当前配置，只写入与模板不同的配置项并回读确认
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+# 导入多串口舵机总线管理类，用于交错读取
+from .servo_bus import ServoBusManager
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机批量配置类
+class ServoProvisioner:
+    """
+    串口舵机批量配置类。
+
+    为一批舵机设置角度限位、偏差、电压范围、温度上限和工作模式时，逐个调用设置和读取方法需要对每个舵机进行几十次串口通信，
+    而且无法跳过已经正确的配置项。该类接收一个配置模板（可以按舵机ID单独覆盖部分配置项），按以下步骤完成配置：
+
+    1. 将模板中的每个配置项编码为写入参数（配置写入命令的参数与对应读取命令返回的参数格式一致）；
+    2. 只读取模板中出现的配置项，每个配置项对所有舵机执行一次交错读取（多路总线时各路总线同时收发），
+       不读取不需要的配置项；
+    3. 逐字节比较读到的参数和期望的参数，只发送不同的写入命令；
+    4. 等待舵机保存配置后，只回读写入过的配置项进行确认；
+    5. 返回每个舵机每个配置项的结果；读取失败的舵机不写入。
+
+    配置值使用原始单位：`angle_offset` 为偏差单位（-125~125），`angle_range` 为（最小位置，最大位置）（0~1000），
+    `vin_range` 为（最小毫伏，最大毫伏），`temp_range` 为最高温度（℃），`mode_and_speed` 为（模式，速度），
+    `led_alarm` 为报警代码（0~7）。
+
+    Attributes:
+        bus (ServoBusManager): 多串口舵机总线管理类实例，传入单个 SerialServo 时自动创建。
+        settle_ms (int): 写入后到回读确认前的等待时间，单位毫秒。
+        reads (int): 最近一次配置发送的读取请求数量。
+        writes (int): 最近一次配置发送的写入命令数量。
+        elapsed_ms (int): 最近一次配置所用时间，单位毫秒。
+
+    Methods:
+        provision(profile: dict, servo_ids=None, overrides: dict = None, verify: bool = True,
+                  save_offset: bool = False, dry_run: bool = False) -> dict:
+            按配置模板配置多个舵机，返回每个配置项的结果。
+        encode(name: str, value) -> bytes:
+            将配置值编码为写入参数。
+
+    ==========================================
+
+    Bulk configuration provisioner for serial servos.
+
+    Setting angle limits, offsets, voltage ranges, temperature limits and modes on a fleet of servos with the
+    single setters and getters takes dozens of serial transactions per servo, with no way to skip what is already
+    correct. This class takes a configuration profile (with optional per-ID overrides) and:
+
+    1. encodes every item of the profile as write parameters (the parameters of a configuration write use the
+       same format as the reply of the matching read);
+    2. reads only the items present in the profile, one interleaved read per item across all servos (all buses
+       transmit at the same time on a multi-bus rig), skipping items that are not needed;
+    3. compares the read parameters with the wanted ones byte by byte and sends only the differing writes;
+    4. after letting the servos store the configuration, reads back only the written items to verify them;
+    5. returns the result of every item of every servo; servos that do not answer the read are not written.
+
+    Values use raw units: `angle_offset` in offset units (-125~125), `angle_range` as (min position, max position)
+    (0~1000), `vin_range` as (min mV, max mV), `temp_range` as the temperature limit in degrees Celsius,
+    `mode_and_speed` as (mode, speed) and `led_alarm` as the alarm code (0~7).
+
+    Attributes:
+        bus (ServoBusManager): Multi-UART bus manager, created automatically for a single SerialServo.
+        settle_ms (int): Wait between the writes and the verification reads, in milliseconds.
+        reads (int): Number of read requests sent by the last provisioning.
+        writes (int): Number of write commands sent by the last provisioning.
+        elapsed_ms (int): Duration of the last provisioning, in milliseconds.
+
+    Methods:
+        provision(profile: dict, servo_ids=None, overrides: dict = None, verify: bool = True,
+                  save_offset: bool = False, dry_run: bool = False) -> dict:
+            Configure many servos from a profile and return the result of every item.
+        encode(name: str, value) -> bytes:
+            Encode a configuration value as write parameters.
+    """
+
+    # 类变量：配置项名称、读取命令和写入命令，按该顺序读取和写入
+    ITEMS = (
+        ("angle_offset", SerialServo.SERVO_ANGLE_OFFSET_READ, SerialServo.SERVO_ANGLE_OFFSET_ADJUST),
+        ("angle_range", SerialServo.SERVO_ANGLE_LIMIT_READ, SerialServo.SERVO_ANGLE_LIMIT_WRITE),
+        ("vin_range", SerialServo.SERVO_VIN_LIMIT_READ, SerialServo.SERVO_VIN_LIMIT_WRITE),
+        ("temp_range", SerialServo.SERVO_TEMP_MAX_LIMIT_READ, SerialServo.SERVO_TEMP_MAX_LIMIT_WRITE),
+        ("mode_and_speed", SerialServo.SERVO_OR_MOTOR_MODE_READ, SerialServo.SERVO_OR_MOTOR_MODE_WRITE),
+        ("led_alarm", SerialServo.SERVO_LED_ERROR_READ, SerialServo.SERVO_LED_ERROR_WRITE),
+    )
+
+    # 类变量：配置项的结果
+    # 当前配置与模板一致，没有写入
+    STATUS_UNCHANGED = "unchanged"
+    # 当前配置与模板不同，已写入并确认（不确认时表示已写入）
+    STATUS_WRITTEN = "written"
+    # 当前配置与模板不同，dry_run 时没有写入
+    STATUS_DIFFERS = "differs"
+    # 写入后回读的配置仍与模板不同，或回读失败
+    STATUS_FAILED = "failed"
+    # 读取当前配置失败，舵机可能不在总线上，没有写入
+    STATUS_NO_REPLY = "no_reply"
+
+    def __init__(self, bus, settle_ms: int = 20) -> None:
+        """
+        初始化批量配置类。
+
+        Args:
+            bus (ServoBusManager | SerialServo): 多串口舵机总线管理类实例或单个串口舵机控制类实例。
+            settle_ms (int): 写入后到回读确认前的等待时间，单位毫秒，默认20。
+
+        Raises:
+            ValueError: 如果等待时间为负数，则抛出异常。
+
+        ==========================================
+
+        Initialize the bulk provisioner.
+
+        Args:
+            bus (ServoBusManager | SerialServo): Multi-UART bus manager or a single serial servo control instance.
+            settle_ms (int): Wait between the writes and the verification reads in milliseconds, default 20.
+
+        Raises:
+            ValueError: If the wait is negative.
+        """
+        if settle_ms < 0:
+            raise ValueError("Settle time must not be negative.")
+
+        # 单路总线也通过总线管理类读取，舵机ID在配置时映射
+        if isinstance(bus, SerialServo):
+            bus = ServoBusManager([bus])
+            self._single = True
+        else:
+            self._single = False
+
+        self.bus = bus
+        self.settle_ms = settle_ms
+
+        # 统计数据
+        self.reads = 0
+        self.writes = 0
+        self.elapsed_ms = 0
+
+    def encode(self, name: str, value) -> bytes:
+        """
+        将配置值编码为写入参数，范围检查与 SerialServo 的设置方法一致。
+
+        Args:
+            name (str): 配置项名称。
+            value: 配置值，单位见类说明。
+
+        Returns:
+            bytes: 写入参数，与对应读取命令返回的参数格式一致。
+
+        Raises:
+            ValueError: 如果配置项名称未知或配置值超出范围，则抛出异常。
+
+        ==========================================
+
+        Encode a configuration value as write parameters, with the same range checks as the SerialServo setters.
+
+        Args:
+            name (str): Item name.
+            value: Configuration value, units as described in the class documentation.
+
+        Returns:
+            bytes: Write parameters, in the same format as the reply of the matching read.
+
+        Raises:
+            ValueError: If the item name is unknown or the value is out of range.
+        """
+        if name == "angle_offset":
+            if value < -125 or value > 125:
+                raise ValueError("Offset must be in range -125~125.")
+            return bytes([(value + 256) % 256])
+
+        if name == "angle_range":
+            low, high = value
+            if low < 0 or low > 1000 or high < 0 or high > 1000:
+                raise ValueError("Position must be in range 0~1000.")
+            if low >= high:
+                raise ValueError("Max position must be greater than min position.")
+            return bytes([low & 0xFF, low >> 8, high & 0xFF, high >> 8])
+
+        if name == "vin_range":
+            low, high = value
+            if low < 4500 or low > 14000 or high < 4500 or high > 14000:
+                raise ValueError("Voltage must be in range 4.5V ~ 14.0V.")
+            if low >= high:
+                raise ValueError("Minimum voltage must be less than maximum voltage.")
+            return bytes([low & 0xFF, low >> 8, high & 0xFF, high >> 8])
+
+        if name == "temp_range":
+            if value < 50 or value > 100:
+                raise ValueError("Temperature must be between 50 and 100 degrees Celsius.")
+            return bytes([value])
+
+        if name == "mode_and_speed":
+            mode, speed = value
+            if mode == SerialServo.MODE_POSITION:
+                return bytes([mode, 0, 0, 0])
+            if mode != SerialServo.MODE_MOTOR:
+                raise ValueError("Invalid mode, must be SerialServo.MODE_POSITION or SerialServo.MODE_MOTOR.")
+            if speed < -1000 or speed > 1000:
+                raise ValueError("Speed must be between -1000 and 1000 in motor control mode.")
+            speed = (speed + 65536) % 65536
+            return bytes([mode, 0, speed & 0xFF, speed >> 8])
+
+        if name == "led_alarm":
+            if value < SerialServo.ERROR_NO_ALARM or value > SerialServo.ERROR_ALL:
+                raise ValueError("Invalid alarm code. Must be between 0 and 7.")
+            return bytes([value])
+
+        raise ValueError("Unknown configuration item: %s." % name)
+
+    def _matches(self, name: str, wanted: bytes, actual) -> bool:
+        """
+        判断读到的参数是否与期望的参数一致，位置控制模式下不比较速度字节。
+
+        ==========================================
+
+        Whether the read parameters match the wanted ones; speed bytes are ignored in position mode.
+        """
+        if actual is None:
+            return False
+        if name == "mode_and_speed" and wanted[0] == SerialServo.MODE_POSITION:
+            return actual[0] == SerialServo.MODE_POSITION
+        return actual == wanted
+
+    def _read(self, command: tuple, servo_ids: list) -> dict:
+        """
+        对一组舵机执行一次交错读取，并计入读取请求数量。
+
+        ==========================================
+
+        Run one interleaved read over a group of servos and count the requests.
+        """
+        self.reads += len(servo_ids)
+        return self.bus.read_params(command, servo_ids)
+
+    def provision(self, profile: dict, servo_ids=None, overrides: dict = None, verify: bool = True,
+                  save_offset: bool = False, dry_run: bool = False) -> dict:
+        """
+        按配置模板配置多个舵机：读取当前配置，只写入不同的配置项，并回读确认。
+
+        Args:
+            profile (dict): 配置模板，配置项名称 -> 配置值，所有舵机共用。
+            servo_ids (iterable, optional): 舵机ID列表，默认总线管理类中所有已映射的舵机；
+                                            传入单个 SerialServo 时必须指定。
+            overrides (dict, optional): 舵机ID -> 配置项字典，覆盖或补充该舵机的模板配置项。
+            verify (bool): 是否回读确认写入的配置项，默认True。
+            save_offset (bool): 写入偏差后是否掉电保存，默认False。
+            dry_run (bool): 为True时只读取和比较，不写入。
+
+        Returns:
+            dict: 舵机ID -> {配置项名称: 结果}，结果为 STATUS_UNCHANGED、STATUS_WRITTEN、STATUS_DIFFERS、
+                  STATUS_FAILED 或 STATUS_NO_REPLY。
+
+        Raises:
+            ValueError: 如果舵机ID列表为空、ID超出范围或没有映射到总线，或配置项名称、配置值无效，则抛出异常。
+
+        ==========================================
+
+        Configure many servos from a profile: read the current configuration, write only the differing items and
+        read them back to verify.
+
+        Args:
+            profile (dict): Configuration profile, item name -> value, shared by all servos.
+            servo_ids (iterable, optional): Servo IDs, default every servo mapped in the bus manager; required for
+                                            a single SerialServo.
+            overrides (dict, optional): Servo ID -> item dict overriding or extending the profile for that servo.
+            verify (bool): Whether to read back the written items, default True.
+            save_offset (bool): Whether to save a written offset across power cycles, default False.
+            dry_run (bool): If True, only read and compare, do not write.
+
+        Returns:
+            dict: Servo ID -> {item name: result}, result being STATUS_UNCHANGED, STATUS_WRITTEN, STATUS_DIFFERS,
+                  STATUS_FAILED or STATUS_NO_REPLY.
+
+        Raises:
+            ValueError: If the ID list is empty, an ID is out of range or not mapped to a bus, or an item name or
+                        value is invalid.
+        """
+        if servo_ids is None:
+            servo_ids = list(self.bus.servo_map)
+        else:
+            servo_ids = list(servo_ids)
+        if len(servo_ids) == 0:
+            raise ValueError("Servo ID list must not be empty.")
+        if overrides is None:
+            overrides = {}
+
+        # 单路总线：所有舵机都在第0路
+        if self._single:
+            for servo_id in servo_ids:
+                if servo_id not in self.bus.servo_map:
+                    self.bus.assign(servo_id, 0)
+
+        # 编码每个舵机的期望参数，先完成所有检查再访问总线
+        wanted = {}
+        for servo_id in servo_ids:
+            if servo_id < 0 or servo_id > 253:
+                raise ValueError("Servo ID must be in range 0~253.")
+            self.bus.bus_of(servo_id)
+            items = dict(profile)
+            items.update(overrides.get(servo_id, {}))
+            encoded = {}
+            for name, value in items.items():
+                encoded[name] = self.encode(name, value)
+            wanted[servo_id] = encoded
+
+        start = time.ticks_ms()
+        self.reads = 0
+        self.writes = 0
+        report = {}
+        for servo_id in servo_ids:
+            report[servo_id] = {}
+
+        # 每个配置项对需要它的所有舵机执行一次交错读取，比较后只写入不同的配置项
+        written = []
+        for name, read_cmd, write_cmd in ServoProvisioner.ITEMS:
+            ids = [servo_id for servo_id in servo_ids if name in wanted[servo_id]]
+            if len(ids) == 0:
+                continue
+            current = self._read(read_cmd, ids)
+            for servo_id in ids:
+                params = wanted[servo_id][name]
+                actual = current.get(servo_id)
+                if actual is None:
+                    report[servo_id][name] = ServoProvisioner.STATUS_NO_REPLY
+                elif self._matches(name, params, actual):
+                    report[servo_id][name] = ServoProvisioner.STATUS_UNCHANGED
+                elif dry_run:
+                    report[servo_id][name] = ServoProvisioner.STATUS_DIFFERS
+                else:
+                    bus = self.bus.bus_of(servo_id)
+                    bus.send_command(servo_id, write_cmd[0], list(params))
+                    self.writes += 1
+                    if name == "angle_offset" and save_offset:
+                        bus.send_command(servo_id, SerialServo.SERVO_ANGLE_OFFSET_WRITE[0], [])
+                        self.writes += 1
+                    report[servo_id][name] = ServoProvisioner.STATUS_WRITTEN
+                    written.append((servo_id, name))
+
+        # 等待舵机保存配置后，只回读写入过的配置项
+        if verify and len(written) > 0:
+            if self.settle_ms > 0:
+                time.sleep_ms(self.settle_ms)
+            for name, read_cmd, _ in ServoProvisioner.ITEMS:
+                ids = [servo_id for servo_id, item in written if item == name]
+                if len(ids) == 0:
+                    continue
+                current = self._read(read_cmd, ids)
+                for servo_id in ids:
+                    if not self._matches(name, wanted[servo_id][name], current.get(servo_id)):
+                        report[servo_id][name] = ServoProvisioner.STATUS_FAILED
+                        # 写入结果不确定，丢弃该舵机的配置缓存
+                        self.bus.bus_of(servo_id).invalidate_config_cache(servo_id)
+
+        self.elapsed_ms = time.ticks_diff(time.ticks_ms(), start)
+        return report
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
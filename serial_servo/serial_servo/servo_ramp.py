@@ -0,0 +1,523 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/26 上午9:50
+# @Author  : 李清水
+# @File    : servo_ramp.py
+# @Description : 串口舵机电机模式速度斜坡类，按固定周期将多个轮子的转速按加速度限制逐步调整到目标速度，
+#                所有速度指令预先构建，每个周期合并为一次写入
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 紧凑数组模块
+from array import array
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机电机模式速度斜坡类
+class ServoSpeedRamp:
+    """
+    串口舵机电机模式速度斜坡类。
+
+    电机模式下 `set_servo_mode_and_speed` 会让舵机直接跳到目标速度，调用者只能用一连串阻塞调用手动调整速度。
+    该类为多个轮子保存目标速度和当前速度，按固定控制周期把当前速度向目标速度调整一步，
+    加速（速度绝对值增大）和减速（速度绝对值减小或反向）使用各自的加速度限制，单位为速度单位每秒。
+
+    所有舵机的 SERVO_OR_MOTOR_MODE_WRITE 指令在初始化时预先构建；每个周期只把速度发生变化的轮子的数据包
+    复制到预先分配的发送缓冲区（只修改速度字节和校验和），合并为一次写入，全部轮子到达目标后不再发送，
+    斜坡过程中不分配内存。如果主循环跟不上控制周期，会跳过过期的周期并统计截止时间错过次数，
+    跳过的周期对应的速度变化会在下一个周期一并完成，整体加速时间不变。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例。
+        servo_ids (list[int]): 控制的轮子舵机ID列表。
+        period_ms (int): 控制周期，单位毫秒。
+        updates_sent (int): 已发送的速度指令数量。
+        frames_sent (int): 已发送的合并写入次数。
+        deadline_misses (int): 因超过截止时间而跳过的周期数。
+        max_lateness_us (int): 周期开始时间相对截止时间的最大延迟，单位微秒。
+
+    Methods:
+        set_speed(servo_id: int, speed: int) -> None:
+            设置轮子的目标速度。
+        set_speeds(speeds: dict) -> None:
+            同时设置多个轮子的目标速度。
+        set_profile(servo_id: int, accel: int, decel: int = None) -> None:
+            设置轮子的加速度限制。
+        speed(servo_id: int) -> int:
+            获取轮子当前已发送的速度。
+        target(servo_id: int) -> int:
+            获取轮子的目标速度。
+        ramping() -> bool:
+            判断是否还有轮子没有到达目标速度。
+        update() -> bool:
+            非阻塞地运行到期的控制周期。
+        run() -> None:
+            阻塞地运行直到所有轮子到达目标速度。
+        halt() -> None:
+            立即停止所有轮子。
+
+    ==========================================
+
+    Motor-mode speed ramp engine for serial servos.
+
+    In motor mode `set_servo_mode_and_speed` makes the servo jump straight to the requested speed, so callers ramp
+    by hand with a stream of blocking calls. This class keeps a target and a current speed for many wheels and,
+    at a fixed control rate, moves every current speed one step towards its target. Acceleration (speed magnitude
+    growing) and deceleration (magnitude shrinking or reversing) have their own limits, in speed units per second.
+
+    The SERVO_OR_MOTOR_MODE_WRITE packets of all servos are built once in the constructor. Every period only the
+    packets of wheels whose speed changed are copied into a preallocated TX buffer (speed bytes and checksum
+    patched) and sent in one write; nothing is sent once every wheel has reached its target, and nothing is
+    allocated while ramping. If the main loop cannot keep up, stale periods are skipped and counted as deadline
+    misses, and the speed change of the skipped periods is applied in the next one, so the total ramp time is kept.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance.
+        servo_ids (list[int]): IDs of the wheel servos.
+        period_ms (int): Control period in milliseconds.
+        updates_sent (int): Number of speed commands sent.
+        frames_sent (int): Number of combined writes sent.
+        deadline_misses (int): Number of periods skipped because their deadline had passed.
+        max_lateness_us (int): Largest delay of a period start after its deadline, in microseconds.
+
+    Methods:
+        set_speed(servo_id: int, speed: int) -> None:
+            Set the target speed of a wheel.
+        set_speeds(speeds: dict) -> None:
+            Set the target speeds of several wheels at once.
+        set_profile(servo_id: int, accel: int, decel: int = None) -> None:
+            Set the acceleration limits of a wheel.
+        speed(servo_id: int) -> int:
+            Current speed sent to a wheel.
+        target(servo_id: int) -> int:
+            Target speed of a wheel.
+        ramping() -> bool:
+            Whether any wheel has not reached its target yet.
+        update() -> bool:
+            Run the due control period without blocking.
+        run() -> None:
+            Block until every wheel has reached its target.
+        halt() -> None:
+            Stop every wheel immediately.
+    """
+
+    # 类变量：速度指令数据包长度
+    PACKET_SIZE = 10
+
+    def __init__(self, servo: SerialServo, servo_ids: list, period_ms: int = 20, accel: int = 2000,
+                 decel: int = None) -> None:
+        """
+        初始化速度斜坡类，所有轮子的当前速度和目标速度初始为0（假设轮子处于停止状态）。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            servo_ids (list): 轮子舵机ID列表，ID范围0~253。
+            period_ms (int): 控制周期，单位毫秒，范围1~1000，默认20ms。
+            accel (int): 默认加速度限制，单位速度单位每秒，默认2000（从0加速到1000用时0.5秒）。
+            decel (int, optional): 默认减速度限制，None表示与加速度相同。
+
+        Raises:
+            ValueError: 如果舵机ID列表为空、ID超出范围、控制周期超出范围或加速度不大于0，则抛出异常。
+
+        ==========================================
+
+        Initialize the speed ramp engine; the current and target speed of every wheel start at 0 (the wheels are
+        assumed to be stopped).
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            servo_ids (list): IDs of the wheel servos, range 0~253.
+            period_ms (int): Control period in milliseconds, range 1~1000, 20 ms by default.
+            accel (int): Default acceleration limit in speed units per second, default 2000 (0 to 1000 in 0.5 s).
+            decel (int, optional): Default deceleration limit, None means the same as the acceleration.
+
+        Raises:
+            ValueError: If the ID list is empty, an ID is out of range, the period is out of range, or an
+                        acceleration is not greater than 0.
+        """
+        if len(servo_ids) == 0:
+            raise ValueError("Servo ID list must not be empty.")
+        for servo_id in servo_ids:
+            if servo_id < 0 or servo_id > 253:
+                raise ValueError("Servo ID must be in range 0~253.")
+        if period_ms < 1 or period_ms > 1000:
+            raise ValueError("Period must be in range 1~1000 ms.")
+
+        self.servo = servo
+        self.servo_ids = list(servo_ids)
+        self.period_ms = period_ms
+
+        count = len(self.servo_ids)
+        self._index = {}
+        for i in range(count):
+            self._index[self.servo_ids[i]] = i
+
+        # 每个轮子的目标速度、当前速度，以及每秒的加速度和减速度限制
+        self._targets = array('h', [0] * count)
+        self._speeds = array('h', [0] * count)
+        self._accel = array('h', [0] * count)
+        self._decel = array('h', [0] * count)
+        for servo_id in self.servo_ids:
+            self.set_profile(servo_id, accel, decel)
+
+        # 预先构建所有轮子的速度指令，并记录校验和中与速度无关的部分
+        size = ServoSpeedRamp.PACKET_SIZE
+        self._packets = bytearray(size * count)
+        self._checksum_base = array('H', [0] * count)
+        for i in range(count):
+            packet = servo.build_packet(self.servo_ids[i], SerialServo.SERVO_OR_MOTOR_MODE_WRITE[0],
+                                        [SerialServo.MODE_MOTOR, 0, 0, 0])
+            self._packets[size * i:size * i + size] = packet
+            self._checksum_base[i] = packet[2] + packet[3] + packet[4] + packet[5] + packet[6]
+
+        # 发送缓冲区及其各长度的视图，每个周期只发送速度发生变化的轮子
+        self._tx = bytearray(size * count)
+        view = memoryview(self._tx)
+        self._views = [view[:size * k] for k in range(count + 1)]
+
+        self._deadline = 0
+        self._running = False
+
+        # 统计数据
+        self.updates_sent = 0
+        self.frames_sent = 0
+        self.deadline_misses = 0
+        self.max_lateness_us = 0
+
+    def _slot(self, servo_id: int) -> int:
+        """
+        获取轮子在状态数组中的序号。
+
+        ==========================================
+
+        Index of a wheel in the state arrays.
+        """
+        index = self._index.get(servo_id)
+        if index is None:
+            raise ValueError("Servo ID is not ramped.")
+        return index
+
+    def set_profile(self, servo_id: int, accel: int, decel: int = None) -> None:
+        """
+        设置轮子的加速度限制。
+
+        Args:
+            servo_id (int): 舵机ID。
+            accel (int): 加速度限制，单位速度单位每秒，范围1~30000。
+            decel (int, optional): 减速度限制，None表示与加速度相同。
+
+        Raises:
+            ValueError: 如果舵机没有被控制，或加速度超出范围，则抛出异常。
+
+        ==========================================
+
+        Set the acceleration limits of a wheel.
+
+        Args:
+            servo_id (int): Servo ID.
+            accel (int): Acceleration limit in speed units per second, range 1~30000.
+            decel (int, optional): Deceleration limit, None means the same as the acceleration.
+
+        Raises:
+            ValueError: If the servo is not ramped, or an acceleration is out of range.
+        """
+        if decel is None:
+            decel = accel
+        if accel < 1 or accel > 30000 or decel < 1 or decel > 30000:
+            raise ValueError("Acceleration must be in range 1~30000.")
+        i = self._slot(servo_id)
+        self._accel[i] = accel
+        self._decel[i] = decel
+
+    def set_speed(self, servo_id: int, speed: int) -> None:
+        """
+        设置轮子的目标速度，下一个控制周期开始调整。
+
+        Args:
+            servo_id (int): 舵机ID。
+            speed (int): 目标速度，范围-1000~1000，负值表示反转。
+
+        Raises:
+            ValueError: 如果舵机没有被控制，或速度超出范围，则抛出异常。
+
+        ==========================================
+
+        Set the target speed of a wheel; ramping starts in the next control period.
+
+        Args:
+            servo_id (int): Servo ID.
+            speed (int): Target speed, range -1000~1000, negative for reverse.
+
+        Raises:
+            ValueError: If the servo is not ramped, or the speed is out of range.
+        """
+        if speed < -1000 or speed > 1000:
+            raise ValueError("Speed must be between -1000 and 1000 in motor control mode.")
+        i = self._slot(servo_id)
+        self._targets[i] = speed
+        # 斜坡直接写入数据包，写入合并的影子状态在斜坡结束前不再可信
+        self.servo.invalidate_shadow(servo_id)
+
+        # 从空闲状态开始斜坡，截止时间从当前时刻开始计算
+        if not self._running and self._speeds[i] != speed:
+            self._running = True
+            self._deadline = time.ticks_us()
+
+    def set_speeds(self, speeds: dict) -> None:
+        """
+        同时设置多个轮子的目标速度，先检查全部参数再修改。
+
+        Args:
+            speeds (dict): 舵机ID -> 目标速度（-1000~1000）。
+
+        Raises:
+            ValueError: 如果舵机没有被控制，或速度超出范围，则抛出异常。
+
+        ==========================================
+
+        Set the target speeds of several wheels at once; all values are checked before any is changed.
+
+        Args:
+            speeds (dict): Servo ID -> target speed (-1000~1000).
+
+        Raises:
+            ValueError: If a servo is not ramped, or a speed is out of range.
+        """
+        for servo_id, speed in speeds.items():
+            self._slot(servo_id)
+            if speed < -1000 or speed > 1000:
+                raise ValueError("Speed must be between -1000 and 1000 in motor control mode.")
+        for servo_id, speed in speeds.items():
+            self.set_speed(servo_id, speed)
+
+    def speed(self, servo_id: int) -> int:
+        """
+        获取轮子当前已发送的速度。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 当前速度，范围-1000~1000。
+
+        ==========================================
+
+        Current speed sent to a wheel.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            int: Current speed, range -1000~1000.
+        """
+        return self._speeds[self._slot(servo_id)]
+
+    def target(self, servo_id: int) -> int:
+        """
+        获取轮子的目标速度。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            int: 目标速度，范围-1000~1000。
+
+        ==========================================
+
+        Target speed of a wheel.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            int: Target speed, range -1000~1000.
+        """
+        return self._targets[self._slot(servo_id)]
+
+    def ramping(self) -> bool:
+        """
+        判断是否还有轮子没有到达目标速度。
+
+        Returns:
+            bool: 有轮子正在调整速度时返回True。
+
+        ==========================================
+
+        Whether any wheel has not reached its target yet.
+
+        Returns:
+            bool: True while a wheel is still ramping.
+        """
+        return self._running
+
+    def _put(self, k: int, i: int, speed: int) -> None:
+        """
+        把第 i 个轮子的速度指令写入发送缓冲区的第 k 个位置。
+
+        ==========================================
+
+        Write the speed command of the i-th wheel into slot k of the TX buffer.
+        """
+        size = ServoSpeedRamp.PACKET_SIZE
+        packets = self._packets
+        tx = self._tx
+        source = size * i
+        offset = size * k
+        for j in range(7):
+            tx[offset + j] = packets[source + j]
+        # 速度以补码形式发送
+        value = speed & 0xFFFF
+        low = value & 0xFF
+        high = value >> 8
+        tx[offset + 7] = low
+        tx[offset + 8] = high
+        tx[offset + 9] = ~(self._checksum_base[i] + low + high) & 0xFF
+
+    def _step(self, periods: int) -> int:
+        """
+        把所有轮子的速度向目标调整 periods 个周期，并写入发送缓冲区，返回写入的指令数量。
+
+        ==========================================
+
+        Move every wheel towards its target by periods periods, fill the TX buffer and return the command count.
+        """
+        period_ms = self.period_ms * periods
+        targets = self._targets
+        speeds = self._speeds
+        k = 0
+        for i in range(len(speeds)):
+            current = speeds[i]
+            target = targets[i]
+            if current == target:
+                continue
+
+            # 速度绝对值增大且方向不变时使用加速度，否则使用减速度
+            if (current >= 0 and target > current) or (current <= 0 and target < current):
+                rate = self._accel[i]
+            else:
+                rate = self._decel[i]
+            step = rate * period_ms // 1000
+            if step < 1:
+                step = 1
+
+            if target > current:
+                current = current + step if target - current > step else target
+            else:
+                current = current - step if current - target > step else target
+            speeds[i] = current
+            self._put(k, i, current)
+            k += 1
+        return k
+
+    def _settle(self) -> None:
+        """
+        斜坡结束后，按最终速度更新舵机控制类的配置缓存和影子状态，与通过 send_command 发送时一致。
+
+        ==========================================
+
+        Once ramping has finished, update the configuration cache and shadow state of the servo control instance
+        with the final speeds, as if they had been sent with send_command.
+        """
+        servo = self.servo
+        cmd = SerialServo.SERVO_OR_MOTOR_MODE_WRITE[0]
+        for i in range(len(self.servo_ids)):
+            value = self._speeds[i] & 0xFFFF
+            params = [SerialServo.MODE_MOTOR, 0, value & 0xFF, value >> 8]
+            if servo.cache_config:
+                servo._update_config_cache(self.servo_ids[i], cmd, params)
+            if servo.coalesce_writes:
+                servo._update_shadow(self.servo_ids[i], cmd, params)
+
+    def update(self) -> bool:
+        """
+        非阻塞地运行到期的控制周期，把速度发生变化的轮子的指令合并为一次写入。
+
+        Returns:
+            bool: 还有轮子正在调整速度时返回True。
+
+        ==========================================
+
+        Run the due control period without blocking, sending the commands of the wheels whose speed changed in
+        one write.
+
+        Returns:
+            bool: True while a wheel is still ramping.
+        """
+        if not self._running:
+            return False
+
+        late = time.ticks_diff(time.ticks_us(), self._deadline)
+        if late < 0:
+            return True
+
+        period_us = self.period_ms * 1000
+        periods = 1
+        # 跳过已经过期的周期，速度变化在本周期一并完成
+        if late >= period_us:
+            skipped = late // period_us
+            self.deadline_misses += skipped
+            periods += skipped
+            self._deadline = time.ticks_add(self._deadline, skipped * period_us)
+            late -= skipped * period_us
+        if late > self.max_lateness_us:
+            self.max_lateness_us = late
+
+        count = self._step(periods)
+        if count > 0:
+            self.servo.write_packet(self._views[count])
+            self.updates_sent += count
+            self.frames_sent += 1
+
+        self._deadline = time.ticks_add(self._deadline, period_us)
+
+        # 所有轮子到达目标后停止发送
+        for i in range(len(self._speeds)):
+            if self._speeds[i] != self._targets[i]:
+                return True
+        self._running = False
+        self._settle()
+        return False
+
+    def run(self) -> None:
+        """
+        阻塞地运行，直到所有轮子到达目标速度。
+
+        ==========================================
+
+        Block until every wheel has reached its target speed.
+        """
+        while self._running:
+            wait = time.ticks_diff(self._deadline, time.ticks_us())
+            if wait > 1000:
+                time.sleep_ms(wait // 1000)
+            self.update()
+
+    def halt(self) -> None:
+        """
+        不经过斜坡立即停止所有轮子，目标速度同时设为0。
+
+        ==========================================
+
+        Stop every wheel immediately without ramping; the target speeds are set to 0 as well.
+        """
+        for i in range(len(self._speeds)):
+            self._targets[i] = 0
+            self._speeds[i] = 0
+            self._put(i, i, 0)
+        self.servo.write_packet(self._views[len(self._speeds)])
+        self.updates_sent += len(self._speeds)
+        self.frames_sent += 1
+        self._running = False
+        self._settle()
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,374 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/16 上午10:20
+# @Author  : 李清水
+# @File    : servo_scanner.py
+# @Description : 串口舵机总线快速扫描类，按线路传输时间设定超时，发现总线上的舵机ID并读取其配置
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+# 导入串口舵机总线时序模型类
+from .servo_timing import ServoTiming
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机总线扫描类
+class ServoScanner:
+    """
+    串口舵机总线扫描类。
+
+    逐个调用 `get_servo_id` 扫描 0~253 号ID时，每次读取都要等待固定的5毫秒，扫描一遍超过一秒。
+    该类使用总线时序模型（`ServoTiming`）计算的回复截止时间，回复到达后立即处理：舵机已经关联时序模型时使用该模型，
+    否则在扫描期间临时关联按 baudrate 和 turnaround_us 创建的模型；
+    可以先探测上次启动时的ID提示列表，找到期望数量的舵机后提前结束；可以把多个ID的请求合并为一次发送，
+    整段没有任何回复时跳过该段；每个发现的舵机都会再次确认，最后读取其配置。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例。
+        baudrate (int): 总线波特率。
+        turnaround_us (int): 舵机收到请求后开始回复的最长时间，单位微秒。
+        timing (ServoTiming): 舵机未关联时序模型时，扫描期间临时使用的时序模型。
+        block_size (int): 合并探测的ID数量，0表示不合并探测。
+        verify (int): 每个发现的舵机再次确认的次数。
+        probes (int): 最近一次扫描发送的探测请求数量。
+        errors (int): 最近一次扫描中配置项回复无法解析的次数。
+        elapsed_ms (int): 最近一次扫描所用时间，单位毫秒。
+
+    Methods:
+        scan(ids=None, hints=None, expected=0, read_config=True) -> dict:
+            扫描总线，返回发现的舵机及其配置。
+        probe(servo_id: int) -> bool:
+            探测单个舵机ID是否存在。
+
+    ==========================================
+
+    Fast serial servo bus scanner.
+
+    Calling `get_servo_id` for IDs 0~253 waits a fixed 5 ms per read, more than a second per pass.
+    This class waits until the reply deadline of the bus timing model (`ServoTiming`) and handles a reply as soon
+    as it is complete: the model attached to the servo is used when there is one, otherwise a model built from
+    baudrate and turnaround_us is attached for the duration of the scan. It can probe a list of hinted IDs (for example
+    those found at the last boot) first and stop once the expected number of servos is found, and it can send the
+    requests of several IDs in one burst and skip the whole block when nothing answers. Every hit is verified
+    again and its configuration is read at the end.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance.
+        baudrate (int): Bus baudrate.
+        turnaround_us (int): Longest time a servo takes to start replying, in microseconds.
+        timing (ServoTiming): Timing model used during scans when the servo has none attached.
+        block_size (int): Number of IDs probed in one burst, 0 disables block probing.
+        verify (int): Number of times every hit is probed again.
+        probes (int): Number of probe requests sent by the last scan.
+        errors (int): Number of configuration replies the last scan could not parse.
+        elapsed_ms (int): Duration of the last scan, in milliseconds.
+
+    Methods:
+        scan(ids=None, hints=None, expected=0, read_config=True) -> dict:
+            Scan the bus and return the discovered servos with their configuration.
+        probe(servo_id: int) -> bool:
+            Probe whether a single servo ID is present.
+    """
+
+    # 类变量：扫描后读取的配置项名称及对应的读取方法
+    CONFIG_READERS = (
+        ("angle_offset", "get_servo_angle_offset"),
+        ("angle_range", "get_servo_angle_range"),
+        ("vin_range", "get_servo_vin_range"),
+        ("temp_range", "get_servo_temp_range"),
+        ("mode_and_speed", "get_servo_mode_and_speed"),
+        ("led_alarm", "get_servo_led_alarm"),
+    )
+
+    def __init__(self, servo: SerialServo, baudrate: int = 115200, turnaround_us: int = 1000,
+                 block_size: int = 0, verify: int = 1) -> None:
+        """
+        初始化串口舵机总线扫描类。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            baudrate (int): 总线波特率，默认115200。
+            turnaround_us (int): 舵机收到请求后开始回复的最长时间，单位微秒，默认1000。
+            block_size (int): 合并探测的ID数量，0表示不合并探测，默认0。
+            verify (int): 每个发现的舵机再次确认的次数，默认1。
+
+        Raises:
+            ValueError: 如果波特率不为正数，或响应时间、合并数量、确认次数为负数，则抛出异常。
+
+        ==========================================
+
+        Initialize the serial servo bus scanner.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            baudrate (int): Bus baudrate, default 115200.
+            turnaround_us (int): Longest time a servo takes to start replying, in microseconds, default 1000.
+            block_size (int): Number of IDs probed in one burst, 0 disables block probing, default 0.
+            verify (int): Number of times every hit is probed again, default 1.
+
+        Raises:
+            ValueError: If the baudrate is not positive, or the turnaround, block size or verify count is negative.
+        """
+        if baudrate <= 0:
+            raise ValueError("Baudrate must be positive.")
+        if turnaround_us < 0 or block_size < 0 or verify < 0:
+            raise ValueError("Turnaround, block size and verify count must not be negative.")
+
+        self.servo = servo
+        self.baudrate = baudrate
+        self.turnaround_us = turnaround_us
+        self.timing = ServoTiming(baudrate, turnaround_us)
+        self.block_size = block_size
+        self.verify = verify
+
+        self.probes = 0
+        self.errors = 0
+        self.elapsed_ms = 0
+
+    def _attach(self) -> bool:
+        """
+        舵机未关联时序模型时，临时关联扫描类的时序模型。
+
+        Returns:
+            bool: 本次调用关联了时序模型时返回True，结束时需要取消关联。
+
+        ==========================================
+
+        Temporarily attach the scanner's timing model when the servo has none.
+
+        Returns:
+            bool: True if this call attached the model, which has to be detached afterwards.
+        """
+        if self.servo.timing is not None:
+            return False
+        self.servo.timing = self.timing
+        return True
+
+    def probe(self, servo_id: int) -> bool:
+        """
+        探测单个舵机ID是否存在。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            bool: 舵机在超时前正确回复了自身ID时返回True，否则返回False。
+
+        ==========================================
+
+        Probe whether a single servo ID is present.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            bool: True if the servo answered with its own ID before the timeout, False otherwise.
+        """
+        servo = self.servo
+        command = SerialServo.SERVO_ID_READ
+        attached = self._attach()
+        try:
+            servo.flush_input()
+            servo.send_command(servo_id, command[0], [])
+            self.probes += 1
+
+            # 等待到时序模型给出的回复截止时刻
+            if not servo.wait_reply(command):
+                servo.flush_input()
+                return False
+
+            params = servo.receive_command(command[0], command[2])
+            return len(params) == 1 and params[0] == servo_id
+        finally:
+            if attached:
+                servo.timing = None
+
+    def _probe_block(self, block: list) -> bool:
+        """
+        一次发送多个ID的读取请求，判断该段ID中是否有舵机存在。
+
+        半双工总线上回复之间可能冲突，但该段中第一个存在的舵机收到的请求一定完整，
+        因此只要收到任何字节就说明该段有舵机，再逐个探测。
+
+        ==========================================
+
+        Send the read requests of several IDs in one burst and tell whether any servo in the block is present.
+
+        Replies may collide on a half-duplex bus, but the first present servo of the block always receives an
+        intact request, so any received byte means the block is occupied and has to be probed one by one.
+        """
+        servo = self.servo
+        command = SerialServo.SERVO_ID_READ
+
+        burst = bytearray()
+        for servo_id in block:
+            burst += servo.build_packet(servo_id, command[0], [])
+
+        timing = servo.timing
+        servo.flush_input()
+        start = time.ticks_us()
+        servo.write_packet(burst)
+        self.probes += len(block)
+
+        # 回显模式下自身发送的字节不算作回复
+        echo = len(burst) if servo.echo else 0
+        # 最后一个请求发送完成后，舵机在响应时间内开始回复，收到第一个字节即可判断
+        first = time.ticks_add(servo._tx_end, timing.turnaround_us + timing.wire_us(1))
+        occupied = False
+        while time.ticks_diff(time.ticks_us(), first) <= 0:
+            if servo.uart.any() > echo:
+                occupied = True
+                break
+
+        # 有回复时等待整段请求和回复结束，避免干扰后续探测
+        if occupied:
+            size = len(block) * (timing.request_size(command) + timing.response_size(command))
+            end = time.ticks_add(start, timing.wire_us(size) + timing.turnaround_us)
+            remaining = time.ticks_diff(end, time.ticks_us())
+            if remaining > 0:
+                time.sleep_us(remaining)
+        servo.flush_input()
+        return occupied
+
+    def scan(self, ids=None, hints=None, expected: int = 0, read_config: bool = True) -> dict:
+        """
+        扫描总线，返回发现的舵机及其配置。
+
+        Args:
+            ids (iterable, optional): 需要扫描的ID范围，默认0~253。
+            hints (list, optional): 优先探测的ID列表，例如上次启动时发现的舵机。
+            expected (int): 期望的舵机数量，发现该数量的舵机后提前结束扫描，0表示扫描全部ID。
+            read_config (bool): 是否读取发现的舵机的配置，默认True。
+
+        Returns:
+            dict: 舵机ID -> 配置字典（angle_offset、angle_range、vin_range、temp_range、mode_and_speed、led_alarm），
+                  读取失败或无法解析的配置项为None；不读取配置时配置字典为空。
+
+        Raises:
+            ValueError: 如果期望数量为负数，则抛出异常。
+
+        ==========================================
+
+        Scan the bus and return the discovered servos with their configuration.
+
+        Args:
+            ids (iterable, optional): IDs to scan, default 0~253.
+            hints (list, optional): IDs probed first, for example the servos found at the last boot.
+            expected (int): Expected number of servos; the scan stops once that many are found, 0 scans every ID.
+            read_config (bool): Whether to read the configuration of discovered servos, default True.
+
+        Returns:
+            dict: Servo ID -> configuration dict (angle_offset, angle_range, vin_range, temp_range, mode_and_speed,
+                  led_alarm); entries that could not be read or parsed are None. The dict is empty without read_config.
+
+        Raises:
+            ValueError: If the expected count is negative.
+        """
+        if expected < 0:
+            raise ValueError("Expected count must not be negative.")
+        if ids is None:
+            ids = range(0, 254)
+
+        start = time.ticks_ms()
+        self.probes = 0
+        self.errors = 0
+        attached = self._attach()
+        try:
+            table = self._scan(ids, hints, expected, read_config)
+        finally:
+            if attached:
+                self.servo.timing = None
+
+        self.elapsed_ms = time.ticks_diff(time.ticks_ms(), start)
+        return table
+
+    def _scan(self, ids, hints, expected: int, read_config: bool) -> dict:
+        """
+        依次探测提示ID和扫描范围，确认发现的舵机并读取配置，调用者负责关联时序模型。
+
+        ==========================================
+
+        Probe the hinted IDs and the scan range, verify hits and read their configuration; the caller attaches the
+        timing model.
+        """
+        found = []
+        probed = set()
+
+        # 优先探测提示的ID
+        if hints:
+            for servo_id in hints:
+                if servo_id in probed:
+                    continue
+                probed.add(servo_id)
+                if self._confirm(servo_id):
+                    found.append(servo_id)
+                    if expected and len(found) >= expected:
+                        break
+
+        if not expected or len(found) < expected:
+            remaining = [servo_id for servo_id in ids if servo_id not in probed]
+            step = self.block_size if self.block_size > 0 else 1
+            for i in range(0, len(remaining), step):
+                block = remaining[i:i + step]
+                # 整段没有回复时跳过该段
+                if step > 1 and not self._probe_block(block):
+                    continue
+                for servo_id in block:
+                    if self._confirm(servo_id):
+                        found.append(servo_id)
+                        if expected and len(found) >= expected:
+                            break
+                if expected and len(found) >= expected:
+                    break
+
+        found.sort()
+        table = {}
+        for servo_id in found:
+            table[servo_id] = self._read_config(servo_id) if read_config else {}
+        return table
+
+    def _confirm(self, servo_id: int) -> bool:
+        """
+        探测一个ID，发现舵机后按 verify 次数再次确认。
+
+        ==========================================
+
+        Probe one ID and verify a hit the configured number of times.
+        """
+        if not self.probe(servo_id):
+            return False
+        for _ in range(self.verify):
+            if not self.probe(servo_id):
+                return False
+        return True
+
+    def _read_config(self, servo_id: int) -> dict:
+        """
+        以时序模型给出的回复截止时间读取舵机的配置。
+
+        ==========================================
+
+        Read the configuration of a servo with the reply deadlines of the timing model.
+        """
+        servo = self.servo
+        config = {}
+        for name, reader in ServoScanner.CONFIG_READERS:
+            # 设备中的配置超出解析范围时只记为错误，不影响已发现的其他舵机
+            try:
+                config[name] = getattr(servo, reader)(servo_id)
+            except ValueError:
+                self.errors += 1
+                config[name] = None
+        return config
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,569 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/22 上午9:40
+# @Author  : 李清水
+# @File    : servo_scheduler.py
+# @Description : 串口舵机总线优先级调度类，按急停、运动、配置、遥测四个优先级排队，在事务之间按优先级发送，
+#                并限制运动指令等待总线的最长时间
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机总线优先级调度类
+class ServoScheduler:
+    """
+    串口舵机总线优先级调度类。
+
+    遥测读取和运动控制共用一条半双工总线时，一次慢速读取可能推迟对时间敏感的运动指令。调度器为每个优先级
+    （急停、运动、配置、遥测）维护一个预分配的环形队列，`update()` 在上一个事务结束后按优先级取出请求发送：
+    只写指令发送后立即结束，连续发送直到遇到读取指令；读取指令发送后等待回复，回复通过回调函数返回。
+    半双工总线上已经发出的读取请求无法撤回，舵机的回复会占用总线，因此调度器不抢占未完成的读取：
+    运动指令最多等待一个未完成读取的回复截止时间（`SerialServo.reply_deadline()`，关联总线时序模型时按波特率计算），
+    之后立即按优先级发送。急停指令会丢弃队列中尚未发送的运动指令。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例。
+        max_motion_wait_us (int): 急停和运动指令从入队到发送的最长等待时间，单位微秒。
+        dropped (int): 因队列已满而被拒绝的请求数量。
+        timeouts (int): 超时未收到完整回复的读取数量。
+        errors (int): 回复校验失败的读取数量。
+
+    Methods:
+        submit(priority: int, servo_id: int, cmd: int, params: list = [], command: tuple = None,
+               callback=None) -> bool:
+            将一个请求加入指定优先级的队列。
+        stop(servo_id: int = 254) -> bool:
+            以急停优先级发送停止指令，并丢弃队列中该舵机的运动指令。
+        move(servo_id: int, position: int, time_ms: int) -> bool:
+            以运动优先级发送立即转动指令。
+        write(servo_id: int, cmd: int, params: list = []) -> bool:
+            以配置优先级发送写入指令。
+        read(servo_id: int, command: tuple, callback, priority: int = PRIORITY_TELEMETRY) -> bool:
+            将读取指令加入队列，回复通过回调函数返回。
+        update() -> bool:
+            非阻塞地推进一次调度状态机。
+        run_until_idle(timeout_ms: int = 1000) -> bool:
+            阻塞地处理队列，直到所有请求完成。
+        pending(priority: int = None) -> int:
+            获取排队中的请求数量。
+
+    ==========================================
+
+    Priority scheduler for a serial servo bus.
+
+    When telemetry reads and motion share one half-duplex bus, a slow read can delay a time-critical move. The
+    scheduler keeps a preallocated ring queue per priority class (emergency stop, motion, config, telemetry), and
+    `update()` takes requests in priority order once the previous transaction has finished: write-only commands
+    finish as soon as they are sent, so writes go out back to back until a read is reached; a read is sent and its
+    reply is delivered through a callback. On a half-duplex bus a read request that has been sent cannot be taken
+    back and the servo's reply will occupy the bus, so reads in flight are never preempted: motion waits for at
+    most one read in flight, until its reply deadline (`SerialServo.reply_deadline()`, derived from the baud rate
+    when a bus timing model is attached), and is then sent first. An emergency stop discards the motion commands
+    still queued for that servo.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance.
+        max_motion_wait_us (int): Longest time an emergency stop or motion command waited from queueing to sending,
+                                  in microseconds.
+        dropped (int): Number of requests rejected because their queue was full.
+        timeouts (int): Number of reads without a complete reply in time.
+        errors (int): Number of replies that failed validation.
+
+    Methods:
+        submit(priority: int, servo_id: int, cmd: int, params: list = [], command: tuple = None,
+               callback=None) -> bool:
+            Queue one request with the given priority.
+        stop(servo_id: int = 254) -> bool:
+            Send a stop command with emergency priority and discard queued motion for that servo.
+        move(servo_id: int, position: int, time_ms: int) -> bool:
+            Send an immediate move with motion priority.
+        write(servo_id: int, cmd: int, params: list = []) -> bool:
+            Send a write command with config priority.
+        read(servo_id: int, command: tuple, callback, priority: int = PRIORITY_TELEMETRY) -> bool:
+            Queue a read command; the reply is delivered through the callback.
+        update() -> bool:
+            Advance the scheduler state machine once without blocking.
+        run_until_idle(timeout_ms: int = 1000) -> bool:
+            Process the queues until every request has finished.
+        pending(priority: int = None) -> int:
+            Number of queued requests.
+    """
+
+    # 类变量：优先级，数值越小优先级越高
+    PRIORITY_ESTOP = 0
+    PRIORITY_MOTION = 1
+    PRIORITY_CONFIG = 2
+    PRIORITY_TELEMETRY = 3
+
+    # 统计等待时间的优先级：急停和运动
+    URGENT_PRIORITIES = (0, 1)
+
+    def __init__(self, servo: SerialServo, queue_size: int = 32) -> None:
+        """
+        初始化总线优先级调度类。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            queue_size (int): 每个优先级队列的容量。
+
+        Raises:
+            ValueError: 如果队列容量不大于0，则抛出异常。
+
+        ==========================================
+
+        Initialize the bus priority scheduler.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            queue_size (int): Capacity of each priority queue.
+
+        Raises:
+            ValueError: If the queue size is not greater than 0.
+        """
+        if queue_size <= 0:
+            raise ValueError("Queue size must be greater than 0.")
+
+        self.servo = servo
+
+        # 每个优先级一个预分配的环形队列：数据包、读取命令、回调函数、舵机ID和入队时间
+        self._size = queue_size
+        self._packets = [[None] * queue_size for _ in range(4)]
+        self._commands = [[None] * queue_size for _ in range(4)]
+        self._callbacks = [[None] * queue_size for _ in range(4)]
+        self._ids = [[0] * queue_size for _ in range(4)]
+        self._stamps = [[0] * queue_size for _ in range(4)]
+        self._head = [0, 0, 0, 0]
+        self._count = [0, 0, 0, 0]
+
+        # 当前未完成的读取：命令、回调函数、舵机ID和回复截止时刻，命令为None表示总线空闲
+        self._pending_command = None
+        self._pending_callback = None
+        self._pending_id = 0
+        self._pending_deadline = 0
+
+        # 统计数据
+        self.max_motion_wait_us = 0
+        self.dropped = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def submit(self, priority: int, servo_id: int, cmd: int, params: list = [], command: tuple = None,
+               callback=None) -> bool:
+        """
+        将一个请求加入指定优先级的队列。
+
+        数据包在入队时构建，发送时不再分配内存。
+
+        Args:
+            priority (int): 优先级，PRIORITY_ESTOP、PRIORITY_MOTION、PRIORITY_CONFIG 或 PRIORITY_TELEMETRY。
+            servo_id (int): 舵机ID，范围0~254。
+            cmd (int): 指令编号。
+            params (list): 参数列表。
+            command (tuple, optional): 读取命令元组（命令编号，参数长度，返回数据长度），None表示只写指令。
+            callback (callable, optional): 读取完成后调用 callback(servo_id, params)，失败时 params 为None。
+
+        Returns:
+            bool: 成功入队时返回True，队列已满时返回False。
+
+        Raises:
+            ValueError: 如果优先级或舵机ID超出范围，则抛出异常。
+
+        ==========================================
+
+        Queue one request with the given priority.
+
+        The packet is built when it is queued, so sending it allocates nothing.
+
+        Args:
+            priority (int): PRIORITY_ESTOP, PRIORITY_MOTION, PRIORITY_CONFIG or PRIORITY_TELEMETRY.
+            servo_id (int): Servo ID, range 0~254.
+            cmd (int): Command ID.
+            params (list): Parameter list.
+            command (tuple, optional): Read command tuple (command ID, parameter length, returned data length),
+                                       None for write-only commands.
+            callback (callable, optional): Called as callback(servo_id, params) when a read finishes; params is
+                                           None on failure.
+
+        Returns:
+            bool: True if the request was queued, False if the queue is full.
+
+        Raises:
+            ValueError: If the priority or servo ID is out of range.
+        """
+        if priority < ServoScheduler.PRIORITY_ESTOP or priority > ServoScheduler.PRIORITY_TELEMETRY:
+            raise ValueError("Priority must be in range 0~3.")
+
+        if self._count[priority] >= self._size:
+            self.dropped += 1
+            return False
+
+        packet = self.servo.build_packet(servo_id, cmd, params)
+        index = (self._head[priority] + self._count[priority]) % self._size
+        self._packets[priority][index] = packet
+        self._commands[priority][index] = command
+        self._callbacks[priority][index] = callback
+        self._ids[priority][index] = servo_id
+        self._stamps[priority][index] = time.ticks_us()
+        self._count[priority] += 1
+        return True
+
+    def stop(self, servo_id: int = 254) -> bool:
+        """
+        以急停优先级发送停止指令，并丢弃队列中该舵机尚未发送的运动指令。
+
+        Args:
+            servo_id (int): 舵机ID，默认254表示广播停止所有舵机。
+
+        Returns:
+            bool: 成功入队时返回True，队列已满时返回False。
+
+        ==========================================
+
+        Send a stop command with emergency priority and discard the queued motion commands of that servo.
+
+        Args:
+            servo_id (int): Servo ID, default 254 broadcasts the stop to every servo.
+
+        Returns:
+            bool: True if the request was queued, False if the queue is full.
+        """
+        self._discard(ServoScheduler.PRIORITY_MOTION, servo_id)
+        return self.submit(ServoScheduler.PRIORITY_ESTOP, servo_id, SerialServo.SERVO_MOVE_STOP[0])
+
+    def move(self, servo_id: int, position: int, time_ms: int) -> bool:
+        """
+        以运动优先级发送立即转动指令。
+
+        Args:
+            servo_id (int): 舵机ID。
+            position (int): 目标位置原始值，范围0~1000。
+            time_ms (int): 运动时间，单位毫秒，范围0~30000。
+
+        Returns:
+            bool: 成功入队时返回True，队列已满时返回False。
+
+        Raises:
+            ValueError: 如果位置或时间超出范围，则抛出异常。
+
+        ==========================================
+
+        Send an immediate move with motion priority.
+
+        Args:
+            servo_id (int): Servo ID.
+            position (int): Raw target position, range 0~1000.
+            time_ms (int): Move time in milliseconds, range 0~30000.
+
+        Returns:
+            bool: True if the request was queued, False if the queue is full.
+
+        Raises:
+            ValueError: If the position or time is out of range.
+        """
+        if position < 0 or position > 1000:
+            raise ValueError("Position must be in range 0~1000.")
+        if time_ms < 0 or time_ms > 30000:
+            raise ValueError("Time must be in range 0~30000 ms.")
+
+        params = [position & 0xFF, (position >> 8) & 0xFF, time_ms & 0xFF, (time_ms >> 8) & 0xFF]
+        return self.submit(ServoScheduler.PRIORITY_MOTION, servo_id, SerialServo.SERVO_MOVE_TIME_WRITE[0], params)
+
+    def write(self, servo_id: int, cmd: int, params: list = []) -> bool:
+        """
+        以配置优先级发送写入指令。
+
+        Args:
+            servo_id (int): 舵机ID。
+            cmd (int): 写入指令编号。
+            params (list): 参数列表。
+
+        Returns:
+            bool: 成功入队时返回True，队列已满时返回False。
+
+        ==========================================
+
+        Send a write command with config priority.
+
+        Args:
+            servo_id (int): Servo ID.
+            cmd (int): Write command ID.
+            params (list): Parameter list.
+
+        Returns:
+            bool: True if the request was queued, False if the queue is full.
+        """
+        return self.submit(ServoScheduler.PRIORITY_CONFIG, servo_id, cmd, params)
+
+    def read(self, servo_id: int, command: tuple, callback, priority: int = 3) -> bool:
+        """
+        将读取指令加入队列，回复通过回调函数返回。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            command (tuple): 读取命令元组，例如 SerialServo.SERVO_POS_READ。
+            callback (callable): 读取完成后调用 callback(servo_id, params)，失败时 params 为None；
+                                 params 是只在回调期间有效的视图，需要保留时应复制。
+            priority (int): 优先级，默认 PRIORITY_TELEMETRY。
+
+        Returns:
+            bool: 成功入队时返回True，队列已满时返回False。
+
+        Raises:
+            ValueError: 如果命令不是读取命令，则抛出异常。
+
+        ==========================================
+
+        Queue a read command; the reply is delivered through the callback.
+
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            command (tuple): Read command tuple, such as SerialServo.SERVO_POS_READ.
+            callback (callable): Called as callback(servo_id, params) when the read finishes; params is None on
+                                 failure. params is a view that is only valid during the callback; copy it to keep
+                                 it.
+            priority (int): Priority, default PRIORITY_TELEMETRY.
+
+        Returns:
+            bool: True if the request was queued, False if the queue is full.
+
+        Raises:
+            ValueError: If the command is not a read command.
+        """
+        if len(command) != 3 or command[0] not in SerialServo.READ_COMMANDS:
+            raise ValueError("Command is not a read command.")
+        return self.submit(priority, servo_id, command[0], [], command, callback)
+
+    def _discard(self, priority: int, servo_id: int) -> None:
+        """
+        丢弃队列中指定舵机的请求，舵机ID为254时丢弃全部请求。
+
+        ==========================================
+
+        Discard the queued requests of a servo, or all of them for servo ID 254.
+        """
+        size = self._size
+        head = self._head[priority]
+        kept = 0
+        for i in range(self._count[priority]):
+            src = (head + i) % size
+            if servo_id == 254 or self._ids[priority][src] == servo_id:
+                continue
+            # 保留的请求按顺序前移
+            dst = (head + kept) % size
+            if dst != src:
+                self._packets[priority][dst] = self._packets[priority][src]
+                self._commands[priority][dst] = self._commands[priority][src]
+                self._callbacks[priority][dst] = self._callbacks[priority][src]
+                self._ids[priority][dst] = self._ids[priority][src]
+                self._stamps[priority][dst] = self._stamps[priority][src]
+            kept += 1
+        # 释放被丢弃请求的引用
+        for i in range(kept, self._count[priority]):
+            index = (head + i) % size
+            self._packets[priority][index] = None
+            self._callbacks[priority][index] = None
+        self._count[priority] = kept
+
+    def _finish(self, params) -> None:
+        """
+        结束未完成的读取，并调用其回调函数。
+
+        ==========================================
+
+        Finish the read in flight and call its callback.
+        """
+        callback = self._pending_callback
+        servo_id = self._pending_id
+        self._pending_command = None
+        self._pending_callback = None
+        if callback is not None:
+            callback(servo_id, params)
+
+    def _poll_reply(self) -> bool:
+        """
+        检查未完成读取的回复：完整则解析，超过回复截止时间则放弃。
+
+        Returns:
+            bool: 读取已结束时返回True，仍在等待回复时返回False。
+
+        ==========================================
+
+        Check the reply of the read in flight: parse it when complete, drop it once the reply deadline has passed.
+
+        Returns:
+            bool: True if the read has finished, False while still waiting for the reply.
+        """
+        servo = self.servo
+        command = self._pending_command
+
+        if servo.uart.any() >= servo.reply_size(command):
+            params = servo.receive_command(command[0], command[2])
+            if len(params) == 0:
+                self.errors += 1
+                self._finish(None)
+            else:
+                self._finish(params)
+            return True
+
+        # 回复仍可能在截止时间前到达，此时发送任何数据都会与回复在半双工总线上冲突
+        if time.ticks_diff(time.ticks_us(), self._pending_deadline) <= 0:
+            return False
+
+        # 超时则清空接收缓冲区中的残留数据
+        self.timeouts += 1
+        servo.flush_input()
+        self._finish(None)
+        return True
+
+    def _sent(self, servo_id: int, packet) -> None:
+        """
+        数据包发送后，按其命令更新舵机控制类的配置缓存和影子状态，与通过 send_command 发送时一致。
+
+        ==========================================
+
+        After a packet has been sent, update the configuration cache and shadow state of the servo control
+        instance from its command, as if it had been sent with send_command.
+        """
+        servo = self.servo
+        if not (servo.cache_config or servo.coalesce_writes):
+            return
+        cmd = packet[4]
+        # 去掉帧头、ID、长度、命令和校验和
+        params = packet[5:-1]
+        if servo.cache_config:
+            servo._update_config_cache(servo_id, cmd, params)
+        if servo.coalesce_writes:
+            servo._update_shadow(servo_id, cmd, params)
+
+    def update(self) -> bool:
+        """
+        非阻塞地推进一次调度状态机。
+
+        如果有未完成的读取，则先检查其回复；总线空闲后按优先级发送排队的请求，
+        只写指令连续发送，遇到读取指令时发送后返回。
+
+        Returns:
+            bool: 本次调用发送了请求或结束了读取时返回True，否则返回False。
+
+        ==========================================
+
+        Advance the scheduler state machine once without blocking.
+
+        A read in flight is checked first; once the bus is idle, queued requests are sent in priority order,
+        write-only commands back to back, returning after a read has been sent.
+
+        Returns:
+            bool: True if a request was sent or a read finished during this call, otherwise False.
+        """
+        progress = False
+        if self._pending_command is not None:
+            if not self._poll_reply():
+                return False
+            progress = True
+
+        size = self._size
+        priority = 0
+        while priority < 4:
+            if self._count[priority] == 0:
+                priority += 1
+                continue
+
+            # 取出队首请求
+            index = self._head[priority]
+            packet = self._packets[priority][index]
+            command = self._commands[priority][index]
+            callback = self._callbacks[priority][index]
+            servo_id = self._ids[priority][index]
+            stamp = self._stamps[priority][index]
+            self._packets[priority][index] = None
+            self._callbacks[priority][index] = None
+            self._head[priority] = (index + 1) % size
+            self._count[priority] -= 1
+
+            now = time.ticks_us()
+            if priority in ServoScheduler.URGENT_PRIORITIES:
+                waited = time.ticks_diff(now, stamp)
+                if waited > self.max_motion_wait_us:
+                    self.max_motion_wait_us = waited
+
+            self.servo.write_packet(packet)
+            self._sent(servo_id, packet)
+            progress = True
+
+            # 读取指令发送后等待回复，之后再继续发送
+            if command is not None:
+                self._pending_command = command
+                self._pending_callback = callback
+                self._pending_id = servo_id
+                self._pending_deadline = self.servo.reply_deadline(command)
+                break
+
+            # 只写指令发送后可能有更高优先级的请求入队（例如在回调中），从最高优先级重新检查
+            priority = 0
+
+        return progress
+
+    def run_until_idle(self, timeout_ms: int = 1000) -> bool:
+        """
+        阻塞地处理队列，直到所有请求完成。
+
+        Args:
+            timeout_ms (int): 最长处理时间，单位毫秒。
+
+        Returns:
+            bool: 所有请求完成时返回True，超时返回False。
+
+        ==========================================
+
+        Process the queues until every request has finished.
+
+        Args:
+            timeout_ms (int): Longest processing time in milliseconds.
+
+        Returns:
+            bool: True if every request finished, False on timeout.
+        """
+        start = time.ticks_ms()
+        while self._pending_command is not None or self.pending() > 0:
+            self.update()
+            if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+                return False
+        return True
+
+    def pending(self, priority: int = None) -> int:
+        """
+        获取排队中的请求数量（不包括未完成的读取）。
+
+        Args:
+            priority (int, optional): 优先级，None表示所有优先级。
+
+        Returns:
+            int: 排队中的请求数量。
+
+        ==========================================
+
+        Number of queued requests, not counting the read in flight.
+
+        Args:
+            priority (int, optional): Priority, None means every priority.
+
+        Returns:
+            int: Number of queued requests.
+        """
+        if priority is None:
+            return sum(self._count)
+        return self._count[priority]
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,406 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/22 下午3:05
+# @Author  : 李清水
+# @File    : servo_sender.py
+# @Description : 串口舵机后台发送类，写入指令放入预分配的环形发送缓冲区，由定时器、micropython.schedule
+#                或asyncio任务在后台分块写入UART，控制循环不再被UART写入阻塞
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# MicroPython相关的模块，用于将定时器中断中的发送推迟到主程序上下文中执行
+import micropython
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机后台发送类
+class ServoSender:
+    """
+    串口舵机后台发送类。
+
+    `send_command` 在调用者的控制循环中同步调用 `uart.write`，低波特率下一次发送多个舵机的指令会阻塞循环数毫秒。
+    创建该类后，`SerialServo.write_packet` 把只写指令复制到预分配的环形发送缓冲区后立即返回（只复制数据包，不分配内存），
+    由后台按块写入UART：可以由 `start_timer()` 启动的硬件定时器通过 `micropython.schedule` 驱动，
+    也可以作为asyncio任务 `run()` 运行，或者在主循环中手动调用 `drain()`。每次最多写入 `chunk_size` 字节，
+    使单次写入不超过UART硬件缓冲区，不会阻塞。
+
+    读取指令需要按顺序收到回复，因此发送读取指令前会先同步写出缓冲区中的全部数据；缓冲区已满时同样先同步写出再发送。
+    读取指令发出后到回复截止时刻之前（同步读取则到回复处理完为止），后台发送暂停，不会与舵机的回复冲突。
+    发送完成时刻和回显字节数在数据真正写入UART时才累计到舵机控制类中。
+    环形缓冲区只由一个生产者（主程序）和一个消费者（后台发送）修改各自的读写位置，定时器调度的发送和主程序之间不需要加锁。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例。
+        chunk_size (int): 每次后台发送最多写入UART的字节数。
+        queued_bytes (int): 累计放入缓冲区的字节数。
+        overflows (int): 缓冲区已满、不得不同步写出的次数。
+        max_backlog (int): 缓冲区中待发送字节数的最大值。
+
+    Methods:
+        enqueue(packet) -> bool:
+            将数据放入发送缓冲区。
+        drain(max_bytes: int = None) -> int:
+            将缓冲区中的数据写入UART，最多写入 max_bytes 字节。
+        flush() -> None:
+            同步写出缓冲区中的全部数据。
+        backlog() -> int:
+            获取缓冲区中待发送的字节数。
+        start_timer(period_ms: int = 1, timer_id: int = -1) -> None:
+            启动定时器，定期在后台发送。
+        stop_timer() -> None:
+            停止定时器。
+        run(period_ms: int = 1) -> None:
+            asyncio任务，定期在后台发送。
+        close() -> None:
+            写出全部数据并与舵机控制类解除关联。
+
+    ==========================================
+
+    Background sender for serial servos.
+
+    `send_command` calls `uart.write` synchronously inside the caller's control loop, so at low baud rates a burst
+    for many servos blocks the loop for milliseconds. Once this class is created, `SerialServo.write_packet` copies
+    write-only commands into a preallocated TX ring buffer and returns at once (only the packet bytes are copied,
+    nothing is allocated), and the buffer is written to the UART in the background: by a hardware timer started with
+    `start_timer()` through `micropython.schedule`, by the asyncio task `run()`, or by calling `drain()` from the
+    main loop. At most `chunk_size` bytes are written per drain, so a single write fits the UART hardware buffer and
+    does not block.
+
+    Read commands need their replies in order, so everything queued is written synchronously before a read command
+    is sent; the same happens when the buffer is full. After a read command, background drains pause until its reply
+    deadline (or until a synchronous read has handled the reply), so they cannot collide with the servo's reply.
+    The end of transmission and the echoed byte count are added to the servo control instance when the data is
+    actually written to the UART. Only one producer (the main program) and one consumer (the
+    background drain) update their own ring index, so the timer-scheduled drain needs no lock against the main program.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance.
+        chunk_size (int): Largest number of bytes one background drain writes to the UART.
+        queued_bytes (int): Total number of bytes queued.
+        overflows (int): Number of times the buffer was full and had to be written synchronously.
+        max_backlog (int): Largest number of bytes waiting in the buffer.
+
+    Methods:
+        enqueue(packet) -> bool:
+            Put data into the TX buffer.
+        drain(max_bytes: int = None) -> int:
+            Write buffered data to the UART, at most max_bytes bytes.
+        flush() -> None:
+            Write all buffered data synchronously.
+        backlog() -> int:
+            Number of bytes waiting to be sent.
+        start_timer(period_ms: int = 1, timer_id: int = -1) -> None:
+            Start a timer that drains the buffer periodically.
+        stop_timer() -> None:
+            Stop the timer.
+        run(period_ms: int = 1) -> None:
+            asyncio task draining the buffer periodically.
+        close() -> None:
+            Write all data and detach from the servo control instance.
+    """
+
+    def __init__(self, servo: SerialServo, buffer_size: int = 512, chunk_size: int = 32) -> None:
+        """
+        初始化后台发送类，并关联到舵机控制类，之后的只写指令都经过发送缓冲区。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            buffer_size (int): 环形发送缓冲区的容量，单位字节。
+            chunk_size (int): 每次后台发送最多写入的字节数，应不大于UART硬件发送缓冲区。
+
+        Raises:
+            ValueError: 如果缓冲区容量或每次写入的字节数不大于0，则抛出异常。
+
+        ==========================================
+
+        Initialize the background sender and attach it to the servo control instance; from now on write-only
+        commands go through the TX buffer.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            buffer_size (int): Capacity of the TX ring buffer in bytes.
+            chunk_size (int): Largest number of bytes one background drain writes; should not exceed the UART
+                              hardware TX buffer.
+
+        Raises:
+            ValueError: If the buffer size or chunk size is not greater than 0.
+        """
+        if buffer_size <= 0 or chunk_size <= 0:
+            raise ValueError("Buffer size and chunk size must be greater than 0.")
+
+        self.servo = servo
+        self.chunk_size = chunk_size
+
+        # 环形缓冲区，多留一个字节用于区分空和满；_head 只由发送方修改，_tail 只由放入方修改
+        self._size = buffer_size + 1
+        self._buffer = bytearray(self._size)
+        self._view = memoryview(self._buffer)
+        self._head = 0
+        self._tail = 0
+
+        # 同步写出时置位，期间跳过后台发送
+        self._busy = False
+        # 等待读取回复时的截止时刻，之前暂停后台发送；由舵机控制类在发送读取指令时设置，None表示不暂停
+        self._hold_until = None
+        # 定时器实例和预先绑定的回调，避免每次中断分配内存
+        self._timer = None
+        self._drain_ref = self._scheduled_drain
+        self._irq_ref = self._irq
+
+        # 统计数据
+        self.queued_bytes = 0
+        self.overflows = 0
+        self.max_backlog = 0
+
+        servo.sender = self
+
+    def backlog(self) -> int:
+        """
+        获取缓冲区中待发送的字节数。
+
+        Returns:
+            int: 待发送的字节数。
+
+        ==========================================
+
+        Number of bytes waiting to be sent.
+
+        Returns:
+            int: Number of bytes waiting.
+        """
+        return (self._tail - self._head) % self._size
+
+    def enqueue(self, packet) -> bool:
+        """
+        将数据放入发送缓冲区，不写入UART。
+
+        Args:
+            packet (bytes | bytearray | memoryview): 一个或多个完整的数据包。
+
+        Returns:
+            bool: 放入成功时返回True，缓冲区空间不足时返回False（不放入任何数据）。
+
+        ==========================================
+
+        Put data into the TX buffer without writing to the UART.
+
+        Args:
+            packet (bytes | bytearray | memoryview): One or more complete packets.
+
+        Returns:
+            bool: True if the data was queued, False if there is not enough room (nothing is queued).
+        """
+        length = len(packet)
+        size = self._size
+        tail = self._tail
+        backlog = (tail - self._head) % size
+        if backlog + length > size - 1:
+            return False
+
+        # 复制到缓冲区，跨越末尾时分两段复制
+        first = size - tail
+        if length <= first:
+            self._buffer[tail:tail + length] = packet
+        else:
+            self._buffer[tail:size] = packet[:first]
+            self._buffer[0:length - first] = packet[first:]
+
+        # 数据复制完成后再移动写入位置，后台发送不会读到不完整的数据
+        self._tail = (tail + length) % size
+        self.queued_bytes += length
+        backlog += length
+        if backlog > self.max_backlog:
+            self.max_backlog = backlog
+        return True
+
+    def _write(self, max_bytes: int) -> int:
+        """
+        将缓冲区中最多 max_bytes 字节写入UART。
+
+        ==========================================
+
+        Write at most max_bytes bytes of the buffer to the UART.
+        """
+        servo = self.servo
+        size = self._size
+        head = self._head
+        tail = self._tail
+        written = 0
+        while head != tail and written < max_bytes:
+            # 每次写入一段连续的数据
+            end = tail if tail > head else size
+            if end - head > max_bytes - written:
+                end = head + max_bytes - written
+            servo.uart.write(self._view[head:end])
+            written += end - head
+            head = end % size
+            self._head = head
+
+        if written > 0:
+            # 数据真正写入UART时才累计发送完成时刻和回显字节数
+            if servo.timing is not None:
+                servo._tx_end = servo.timing.tx_end(servo._tx_end, written)
+            # 读取指令总是在同步写出缓冲区之后发送，回显比对使用的最近数据包仍是读取指令本身
+            if servo.echo:
+                servo._echo_pending += written
+        return written
+
+    def drain(self, max_bytes: int = None) -> int:
+        """
+        将缓冲区中的数据写入UART。
+
+        Args:
+            max_bytes (int, optional): 最多写入的字节数，None表示 chunk_size。
+
+        Returns:
+            int: 写入的字节数，同步写出正在进行或正在等待读取回复时返回0。
+
+        ==========================================
+
+        Write buffered data to the UART.
+
+        Args:
+            max_bytes (int, optional): Largest number of bytes to write, None means chunk_size.
+
+        Returns:
+            int: Number of bytes written, 0 while a synchronous flush is in progress or a read reply is awaited.
+        """
+        if self._busy:
+            return 0
+        hold = self._hold_until
+        if hold is not None:
+            # 读取回复截止之前不发送
+            if time.ticks_diff(hold, time.ticks_us()) > 0:
+                return 0
+            self._hold_until = None
+        if max_bytes is None:
+            max_bytes = self.chunk_size
+        return self._write(max_bytes)
+
+    def flush(self) -> None:
+        """
+        同步写出缓冲区中的全部数据。
+
+        ==========================================
+
+        Write all buffered data synchronously.
+        """
+        self._busy = True
+        try:
+            self._write(self._size)
+        finally:
+            self._busy = False
+
+    def _scheduled_drain(self, _) -> None:
+        """
+        由 micropython.schedule 在主程序上下文中调用的发送函数。
+
+        ==========================================
+
+        Drain function called by micropython.schedule in the main program context.
+        """
+        self.drain()
+
+    def _irq(self, _) -> None:
+        """
+        定时器中断回调，将发送推迟到主程序上下文中执行。
+
+        ==========================================
+
+        Timer interrupt callback deferring the drain to the main program context.
+        """
+        if self._head != self._tail:
+            try:
+                micropython.schedule(self._drain_ref, None)
+            except RuntimeError:
+                # 调度队列已满，下一次中断再发送
+                pass
+
+    def start_timer(self, period_ms: int = 1, timer_id: int = -1) -> None:
+        """
+        启动定时器，定期在后台发送。
+
+        Args:
+            period_ms (int): 发送周期，单位毫秒。
+            timer_id (int): 定时器编号，默认-1表示虚拟定时器。
+
+        Raises:
+            ValueError: 如果发送周期不大于0，则抛出异常。
+
+        ==========================================
+
+        Start a timer that drains the buffer periodically.
+
+        Args:
+            period_ms (int): Drain period in milliseconds.
+            timer_id (int): Timer ID, default -1 for a virtual timer.
+
+        Raises:
+            ValueError: If the period is not greater than 0.
+        """
+        if period_ms <= 0:
+            raise ValueError("Period must be greater than 0.")
+
+        # 只在使用定时器时导入，便于在没有定时器的平台上使用其他发送方式
+        from machine import Timer
+
+        self.stop_timer()
+        self._timer = Timer(timer_id)
+        self._timer.init(mode=Timer.PERIODIC, period=period_ms, callback=self._irq_ref)
+
+    def stop_timer(self) -> None:
+        """
+        停止定时器。
+
+        ==========================================
+
+        Stop the timer.
+        """
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+
+    async def run(self, period_ms: int = 1) -> None:
+        """
+        asyncio任务，定期在后台发送，使用 asyncio.create_task(sender.run()) 启动。
+
+        Args:
+            period_ms (int): 发送周期，单位毫秒。
+
+        ==========================================
+
+        asyncio task draining the buffer periodically; start it with asyncio.create_task(sender.run()).
+
+        Args:
+            period_ms (int): Drain period in milliseconds.
+        """
+        import asyncio
+
+        while True:
+            self.drain()
+            await asyncio.sleep_ms(period_ms)
+
+    def close(self) -> None:
+        """
+        停止定时器，写出全部数据，并与舵机控制类解除关联。
+
+        ==========================================
+
+        Stop the timer, write all data and detach from the servo control instance.
+        """
+        self.stop_timer()
+        self.flush()
+        if self.servo.sender is self:
+            self.servo.sender = None
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
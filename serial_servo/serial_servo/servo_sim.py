@@ -0,0 +1,741 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/18 上午11:05
+# @Author  : 李清水
+# @File    : servo_sim.py
+# @Description : 串口舵机总线模拟，提供可替代UART的模拟总线和实现全部指令的虚拟舵机，用于无硬件测试和性能测试
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 流对象基类，使模拟总线可以被asyncio轮询
+import io
+# 随机数模块，用于按概率注入故障
+import random
+
+# ======================================== 全局变量 ============================================
+
+# 帧头
+_HEADER = 0x55
+# 广播ID
+_BROADCAST_ID = 254
+# 流对象轮询请求及事件（与 MicroPython 的 stream 定义一致）
+_MP_STREAM_POLL = 3
+_MP_STREAM_POLL_RD = 0x0001
+_MP_STREAM_POLL_WR = 0x0004
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 虚拟串口舵机类
+class VirtualServo:
+    """
+    虚拟串口舵机类，在内存中实现舵机的全部指令。
+
+    位置按最近一次转动指令的起点、目标和时间线性插值，目标位置限制在角度限位范围内；
+    输入电压和温度可以直接修改 vin_mv 和 temp_c 属性来模拟不同工况。
+
+    Attributes:
+        servo_id (int): 舵机ID。
+        position (int): 最近一次转动的起始位置，舵机原始单位0~1000。
+        target (int): 目标位置，舵机原始单位0~1000。
+        vin_mv (int): 输入电压，单位毫伏。
+        temp_c (int): 温度，单位摄氏度。
+
+    Methods:
+        read_position() -> int:
+            获取当前位置。
+        handle(cmd: int, params: bytes) -> list:
+            执行一条指令，读取指令返回回复参数，写入指令返回None。
+
+    ==========================================
+
+    Virtual serial servo implementing the full command set in memory.
+
+    The position is interpolated linearly between the start, target and time of the last move and the target is
+    clamped to the angle limits; vin_mv and temp_c can be changed directly to emulate operating conditions.
+
+    Attributes:
+        servo_id (int): Servo ID.
+        position (int): Start position of the last move, raw units 0~1000.
+        target (int): Target position, raw units 0~1000.
+        vin_mv (int): Input voltage in millivolts.
+        temp_c (int): Temperature in degrees Celsius.
+
+    Methods:
+        read_position() -> int:
+            Get the current position.
+        handle(cmd: int, params: bytes) -> list:
+            Execute a command; reads return the reply parameters, writes return None.
+    """
+
+    def __init__(self, servo_id: int, position: int = 500) -> None:
+        """
+        初始化虚拟舵机，配置为出厂默认值。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            position (int): 初始位置，舵机原始单位0~1000，默认500。
+
+        Raises:
+            ValueError: 如果舵机ID或初始位置超出范围，则抛出异常。
+
+        ==========================================
+
+        Initialize a virtual servo with factory default configuration.
+
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            position (int): Initial position, raw units 0~1000, default 500.
+
+        Raises:
+            ValueError: If the servo ID or the initial position is out of range.
+        """
+        if servo_id < 0 or servo_id > 253:
+            raise ValueError("Servo ID must be in range 0~253.")
+        if position < 0 or position > 1000:
+            raise ValueError("Position must be in range 0~1000.")
+
+        self.servo_id = servo_id
+
+        # 运动状态：起始位置、目标位置、开始时间和运动时间
+        self.position = position
+        self.target = position
+        self._move_start = time.ticks_ms()
+        self._move_time = 0
+        # 最近一次立即转动和延迟转动指令的参数
+        self._move_params = [position & 0xFF, position >> 8, 0, 0]
+        self._wait_params = [position & 0xFF, position >> 8, 0, 0]
+        self._wait_pending = False
+
+        # 配置，与出厂默认值一致
+        self.offset = 0
+        self.angle_limit = [0, 0, 0xE8, 0x03]
+        self.vin_limit = [0x94, 0x11, 0xE0, 0x2E]
+        self.temp_limit = 85
+        self.mode = [0, 0, 0, 0]
+        self.load = 0
+        self.led = 0
+        self.alarm = 7
+
+        # 工况
+        self.vin_mv = 7400
+        self.temp_c = 30
+
+    def read_position(self) -> int:
+        """
+        获取当前位置。
+
+        Returns:
+            int: 当前位置，舵机原始单位。
+
+        ==========================================
+
+        Get the current position.
+
+        Returns:
+            int: Current position in raw units.
+        """
+        if self._move_time <= 0:
+            return self.target
+        elapsed = time.ticks_diff(time.ticks_ms(), self._move_start)
+        if elapsed >= self._move_time:
+            return self.target
+        return self.position + (self.target - self.position) * elapsed // self._move_time
+
+    def _move(self, params) -> None:
+        """
+        按转动参数开始运动，目标位置限制在角度限位范围内。
+
+        ==========================================
+
+        Start a move from move parameters, clamping the target to the angle limits.
+        """
+        low = self.angle_limit[0] | (self.angle_limit[1] << 8)
+        high = self.angle_limit[2] | (self.angle_limit[3] << 8)
+        target = params[0] | (params[1] << 8)
+        target = min(max(target, low), high)
+
+        self.position = self.read_position()
+        self.target = target
+        self._move_start = time.ticks_ms()
+        self._move_time = params[2] | (params[3] << 8)
+
+    def handle(self, cmd: int, params) -> list:
+        """
+        执行一条指令。
+
+        Args:
+            cmd (int): 指令编号。
+            params (bytes): 指令参数。
+
+        Returns:
+            list: 读取指令返回回复参数，写入指令和未知指令返回None。
+
+        ==========================================
+
+        Execute a command.
+
+        Args:
+            cmd (int): Command ID.
+            params (bytes): Command parameters.
+
+        Returns:
+            list: Reply parameters for read commands, None for write and unknown commands.
+        """
+        if cmd == 1:
+            self._move_params = list(params)
+            self._move(params)
+        elif cmd == 2:
+            return list(self._move_params)
+        elif cmd == 7:
+            self._wait_params = list(params)
+            self._wait_pending = True
+        elif cmd == 8:
+            return list(self._wait_params)
+        elif cmd == 11:
+            if self._wait_pending:
+                self._wait_pending = False
+                self._move(self._wait_params)
+        elif cmd == 12:
+            # 停止在当前位置
+            self.position = self.read_position()
+            self.target = self.position
+            self._move_time = 0
+        elif cmd == 13:
+            self.servo_id = params[0]
+        elif cmd == 14:
+            return [self.servo_id]
+        elif cmd == 17:
+            self.offset = params[0]
+        elif cmd == 18:
+            # 偏差保存到掉电存储，模拟中无需处理
+            pass
+        elif cmd == 19:
+            return [self.offset]
+        elif cmd == 20:
+            self.angle_limit = list(params)
+        elif cmd == 21:
+            return list(self.angle_limit)
+        elif cmd == 22:
+            self.vin_limit = list(params)
+        elif cmd == 23:
+            return list(self.vin_limit)
+        elif cmd == 24:
+            self.temp_limit = params[0]
+        elif cmd == 25:
+            return [self.temp_limit]
+        elif cmd == 26:
+            return [self.temp_c]
+        elif cmd == 27:
+            return [self.vin_mv & 0xFF, (self.vin_mv >> 8) & 0xFF]
+        elif cmd == 28:
+            position = self.read_position() & 0xFFFF
+            return [position & 0xFF, position >> 8]
+        elif cmd == 29:
+            self.mode = list(params)
+        elif cmd == 30:
+            return list(self.mode)
+        elif cmd == 31:
+            self.load = params[0]
+        elif cmd == 32:
+            return [self.load]
+        elif cmd == 33:
+            self.led = params[0]
+        elif cmd == 34:
+            return [self.led]
+        elif cmd == 35:
+            self.alarm = params[0]
+        elif cmd == 36:
+            return [self.alarm]
+        return None
+
+# 模拟串口舵机总线类
+class SimulatedUART(io.IOBase):
+    """
+    模拟串口舵机总线类，可以代替 `machine.UART` 传给 `SerialServo` 及其扩展类。
+
+    写入的字节按协议解析后交给对应的虚拟舵机处理，读取指令的回复放入接收缓冲区。启用实时模式时按波特率
+    计算每个字节在线路上的传输时间，半双工总线上请求和回复依次占用总线，回复在请求发送完成并经过舵机响应
+    时间后逐字节到达；可以模拟单线总线的回显，也可以按次数或按概率注入校验和错误和不回复故障。
+    实现了 `any`、`read`、`readinto`、`write` 以及供asyncio轮询的 `ioctl`。
+
+    Attributes:
+        servos (dict): 舵机ID -> VirtualServo。
+        baudrate (int): 模拟的波特率。
+        latency_us (int): 舵机收到请求后开始回复的时间，单位微秒。
+        echo (bool): 是否将发送的字节回显到接收端。
+        realtime (bool): 是否按波特率模拟传输时间，为False时回复立即可读。
+        txbuf (int): 发送缓冲区大小，未发送完的字节超过该大小时 write 阻塞，与真实UART一致。
+        checksum_error_rate (float): 回复校验和错误的概率。
+        timeout_rate (float): 读取请求不回复的概率。
+        bytes_written (int): 写入的字节数。
+        bytes_read (int): 读取的字节数。
+        rejected (int): 校验和错误而被虚拟舵机忽略的请求数量。
+
+    Methods:
+        add_servo(servo: VirtualServo) -> None:
+            添加一个虚拟舵机。
+        inject_fault(kind: int, count: int = 1) -> None:
+            让接下来的若干个回复出现指定故障。
+        any() -> int:
+            返回可读取的字节数。
+        read(nbytes=None) -> bytes:
+            读取数据。
+        readinto(buf, nbytes=None) -> int:
+            读取数据到缓冲区。
+        write(buf) -> int:
+            发送数据。
+
+    ==========================================
+
+    Simulated serial servo bus that can be passed to `SerialServo` and its extensions instead of `machine.UART`.
+
+    Written bytes are parsed according to the protocol and handled by the addressed virtual servos; replies to
+    read commands are queued for reading. In realtime mode every byte takes its wire time at the configured
+    baudrate, requests and replies occupy the half-duplex bus one after another, and replies arrive byte by byte
+    after the request has been sent and the servo latency has elapsed. One-wire echo can be emulated, and checksum
+    and no-reply faults can be injected by count or by probability. Implements `any`, `read`, `readinto`, `write`
+    and `ioctl` for asyncio polling.
+
+    Attributes:
+        servos (dict): Servo ID -> VirtualServo.
+        baudrate (int): Simulated baudrate.
+        latency_us (int): Time a servo takes to start replying, in microseconds.
+        echo (bool): Whether transmitted bytes are echoed into RX.
+        realtime (bool): Whether wire time is simulated; when False replies are readable at once.
+        txbuf (int): Transmit buffer size; write blocks while more unsent bytes are queued, like a real UART.
+        checksum_error_rate (float): Probability of a reply with a wrong checksum.
+        timeout_rate (float): Probability that a read request is not answered.
+        bytes_written (int): Number of bytes written.
+        bytes_read (int): Number of bytes read.
+        rejected (int): Number of requests ignored by the virtual servos because of a wrong checksum.
+
+    Methods:
+        add_servo(servo: VirtualServo) -> None:
+            Add a virtual servo.
+        inject_fault(kind: int, count: int = 1) -> None:
+            Make the next replies fail with the given fault.
+        any() -> int:
+            Number of bytes available for reading.
+        read(nbytes=None) -> bytes:
+            Read data.
+        readinto(buf, nbytes=None) -> int:
+            Read data into a buffer.
+        write(buf) -> int:
+            Send data.
+    """
+
+    # 类变量：故障类型
+    # 回复的校验和错误
+    FAULT_CHECKSUM = 0
+    # 不回复
+    FAULT_TIMEOUT = 1
+    # 回复缺少最后一个字节
+    FAULT_TRUNCATE = 2
+
+    def __init__(self, servo_ids=(1,), baudrate: int = 115200, latency_us: int = 500, echo: bool = False,
+                 realtime: bool = True, checksum_error_rate: float = 0.0, timeout_rate: float = 0.0,
+                 txbuf: int = 256) -> None:
+        """
+        初始化模拟总线，并为每个ID创建一个虚拟舵机。
+
+        Args:
+            servo_ids (iterable): 虚拟舵机的ID，默认只有1号舵机。
+            baudrate (int): 模拟的波特率，默认115200。
+            latency_us (int): 舵机收到请求后开始回复的时间，单位微秒，默认500。
+            echo (bool): 是否将发送的字节回显到接收端，默认False。
+            realtime (bool): 是否按波特率模拟传输时间，默认True。
+            checksum_error_rate (float): 回复校验和错误的概率，默认0。
+            timeout_rate (float): 读取请求不回复的概率，默认0。
+            txbuf (int): 发送缓冲区大小，默认256字节。
+
+        Raises:
+            ValueError: 如果波特率或发送缓冲区大小不为正数、响应时间为负数或概率不在0~1范围内，则抛出异常。
+
+        ==========================================
+
+        Initialize the simulated bus with one virtual servo per ID.
+
+        Args:
+            servo_ids (iterable): IDs of the virtual servos, default only servo 1.
+            baudrate (int): Simulated baudrate, default 115200.
+            latency_us (int): Time a servo takes to start replying, in microseconds, default 500.
+            echo (bool): Whether transmitted bytes are echoed into RX, default False.
+            realtime (bool): Whether wire time is simulated, default True.
+            checksum_error_rate (float): Probability of a reply with a wrong checksum, default 0.
+            timeout_rate (float): Probability that a read request is not answered, default 0.
+            txbuf (int): Transmit buffer size, default 256 bytes.
+
+        Raises:
+            ValueError: If the baudrate or the buffer size is not positive, the latency is negative
+                        or a probability is not in 0~1.
+        """
+        if baudrate <= 0:
+            raise ValueError("Baudrate must be positive.")
+        if txbuf <= 0:
+            raise ValueError("Transmit buffer size must be positive.")
+        if latency_us < 0:
+            raise ValueError("Latency must not be negative.")
+        if not (0 <= checksum_error_rate <= 1) or not (0 <= timeout_rate <= 1):
+            raise ValueError("Fault rates must be in range 0~1.")
+
+        self.servos = {}
+        for servo_id in servo_ids:
+            self.add_servo(VirtualServo(servo_id))
+
+        self.baudrate = baudrate
+        self.latency_us = latency_us
+        self.echo = echo
+        self.realtime = realtime
+        self.txbuf = txbuf
+        self.checksum_error_rate = checksum_error_rate
+        self.timeout_rate = timeout_rate
+
+        # 每个字节（1位起始位、8位数据位、1位停止位）的传输时间，单位微秒
+        self._byte_us = (10 * 1000000 + baudrate - 1) // baudrate
+        # 接收队列：每段为 [开始到达的时间, 数据]，段内字节依次间隔一个字节时间到达
+        self._segments = []
+        # 总线空闲的时间
+        self._bus_free = time.ticks_us()
+        # 尚未凑成完整数据包的发送字节
+        self._tx = bytearray()
+        # 按次数注入的故障：[故障类型, 剩余次数]
+        self._faults = []
+
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.rejected = 0
+
+    def add_servo(self, servo: VirtualServo) -> None:
+        """
+        添加一个虚拟舵机，ID相同时替换原有舵机。
+
+        Args:
+            servo (VirtualServo): 虚拟舵机实例。
+
+        ==========================================
+
+        Add a virtual servo, replacing any servo with the same ID.
+
+        Args:
+            servo (VirtualServo): Virtual servo instance.
+        """
+        self.servos[servo.servo_id] = servo
+
+    def inject_fault(self, kind: int, count: int = 1) -> None:
+        """
+        让接下来的若干个回复出现指定故障。
+
+        Args:
+            kind (int): 故障类型，FAULT_CHECKSUM、FAULT_TIMEOUT 或 FAULT_TRUNCATE。
+            count (int): 出现故障的回复数量，默认1。
+
+        Raises:
+            ValueError: 如果故障类型无效或数量不为正数，则抛出异常。
+
+        ==========================================
+
+        Make the next replies fail with the given fault.
+
+        Args:
+            kind (int): Fault type, FAULT_CHECKSUM, FAULT_TIMEOUT or FAULT_TRUNCATE.
+            count (int): Number of replies affected, default 1.
+
+        Raises:
+            ValueError: If the fault type is invalid or the count is not positive.
+        """
+        if kind not in (SimulatedUART.FAULT_CHECKSUM, SimulatedUART.FAULT_TIMEOUT, SimulatedUART.FAULT_TRUNCATE):
+            raise ValueError("Invalid fault type.")
+        if count <= 0:
+            raise ValueError("Fault count must be positive.")
+        self._faults.append([kind, count])
+
+    def _next_fault(self) -> int:
+        """
+        获取下一个回复的故障类型，没有故障时返回-1。
+
+        ==========================================
+
+        Get the fault of the next reply, or -1 if there is none.
+        """
+        if self._faults:
+            fault = self._faults[0]
+            fault[1] -= 1
+            if fault[1] == 0:
+                self._faults.pop(0)
+            return fault[0]
+        if self.timeout_rate > 0 and random.getrandbits(16) < self.timeout_rate * 65536:
+            return SimulatedUART.FAULT_TIMEOUT
+        if self.checksum_error_rate > 0 and random.getrandbits(16) < self.checksum_error_rate * 65536:
+            return SimulatedUART.FAULT_CHECKSUM
+        return -1
+
+    def _transmit(self, data, earliest) -> tuple:
+        """
+        在总线空闲后发送一段数据（请求的回显或舵机的回复），返回发送完成的时间。
+
+        ==========================================
+
+        Put a piece of data on the bus once it is free (echo of a request or a servo reply) and return
+        the time its transmission ends.
+        """
+        start = earliest
+        if time.ticks_diff(self._bus_free, start) > 0:
+            start = self._bus_free
+        end = time.ticks_add(start, len(data) * self._byte_us)
+        self._bus_free = end
+        return start, end
+
+    def _queue(self, start, data) -> None:
+        """
+        将一段数据放入接收队列。
+
+        ==========================================
+
+        Queue a piece of data for reading.
+        """
+        if len(data) > 0:
+            self._segments.append([start, bytes(data)])
+
+    def _reply(self, servo_id: int, cmd: int, params: list, earliest) -> None:
+        """
+        构建回复数据包，注入故障后放入接收队列。
+
+        ==========================================
+
+        Build a reply packet, apply any injected fault and queue it.
+        """
+        fault = self._next_fault()
+        if fault == SimulatedUART.FAULT_TIMEOUT:
+            return
+
+        packet = bytearray([_HEADER, _HEADER, servo_id, 3 + len(params), cmd])
+        packet.extend(bytes(params))
+        packet.append(~(sum(packet[2:]) & 0xFF) & 0xFF)
+        if fault == SimulatedUART.FAULT_CHECKSUM:
+            packet[-1] ^= 0xFF
+        elif fault == SimulatedUART.FAULT_TRUNCATE:
+            packet = packet[:-1]
+
+        start, _ = self._transmit(packet, time.ticks_add(earliest, self.latency_us))
+        self._queue(start, packet)
+
+    def _process(self, packet_end) -> None:
+        """
+        从发送缓冲区中解析完整的数据包并交给虚拟舵机处理。
+
+        ==========================================
+
+        Parse complete packets from the transmit buffer and hand them to the virtual servos.
+        """
+        tx = self._tx
+        while True:
+            # 丢弃帧头之前的字节
+            while len(tx) >= 2 and not (tx[0] == _HEADER and tx[1] == _HEADER):
+                del tx[0]
+            if len(tx) < 4:
+                return
+            size = tx[3] + 3
+            if len(tx) < size:
+                return
+
+            packet = bytes(tx[:size])
+            del tx[:size]
+
+            servo_id = packet[2]
+            cmd = packet[4]
+            params = packet[5:-1]
+            if (~(sum(packet[2:-1]) & 0xFF) & 0xFF) != packet[-1]:
+                self.rejected += 1
+                continue
+
+            if servo_id == _BROADCAST_ID:
+                targets = list(self.servos.values())
+            elif servo_id in self.servos:
+                targets = [self.servos[servo_id]]
+            else:
+                continue
+
+            for servo in targets:
+                old_id = servo.servo_id
+                reply = servo.handle(cmd, params)
+                # 修改ID后更新舵机表
+                if servo.servo_id != old_id:
+                    del self.servos[old_id]
+                    self.servos[servo.servo_id] = servo
+                if reply is not None:
+                    self._reply(servo.servo_id, cmd, reply, packet_end)
+
+    def write(self, buf) -> int:
+        """
+        发送数据，虚拟舵机在请求发送完成后处理并回复。
+
+        Args:
+            buf (bytes | bytearray | memoryview): 发送的数据。
+
+        Returns:
+            int: 发送的字节数。
+
+        ==========================================
+
+        Send data; the virtual servos handle and answer each request once it has been transmitted.
+
+        Args:
+            buf (bytes | bytearray | memoryview): Data to send.
+
+        Returns:
+            int: Number of bytes sent.
+        """
+        data = bytes(buf)
+        self.bytes_written += len(data)
+
+        # 总线上未发送完的字节超过发送缓冲区时阻塞，直到放得下本次数据
+        if self.realtime:
+            backlog = time.ticks_diff(self._bus_free, time.ticks_us())
+            excess = backlog - (self.txbuf - len(data)) * self._byte_us
+            if excess > 0:
+                time.sleep_us(excess)
+
+        start, end = self._transmit(data, time.ticks_us())
+        if self.echo:
+            self._queue(start, data)
+
+        # 数据包按发送完成的时间依次处理，简化为整段发送完成后处理
+        self._tx.extend(data)
+        self._process(end)
+        return len(data)
+
+    def _available(self) -> int:
+        """
+        计算已经到达的字节数。
+
+        ==========================================
+
+        Count the bytes that have arrived.
+        """
+        if not self.realtime:
+            return sum(len(segment[1]) for segment in self._segments)
+
+        now = time.ticks_us()
+        count = 0
+        for start, data in self._segments:
+            elapsed = time.ticks_diff(now, start)
+            if elapsed <= 0:
+                break
+            arrived = elapsed // self._byte_us
+            if arrived < len(data):
+                count += arrived
+                break
+            count += len(data)
+        return count
+
+    def any(self) -> int:
+        """
+        返回可读取的字节数。
+
+        Returns:
+            int: 可读取的字节数。
+
+        ==========================================
+
+        Number of bytes available for reading.
+
+        Returns:
+            int: Number of readable bytes.
+        """
+        return self._available()
+
+    def read(self, nbytes=None):
+        """
+        读取已到达的数据。
+
+        Args:
+            nbytes (int, optional): 最多读取的字节数，None表示全部。
+
+        Returns:
+            bytes: 读取的数据，没有数据时返回None。
+
+        ==========================================
+
+        Read the data that has arrived.
+
+        Args:
+            nbytes (int, optional): Maximum number of bytes, None means everything.
+
+        Returns:
+            bytes: Data read, or None if nothing is available.
+        """
+        count = self._available()
+        if nbytes is not None and nbytes < count:
+            count = nbytes
+        if count <= 0:
+            return None
+
+        result = bytearray()
+        while len(result) < count:
+            segment = self._segments[0]
+            take = count - len(result)
+            data = segment[1]
+            if take >= len(data):
+                result.extend(data)
+                self._segments.pop(0)
+            else:
+                result.extend(data[:take])
+                # 剩余字节的到达时间顺延
+                segment[0] = time.ticks_add(segment[0], take * self._byte_us)
+                segment[1] = data[take:]
+
+        self.bytes_read += count
+        return bytes(result)
+
+    def readinto(self, buf, nbytes=None):
+        """
+        读取已到达的数据到缓冲区。
+
+        Args:
+            buf (bytearray | memoryview): 目标缓冲区。
+            nbytes (int, optional): 最多读取的字节数，None表示缓冲区长度。
+
+        Returns:
+            int: 读取的字节数，没有数据时返回None。
+
+        ==========================================
+
+        Read the data that has arrived into a buffer.
+
+        Args:
+            buf (bytearray | memoryview): Destination buffer.
+            nbytes (int, optional): Maximum number of bytes, None means the buffer length.
+
+        Returns:
+            int: Number of bytes read, or None if nothing is available.
+        """
+        if nbytes is None or nbytes > len(buf):
+            nbytes = len(buf)
+        data = self.read(nbytes)
+        if data is None:
+            return None
+        buf[:len(data)] = data
+        return len(data)
+
+    def ioctl(self, request: int, arg: int) -> int:
+        """
+        流对象轮询接口，使asyncio可以等待模拟总线可读。
+
+        ==========================================
+
+        Stream polling interface so that asyncio can wait for the simulated bus to become readable.
+        """
+        if request == _MP_STREAM_POLL:
+            events = arg & _MP_STREAM_POLL_WR
+            if (arg & _MP_STREAM_POLL_RD) and self._available() > 0:
+                events |= _MP_STREAM_POLL_RD
+            return events
+        return 0
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,506 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/25 下午3:20
+# @Author  : 李清水
+# @File    : servo_snapshot.py
+# @Description : 串口舵机配置快照类，将多个舵机的配置保存为Flash上的紧凑二进制文件，
+#                启动时直接载入配置缓存，再按抽样方式在后台确认，不再逐个重新读取
+
+# ======================================== 导入相关模块 =========================================
+
+# 文件系统相关的模块，用于原子地替换快照文件
+import os
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+# 导入多串口舵机总线管理类，用于交错读取
+from .servo_bus import ServoBusManager
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机配置快照类
+class ServoConfigSnapshot:
+    """
+    串口舵机配置快照类。
+
+    每次启动前逐个读取所有舵机的角度限位、偏差、电压范围和工作模式需要大量总线往返。
+    该类将这些配置保存为Flash上的紧凑二进制快照，启动时：
+
+    1. 读取并校验快照文件，把其中的参数直接写入各路总线 `SerialServo` 的配置缓存，
+       之后 `get_servo_angle_range` 等读取方法直接返回缓存中的值，不访问总线；
+    2. 用 `verify(count)` 每次只从舵机回读少数几个舵机的配置进行确认（轮流抽样，可以在空闲时分多次调用），
+       发现不一致时以舵机上的值更新快照和缓存，并标记快照需要重新保存；
+    3. 快照文件不存在或损坏时，用一次交错读取采集全部配置并保存。
+
+    快照只保存可缓存的配置项（偏差、角度限位、电压范围、温度上限、工作模式、报警代码），
+    因此需要以 `cache_config=True` 创建 `SerialServo`。文件格式为：魔数 `SSC1`、舵机数量，
+    每个舵机的ID、配置项掩码和按固定顺序排列的原始参数，最后是2字节的校验和，每个舵机最多17字节。
+
+    Attributes:
+        bus (ServoBusManager): 多串口舵机总线管理类实例，传入单个 SerialServo 时自动创建。
+        path (str): 快照文件路径。
+        entries (dict): 舵机ID -> {读取命令编号: 参数（bytes）}。
+        dirty (bool): 快照与文件内容不一致，需要重新保存。
+        verified (int): 已回读确认的舵机数量。
+        mismatches (int): 确认时发现配置不一致的配置项数量。
+
+    Methods:
+        capture(servo_ids=None) -> int:
+            从舵机读取配置，更新快照。
+        save(path: str = None) -> None:
+            将快照保存到文件。
+        load(path: str = None) -> bool:
+            从文件读取快照。
+        restore() -> int:
+            将快照写入配置缓存。
+        verify(count: int = 1) -> list:
+            抽样回读确认快照。
+        boot(servo_ids=None, sample: int = 1) -> bool:
+            启动时载入快照，不存在时采集并保存。
+
+    ==========================================
+
+    Configuration snapshot for serial servos.
+
+    Re-reading the angle range, offset, vin range and mode of every servo before operating costs many bus round
+    trips on each boot. This class stores that configuration as a compact binary snapshot on flash. At boot it:
+
+    1. reads and checks the snapshot file and writes its parameters straight into the configuration cache of the
+       `SerialServo` of every bus, so getters such as `get_servo_angle_range` answer from the cache without bus
+       traffic;
+    2. confirms the snapshot with `verify(count)`, which reads back only a few servos per call (round-robin
+       sampling, so it can be spread over idle time); on a mismatch the value on the servo updates the snapshot
+       and the cache, and the snapshot is marked for saving again;
+    3. if the file is missing or corrupt, captures the whole configuration with one interleaved read per item
+       and saves it.
+
+    Only the cacheable items are stored (offset, angle limits, voltage range, temperature limit, mode, alarm
+    code), so `SerialServo` must be created with `cache_config=True`. The file holds the magic `SSC1`, the servo
+    count, then per servo its ID, an item mask and the raw parameters in a fixed order, and finally a 2-byte
+    checksum; at most 17 bytes per servo.
+
+    Attributes:
+        bus (ServoBusManager): Multi-UART bus manager, created automatically for a single SerialServo.
+        path (str): Snapshot file path.
+        entries (dict): Servo ID -> {read command ID: parameters (bytes)}.
+        dirty (bool): The snapshot differs from the file and needs saving.
+        verified (int): Number of servos read back for confirmation.
+        mismatches (int): Number of items found different during confirmation.
+
+    Methods:
+        capture(servo_ids=None) -> int:
+            Read the configuration from the servos into the snapshot.
+        save(path: str = None) -> None:
+            Save the snapshot to a file.
+        load(path: str = None) -> bool:
+            Load the snapshot from a file.
+        restore() -> int:
+            Write the snapshot into the configuration caches.
+        verify(count: int = 1) -> list:
+            Confirm the snapshot by sampled read-back.
+        boot(servo_ids=None, sample: int = 1) -> bool:
+            Load the snapshot at boot, capturing and saving it if missing.
+    """
+
+    # 类变量：快照保存的配置读取命令，按该顺序排列参数
+    COMMANDS = (
+        SerialServo.SERVO_ANGLE_OFFSET_READ,
+        SerialServo.SERVO_ANGLE_LIMIT_READ,
+        SerialServo.SERVO_VIN_LIMIT_READ,
+        SerialServo.SERVO_TEMP_MAX_LIMIT_READ,
+        SerialServo.SERVO_OR_MOTOR_MODE_READ,
+        SerialServo.SERVO_LED_ERROR_READ,
+    )
+
+    # 类变量：文件魔数
+    MAGIC = b"SSC1"
+
+    def __init__(self, bus, path: str = "servo_config.bin") -> None:
+        """
+        初始化配置快照类。
+
+        Args:
+            bus (ServoBusManager | SerialServo): 多串口舵机总线管理类实例或单个串口舵机控制类实例。
+            path (str): 快照文件路径，默认 servo_config.bin。
+
+        Raises:
+            ValueError: 如果有总线没有启用配置缓存，则抛出异常。
+
+        ==========================================
+
+        Initialize the configuration snapshot.
+
+        Args:
+            bus (ServoBusManager | SerialServo): Multi-UART bus manager or a single serial servo control instance.
+            path (str): Snapshot file path, default servo_config.bin.
+
+        Raises:
+            ValueError: If a bus does not have the configuration cache enabled.
+        """
+        # 单路总线也通过总线管理类读取，舵机ID在使用时映射
+        if isinstance(bus, SerialServo):
+            bus = ServoBusManager([bus])
+            self._single = True
+        else:
+            self._single = False
+
+        for servo in bus.buses:
+            if not servo.cache_config:
+                raise ValueError("Configuration cache must be enabled (cache_config=True).")
+
+        self.bus = bus
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+
+        # 抽样确认的轮转位置
+        self._cursor = 0
+
+        # 统计数据
+        self.verified = 0
+        self.mismatches = 0
+
+    def _map(self, servo_ids) -> list:
+        """
+        检查舵机ID，单路总线时将舵机映射到第0路。
+
+        ==========================================
+
+        Check servo IDs and map them to bus 0 for a single bus.
+        """
+        servo_ids = list(servo_ids)
+        for servo_id in servo_ids:
+            if servo_id < 0 or servo_id > 253:
+                raise ValueError("Servo ID must be in range 0~253.")
+            if self._single and servo_id not in self.bus.servo_map:
+                self.bus.assign(servo_id, 0)
+            self.bus.bus_of(servo_id)
+        return servo_ids
+
+    def _read(self, servo_ids: list) -> dict:
+        """
+        每个配置项对一组舵机执行一次交错读取，返回舵机ID -> {读取命令编号: 参数}，读取失败的配置项不包含在内。
+
+        ==========================================
+
+        One interleaved read per item over a group of servos; returns servo ID -> {read command ID: parameters},
+        leaving out failed items.
+        """
+        results = {}
+        for servo_id in servo_ids:
+            results[servo_id] = {}
+        for command in ServoConfigSnapshot.COMMANDS:
+            values = self.bus.read_params(command, servo_ids)
+            for servo_id in servo_ids:
+                params = values.get(servo_id)
+                if params is not None:
+                    results[servo_id][command[0]] = params
+        return results
+
+    def capture(self, servo_ids=None) -> int:
+        """
+        从舵机读取全部配置项，更新快照和配置缓存，修改配置后调用以刷新快照。
+
+        Args:
+            servo_ids (iterable, optional): 舵机ID列表，默认快照中已有的舵机；
+                                            快照为空时默认总线管理类中所有已映射的舵机。
+
+        Returns:
+            int: 至少读到一个配置项的舵机数量。
+
+        Raises:
+            ValueError: 如果舵机ID超出范围或没有映射到总线，则抛出异常。
+
+        ==========================================
+
+        Read every item from the servos and update the snapshot and the configuration caches; call it after
+        changing the configuration to refresh the snapshot.
+
+        Args:
+            servo_ids (iterable, optional): Servo IDs, default the servos already in the snapshot, or every servo
+                                            mapped in the bus manager if the snapshot is empty.
+
+        Returns:
+            int: Number of servos with at least one item read.
+
+        Raises:
+            ValueError: If a servo ID is out of range or not mapped to a bus.
+        """
+        if servo_ids is None:
+            servo_ids = self.entries if len(self.entries) > 0 else self.bus.servo_map
+        servo_ids = self._map(servo_ids)
+
+        found = 0
+        for servo_id, items in self._read(servo_ids).items():
+            if len(items) == 0:
+                continue
+            found += 1
+            self.entries[servo_id] = items
+            servo = self.bus.bus_of(servo_id)
+            for read_cmd, params in items.items():
+                servo._store_config(servo_id, read_cmd, params)
+        self.dirty = True
+        return found
+
+    def _encode(self) -> bytearray:
+        """
+        将快照编码为文件内容。
+
+        ==========================================
+
+        Encode the snapshot as file contents.
+        """
+        data = bytearray(ServoConfigSnapshot.MAGIC)
+        data.append(len(self.entries))
+        for servo_id in sorted(self.entries):
+            items = self.entries[servo_id]
+            mask = 0
+            for bit in range(len(ServoConfigSnapshot.COMMANDS)):
+                if ServoConfigSnapshot.COMMANDS[bit][0] in items:
+                    mask |= 1 << bit
+            data.append(servo_id)
+            data.append(mask)
+            for command in ServoConfigSnapshot.COMMANDS:
+                if command[0] in items:
+                    data += items[command[0]]
+        checksum = sum(data) & 0xFFFF
+        data.append(checksum & 0xFF)
+        data.append(checksum >> 8)
+        return data
+
+    def _decode(self, data) -> dict:
+        """
+        解析文件内容，格式或校验和错误时返回None。
+
+        ==========================================
+
+        Decode file contents, None if the format or the checksum is wrong.
+        """
+        magic = ServoConfigSnapshot.MAGIC
+        if len(data) < len(magic) + 3 or data[:len(magic)] != magic:
+            return None
+        if sum(data[:-2]) & 0xFFFF != data[-2] | (data[-1] << 8):
+            return None
+
+        entries = {}
+        offset = len(magic) + 1
+        end = len(data) - 2
+        for _ in range(data[len(magic)]):
+            if offset + 2 > end:
+                return None
+            servo_id = data[offset]
+            mask = data[offset + 1]
+            offset += 2
+            items = {}
+            for bit in range(len(ServoConfigSnapshot.COMMANDS)):
+                if mask & (1 << bit):
+                    command = ServoConfigSnapshot.COMMANDS[bit]
+                    # 参数长度 = 返回数据长度 - ID、数据长度和命令字节
+                    size = command[2] - 3
+                    if offset + size > end:
+                        return None
+                    items[command[0]] = bytes(data[offset:offset + size])
+                    offset += size
+            entries[servo_id] = items
+        if offset != end:
+            return None
+        return entries
+
+    def save(self, path: str = None) -> None:
+        """
+        将快照保存到文件，先写入临时文件再替换，写入过程中掉电不会损坏原有快照。
+
+        Args:
+            path (str, optional): 文件路径，None表示使用 path 属性。
+
+        ==========================================
+
+        Save the snapshot to a file; a temporary file is written first and then renamed, so a power loss while
+        writing does not corrupt the previous snapshot.
+
+        Args:
+            path (str, optional): File path, None uses the path attribute.
+        """
+        if path is None:
+            path = self.path
+        temp = path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(self._encode())
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        os.rename(temp, path)
+        self.dirty = False
+
+    def load(self, path: str = None) -> bool:
+        """
+        从文件读取快照，不访问总线。
+
+        Args:
+            path (str, optional): 文件路径，None表示使用 path 属性。
+
+        Returns:
+            bool: 读取成功时返回True，文件不存在或损坏时返回False（快照保持不变）。
+
+        ==========================================
+
+        Load the snapshot from a file without touching the bus.
+
+        Args:
+            path (str, optional): File path, None uses the path attribute.
+
+        Returns:
+            bool: True on success, False if the file is missing or corrupt (the snapshot is left unchanged).
+        """
+        if path is None:
+            path = self.path
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+
+        entries = self._decode(data)
+        if entries is None:
+            return False
+        self.entries = entries
+        self.dirty = False
+        self._cursor = 0
+        return True
+
+    def restore(self) -> int:
+        """
+        将快照中的参数写入各路总线的配置缓存，不访问总线。
+
+        Returns:
+            int: 写入缓存的舵机数量。
+
+        Raises:
+            ValueError: 如果快照中的舵机ID没有映射到总线，则抛出异常。
+
+        ==========================================
+
+        Write the snapshot parameters into the configuration cache of every bus without touching the bus.
+
+        Returns:
+            int: Number of servos written into the caches.
+
+        Raises:
+            ValueError: If a servo ID of the snapshot is not mapped to a bus.
+        """
+        self._map(self.entries)
+        for servo_id, items in self.entries.items():
+            servo = self.bus.bus_of(servo_id)
+            for read_cmd, params in items.items():
+                servo._store_config(servo_id, read_cmd, params)
+        return len(self.entries)
+
+    def verify(self, count: int = 1) -> list:
+        """
+        抽样回读确认快照：从轮转位置开始回读 count 个舵机的全部配置项，不一致时以舵机上的值更新快照和缓存。
+
+        Args:
+            count (int): 本次确认的舵机数量，None表示确认所有舵机。
+
+        Returns:
+            list: 发现配置不一致的舵机ID列表。
+
+        ==========================================
+
+        Confirm the snapshot by sampled read-back: read every item of count servos starting at the round-robin
+        position; on a mismatch the value on the servo updates the snapshot and the cache.
+
+        Args:
+            count (int): Number of servos to confirm in this call, None for every servo.
+
+        Returns:
+            list: IDs of the servos whose configuration differed.
+        """
+        servo_ids = sorted(self.entries)
+        total = len(servo_ids)
+        if total == 0:
+            return []
+        if count is None or count > total:
+            count = total
+
+        sample = []
+        for k in range(count):
+            sample.append(servo_ids[(self._cursor + k) % total])
+        self._cursor = (self._cursor + count) % total
+        self._map(sample)
+
+        changed = []
+        for servo_id, items in self._read(sample).items():
+            # 没有回复的舵机不计入确认数量，保留快照中的值
+            if len(items) == 0:
+                continue
+            self.verified += 1
+            snapshot = self.entries[servo_id]
+            servo = self.bus.bus_of(servo_id)
+            differs = False
+            for read_cmd, params in items.items():
+                if snapshot.get(read_cmd) != params:
+                    snapshot[read_cmd] = params
+                    servo._store_config(servo_id, read_cmd, params)
+                    self.mismatches += 1
+                    differs = True
+            if differs:
+                changed.append(servo_id)
+                self.dirty = True
+        return changed
+
+    def boot(self, servo_ids=None, sample: int = 1) -> bool:
+        """
+        启动时使用快照：文件有效时载入配置缓存并抽样确认 sample 个舵机，否则采集全部配置并保存。
+
+        Args:
+            servo_ids (iterable, optional): 期望的舵机ID列表，快照缺少其中的舵机时采集并补充这些舵机。
+            sample (int): 启动时立即确认的舵机数量，0表示不确认，之后可以在空闲时调用 verify()。
+
+        Returns:
+            bool: 使用了快照文件时返回True，重新采集时返回False。
+
+        Raises:
+            ValueError: 如果舵机ID超出范围或没有映射到总线，则抛出异常。
+
+        ==========================================
+
+        Use the snapshot at boot: if the file is valid, load it into the configuration caches and confirm sample
+        servos; otherwise capture the whole configuration and save it.
+
+        Args:
+            servo_ids (iterable, optional): Expected servo IDs; servos missing from the snapshot are captured and
+                                            added.
+            sample (int): Number of servos confirmed right away, 0 for none; verify() can be called later in idle
+                          time.
+
+        Returns:
+            bool: True if the snapshot file was used, False if the configuration was captured again.
+
+        Raises:
+            ValueError: If a servo ID is out of range or not mapped to a bus.
+        """
+        if not self.load():
+            self.entries = {}
+            self.capture(servo_ids)
+            self.save()
+            return False
+
+        self.restore()
+        if servo_ids is not None:
+            missing = [servo_id for servo_id in servo_ids if servo_id not in self.entries]
+            if len(missing) > 0:
+                self.capture(missing)
+        if sample > 0:
+            self.verify(sample)
+        if self.dirty:
+            self.save()
+        return True
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,461 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/6 上午10:12
+# @Author  : 李清水
+# @File    : servo_telemetry.py
+# @Description : 串口舵机遥测轮询类，按轮询方式流水线读取多个舵机的位置、电压和温度
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 紧凑数组模块
+from array import array
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机遥测轮询类
+class ServoTelemetryPoller:
+    """
+    串口舵机遥测轮询类，以轮询（round-robin）方式读取多个舵机的位置、电压和温度。
+
+    每种物理量可以配置独立的刷新周期，到期后对所有舵机依次发起一轮读取。
+    轮询器同一时刻只保留一个未完成的请求，上一条回复解析完成后立即发出下一条请求，
+    不再使用固定的 5ms 延时。所有请求数据包在初始化时预先构建，最新数值和时间戳保存在紧凑的数组中。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例。
+        servo_ids (list[int]): 轮询的舵机ID列表。
+        values (array): 最新数值表，按 物理量 * 舵机数量 + 舵机序号 索引。
+        stamps (array): 最新数值对应的时间戳（time.ticks_ms）。
+        replies (int): 成功解析的回复数量。
+        timeouts (int): 超时未收到完整回复的次数。
+        errors (int): 回复校验失败的次数。
+
+    Methods:
+        update() -> bool:
+            非阻塞地推进一次轮询状态机。
+        sweep() -> None:
+            阻塞地完成所有已启用物理量的一轮完整读取。
+        position(servo_id: int) -> tuple:
+            获取舵机最新的角度位置及时间戳。
+        voltage(servo_id: int) -> tuple:
+            获取舵机最新的输入电压及时间戳。
+        temperature(servo_id: int) -> tuple:
+            获取舵机最新的温度及时间戳。
+
+    ==========================================
+
+    Serial servo telemetry poller, reading position, voltage and temperature of many servos round-robin.
+
+    Each quantity has its own refresh period; when it is due, one read is scheduled for every servo in turn.
+    The poller keeps a single request in flight and issues the next one as soon as the previous reply has
+    been parsed, instead of padding every transaction with a fixed 5 ms sleep. All request packets are
+    built once in the constructor, and the latest values and timestamps live in compact arrays.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance.
+        servo_ids (list[int]): IDs of the polled servos.
+        values (array): Latest values, indexed by quantity * servo count + servo index.
+        stamps (array): Timestamps (time.ticks_ms) of the latest values.
+        replies (int): Number of successfully parsed replies.
+        timeouts (int): Number of requests without a complete reply in time.
+        errors (int): Number of replies that failed validation.
+
+    Methods:
+        update() -> bool:
+            Advance the polling state machine once without blocking.
+        sweep() -> None:
+            Block until every enabled quantity has been read once for all servos.
+        position(servo_id: int) -> tuple:
+            Get the latest angle position of a servo and its timestamp.
+        voltage(servo_id: int) -> tuple:
+            Get the latest input voltage of a servo and its timestamp.
+        temperature(servo_id: int) -> tuple:
+            Get the latest temperature of a servo and its timestamp.
+    """
+
+    # 类变量：物理量编号
+    QUANTITY_POSITION = 0
+    QUANTITY_VOLTAGE = 1
+    QUANTITY_TEMP = 2
+
+    # 物理量对应的读取命令，顺序与物理量编号一致
+    COMMANDS = (SerialServo.SERVO_POS_READ, SerialServo.SERVO_VIN_READ, SerialServo.SERVO_TEMP_READ)
+
+    def __init__(self, servo: SerialServo, servo_ids: list, position_period_ms: int = 20,
+                 voltage_period_ms: int = 1000, temp_period_ms: int = 1000, timeout_ms: int = None) -> None:
+        """
+        初始化遥测轮询类。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            servo_ids (list): 需要轮询的舵机ID列表，ID范围0~253。
+            position_period_ms (int): 位置刷新周期，单位毫秒，0表示不读取位置。
+            voltage_period_ms (int): 电压刷新周期，单位毫秒，0表示不读取电压。
+            temp_period_ms (int): 温度刷新周期，单位毫秒，0表示不读取温度。
+            timeout_ms (int): 单次请求等待完整回复的超时时间，单位毫秒，None表示使用舵机的 reply_deadline()，
+                              关联了总线时序模型时按波特率计算。
+
+        Raises:
+            ValueError: 如果舵机ID列表为空、ID超出范围或周期、超时时间为负数，则抛出异常。
+
+        ==========================================
+
+        Initialize the telemetry poller.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            servo_ids (list): IDs of the servos to poll, range 0~253.
+            position_period_ms (int): Position refresh period in milliseconds, 0 disables position reads.
+            voltage_period_ms (int): Voltage refresh period in milliseconds, 0 disables voltage reads.
+            temp_period_ms (int): Temperature refresh period in milliseconds, 0 disables temperature reads.
+            timeout_ms (int): Time to wait for a complete reply to one request, in milliseconds; None uses the
+                              servo's reply_deadline(), derived from the baud rate when a bus timing model is
+                              attached.
+
+        Raises:
+            ValueError: If the ID list is empty, an ID is out of range, or a period or timeout is negative.
+        """
+        # 检查舵机ID列表
+        if len(servo_ids) == 0:
+            raise ValueError("Servo ID list must not be empty.")
+        for servo_id in servo_ids:
+            if servo_id < 0 or servo_id > 253:
+                raise ValueError("Servo ID must be in range 0~253.")
+
+        # 检查刷新周期和超时时间
+        if position_period_ms < 0 or voltage_period_ms < 0 or temp_period_ms < 0:
+            raise ValueError("Period must not be negative.")
+        if timeout_ms is not None and timeout_ms <= 0:
+            raise ValueError("Timeout must be greater than 0.")
+
+        self.servo = servo
+        self.servo_ids = list(servo_ids)
+
+        # 舵机数量
+        count = len(self.servo_ids)
+        self._count = count
+        # 舵机ID到序号的映射
+        self._index = {}
+        for i in range(count):
+            self._index[self.servo_ids[i]] = i
+
+        # 最新数值表和时间戳表，位置为有符号数，电压单位为毫伏，温度单位为摄氏度
+        self.values = array('h', [0] * (3 * count))
+        self.stamps = array('i', [0] * (3 * count))
+        # 数值是否有效的标志
+        self._valid = bytearray(3 * count)
+
+        # 各物理量的刷新周期、下一次到期时间和本轮读取进度（等于舵机数量表示本轮已完成）
+        self._periods = (position_period_ms, voltage_period_ms, temp_period_ms)
+        now = time.ticks_ms()
+        self._due = [now, now, now]
+        self._cursor = [count, count, count]
+        # 上一次发出请求的物理量，用于在物理量之间轮转
+        self._last_quantity = 2
+
+        # 预先构建所有请求数据包，避免轮询过程中分配内存
+        self._packets = []
+        for quantity in range(3):
+            cmd = ServoTelemetryPoller.COMMANDS[quantity][0]
+            for servo_id in self.servo_ids:
+                self._packets.append(bytes(servo.build_packet(servo_id, cmd, [])))
+
+        # 当前未完成请求的表项序号，-1表示没有未完成请求
+        self._pending = -1
+        self._pending_deadline = 0
+        self._timeout_us = None if timeout_ms is None else timeout_ms * 1000
+
+        # 统计计数
+        self.replies = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def _next_slot(self) -> int:
+        """
+        选择下一个需要读取的表项，没有到期的读取时返回-1。
+
+        ==========================================
+
+        Pick the next table slot to read, or -1 when nothing is due.
+        """
+        now = time.ticks_ms()
+        for k in range(3):
+            # 在物理量之间轮转，避免某一物理量长时间占用总线
+            quantity = (self._last_quantity + 1 + k) % 3
+            period = self._periods[quantity]
+            if period == 0:
+                continue
+
+            # 本轮已完成且到期，开始新一轮读取
+            if self._cursor[quantity] >= self._count and time.ticks_diff(now, self._due[quantity]) >= 0:
+                self._cursor[quantity] = 0
+                # 如果落后超过一个周期，则从当前时刻重新计时
+                if time.ticks_diff(now, self._due[quantity]) >= period:
+                    self._due[quantity] = time.ticks_add(now, period)
+                else:
+                    self._due[quantity] = time.ticks_add(self._due[quantity], period)
+
+            if self._cursor[quantity] < self._count:
+                slot = quantity * self._count + self._cursor[quantity]
+                self._cursor[quantity] += 1
+                self._last_quantity = quantity
+                return slot
+
+        return -1
+
+    def _store(self, slot: int, params) -> None:
+        """
+        将回复参数解析为整数并写入数值表。
+
+        ==========================================
+
+        Parse reply parameters into an integer and store it in the value table.
+        """
+        quantity = slot // self._count
+        if quantity == ServoTelemetryPoller.QUANTITY_TEMP:
+            value = params[0]
+        else:
+            # 低8位和高8位合并为一个16位整数
+            value = params[0] + (params[1] << 8)
+            # 位置值为 signed short int 型数据，进行补码转换
+            if value >= 0x8000:
+                value -= 0x10000
+
+        self.values[slot] = value
+        self.stamps[slot] = time.ticks_ms()
+        self._valid[slot] = 1
+
+    def _poll_reply(self) -> int:
+        """
+        检查未完成请求的回复：完整则解析并保存，超时则丢弃。
+
+        Returns:
+            int: 1表示解析了一条有效回复，0表示请求已结束但没有有效数据，-1表示仍在等待回复。
+
+        ==========================================
+
+        Check the reply of the request in flight: parse and store it when complete, drop it on timeout.
+
+        Returns:
+            int: 1 if a valid reply was parsed, 0 if the request ended without valid data, -1 if still waiting.
+        """
+        uart = self.servo.uart
+        slot = self._pending
+        command = ServoTelemetryPoller.COMMANDS[slot // self._count]
+
+        # 完整回复长度包括回显模式下自身发送的字节
+        if uart.any() >= self.servo.reply_size(command):
+            self._pending = -1
+            params = self.servo.receive_command(command[0], command[2])
+            if len(params) == 0:
+                self.errors += 1
+                return 0
+            self._store(slot, params)
+            self.replies += 1
+            return 1
+
+        if time.ticks_diff(time.ticks_us(), self._pending_deadline) > 0:
+            self._pending = -1
+            # 超时则清空接收缓冲区中的残留数据
+            self.servo.flush_input()
+            self.timeouts += 1
+            return 0
+
+        return -1
+
+    def update(self) -> bool:
+        """
+        非阻塞地推进一次轮询状态机。
+
+        如果有未完成的请求，则检查回复是否已经完整到达：完整则解析并保存，超时则丢弃。
+        请求结束后立即发出下一条到期的请求。
+
+        Returns:
+            bool: 本次调用解析了一条有效回复时返回True，否则返回False。
+
+        ==========================================
+
+        Advance the polling state machine once without blocking.
+
+        If a request is in flight, check whether its reply is complete: parse and store it when it is,
+        or drop it on timeout. As soon as the request is finished, issue the next due request.
+
+        Returns:
+            bool: True if a valid reply was parsed during this call, otherwise False.
+        """
+        parsed = False
+        if self._pending >= 0:
+            result = self._poll_reply()
+            if result < 0:
+                return False
+            parsed = result == 1
+
+        # 上一条请求结束后立即发出下一条请求
+        slot = self._next_slot()
+        if slot >= 0:
+            self.servo.write_packet(self._packets[slot])
+            self._pending = slot
+            # 回复截止时刻：默认由舵机按时序模型计算，指定了超时时间时从发送时刻起算
+            if self._timeout_us is None:
+                command = ServoTelemetryPoller.COMMANDS[slot // self._count]
+                self._pending_deadline = self.servo.reply_deadline(command)
+            else:
+                self._pending_deadline = time.ticks_add(time.ticks_us(), self._timeout_us)
+
+        return parsed
+
+    def sweep(self) -> None:
+        """
+        阻塞地完成所有已启用物理量的一轮完整读取。
+
+        ==========================================
+
+        Block until every enabled quantity has been read once for all servos.
+        """
+        # 先结束未完成的请求
+        while self._pending >= 0:
+            self._poll_reply()
+
+        # 所有已启用的物理量立即到期，重新开始一轮读取
+        now = time.ticks_ms()
+        for quantity in range(3):
+            if self._periods[quantity] > 0:
+                self._due[quantity] = now
+                self._cursor[quantity] = self._count
+
+        self.update()
+        while self._in_sweep():
+            self.update()
+        while self._pending >= 0:
+            self._poll_reply()
+
+    def _in_sweep(self) -> bool:
+        """
+        判断是否有物理量的本轮读取尚未完成。
+
+        ==========================================
+
+        Check whether any quantity is still in the middle of a sweep.
+        """
+        for quantity in range(3):
+            if self._periods[quantity] > 0 and self._cursor[quantity] < self._count:
+                return True
+        return False
+
+    def _latest(self, servo_id: int, quantity: int) -> tuple:
+        """
+        获取表中某一物理量的原始数值和时间戳，没有有效数据时返回None。
+
+        ==========================================
+
+        Get the raw value and timestamp of a quantity, or None if no valid value has been read.
+        """
+        if servo_id not in self._index:
+            raise ValueError("Servo ID is not polled.")
+        slot = quantity * self._count + self._index[servo_id]
+        if not self._valid[slot]:
+            return None
+        return self.values[slot], self.stamps[slot]
+
+    def position(self, servo_id: int) -> tuple:
+        """
+        获取舵机最新的角度位置及时间戳。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            tuple: 角度位置（单位为度）和时间戳（time.ticks_ms）的元组，没有有效数据时返回None。
+
+        Raises:
+            ValueError: 如果该舵机不在轮询列表中，则抛出异常。
+
+        ==========================================
+
+        Get the latest angle position of a servo and its timestamp.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            tuple: Angle position in degrees and timestamp (time.ticks_ms), or None if nothing was read yet.
+
+        Raises:
+            ValueError: If the servo is not polled.
+        """
+        latest = self._latest(servo_id, ServoTelemetryPoller.QUANTITY_POSITION)
+        if latest is None:
+            return None
+        # 将位置值转换为角度值，每个单位对应0.24度
+        return latest[0] * 0.24, latest[1]
+
+    def voltage(self, servo_id: int) -> tuple:
+        """
+        获取舵机最新的输入电压及时间戳。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            tuple: 输入电压（单位为伏特）和时间戳（time.ticks_ms）的元组，没有有效数据时返回None。
+
+        Raises:
+            ValueError: 如果该舵机不在轮询列表中，则抛出异常。
+
+        ==========================================
+
+        Get the latest input voltage of a servo and its timestamp.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            tuple: Input voltage in volts and timestamp (time.ticks_ms), or None if nothing was read yet.
+
+        Raises:
+            ValueError: If the servo is not polled.
+        """
+        latest = self._latest(servo_id, ServoTelemetryPoller.QUANTITY_VOLTAGE)
+        if latest is None:
+            return None
+        return latest[0] / 1000.0, latest[1]
+
+    def temperature(self, servo_id: int) -> tuple:
+        """
+        获取舵机最新的温度及时间戳。
+
+        Args:
+            servo_id (int): 舵机ID。
+
+        Returns:
+            tuple: 温度（单位为摄氏度）和时间戳（time.ticks_ms）的元组，没有有效数据时返回None。
+
+        Raises:
+            ValueError: 如果该舵机不在轮询列表中，则抛出异常。
+
+        ==========================================
+
+        Get the latest temperature of a servo and its timestamp.
+
+        Args:
+            servo_id (int): Servo ID.
+
+        Returns:
+            tuple: Temperature in degrees Celsius and timestamp (time.ticks_ms), or None if nothing was read yet.
+
+        Raises:
+            ValueError: If the servo is not polled.
+        """
+        return self._latest(servo_id, ServoTelemetryPoller.QUANTITY_TEMP)
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,426 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/26 下午2:35
+# @Author  : 李清水
+# @File    : servo_timing.py
+# @Description : 串口舵机总线时序模型类，根据波特率和指令元组中的请求、回复长度计算线路传输时间，
+#                用于计算回复超时、调度等待时间和控制周期能够达到的最高频率
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机总线时序模型类
+class ServoTiming:
+    """
+    串口舵机总线时序模型类。
+
+    `SerialServo` 不知道UART的波特率，回复超时只能使用固定的经验值（5000微秒），而且从调用 `uart.write` 的时刻开始计算：
+    一次写入多个舵机的指令后紧接着读取时，请求还在发送缓冲区中排队，固定超时会被误判为超时。
+
+    该类根据波特率计算每条指令在线路上的传输时间（每字节10位）：请求长度为数据长度字段加3字节
+    （`(cmd, len)` 或 `(cmd, len, ret_len)` 中的 len），回复长度为 ret_len 加3字节，再加上舵机收到请求后开始回复的响应时间。
+    通过 `attach()` 关联到 `SerialServo` 后：
+
+    - 每次写入都会累计发送完成时刻的估计值（前一次写入尚未发送完时顺延），读取的回复截止时间从请求实际发送完成的时刻起算，
+      等于响应时间加回复传输时间，再乘以 (100 + margin_percent)% 的余量；
+    - `wait_reply`、`ServoBusManager` 的交错读取、`ServoScheduler`、`ServoTelemetryPoller` 和 `ServoScanner` 都使用该截止时间，
+      `ServoScheduler` 中运动指令的最长等待时间也随之缩短为一个读取的回复截止时间；
+    - `cycle_us()` 和 `max_rate_hz()` 估算一组舵机每个控制周期的读写总时间和能够达到的最高控制频率。
+
+    Attributes:
+        baudrate (int): 总线波特率。
+        turnaround_us (int): 舵机收到请求后开始回复的最长时间，单位微秒。
+        margin_percent (int): 回复截止时间的余量，百分比。
+        gap_us (int): 主机处理一条回复并发出下一个请求所需的时间，单位微秒，用于估算控制频率。
+        tx_buffer (int): 最多排队等待发送的字节数（UART发送缓冲区与后台发送缓冲区之和）。
+
+    Methods:
+        wire_us(size: int) -> int:
+            计算指定字节数的线路传输时间。
+        request_size(command: tuple) -> int:
+            指令请求数据包的字节数。
+        response_size(command: tuple) -> int:
+            读取指令回复数据包的字节数。
+        transaction_us(command: tuple) -> int:
+            一条指令从开始发送到收到完整回复的时间。
+        reply_window_us(command: tuple) -> int:
+            请求发送完成后等待完整回复的截止时间（含余量）。
+        reply_timeout_us(command: tuple) -> int:
+            总线空闲时从写入开始计算的回复超时时间（含余量）。
+        tx_end(previous: int, size: int) -> int:
+            计算写入 size 字节后发送完成时刻的估计值。
+        cycle_us(servos, reads: tuple = ..., writes: tuple = ...) -> int:
+            估算一个控制周期的读写总时间。
+        max_rate_hz(servos, reads: tuple = ..., writes: tuple = ...) -> int:
+            估算能够达到的最高控制频率。
+        attach(servo: SerialServo) -> None:
+            关联到串口舵机控制类。
+
+    ==========================================
+
+    Baud-rate-aware timing model for the serial servo bus.
+
+    `SerialServo` does not know the UART baud rate, so its reply timeout is a magic constant (5000 microseconds)
+    counted from the `uart.write` call: when a read follows a burst of writes to many servos, the request is still
+    queued behind them and the fixed timeout expires spuriously.
+
+    This class computes the wire time of every command from the baud rate (10 bits per byte): a request is the
+    length field plus 3 bytes (len in `(cmd, len)` or `(cmd, len, ret_len)`), a reply is ret_len plus 3 bytes, and
+    the servo turnaround time is added. Once attached to a `SerialServo` with `attach()`:
+
+    - every write advances an estimate of when the transmitter finishes (pushed back while earlier writes are
+      still being sent), and the reply deadline of a read counts from the moment its request has actually left
+      the wire: turnaround plus reply wire time, times a (100 + margin_percent)% margin;
+    - `wait_reply`, the interleaved reads of `ServoBusManager`, `ServoScheduler`, `ServoTelemetryPoller` and
+      `ServoScanner` use that deadline, which also bounds how long motion commands wait in `ServoScheduler`;
+    - `cycle_us()` and `max_rate_hz()` estimate the bus time of one control cycle for a set of servos and the
+      highest control rate it allows.
+
+    Attributes:
+        baudrate (int): Bus baud rate.
+        turnaround_us (int): Longest time a servo takes to start replying, in microseconds.
+        margin_percent (int): Margin of the reply deadline, in percent.
+        gap_us (int): Time the host needs to handle a reply and issue the next request, in microseconds, used to
+                      estimate control rates.
+        tx_buffer (int): Most bytes that can be queued for transmission (UART TX buffer plus background sender
+                         buffer).
+
+    Methods:
+        wire_us(size: int) -> int:
+            Wire time of a number of bytes.
+        request_size(command: tuple) -> int:
+            Size of the request packet of a command.
+        response_size(command: tuple) -> int:
+            Size of the reply packet of a read command.
+        transaction_us(command: tuple) -> int:
+            Time from the start of a request to its complete reply.
+        reply_window_us(command: tuple) -> int:
+            Deadline for the complete reply after the request has been sent, with margin.
+        reply_timeout_us(command: tuple) -> int:
+            Reply timeout counted from the write on an idle bus, with margin.
+        tx_end(previous: int, size: int) -> int:
+            Estimated time the transmitter finishes after writing size bytes.
+        cycle_us(servos, reads: tuple = ..., writes: tuple = ...) -> int:
+            Estimate the bus time of one control cycle.
+        max_rate_hz(servos, reads: tuple = ..., writes: tuple = ...) -> int:
+            Estimate the highest achievable control rate.
+        attach(servo: SerialServo) -> None:
+            Attach to a serial servo control instance.
+    """
+
+    def __init__(self, baudrate: int = 115200, turnaround_us: int = 1000, margin_percent: int = 25,
+                 gap_us: int = 100, tx_buffer: int = 1024) -> None:
+        """
+        初始化总线时序模型。
+
+        Args:
+            baudrate (int): 总线波特率，默认115200。
+            turnaround_us (int): 舵机收到请求后开始回复的最长时间，单位微秒，默认1000。
+            margin_percent (int): 回复截止时间的余量，百分比，默认25。
+            gap_us (int): 主机处理一条回复并发出下一个请求所需的时间，单位微秒，默认100。
+            tx_buffer (int): 最多排队等待发送的字节数，默认1024。
+
+        Raises:
+            ValueError: 如果波特率、发送缓冲区大小不为正数，或响应时间、余量、处理时间为负数，则抛出异常。
+
+        ==========================================
+
+        Initialize the bus timing model.
+
+        Args:
+            baudrate (int): Bus baud rate, default 115200.
+            turnaround_us (int): Longest time a servo takes to start replying in microseconds, default 1000.
+            margin_percent (int): Margin of the reply deadline in percent, default 25.
+            gap_us (int): Time the host needs to handle a reply and issue the next request in microseconds,
+                          default 100.
+            tx_buffer (int): Most bytes that can be queued for transmission, default 1024.
+
+        Raises:
+            ValueError: If the baud rate or TX buffer size is not positive, or the turnaround, margin or gap is
+                        negative.
+        """
+        if baudrate <= 0 or tx_buffer <= 0:
+            raise ValueError("Baudrate and TX buffer size must be positive.")
+        if turnaround_us < 0 or margin_percent < 0 or gap_us < 0:
+            raise ValueError("Turnaround, margin and gap must not be negative.")
+
+        self.baudrate = baudrate
+        self.turnaround_us = turnaround_us
+        self.margin_percent = margin_percent
+        self.gap_us = gap_us
+        self.tx_buffer = tx_buffer
+
+    def wire_us(self, size: int) -> int:
+        """
+        计算指定字节数在线路上的传输时间（每字节10位），向上取整。
+
+        Args:
+            size (int): 字节数。
+
+        Returns:
+            int: 传输时间，单位微秒。
+
+        ==========================================
+
+        Wire time of a number of bytes (10 bits per byte), rounded up.
+
+        Args:
+            size (int): Number of bytes.
+
+        Returns:
+            int: Wire time in microseconds.
+        """
+        return (size * 10 * 1000000 + self.baudrate - 1) // self.baudrate
+
+    def request_size(self, command: tuple) -> int:
+        """
+        指令请求数据包的字节数：帧头2字节 + ID 1字节 + 数据长度。
+
+        Args:
+            command (tuple): 指令元组（命令编号，参数长度）或（命令编号，参数长度，返回数据长度）。
+
+        Returns:
+            int: 请求数据包的字节数。
+
+        ==========================================
+
+        Size of the request packet of a command: 2 header bytes + 1 ID byte + the length field.
+
+        Args:
+            command (tuple): Command tuple (command ID, length) or (command ID, length, returned data length).
+
+        Returns:
+            int: Size of the request packet in bytes.
+        """
+        return command[1] + 3
+
+    def response_size(self, command: tuple) -> int:
+        """
+        读取指令回复数据包的字节数，只写指令返回0。
+
+        Args:
+            command (tuple): 指令元组。
+
+        Returns:
+            int: 回复数据包的字节数。
+
+        ==========================================
+
+        Size of the reply packet of a read command, 0 for write-only commands.
+
+        Args:
+            command (tuple): Command tuple.
+
+        Returns:
+            int: Size of the reply packet in bytes.
+        """
+        if len(command) < 3:
+            return 0
+        return command[2] + 3
+
+    def transaction_us(self, command: tuple) -> int:
+        """
+        一条指令从开始发送到收到完整回复的时间（不含余量），只写指令为请求的传输时间。
+
+        Args:
+            command (tuple): 指令元组。
+
+        Returns:
+            int: 事务时间，单位微秒。
+
+        ==========================================
+
+        Time from the start of a request to its complete reply (without margin); the request wire time for
+        write-only commands.
+
+        Args:
+            command (tuple): Command tuple.
+
+        Returns:
+            int: Transaction time in microseconds.
+        """
+        total = self.wire_us(self.request_size(command))
+        reply = self.response_size(command)
+        if reply > 0:
+            total += self.turnaround_us + self.wire_us(reply)
+        return total
+
+    def reply_window_us(self, command: tuple) -> int:
+        """
+        请求发送完成后等待完整回复的截止时间：（响应时间 + 回复传输时间）乘以余量。
+
+        Args:
+            command (tuple): 读取指令元组。
+
+        Returns:
+            int: 截止时间，单位微秒。
+
+        ==========================================
+
+        Deadline for the complete reply after the request has left the wire: (turnaround + reply wire time) times
+        the margin.
+
+        Args:
+            command (tuple): Read command tuple.
+
+        Returns:
+            int: Deadline in microseconds.
+        """
+        window = self.turnaround_us + self.wire_us(self.response_size(command))
+        return window * (100 + self.margin_percent) // 100
+
+    def reply_timeout_us(self, command: tuple) -> int:
+        """
+        总线空闲时从写入请求开始计算的回复超时时间（含余量）。
+
+        Args:
+            command (tuple): 读取指令元组。
+
+        Returns:
+            int: 超时时间，单位微秒。
+
+        ==========================================
+
+        Reply timeout counted from writing the request on an idle bus, with margin.
+
+        Args:
+            command (tuple): Read command tuple.
+
+        Returns:
+            int: Timeout in microseconds.
+        """
+        return self.wire_us(self.request_size(command)) + self.reply_window_us(command)
+
+    def tx_end(self, previous: int, size: int) -> int:
+        """
+        计算现在写入 size 字节后发送完成时刻的估计值，前一次写入尚未发送完时顺延。
+
+        排队的数据最多为 tx_buffer 字节，前一次的估计值超前当前时刻更久时说明它来自很久以前
+        （ticks_us 回绕后比较结果失效），从当前时刻重新计算。
+
+        Args:
+            previous (int): 前一次写入发送完成时刻的估计值（time.ticks_us）。
+            size (int): 本次写入的字节数。
+
+        Returns:
+            int: 发送完成时刻的估计值（time.ticks_us）。
+
+        ==========================================
+
+        Estimated time the transmitter finishes when size bytes are written now, pushed back while an earlier
+        write is still being sent.
+
+        At most tx_buffer bytes can be queued, so a previous estimate further ahead of now than their wire time
+        must be a stale one from long ago (the ticks_us comparison is no longer valid after wrap-around), and the
+        estimate restarts from now.
+
+        Args:
+            previous (int): Estimated finish time of the previous write (time.ticks_us).
+            size (int): Number of bytes written now.
+
+        Returns:
+            int: Estimated finish time (time.ticks_us).
+        """
+        now = time.ticks_us()
+        ahead = time.ticks_diff(previous, now)
+        if 0 < ahead <= self.wire_us(self.tx_buffer):
+            now = previous
+        return time.ticks_add(now, self.wire_us(size))
+
+    def cycle_us(self, servos, reads: tuple = (SerialServo.SERVO_POS_READ,),
+                 writes: tuple = (SerialServo.SERVO_MOVE_TIME_WRITE,)) -> int:
+        """
+        估算一个控制周期的总线时间：每个舵机依次完成 reads 中的读取事务，再把 writes 中的写入合并发送。
+
+        Args:
+            servos (int | iterable): 舵机数量或舵机ID列表。
+            reads (tuple): 每个舵机每个周期的读取指令元组，默认读取位置。
+            writes (tuple): 每个舵机每个周期的写入指令元组，默认立即转动。
+
+        Returns:
+            int: 一个控制周期的总线时间，单位微秒。
+
+        ==========================================
+
+        Estimate the bus time of one control cycle: every servo completes the read transactions in reads one after
+        another, then the writes in writes are sent as one burst.
+
+        Args:
+            servos (int | iterable): Number of servos or a list of servo IDs.
+            reads (tuple): Read command tuples per servo and cycle, position by default.
+            writes (tuple): Write command tuples per servo and cycle, immediate move by default.
+
+        Returns:
+            int: Bus time of one control cycle in microseconds.
+        """
+        count = servos if isinstance(servos, int) else len(servos)
+        total = 0
+        for command in reads:
+            total += count * (self.transaction_us(command) + self.gap_us)
+        size = 0
+        for command in writes:
+            size += count * self.request_size(command)
+        return total + self.wire_us(size)
+
+    def max_rate_hz(self, servos, reads: tuple = (SerialServo.SERVO_POS_READ,),
+                    writes: tuple = (SerialServo.SERVO_MOVE_TIME_WRITE,)) -> int:
+        """
+        估算一组舵机能够达到的最高控制频率。
+
+        Args:
+            servos (int | iterable): 舵机数量或舵机ID列表。
+            reads (tuple): 每个舵机每个周期的读取指令元组，默认读取位置。
+            writes (tuple): 每个舵机每个周期的写入指令元组，默认立即转动。
+
+        Returns:
+            int: 最高控制频率，单位赫兹，向下取整。
+
+        ==========================================
+
+        Estimate the highest control rate a set of servos allows.
+
+        Args:
+            servos (int | iterable): Number of servos or a list of servo IDs.
+            reads (tuple): Read command tuples per servo and cycle, position by default.
+            writes (tuple): Write command tuples per servo and cycle, immediate move by default.
+
+        Returns:
+            int: Highest control rate in hertz, rounded down.
+        """
+        cycle = self.cycle_us(servos, reads, writes)
+        if cycle <= 0:
+            return 0
+        return 1000000 // cycle
+
+    def attach(self, servo: SerialServo) -> None:
+        """
+        关联到串口舵机控制类：之后读取的回复截止时间按时序模型计算，
+        reply_timeout_us 同时更新为回复最长的读取指令在总线空闲时的超时时间。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+
+        ==========================================
+
+        Attach to a serial servo control instance: reply deadlines of later reads follow the timing model, and
+        reply_timeout_us is set to the idle-bus timeout of the read with the longest reply.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+        """
+        servo.timing = self
+        servo.reply_timeout_us = self.reply_timeout_us(SerialServo.SERVO_MOVE_TIME_READ)
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,385 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/12 下午4:05
+# @Author  : 李清水
+# @File    : servo_trajectory.py
+# @Description : 串口舵机轨迹流式发送类，按固定控制周期发送预先计算好的多路点轨迹
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 紧凑数组模块
+from array import array
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机轨迹流式发送类
+class ServoTrajectory:
+    """
+    串口舵机轨迹流式发送类。
+
+    为每个舵机指定一组路点（时间，角度），按梯形速度、三次多项式或线性插值生成平滑轨迹，
+    并在 compile() 中以固定控制周期预先计算为 array 格式的位置序列（舵机原始单位0~1000）。
+    播放时每个控制周期将所有舵机的 SERVO_MOVE_TIME_WRITE 指令写入一个预先分配的缓冲区，
+    只修改位置字节和校验和后一次性发送，播放过程中不分配内存。
+    如果总线或主循环跟不上控制周期，会跳过过期的帧并统计截止时间错过次数。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例。
+        period_ms (int): 控制周期，单位毫秒。
+        frames (int): 轨迹总帧数。
+        frames_sent (int): 已发送的帧数。
+        deadline_misses (int): 因超过截止时间而跳过的帧数。
+        max_lateness_us (int): 帧发送相对截止时间的最大延迟，单位微秒。
+
+    Methods:
+        add(servo_id: int, waypoints: list, profile: int = PROFILE_TRAPEZOID) -> None:
+            添加一个舵机的路点。
+        compile() -> None:
+            预先计算所有舵机的位置序列和数据包。
+        start() -> None:
+            开始播放轨迹。
+        update() -> bool:
+            非阻塞地发送到期的帧。
+        run() -> None:
+            阻塞地播放完整条轨迹。
+
+    ==========================================
+
+    Trajectory streaming engine for serial servos.
+
+    Each servo gets a list of (time, angle) waypoints, which are turned into a smooth path with a trapezoidal
+    velocity, cubic or linear profile. compile() precomputes the path at a fixed control rate into an array of
+    positions in native servo units (0~1000). During playback, every control period patches the position bytes
+    and checksums of the SERVO_MOVE_TIME_WRITE packets of all servos in one preallocated buffer and sends it
+    in a single write, so nothing is allocated while streaming. If the bus or the main loop cannot keep up,
+    stale frames are skipped and counted as deadline misses.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance.
+        period_ms (int): Control period in milliseconds.
+        frames (int): Total number of frames.
+        frames_sent (int): Number of frames sent.
+        deadline_misses (int): Number of frames skipped because their deadline had passed.
+        max_lateness_us (int): Largest delay of a frame after its deadline, in microseconds.
+
+    Methods:
+        add(servo_id: int, waypoints: list, profile: int = PROFILE_TRAPEZOID) -> None:
+            Add the waypoints of one servo.
+        compile() -> None:
+            Precompute the position streams and packets of all servos.
+        start() -> None:
+            Start playing the trajectory.
+        update() -> bool:
+            Send the due frame without blocking.
+        run() -> None:
+            Block until the whole trajectory has been played.
+    """
+
+    # 类变量：插值方式
+    # 线性插值
+    PROFILE_LINEAR = 0
+    # 梯形速度曲线（加速-匀速-减速）
+    PROFILE_TRAPEZOID = 1
+    # 三次多项式（起止速度为0）
+    PROFILE_CUBIC = 2
+
+    def __init__(self, servo: SerialServo, period_ms: int = 20, accel_fraction: float = 0.25) -> None:
+        """
+        初始化轨迹流式发送类。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            period_ms (int): 控制周期，单位毫秒，范围1~1000，默认20ms。
+            accel_fraction (float): 梯形速度曲线中加速段和减速段各占一段路点时间的比例，范围0~0.5。
+
+        Raises:
+            ValueError: 如果控制周期或加速段比例超出范围，则抛出异常。
+
+        ==========================================
+
+        Initialize the trajectory streaming engine.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            period_ms (int): Control period in milliseconds, range 1~1000, 20 ms by default.
+            accel_fraction (float): Share of each segment spent accelerating and decelerating in the
+                                    trapezoidal profile, range 0~0.5.
+
+        Raises:
+            ValueError: If the control period or the acceleration share is out of range.
+        """
+        if period_ms < 1 or period_ms > 1000:
+            raise ValueError("Period must be in range 1~1000 ms.")
+        if accel_fraction <= 0 or accel_fraction > 0.5:
+            raise ValueError("Acceleration fraction must be in range 0~0.5.")
+
+        self.servo = servo
+        self.period_ms = period_ms
+        self._accel_fraction = accel_fraction
+
+        # 舵机ID -> (路点列表, 插值方式)
+        self._waypoints = {}
+        # 按舵机顺序排列的ID列表和位置序列
+        self._ids = []
+        self._streams = []
+        # 一帧中所有舵机的数据包缓冲区及每个舵机校验和的固定部分
+        self._frame = None
+        self._checksum_base = None
+
+        self.frames = 0
+        self._index = 0
+        self._deadline = 0
+        self._running = False
+
+        # 统计数据
+        self.frames_sent = 0
+        self.deadline_misses = 0
+        self.max_lateness_us = 0
+
+    def add(self, servo_id: int, waypoints: list, profile: int = PROFILE_TRAPEZOID) -> None:
+        """
+        添加一个舵机的路点。
+
+        Args:
+            servo_id (int): 舵机ID，范围0~253。
+            waypoints (list): 路点列表，每个路点为（时间，角度）元组，时间单位毫秒、从0开始严格递增，
+                              角度范围0~240度。
+            profile (int): 插值方式，PROFILE_LINEAR、PROFILE_TRAPEZOID 或 PROFILE_CUBIC。
+
+        Raises:
+            ValueError: 如果舵机ID、路点或插值方式无效，则抛出异常。
+
+        ==========================================
+
+        Add the waypoints of one servo.
+
+        Args:
+            servo_id (int): Servo ID, range 0~253.
+            waypoints (list): List of (time, angle) tuples; time in milliseconds starting at 0 and strictly
+                              increasing, angle in the range 0~240 degrees.
+            profile (int): Interpolation profile, PROFILE_LINEAR, PROFILE_TRAPEZOID or PROFILE_CUBIC.
+
+        Raises:
+            ValueError: If the servo ID, the waypoints or the profile are invalid.
+        """
+        if servo_id < 0 or servo_id > 253:
+            raise ValueError("Servo ID must be in range 0~253.")
+        if profile not in (ServoTrajectory.PROFILE_LINEAR, ServoTrajectory.PROFILE_TRAPEZOID,
+                           ServoTrajectory.PROFILE_CUBIC):
+            raise ValueError("Invalid trajectory profile.")
+        if len(waypoints) == 0 or waypoints[0][0] != 0:
+            raise ValueError("Waypoints must start at time 0.")
+
+        last_time = -1
+        for t, angle in waypoints:
+            if t <= last_time:
+                raise ValueError("Waypoint times must be strictly increasing.")
+            if angle < 0 or angle > 240:
+                raise ValueError("Angle must be in range 0~240.")
+            last_time = t
+
+        self._waypoints[servo_id] = (list(waypoints), profile)
+        # 路点改变后需要重新编译
+        self._frame = None
+
+    def _shape(self, u: float, profile: int) -> float:
+        """
+        根据插值方式将段内归一化时间（0~1）映射为归一化位移（0~1）。
+
+        ==========================================
+
+        Map normalized segment time (0~1) to normalized displacement (0~1) for the given profile.
+        """
+        if profile == ServoTrajectory.PROFILE_CUBIC:
+            return u * u * (3 - 2 * u)
+
+        if profile == ServoTrajectory.PROFILE_TRAPEZOID:
+            ta = self._accel_fraction
+            # 匀速段速度，使总位移为1
+            v = 1 / (1 - ta)
+            if u < ta:
+                return 0.5 * v / ta * u * u
+            if u > 1 - ta:
+                r = 1 - u
+                return 1 - 0.5 * v / ta * r * r
+            return 0.5 * v * ta + v * (u - ta)
+
+        return u
+
+    def compile(self) -> None:
+        """
+        预先计算所有舵机的位置序列和数据包。
+
+        Raises:
+            ValueError: 如果还没有添加任何舵机的路点，则抛出异常。
+
+        ==========================================
+
+        Precompute the position streams and packets of all servos.
+
+        Raises:
+            ValueError: If no waypoints have been added.
+        """
+        if len(self._waypoints) == 0:
+            raise ValueError("No waypoints added.")
+
+        period = self.period_ms
+        # 轨迹总时长取所有舵机最后一个路点时间的最大值
+        duration = 0
+        for waypoints, _ in self._waypoints.values():
+            duration = max(duration, waypoints[-1][0])
+        frames = duration // period + 1
+        if duration % period:
+            frames += 1
+
+        self._ids = list(self._waypoints.keys())
+        self._streams = []
+        for servo_id in self._ids:
+            waypoints, profile = self._waypoints[servo_id]
+            stream = array('H', [0] * frames)
+            segment = 0
+            for k in range(frames):
+                t = k * period
+                # 找到当前时间所在的路点段
+                while segment < len(waypoints) - 1 and t >= waypoints[segment + 1][0]:
+                    segment += 1
+                if segment >= len(waypoints) - 1:
+                    # 超过最后一个路点，保持在终点
+                    angle = waypoints[-1][1]
+                else:
+                    t0, a0 = waypoints[segment]
+                    t1, a1 = waypoints[segment + 1]
+                    angle = a0 + (a1 - a0) * self._shape((t - t0) / (t1 - t0), profile)
+                # 转换为舵机原始单位，每个单位对应0.24度
+                stream[k] = int(angle / 0.24)
+            self._streams.append(stream)
+
+        # 预先构建一帧中所有舵机的数据包，转动时间等于控制周期，舵机在两帧之间自行插值
+        count = len(self._ids)
+        self._frame = bytearray(10 * count)
+        self._checksum_base = array('H', [0] * count)
+        for i in range(count):
+            packet = self.servo.build_packet(self._ids[i], SerialServo.SERVO_MOVE_TIME_WRITE[0],
+                                             [0, 0, period & 0xFF, (period >> 8) & 0xFF])
+            self._frame[10 * i:10 * i + 10] = packet
+            # 校验和中与位置无关的部分：ID + 数据长度 + 命令 + 时间
+            self._checksum_base[i] = packet[2] + packet[3] + packet[4] + packet[7] + packet[8]
+
+        self.frames = frames
+
+    def _send_frame(self, k: int) -> None:
+        """
+        修改缓冲区中的位置字节和校验和，并发送第k帧。
+
+        ==========================================
+
+        Patch the position bytes and checksums in the buffer and send frame k.
+        """
+        frame = self._frame
+        base = self._checksum_base
+        streams = self._streams
+        for i in range(len(streams)):
+            position = streams[i][k]
+            low = position & 0xFF
+            high = position >> 8
+            offset = 10 * i
+            frame[offset + 5] = low
+            frame[offset + 6] = high
+            frame[offset + 9] = ~(base[i] + low + high) & 0xFF
+        self.servo.write_packet(frame)
+        self.frames_sent += 1
+
+    def start(self) -> None:
+        """
+        开始播放轨迹，立即发送第一帧。
+
+        ==========================================
+
+        Start playing the trajectory and send the first frame immediately.
+        """
+        if self._frame is None:
+            self.compile()
+
+        # 轨迹直接写入数据包，写入合并的影子状态不再可信
+        for servo_id in self._ids:
+            self.servo.invalidate_shadow(servo_id)
+
+        self.frames_sent = 0
+        self.deadline_misses = 0
+        self.max_lateness_us = 0
+        self._index = 0
+        self._deadline = time.ticks_us()
+        self._running = True
+        self.update()
+
+    def update(self) -> bool:
+        """
+        非阻塞地发送到期的帧。
+
+        如果当前时间已经超过下一帧的截止时间一个控制周期以上，跳过过期的帧并计入截止时间错过次数。
+
+        Returns:
+            bool: 轨迹仍在播放时返回True，播放结束后返回False。
+
+        ==========================================
+
+        Send the due frame without blocking.
+
+        If the current time is more than one control period past the next deadline, stale frames are skipped
+        and counted as deadline misses.
+
+        Returns:
+            bool: True while the trajectory is playing, False once it has finished.
+        """
+        if not self._running:
+            return False
+
+        late = time.ticks_diff(time.ticks_us(), self._deadline)
+        if late < 0:
+            return True
+
+        period_us = self.period_ms * 1000
+        # 跳过已经过期的帧，最后一帧总是发送
+        if late >= period_us:
+            skipped = min(late // period_us, self.frames - 1 - self._index)
+            self.deadline_misses += skipped
+            self._index += skipped
+            self._deadline = time.ticks_add(self._deadline, skipped * period_us)
+            late -= skipped * period_us
+        if late > self.max_lateness_us:
+            self.max_lateness_us = late
+
+        self._send_frame(self._index)
+        self._index += 1
+        self._deadline = time.ticks_add(self._deadline, period_us)
+
+        if self._index >= self.frames:
+            self._running = False
+        return self._running
+
+    def run(self) -> None:
+        """
+        阻塞地播放完整条轨迹。
+
+        ==========================================
+
+        Block until the whole trajectory has been played.
+        """
+        self.start()
+        while self._running:
+            wait = time.ticks_diff(self._deadline, time.ticks_us())
+            if wait > 1000:
+                time.sleep_ms(wait // 1000)
+            self.update()
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,635 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/23 上午10:20
+# @Author  : 李清水
+# @File    : servo_worker.py
+# @Description : 串口舵机第二核总线工作类，在RP2040的第二个核心上通过 _thread 运行总线事务循环，
+#                两个核心通过预分配的环形缓冲区交换指令和遥测数据
+
+# ======================================== 导入相关模块 =========================================
+
+# 时间相关的模块
+import time
+# 数组模块，用于预分配遥测数据表
+from array import array
+# 导入串口舵机驱动类
+from .serial_servo import SerialServo
+# 导入总线优先级调度类
+from .servo_scheduler import ServoScheduler
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 串口舵机第二核总线工作类
+class ServoWorker:
+    """
+    串口舵机第二核总线工作类。
+
+    RP2040有两个核心，但默认所有 `SerialServo` 通信都和运动学计算、LED渲染一起运行在核心0上。
+    `start()` 通过 `_thread` 在核心1上运行总线事务循环：核心1用 `ServoScheduler` 按优先级发送指令，
+    并按周期轮询遥测数据，核心0只与预分配的环形缓冲区交互，从不等待UART。
+
+    - 指令环形缓冲区：核心0写入、核心1读取的单生产者单消费者队列，每个槽保存优先级、舵机ID、指令编号和参数，
+      双方只修改各自的读写位置，不需要加锁。
+    - 遥测环形缓冲区和最新数值表：由核心1写入，每条记录包含多个字，使用锁保护，核心0持锁时间只有几次数组访问。
+
+    创建该类后，核心0上不应再直接调用同一个 `SerialServo` 实例的方法，所有总线访问都交给核心1。
+
+    Attributes:
+        servo (SerialServo): 串口舵机控制类实例，由核心1独占使用。
+        scheduler (ServoScheduler): 核心1使用的总线优先级调度类实例。
+        servo_ids (list[int]): 轮询遥测的舵机ID列表。
+        commands_sent (int): 核心1已交给调度器的指令数量。
+        dropped (int): 指令缓冲区已满而被拒绝的指令数量。
+        telemetry_overruns (int): 遥测缓冲区已满而被覆盖的记录数量。
+        telemetry_deferred (int): 一轮开始时放不进调度器队列、等前面的读取完成后才排队的遥测读取数量。
+        read_failures (int): 遥测读取失败的次数。
+        loops (int): 核心1事务循环的执行次数。
+        error (Exception): 核心1上发生的异常，没有异常时为None。
+
+    Methods:
+        start() -> None:
+            在第二个核心上启动总线事务循环。
+        stop(timeout_ms: int = 100) -> bool:
+            停止总线事务循环。
+        running() -> bool:
+            判断总线事务循环是否正在运行。
+        move(servo_id: int, position: int, time_ms: int) -> bool:
+            排队立即转动指令（原始位置单位）。
+        stop_servo(servo_id: int = 254) -> bool:
+            排队急停指令。
+        send(servo_id: int, cmd: int, params: list = []) -> bool:
+            排队写入指令。
+        pop_telemetry(record: array) -> bool:
+            取出一条遥测记录。
+        latest(servo_id: int, cmd: int) -> tuple:
+            获取最新的遥测数值及时间戳。
+
+    ==========================================
+
+    Second-core bus worker for serial servos.
+
+    The RP2040 has two cores, but by default all `SerialServo` I/O runs on core 0 together with kinematics and LED
+    rendering. `start()` runs the bus transaction loop on core 1 through `_thread`: core 1 sends commands in
+    priority order with a `ServoScheduler` and polls telemetry periodically, while core 0 only touches preallocated
+    ring buffers and never waits for the UART.
+
+    - Command ring: a single-producer single-consumer queue written by core 0 and read by core 1. Each slot holds
+      priority, servo ID, command ID and parameters; each side only updates its own index, so no lock is needed.
+    - Telemetry ring and latest-value table: written by core 1. Every record spans several words, so they are
+      protected by a lock that core 0 holds only for a few array accesses.
+
+    Once the worker exists, core 0 should not call the same `SerialServo` instance directly; all bus access belongs
+    to core 1.
+
+    Attributes:
+        servo (SerialServo): Serial servo control instance, used by core 1 only.
+        scheduler (ServoScheduler): Bus priority scheduler used by core 1.
+        servo_ids (list[int]): IDs of the servos polled for telemetry.
+        commands_sent (int): Number of commands handed to the scheduler by core 1.
+        dropped (int): Number of commands rejected because the command ring was full.
+        telemetry_overruns (int): Number of telemetry records overwritten because the ring was full.
+        telemetry_deferred (int): Number of telemetry reads that did not fit into the scheduler queue when a round
+                                  started and were queued as earlier reads completed.
+        read_failures (int): Number of failed telemetry reads.
+        loops (int): Number of iterations of the core 1 transaction loop.
+        error (Exception): Exception raised on core 1, None if there was none.
+
+    Methods:
+        start() -> None:
+            Start the bus transaction loop on the second core.
+        stop(timeout_ms: int = 100) -> bool:
+            Stop the bus transaction loop.
+        running() -> bool:
+            Whether the bus transaction loop is running.
+        move(servo_id: int, position: int, time_ms: int) -> bool:
+            Queue an immediate move in raw position units.
+        stop_servo(servo_id: int = 254) -> bool:
+            Queue an emergency stop.
+        send(servo_id: int, cmd: int, params: list = []) -> bool:
+            Queue a write command.
+        pop_telemetry(record: array) -> bool:
+            Take one telemetry record.
+        latest(servo_id: int, cmd: int) -> tuple:
+            Latest telemetry value and timestamp.
+    """
+
+    # 类变量：指令槽中参数的最大长度
+    MAX_PARAMS = 4
+
+    # 遥测读取命令及对应的整数解析方法
+    TELEMETRY_PARSERS = {
+        26: "_parse_temp",          # SERVO_TEMP_READ，单位摄氏度
+        27: "_parse_voltage_mv",    # SERVO_VIN_READ，单位毫伏
+        28: "_parse_position_raw"   # SERVO_POS_READ，原始位置单位
+    }
+
+    def __init__(self, servo: SerialServo, servo_ids: list = (), telemetry: tuple = (SerialServo.SERVO_POS_READ,),
+                 period_ms: int = 20, queue_size: int = 32, telemetry_size: int = 64) -> None:
+        """
+        初始化第二核总线工作类。
+
+        Args:
+            servo (SerialServo): 串口舵机控制类实例。
+            servo_ids (list): 轮询遥测的舵机ID列表，ID范围0~253，为空时不轮询遥测。
+            telemetry (tuple): 轮询的读取命令，可选 SERVO_POS_READ、SERVO_VIN_READ 和 SERVO_TEMP_READ。
+            period_ms (int): 遥测轮询周期，单位毫秒。
+            queue_size (int): 指令环形缓冲区的槽数。
+            telemetry_size (int): 遥测环形缓冲区的记录数。
+
+        Raises:
+            ValueError: 如果舵机ID超出范围、读取命令不支持，或周期、缓冲区大小不大于0，则抛出异常。
+
+        ==========================================
+
+        Initialize the second-core bus worker.
+
+        Args:
+            servo (SerialServo): Serial servo control instance.
+            servo_ids (list): IDs of the servos polled for telemetry, range 0~253; empty disables polling.
+            telemetry (tuple): Read commands to poll: SERVO_POS_READ, SERVO_VIN_READ and SERVO_TEMP_READ.
+            period_ms (int): Telemetry polling period in milliseconds.
+            queue_size (int): Number of slots of the command ring.
+            telemetry_size (int): Number of records of the telemetry ring.
+
+        Raises:
+            ValueError: If a servo ID is out of range, a read command is not supported, or the period or a buffer
+                        size is not greater than 0.
+        """
+        for servo_id in servo_ids:
+            if servo_id < 0 or servo_id > 253:
+                raise ValueError("Servo ID must be in range 0~253.")
+        for command in telemetry:
+            if command[0] not in ServoWorker.TELEMETRY_PARSERS:
+                raise ValueError("Unsupported telemetry command.")
+        if period_ms <= 0 or queue_size <= 0 or telemetry_size <= 0:
+            raise ValueError("Period and buffer sizes must be greater than 0.")
+
+        self.servo = servo
+        self.scheduler = ServoScheduler(servo, queue_size=queue_size)
+        self.servo_ids = list(servo_ids)
+        self._telemetry = tuple(telemetry)
+        self._period_ms = period_ms
+
+        # 指令环形缓冲区：每个槽依次为 优先级、舵机ID、指令编号、参数长度、参数，多留一个槽用于区分空和满
+        self._slot = 4 + ServoWorker.MAX_PARAMS
+        self._queue_size = queue_size + 1
+        self._queue = bytearray(self._queue_size * self._slot)
+        self._queue_head = 0
+        self._queue_tail = 0
+
+        # 遥测环形缓冲区：每条记录依次为 舵机ID、指令编号、数值、时间戳
+        self._records = array('i', [0] * (telemetry_size * 4))
+        self._record_size = telemetry_size
+        self._record_head = 0
+        self._record_count = 0
+
+        # 最新数值表：按 命令序号 * 舵机数量 + 舵机序号 索引
+        count = len(self.servo_ids)
+        self._index = {}
+        for i in range(count):
+            self._index[self.servo_ids[i]] = i
+        self._values = array('i', [0] * (count * len(self._telemetry)))
+        self._stamps = array('i', [0] * (count * len(self._telemetry)))
+        self._valid = bytearray(count * len(self._telemetry))
+
+        # 创建实例时才导入线程模块（RP2040上新线程运行在第二个核心），没有 _thread 的平台仍可导入本包
+        import _thread
+        self._start_thread = _thread.start_new_thread
+        # 遥测数据锁，核心1写入和核心0读取时持有
+        self._lock = _thread.allocate_lock()
+
+        # 每个遥测命令预先绑定一个回调函数，避免轮询时创建闭包
+        self._callbacks = [self._make_callback(k) for k in range(len(self._telemetry))]
+
+        # 线程控制标志
+        self._stop_request = False
+        self._running = False
+
+        # 一轮遥测读取的总数和下一个待排队读取的序号，调度器队列放不下时随读取完成逐个补充
+        self._poll_total = count * len(self._telemetry)
+        self._poll_index = self._poll_total
+
+        # 统计数据
+        self.commands_sent = 0
+        self.dropped = 0
+        self.telemetry_overruns = 0
+        self.telemetry_deferred = 0
+        self.read_failures = 0
+        self.loops = 0
+        self.error = None
+
+    def _make_callback(self, k: int):
+        """
+        创建第 k 个遥测命令的回复回调函数。
+
+        ==========================================
+
+        Create the reply callback of the k-th telemetry command.
+        """
+        command = self._telemetry[k]
+        parser = getattr(self.servo, ServoWorker.TELEMETRY_PARSERS[command[0]])
+
+        def callback(servo_id, params):
+            if params is None:
+                self.read_failures += 1
+                return
+            try:
+                value = parser(params)
+            except ValueError:
+                self.read_failures += 1
+                return
+            self._store(k, servo_id, command[0], value)
+
+        return callback
+
+    def _store(self, k: int, servo_id: int, cmd: int, value: int) -> None:
+        """
+        在核心1上保存一条遥测数据：写入最新数值表和遥测环形缓冲区。
+
+        ==========================================
+
+        Store one telemetry value on core 1: update the latest-value table and the telemetry ring.
+        """
+        stamp = time.ticks_ms()
+        slot = k * len(self.servo_ids) + self._index[servo_id]
+
+        self._lock.acquire()
+        self._values[slot] = value
+        self._stamps[slot] = stamp
+        self._valid[slot] = 1
+
+        # 缓冲区已满时覆盖最旧的记录
+        size = self._record_size
+        if self._record_count == size:
+            self._record_head = (self._record_head + 1) % size
+            self._record_count -= 1
+            self.telemetry_overruns += 1
+        index = ((self._record_head + self._record_count) % size) * 4
+        records = self._records
+        records[index] = servo_id
+        records[index + 1] = cmd
+        records[index + 2] = value
+        records[index + 3] = stamp
+        self._record_count += 1
+        self._lock.release()
+
+    def _push(self, priority: int, servo_id: int, cmd: int, params) -> bool:
+        """
+        在核心0上将一条指令写入指令环形缓冲区。
+
+        ==========================================
+
+        Write one command into the command ring on core 0.
+        """
+        if len(params) > ServoWorker.MAX_PARAMS:
+            raise ValueError("Too many parameters.")
+        if servo_id < 0 or servo_id > 254:
+            raise ValueError("Servo ID must be in range 0~254.")
+
+        tail = self._queue_tail
+        next_tail = (tail + 1) % self._queue_size
+        if next_tail == self._queue_head:
+            self.dropped += 1
+            return False
+
+        # 先写入槽的内容，再移动写入位置，核心1不会读到不完整的指令
+        queue = self._queue
+        base = tail * self._slot
+        queue[base] = priority
+        queue[base + 1] = servo_id
+        queue[base + 2] = cmd
+        queue[base + 3] = len(params)
+        for i in range(len(params)):
+            queue[base + 4 + i] = params[i]
+        self._queue_tail = next_tail
+        return True
+
+    def move(self, servo_id: int, position: int, time_ms: int) -> bool:
+        """
+        排队立即转动指令（原始位置单位），由核心1以运动优先级发送。
+
+        Args:
+            servo_id (int): 舵机ID。
+            position (int): 目标位置原始值，范围0~1000。
+            time_ms (int): 运动时间，单位毫秒，范围0~30000。
+
+        Returns:
+            bool: 成功排队时返回True，指令缓冲区已满时返回False。
+
+        Raises:
+            ValueError: 如果舵机ID、位置或时间超出范围，则抛出异常。
+
+        ==========================================
+
+        Queue an immediate move in raw position units, sent by core 1 with motion priority.
+
+        Args:
+            servo_id (int): Servo ID.
+            position (int): Raw target position, range 0~1000.
+            time_ms (int): Move time in milliseconds, range 0~30000.
+
+        Returns:
+            bool: True if queued, False if the command ring is full.
+
+        Raises:
+            ValueError: If the servo ID, position or time is out of range.
+        """
+        if position < 0 or position > 1000:
+            raise ValueError("Position must be in range 0~1000.")
+        if time_ms < 0 or time_ms > 30000:
+            raise ValueError("Time must be in range 0~30000 ms.")
+        return self._push(ServoScheduler.PRIORITY_MOTION, servo_id, SerialServo.SERVO_MOVE_TIME_WRITE[0],
+                          (position & 0xFF, (position >> 8) & 0xFF, time_ms & 0xFF, (time_ms >> 8) & 0xFF))
+
+    def stop_servo(self, servo_id: int = 254) -> bool:
+        """
+        排队急停指令，由核心1以急停优先级发送，并丢弃该舵机尚未发送的运动指令。
+
+        Args:
+            servo_id (int): 舵机ID，默认254表示广播停止所有舵机。
+
+        Returns:
+            bool: 成功排队时返回True，指令缓冲区已满时返回False。
+
+        ==========================================
+
+        Queue an emergency stop, sent by core 1 with emergency priority; queued moves of that servo are discarded.
+
+        Args:
+            servo_id (int): Servo ID, default 254 broadcasts the stop to every servo.
+
+        Returns:
+            bool: True if queued, False if the command ring is full.
+        """
+        return self._push(ServoScheduler.PRIORITY_ESTOP, servo_id, SerialServo.SERVO_MOVE_STOP[0], ())
+
+    def send(self, servo_id: int, cmd: int, params: list = []) -> bool:
+        """
+        排队写入指令，由核心1以配置优先级发送。
+
+        Args:
+            servo_id (int): 舵机ID。
+            cmd (int): 写入指令编号。
+            params (list): 参数列表，最多4个字节。
+
+        Returns:
+            bool: 成功排队时返回True，指令缓冲区已满时返回False。
+
+        Raises:
+            ValueError: 如果指令是读取指令或参数过多，则抛出异常。
+
+        ==========================================
+
+        Queue a write command, sent by core 1 with config priority.
+
+        Args:
+            servo_id (int): Servo ID.
+            cmd (int): Write command ID.
+            params (list): Parameter list, at most 4 bytes.
+
+        Returns:
+            bool: True if queued, False if the command ring is full.
+
+        Raises:
+            ValueError: If the command is a read command or has too many parameters.
+        """
+        if cmd in SerialServo.READ_COMMANDS:
+            raise ValueError("Read commands are polled by the worker.")
+        return self._push(ServoScheduler.PRIORITY_CONFIG, servo_id, cmd, params)
+
+    def pop_telemetry(self, record: array) -> bool:
+        """
+        取出最旧的一条遥测记录，写入调用者提供的数组，不分配内存。
+
+        Args:
+            record (array): 长度至少为4的整数数组，依次写入舵机ID、指令编号、数值和时间戳（time.ticks_ms）。
+
+        Returns:
+            bool: 取出记录时返回True，没有记录时返回False。
+
+        ==========================================
+
+        Take the oldest telemetry record into a caller-provided array without allocating.
+
+        Args:
+            record (array): Integer array of length 4 or more, filled with servo ID, command ID, value and timestamp
+                            (time.ticks_ms).
+
+        Returns:
+            bool: True if a record was taken, False if there is none.
+        """
+        self._lock.acquire()
+        if self._record_count == 0:
+            self._lock.release()
+            return False
+        index = self._record_head * 4
+        records = self._records
+        record[0] = records[index]
+        record[1] = records[index + 1]
+        record[2] = records[index + 2]
+        record[3] = records[index + 3]
+        self._record_head = (self._record_head + 1) % self._record_size
+        self._record_count -= 1
+        self._lock.release()
+        return True
+
+    def latest(self, servo_id: int, cmd: int) -> tuple:
+        """
+        获取最新的遥测数值及时间戳。
+
+        Args:
+            servo_id (int): 舵机ID。
+            cmd (int): 读取指令编号，例如 SerialServo.SERVO_POS_READ[0]。
+
+        Returns:
+            tuple: 整数数值（位置为原始单位，电压为毫伏，温度为摄氏度）和时间戳的元组，没有有效数据时返回None。
+
+        Raises:
+            ValueError: 如果该舵机或指令没有被轮询，则抛出异常。
+
+        ==========================================
+
+        Latest telemetry value and timestamp.
+
+        Args:
+            servo_id (int): Servo ID.
+            cmd (int): Read command ID, such as SerialServo.SERVO_POS_READ[0].
+
+        Returns:
+            tuple: Integer value (raw position units, millivolts or degrees Celsius) and timestamp, or None if
+                   nothing was read yet.
+
+        Raises:
+            ValueError: If the servo or command is not polled.
+        """
+        if servo_id not in self._index:
+            raise ValueError("Servo ID is not polled.")
+        for k in range(len(self._telemetry)):
+            if self._telemetry[k][0] == cmd:
+                break
+        else:
+            raise ValueError("Command is not polled.")
+
+        slot = k * len(self.servo_ids) + self._index[servo_id]
+        self._lock.acquire()
+        result = (self._values[slot], self._stamps[slot]) if self._valid[slot] else None
+        self._lock.release()
+        return result
+
+    def _drain_commands(self) -> None:
+        """
+        在核心1上将指令环形缓冲区中的指令交给调度器。
+
+        ==========================================
+
+        Hand the commands of the command ring to the scheduler on core 1.
+        """
+        queue = self._queue
+        scheduler = self.scheduler
+        head = self._queue_head
+        while head != self._queue_tail:
+            base = head * self._slot
+            priority = queue[base]
+            servo_id = queue[base + 1]
+            cmd = queue[base + 2]
+            params = list(queue[base + 4:base + 4 + queue[base + 3]])
+            # 调度器队列已满时保留在环形缓冲区中，下一次循环再交给调度器
+            if priority == ServoScheduler.PRIORITY_ESTOP:
+                if not scheduler.stop(servo_id):
+                    break
+            elif not scheduler.submit(priority, servo_id, cmd, params):
+                break
+            self.commands_sent += 1
+            head = (head + 1) % self._queue_size
+            self._queue_head = head
+
+    def _queue_telemetry(self) -> None:
+        """
+        在核心1上将本轮尚未排队的遥测读取交给调度器，直到遥测队列已满。
+
+        ==========================================
+
+        Hand the telemetry reads of the current round that are not queued yet to the scheduler on core 1,
+        until the telemetry queue is full.
+        """
+        scheduler = self.scheduler
+        count = len(self.servo_ids)
+        index = self._poll_index
+        # 只在队列有空位时排队，避免读取被调度器丢弃
+        while index < self._poll_total and scheduler.pending(ServoScheduler.PRIORITY_TELEMETRY) < scheduler._size:
+            k = index // count
+            scheduler.read(self.servo_ids[index % count], self._telemetry[k], self._callbacks[k])
+            index += 1
+        self._poll_index = index
+
+    def _run(self) -> None:
+        """
+        核心1上的总线事务循环。
+
+        ==========================================
+
+        Bus transaction loop running on core 1.
+        """
+        scheduler = self.scheduler
+        due = time.ticks_ms()
+        try:
+            while not self._stop_request:
+                self._drain_commands()
+
+                if self._poll_index < self._poll_total:
+                    # 本轮还有读取没有放进调度器队列，随前面的读取完成逐个补充
+                    self._queue_telemetry()
+                elif self.servo_ids and scheduler.pending(ServoScheduler.PRIORITY_TELEMETRY) == 0:
+                    # 上一轮遥测读取完成且到期后开始下一轮
+                    now = time.ticks_ms()
+                    if time.ticks_diff(now, due) >= 0:
+                        due = time.ticks_add(due, self._period_ms)
+                        # 落后超过一个周期时从当前时刻重新计时
+                        if time.ticks_diff(now, due) >= 0:
+                            due = time.ticks_add(now, self._period_ms)
+                        self._poll_index = 0
+                        self._queue_telemetry()
+                        self.telemetry_deferred += self._poll_total - self._poll_index
+
+                scheduler.update()
+                self.loops += 1
+
+            # 退出前发送完排队的指令
+            self._drain_commands()
+            scheduler.run_until_idle()
+        except Exception as e:
+            self.error = e
+        self._running = False
+
+    def start(self) -> None:
+        """
+        在第二个核心上启动总线事务循环。
+
+        Raises:
+            RuntimeError: 如果总线事务循环已经在运行，则抛出异常。
+
+        ==========================================
+
+        Start the bus transaction loop on the second core.
+
+        Raises:
+            RuntimeError: If the loop is already running.
+        """
+        if self._running:
+            raise RuntimeError("Worker is already running.")
+        self._stop_request = False
+        self.error = None
+        self._running = True
+        self._start_thread(self._run, ())
+
+    def stop(self, timeout_ms: int = 100) -> bool:
+        """
+        请求停止总线事务循环，并等待其发送完排队的指令后退出。
+
+        Args:
+            timeout_ms (int): 最长等待时间，单位毫秒。
+
+        Returns:
+            bool: 循环在超时前退出时返回True，否则返回False。
+
+        ==========================================
+
+        Ask the bus transaction loop to stop and wait until it has sent the queued commands and exited.
+
+        Args:
+            timeout_ms (int): Longest wait in milliseconds.
+
+        Returns:
+            bool: True if the loop exited before the timeout, False otherwise.
+        """
+        self._stop_request = True
+        start = time.ticks_ms()
+        while self._running:
+            if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+                return False
+            time.sleep_ms(1)
+        return True
+
+    def running(self) -> bool:
+        """
+        判断总线事务循环是否正在运行。
+
+        Returns:
+            bool: 正在运行时返回True。
+
+        ==========================================
+
+        Whether the bus transaction loop is running.
+
+        Returns:
+            bool: True while running.
+        """
+        return self._running
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
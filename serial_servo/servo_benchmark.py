@@ -0,0 +1,257 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/19 下午3:10
+# @Author  : 李清水
+# @File    : servo_benchmark.py
+# @Description : 串口舵机驱动性能测试，测量单次读取、分组运动、遥测轮询和总线扫描的吞吐量、往返延迟、
+#                线路字节数和每次调用的内存分配，结果保存为JSON文件以便比较
+#                在Linux（MicroPython unix 端口）上使用模拟总线运行，在开发板上使用真实UART运行
+
+# ======================================== 导入相关模块 =========================================
+
+# 系统相关的模块
+import sys
+# 时间相关的模块
+import time
+# 垃圾回收模块，用于统计内存分配
+import gc
+# json模块
+import json
+# 导入串口舵机驱动相关类
+from serial_servo import SerialServo, ServoTelemetryPoller, ServoScanner, ServoBusManager, SimulatedUART
+
+# ======================================== 全局变量 ============================================
+
+# 测试用的舵机ID
+servo_ids = [1, 2, 3, 4, 5, 6]
+# 模拟总线测试的波特率
+sim_baudrates = [115200, 500000, 1000000]
+# 开发板测试的波特率
+device_baudrate = 115200
+# 每个测试项的调用次数
+iterations = {
+    "single_read": 200,
+    "group_move": 200,
+    "telemetry_sweep": 20,
+    "scan": 2,
+}
+
+# ======================================== 功能函数 ============================================
+
+def percentile(samples: list, p: float) -> int:
+    """
+    计算已排序样本的百分位数。
+
+    Args:
+        samples (list): 已排序的样本。
+        p (float): 百分位，范围0~100。
+
+    Returns:
+        int: 百分位数，没有样本时返回0。
+
+    ==========================================
+
+    Percentile of sorted samples.
+
+    Args:
+        samples (list): Sorted samples.
+        p (float): Percentile, range 0~100.
+
+    Returns:
+        int: The percentile, 0 if there are no samples.
+    """
+    if len(samples) == 0:
+        return 0
+    index = int(len(samples) * p / 100)
+    if index >= len(samples):
+        index = len(samples) - 1
+    return samples[index]
+
+def mem_alloc() -> int:
+    """
+    获取当前已分配的堆内存字节数，平台不支持时返回None。
+
+    ==========================================
+
+    Currently allocated heap bytes, or None if the platform does not report it.
+    """
+    if hasattr(gc, "mem_alloc"):
+        return gc.mem_alloc()
+    return None
+
+def measure(name: str, uart, func, count: int, commands: int) -> dict:
+    """
+    重复调用被测函数，统计延迟、吞吐量、线路字节数和内存分配。
+
+    Args:
+        name (str): 测试项名称。
+        uart (CountingUART): 统计字节数的UART包装类实例。
+        func (callable): 被测函数，每次调用完成一次操作。
+        count (int): 调用次数。
+        commands (int): 每次调用发送的舵机指令数量。
+
+    Returns:
+        dict: 测试结果。
+
+    ==========================================
+
+    Call the function under test repeatedly and collect latency, throughput, wire bytes and allocations.
+
+    Args:
+        name (str): Name of the benchmark.
+        uart (CountingUART): Byte-counting UART wrapper.
+        func (callable): Function under test; every call performs one operation.
+        count (int): Number of calls.
+        commands (int): Number of servo commands sent per call.
+
+    Returns:
+        dict: Benchmark result.
+    """
+    samples = []
+    uart.reset()
+
+    # 测量期间关闭自动垃圾回收，使分配统计准确
+    gc.collect()
+    gc.disable()
+    before = mem_alloc()
+    start = time.ticks_us()
+    for _ in range(count):
+        t0 = time.ticks_us()
+        func()
+        samples.append(time.ticks_diff(time.ticks_us(), t0))
+    total_us = time.ticks_diff(time.ticks_us(), start)
+    after = mem_alloc()
+    gc.enable()
+
+    samples.sort()
+    result = {
+        "calls": count,
+        "commands_per_s": int(count * commands * 1000000 / total_us) if total_us > 0 else 0,
+        "p50_us": percentile(samples, 50),
+        "p99_us": percentile(samples, 99),
+        "mean_us": total_us // count,
+        "tx_bytes_per_call": uart.tx_bytes // count,
+        "rx_bytes_per_call": uart.rx_bytes // count,
+        "alloc_bytes_per_call": (after - before) // count if before is not None else None,
+    }
+    print("%-16s %8d cmd/s  p50 %7d us  p99 %7d us  tx %5d B  rx %5d B  alloc %s B" % (
+        name, result["commands_per_s"], result["p50_us"], result["p99_us"],
+        result["tx_bytes_per_call"], result["rx_bytes_per_call"], result["alloc_bytes_per_call"]))
+    return result
+
+def run_suite(uart, baudrate: int) -> dict:
+    """
+    在一路总线上运行全部测试项。
+
+    Args:
+        uart: UART实例或模拟总线实例。
+        baudrate (int): 总线波特率。
+
+    Returns:
+        dict: 测试项名称 -> 测试结果。
+
+    ==========================================
+
+    Run every benchmark on one bus.
+
+    Args:
+        uart: UART or simulated bus instance.
+        baudrate (int): Bus baudrate.
+
+    Returns:
+        dict: Benchmark name -> result.
+    """
+    counting = CountingUART(uart)
+    servo = SerialServo(counting)
+    bus = ServoBusManager([servo], {servo_id: 0 for servo_id in servo_ids})
+    poller = ServoTelemetryPoller(servo, servo_ids)
+    scanner = ServoScanner(servo, baudrate=baudrate, block_size=8, verify=0)
+    moves = {servo_id: 120 for servo_id in servo_ids}
+
+    results = {}
+    results["single_read"] = measure("single_read", counting,
+                                     lambda: servo.read_servo_position(servo_ids[0]),
+                                     iterations["single_read"], 1)
+    results["group_move"] = measure("group_move", counting,
+                                    lambda: bus.move_servos(moves, 100),
+                                    iterations["group_move"], len(servo_ids))
+    results["telemetry_sweep"] = measure("telemetry_sweep", counting, poller.sweep,
+                                         iterations["telemetry_sweep"],
+                                         len(servo_ids) * len(ServoTelemetryPoller.COMMANDS))
+    results["scan"] = measure("scan", counting, lambda: scanner.scan(read_config=False),
+                              iterations["scan"], 254)
+    return results
+
+# ======================================== 自定义类 ============================================
+
+# 统计收发字节数的UART包装类
+class CountingUART:
+    """
+    统计收发字节数的UART包装类，转发 any、read、readinto、write 调用。
+
+    ==========================================
+
+    UART wrapper counting transmitted and received bytes, forwarding any, read, readinto and write.
+    """
+
+    def __init__(self, uart) -> None:
+        self.uart = uart
+        self.tx_bytes = 0
+        self.rx_bytes = 0
+
+    def reset(self) -> None:
+        self.tx_bytes = 0
+        self.rx_bytes = 0
+
+    def any(self) -> int:
+        return self.uart.any()
+
+    def read(self, nbytes=None):
+        data = self.uart.read() if nbytes is None else self.uart.read(nbytes)
+        if data:
+            self.rx_bytes += len(data)
+        return data
+
+    def readinto(self, buf, nbytes=None):
+        count = self.uart.readinto(buf) if nbytes is None else self.uart.readinto(buf, nbytes)
+        if count:
+            self.rx_bytes += count
+        return count
+
+    def write(self, buf) -> int:
+        self.tx_bytes += len(buf)
+        return self.uart.write(buf)
+
+# ======================================== 初始化配置 ==========================================
+
+time.sleep(1)
+print("FreakStudio: Serial Servo Benchmark")
+
+report = {
+    "platform": sys.platform,
+    "implementation": sys.implementation.name,
+    "servos": len(servo_ids),
+    "runs": [],
+}
+
+# ========================================  主程序  ===========================================
+
+if sys.platform in ("linux", "darwin"):
+    # 在主机上使用模拟总线
+    report["target"] = "simulated"
+    for baudrate in sim_baudrates:
+        print("--- simulated bus, %d baud ---" % baudrate)
+        uart = SimulatedUART(servo_ids=servo_ids, baudrate=baudrate)
+        report["runs"].append({"baudrate": baudrate, "results": run_suite(uart, baudrate)})
+else:
+    # 在开发板上使用真实UART
+    from machine import UART, Pin
+    report["target"] = "device"
+    print("--- device bus, %d baud ---" % device_baudrate)
+    uart = UART(1, baudrate=device_baudrate, tx=Pin(4), rx=Pin(5))
+    report["runs"].append({"baudrate": device_baudrate, "results": run_suite(uart, device_baudrate)})
+
+filename = "benchmark_%s.json" % report["target"]
+with open(filename, "w") as f:
+    json.dump(report, f)
+print("Results saved to %s" % filename)
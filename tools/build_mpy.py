@@ -0,0 +1,404 @@
+# Python env   : Python 3.9+ (PC)
+# -*- coding: utf-8 -*-
+# @Time    : 2025/5/21 下午4:30
+# @Author  : 李清水
+# @File    : build_mpy.py
+# @Description : 为 serial_servo 和 neopixel_matrix 生成去除文档字符串的源文件和 .mpy 文件，
+#                可选折叠常量，并输出文件大小和导入时间对比报告
+#                用法：python tools/build_mpy.py [--fold-const] [--mpy-cross PATH] [--micropython PATH] [--march ARCH]
+
+# ======================================== 导入相关模块 =========================================
+
+# 命令行参数解析模块
+import argparse
+# 语法树模块，用于去除文档字符串和折叠常量
+import ast
+# json模块
+import json
+# 文件和路径操作模块
+import os
+import shutil
+import subprocess
+import sys
+
+# ======================================== 全局变量 ============================================
+
+# 仓库根目录
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 需要构建的库：源码目录、参与构建的文件（None表示目录下所有 .py 文件）、导入时间测试使用的模块名、输出目录
+LIBRARIES = {
+    "serial_servo": {
+        "source": os.path.join(ROOT, "serial_servo", "serial_servo"),
+        "files": None,
+        "import": "serial_servo",
+        "package": True,
+        "output": os.path.join(ROOT, "serial_servo", "dist", "mpy"),
+    },
+    "neopixel_matrix": {
+        "source": os.path.join(ROOT, "neopixel_matrix", "neopixel_matrix"),
+        # main.py 为测试程序，不参与构建
+        "files": ["neopixel_matrix.py"],
+        "import": "neopixel_matrix",
+        "package": False,
+        "output": os.path.join(ROOT, "neopixel_matrix", "dist", "mpy"),
+    },
+}
+
+# 导入时间测试代码，在 MicroPython unix 端口中运行
+IMPORT_PROBE = (
+    "import gc, time\n"
+    "gc.collect()\n"
+    "m = gc.mem_alloc()\n"
+    "t = time.ticks_us()\n"
+    "import {module}\n"
+    "print(time.ticks_diff(time.ticks_us(), t), gc.mem_alloc() - m)\n"
+)
+
+# ======================================== 功能函数 ============================================
+
+def strip_docstrings(tree: ast.AST) -> int:
+    """
+    去除模块、类和函数的文档字符串。
+
+    Args:
+        tree (ast.AST): 语法树，原地修改。
+
+    Returns:
+        int: 去除的文档字符串数量。
+
+    ==========================================
+
+    Remove module, class and function docstrings.
+
+    Args:
+        tree (ast.AST): Syntax tree, modified in place.
+
+    Returns:
+        int: Number of docstrings removed.
+    """
+    count = 0
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        body = node.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+                and isinstance(body[0].value.value, str):
+            body.pop(0)
+            count += 1
+            # 函数或类只有文档字符串时保留一个 pass 语句
+            if not body:
+                body.append(ast.Pass())
+    return count
+
+def _literal(node: ast.AST):
+    """
+    获取可折叠的常量值：整数、const(整数) 或由整数组成的元组，不可折叠时返回None。
+
+    ==========================================
+
+    Get a foldable constant value: an int, const(int) or a tuple of ints; None if it cannot be folded.
+    """
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "const" \
+            and len(node.args) == 1 and not node.keywords:
+        node = node.args[0]
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return node.value
+    if isinstance(node, ast.Tuple) and node.elts \
+            and all(isinstance(e, ast.Constant) and type(e.value) is int for e in node.elts):
+        return tuple(e.value for e in node.elts)
+    return None
+
+def collect_constants(trees: list) -> dict:
+    """
+    收集类中以大写字母命名、由字面量定义且从未被重新赋值的整数或整数元组常量。
+
+    Args:
+        trees (list): 同一个库中所有文件的语法树。
+
+    Returns:
+        dict: 类名 -> {常量名: 值}。
+
+    ==========================================
+
+    Collect class constants named in upper case, defined by a literal and never reassigned.
+
+    Args:
+        trees (list): Syntax trees of every file of one library.
+
+    Returns:
+        dict: Class name -> {constant name: value}.
+    """
+    constants = {}
+    for tree in trees:
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ClassDef):
+                continue
+            values = {}
+            for stmt in node.body:
+                if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 \
+                        and isinstance(stmt.targets[0], ast.Name) and stmt.targets[0].id.isupper():
+                    value = _literal(stmt.value)
+                    if value is not None:
+                        values[stmt.targets[0].id] = value
+            if values:
+                constants[node.name] = values
+
+    # 任何地方对同名属性赋值的常量都不折叠
+    for tree in trees:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Store):
+                for values in constants.values():
+                    values.pop(node.attr, None)
+    return constants
+
+class ConstantFolder(ast.NodeTransformer):
+    """
+    将 `类名.常量`、类方法中的 `self.常量` 以及 `类名.常量[整数]` 替换为字面量。
+
+    ==========================================
+
+    Replace `ClassName.CONST`, `self.CONST` inside the defining class and `ClassName.CONST[int]` with literals.
+    """
+
+    def __init__(self, constants: dict) -> None:
+        self.constants = constants
+        self.folded = 0
+        self._classes = []
+
+    def visit_ClassDef(self, node):
+        self._classes.append(node.name)
+        self.generic_visit(node)
+        self._classes.pop()
+        return node
+
+    def _lookup(self, node):
+        if not isinstance(node, ast.Attribute) or not isinstance(node.ctx, ast.Load) \
+                or not isinstance(node.value, ast.Name):
+            return None
+        owner = node.value.id
+        if owner == "self" and self._classes:
+            owner = self._classes[-1]
+        values = self.constants.get(owner)
+        if values is None:
+            return None
+        return values.get(node.attr)
+
+    def _make(self, value, source):
+        self.folded += 1
+        if isinstance(value, tuple):
+            new = ast.Tuple(elts=[ast.Constant(v) for v in value], ctx=ast.Load())
+        else:
+            new = ast.Constant(value)
+        return ast.copy_location(new, source)
+
+    def visit_Subscript(self, node):
+        value = self._lookup(node.value)
+        index = node.slice
+        if isinstance(value, tuple) and isinstance(index, ast.Constant) and type(index.value) is int \
+                and -len(value) <= index.value < len(value):
+            return self._make(value[index.value], node)
+        self.generic_visit(node)
+        return node
+
+    def visit_Attribute(self, node):
+        value = self._lookup(node)
+        if value is not None:
+            return self._make(value, node)
+        self.generic_visit(node)
+        return node
+
+def find_tool(name: str, explicit: str):
+    """
+    查找外部工具的可执行文件，找不到时返回None。
+
+    ==========================================
+
+    Find the executable of an external tool, or None if it is not available.
+    """
+    if explicit:
+        return explicit
+    return shutil.which(name)
+
+def compile_mpy(mpy_cross: str, source: str, target: str, march: str) -> bool:
+    """
+    调用 mpy-cross 将源文件编译为 .mpy 文件。
+
+    ==========================================
+
+    Compile a source file to .mpy with mpy-cross.
+    """
+    command = [mpy_cross, "-o", target]
+    if march:
+        command.append("-march=" + march)
+    command.append(source)
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        print("mpy-cross failed for %s: %s" % (source, result.stderr.strip()))
+        return False
+    return True
+
+def measure_import(micropython: str, path: str, module: str):
+    """
+    在 MicroPython unix 端口中测量模块导入时间和堆内存占用。
+    没有指定 unix 端口时返回None，测量失败时返回包含失败原因的 error 项。
+
+    ==========================================
+
+    Measure the import time and heap usage of a module with the MicroPython unix port.
+    Returns None without a unix port, and a dict with the failure reason under "error" if the measurement failed.
+    """
+    if micropython is None:
+        return None
+    env = dict(os.environ)
+    env["MICROPYPATH"] = path + os.pathsep + ".frozen"
+    try:
+        result = subprocess.run([micropython, "-c", IMPORT_PROBE.format(module=module)], capture_output=True,
+                                text=True, env=env, timeout=30)
+    except subprocess.TimeoutExpired:
+        return {"error": "timed out"}
+    except OSError as e:
+        return {"error": str(e)}
+    if result.returncode != 0:
+        # 导入失败时取回溯的最后一行作为原因，例如缺少的模块
+        lines = result.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else "exit code %d" % result.returncode}
+    try:
+        import_us, heap = result.stdout.split()
+        return {"import_us": int(import_us), "heap_bytes": int(heap)}
+    except ValueError:
+        return {"error": "unexpected output: %r" % result.stdout.strip()}
+
+def build_library(name: str, config: dict, args) -> dict:
+    """
+    构建一个库：生成去除文档字符串的源文件和 .mpy 文件，返回对比报告。
+
+    ==========================================
+
+    Build one library: write docstring-stripped sources and .mpy files and return the comparison report.
+    """
+    source_dir = config["source"]
+    files = config["files"] or sorted(f for f in os.listdir(source_dir) if f.endswith(".py"))
+    output = config["output"]
+    # 包按包名放在输出目录下，单文件模块直接放在输出目录下
+    subdir = name if config["package"] else ""
+    stripped_dir = os.path.join(output, "py", subdir)
+    mpy_dir = os.path.join(output, "mpy", subdir)
+    shutil.rmtree(output, ignore_errors=True)
+    os.makedirs(stripped_dir)
+    os.makedirs(mpy_dir)
+
+    trees = {}
+    for filename in files:
+        with open(os.path.join(source_dir, filename), "r", encoding="utf-8") as f:
+            trees[filename] = ast.parse(f.read(), filename)
+
+    constants = collect_constants(list(trees.values())) if args.fold_const else {}
+
+    report = {"files": {}, "total": {"source": 0, "stripped": 0, "mpy": 0}}
+    for filename, tree in trees.items():
+        docstrings = strip_docstrings(tree)
+        folded = 0
+        if constants:
+            folder = ConstantFolder(constants)
+            tree = ast.fix_missing_locations(folder.visit(tree))
+            folded = folder.folded
+
+        stripped_path = os.path.join(stripped_dir, filename)
+        with open(stripped_path, "w", encoding="utf-8") as f:
+            f.write(ast.unparse(tree) + "\n")
+
+        entry = {
+            "source": os.path.getsize(os.path.join(source_dir, filename)),
+            "stripped": os.path.getsize(stripped_path),
+            "mpy": None,
+            "docstrings": docstrings,
+            "folded": folded,
+        }
+
+        # __init__.py 在设备上保持源文件形式，使包可以正常导入
+        if args.mpy_cross and filename != "__init__.py":
+            mpy_path = os.path.join(mpy_dir, filename[:-3] + ".mpy")
+            if compile_mpy(args.mpy_cross, stripped_path, mpy_path, args.march):
+                entry["mpy"] = os.path.getsize(mpy_path)
+        elif filename == "__init__.py":
+            shutil.copy(stripped_path, os.path.join(mpy_dir, filename))
+            entry["mpy"] = entry["stripped"]
+
+        report["files"][filename] = entry
+        report["total"]["source"] += entry["source"]
+        report["total"]["stripped"] += entry["stripped"]
+        if entry["mpy"] is not None:
+            report["total"]["mpy"] += entry["mpy"]
+
+    if not args.mpy_cross:
+        report["total"]["mpy"] = None
+
+    # 分别测量源文件、去除文档字符串的源文件和 .mpy 文件的导入开销
+    report["import"] = {
+        "source": measure_import(args.micropython, os.path.dirname(source_dir) if config["package"] else source_dir,
+                                 config["import"]),
+        "stripped": measure_import(args.micropython, os.path.join(output, "py"), config["import"]),
+        "mpy": measure_import(args.micropython, os.path.join(output, "mpy"), config["import"]) if args.mpy_cross
+        else None,
+    }
+    return report
+
+def print_report(name: str, report: dict) -> None:
+    """
+    打印一个库的大小和导入时间对比表。
+
+    ==========================================
+
+    Print the size and import time comparison of one library.
+    """
+    def fmt(value):
+        return "-" if value is None else str(value)
+
+    print("\n== %s ==" % name)
+    print("%-24s %10s %10s %10s %6s %6s" % ("file", "source", "stripped", "mpy", "docs", "folded"))
+    for filename, entry in report["files"].items():
+        print("%-24s %10d %10d %10s %6d %6d" % (filename, entry["source"], entry["stripped"], fmt(entry["mpy"]),
+                                                entry["docstrings"], entry["folded"]))
+    total = report["total"]
+    print("%-24s %10d %10d %10s" % ("total", total["source"], total["stripped"], fmt(total["mpy"])))
+    for variant, result in report["import"].items():
+        if result is None:
+            print("import %-9s: not measured (no MicroPython unix port)" % variant)
+        elif "error" in result:
+            print("import %-9s: not measured (%s)" % (variant, result["error"]))
+        else:
+            print("import %-9s: %d us, %d bytes heap" % (variant, result["import_us"], result["heap_bytes"]))
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build docstring-stripped .py and .mpy files.")
+    parser.add_argument("libraries", nargs="*", default=list(LIBRARIES), help="libraries to build")
+    parser.add_argument("--fold-const", action="store_true", help="fold class constants into literals")
+    parser.add_argument("--mpy-cross", default=None, help="path of mpy-cross, searched on PATH by default")
+    parser.add_argument("--march", default=None, help="target architecture passed to mpy-cross")
+    parser.add_argument("--micropython", default=None,
+                        help="path of the MicroPython unix port used to measure import time")
+    parser.add_argument("--report", default=os.path.join(ROOT, "build_mpy_report.json"), help="JSON report path")
+    args = parser.parse_args()
+
+    args.mpy_cross = find_tool("mpy-cross", args.mpy_cross)
+    args.micropython = find_tool("micropython", args.micropython)
+    if args.mpy_cross is None:
+        print("mpy-cross not found, only docstring-stripped sources are generated.")
+
+    reports = {}
+    for library in args.libraries:
+        if library not in LIBRARIES:
+            sys.exit("Unknown library: %s" % library)
+        reports[library] = build_library(library, LIBRARIES[library], args)
+        print_report(library, reports[library])
+
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(reports, f, indent=2)
+    print("\nReport saved to %s" % args.report)